@@ -85,8 +85,12 @@ def get_conversation(
         conversation_id,
     )
     try:
+        # every turn consists of two messages
+        limit = None if history_length is None else (history_length + 1) // 2
         chat_history = CacheEntry.cache_entries_to_history(
-            retrieve_previous_input(user_id, conversation_id, skip_user_id_check)
+            retrieve_previous_input(
+                user_id, conversation_id, skip_user_id_check, limit=limit
+            )
         )
         if len(chat_history) == 0:
             logger.info(
@@ -224,8 +228,11 @@ def list_conversations(
     new_conversations = []
     for conv in conversations:
         conversation_id = conv["conversation_id"]
+        # just the last turn is needed for its timestamp
         chat_history = CacheEntry.cache_entries_to_history(
-            retrieve_previous_input(user_id, conversation_id, skip_user_id_check)
+            retrieve_previous_input(
+                user_id, conversation_id, skip_user_id_check, limit=1
+            )
         )
         conv["last_message_timestamp"] = chat_history[-1].response_metadata[
             "created_at"
@@ -7,7 +7,7 @@ methods. For HEAD HTTP method, just the HTTP response code is used.
 
 import logging
 import time
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException, status
 from langchain_core.messages.ai import AIMessage
@@ -20,6 +20,13 @@ from ols.app.models.models import (
 )
 from ols.src.llms.llm_loader import load_llm
 
+# as the index_loader.py is excluded from type checks, it confuses
+# mypy a bit, hence the [attr-defined] bellow
+from ols.src.rag_index.index_loader import (  # type: ignore [attr-defined]
+    get_index_load_durations,
+)
+from ols.src.rag_index.remote_index import RemoteIndex
+
 router = APIRouter(tags=["health"])
 logger = logging.getLogger(__name__)
 llm_is_ready_persistent_state: bool = False
@@ -64,9 +71,18 @@ def index_is_ready() -> bool:
     """Check if the index is loaded."""
     if config._rag_index is None and config.ols_config.reference_content is not None:
         return False
+    if isinstance(config._rag_index, RemoteIndex):
+        return config._rag_index.is_ready()
     return True
 
 
+def index_load_details() -> Optional[dict[str, Any]]:
+    """Get durations of index load phases finished so far."""
+    if config.ols_config.reference_content is None:
+        return None
+    return get_index_load_durations() or None
+
+
 def cache_is_ready() -> bool:
     """Check if the cache is ready."""
     if config.conversation_cache is None:
@@ -95,6 +111,7 @@ def readiness_probe_get_method() -> ReadinessResponse:
             detail={
                 "response": "Service is not ready",
                 "cause": "Index is not ready",
+                "index_load": index_load_details(),
             },
         )
     if not llm_is_ready():
@@ -114,7 +131,9 @@ def readiness_probe_get_method() -> ReadinessResponse:
             },
         )
 
-    return ReadinessResponse(ready=True, reason="service is ready")
+    return ReadinessResponse(
+        ready=True, reason="service is ready", details=index_load_details()
+    )
 
 
 get_liveness_responses: dict[int | str, dict[str, Any]] = {
@@ -7,12 +7,12 @@ import os
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Generator, Optional, Union
+from typing import Any, Callable, Generator, Optional, Union
 
 import psycopg2
 import pytz
 from fastapi import APIRouter, Depends, HTTPException, status
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 
 from ols import config, constants
 from ols.app import metrics
@@ -40,6 +40,8 @@ from ols.src.query_helpers.question_validator import QuestionValidator
 from ols.src.query_helpers.topic_summarizer import TopicSummarizer
 from ols.src.quota.quota_limiter import QuotaLimiter
 from ols.src.quota.token_usage_history import TokenUsageHistory
+from ols.src.rag_index.multi_index import MultiIndex
+from ols.src.rag_index.remote_index import RemoteIndex
 from ols.utils import errors_parsing, suid
 from ols.utils.token_handler import PromptTooLongError
 
@@ -108,6 +110,7 @@ def conversation_request(
             processed_request.conversation_id,
             llm_request,
             processed_request.previous_input,
+            history_loader=conversation_history_loader(processed_request),
         )
 
     processed_request.timestamps["generate response"] = time.time()
@@ -277,7 +280,10 @@ def process_request(auth: Any, llm_request: LLMRequest) -> ProcessedRequest:
     )
 
     previous_input = retrieve_previous_input(
-        user_id, llm_request.conversation_id, skip_user_id_check
+        user_id,
+        llm_request.conversation_id,
+        skip_user_id_check,
+        limit=constants.CONVERSATION_HISTORY_TAIL_TURNS,
     )
     timestamps["retrieve previous input"] = time.time()
 
@@ -294,6 +300,7 @@ def process_request(auth: Any, llm_request: LLMRequest) -> ProcessedRequest:
     timestamps["append attachments"] = time.time()
 
     validate_requested_provider_model(llm_request)
+    validate_requested_rag_indexes(llm_request)
 
     check_tokens_available(config.quota_limiters, user_id)
 
@@ -417,14 +424,21 @@ def retrieve_conversation_id(llm_request: LLMRequest) -> str:
 
 
 def retrieve_previous_input(
-    user_id: str, conversation_id: str, skip_user_id_check: bool = False
+    user_id: str,
+    conversation_id: str,
+    skip_user_id_check: bool = False,
+    limit: Optional[int] = None,
 ) -> list[CacheEntry]:
-    """Retrieve previous user input, if exists."""
+    """Retrieve previous user input, if exists.
+
+    Only the given number of the most recent entries is retrieved when
+    the limit is set.
+    """
     try:
         previous_input = []
         if conversation_id:
             cache_content = config.conversation_cache.get(
-                user_id, conversation_id, skip_user_id_check
+                user_id, conversation_id, skip_user_id_check, limit=limit
             )
             if cache_content is not None:
                 previous_input = cache_content
@@ -475,11 +489,38 @@ def retrieve_attachments(llm_request: LLMRequest) -> list[Attachment]:
     return attachments
 
 
+def conversation_history_loader(
+    processed_request: ProcessedRequest,
+) -> Optional[Callable[[int], list[BaseMessage]]]:
+    """Get function loading longer conversation history for the summarizer.
+
+    Returns:
+        None when the whole conversation was retrieved already, otherwise
+        function loading the given number of the most recent turns.
+    """
+    previous_input = processed_request.previous_input
+    if len(previous_input) < constants.CONVERSATION_HISTORY_TAIL_TURNS:
+        return None
+
+    def load(turns: int) -> list[BaseMessage]:
+        return CacheEntry.cache_entries_to_history(
+            retrieve_previous_input(
+                processed_request.user_id,
+                processed_request.conversation_id,
+                processed_request.skip_user_id_check,
+                limit=turns,
+            )
+        )
+
+    return load
+
+
 def generate_response(
     conversation_id: str,
     llm_request: LLMRequest,
     previous_input: list[CacheEntry],
     streaming: bool = False,
+    history_loader: Optional[Callable[[int], list[BaseMessage]]] = None,
 ) -> Union[SummarizerResponse, Generator]:
     """Generate response based on validation result, previous input, and model output.
 
@@ -488,6 +529,8 @@ def generate_response(
         llm_request: The request containing a query.
         previous_input: The history of the conversation (if available).
         streaming: The flag indicating if the response should be streamed.
+        history_loader: Function loading longer history when previous
+            input is just the tail of the conversation.
 
     Returns:
         SummarizerResponse or Generator, depending on the streaming flag.
@@ -499,12 +542,13 @@ def generate_response(
             system_prompt=llm_request.system_prompt,
         )
         history = CacheEntry.cache_entries_to_history(previous_input)
+        rag_index = select_rag_index(llm_request)
         if streaming:
             return docs_summarizer.generate_response(
-                llm_request.query, config.rag_index, history
+                llm_request.query, rag_index, history, history_loader
             )
         response = docs_summarizer.create_response(
-            llm_request.query, config.rag_index, history
+            llm_request.query, rag_index, history, history_loader
         )
         logger.debug("%s Generated response: %s", conversation_id, response)
         return response
@@ -551,6 +595,52 @@ def validate_requested_provider_model(llm_request: LLMRequest) -> None:
         )
 
 
+def validate_requested_rag_indexes(llm_request: LLMRequest) -> None:
+    """Validate indexes used for RAG; if provided in request payload."""
+    if not llm_request.rag_indexes:
+        return
+
+    reference_content = config.ols_config.reference_content
+    known_indexes = (
+        [index.name for index in reference_content.get_indexes()]
+        if reference_content is not None
+        else []
+    )
+    unknown_indexes = [
+        name for name in llm_request.rag_indexes if name not in known_indexes
+    ]
+    if unknown_indexes:
+        message = (
+            f"Unknown index(es) {unknown_indexes}, "
+            f"available indexes are {known_indexes}"
+        )
+        logger.error(message)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"response": "Unable to process this request", "cause": message},
+        )
+
+
+def select_rag_index(llm_request: LLMRequest) -> Any:
+    """Select index(es) used for RAG, honoring indexes requested by client."""
+    if llm_request.rag_indexes is None:
+        return config.rag_index
+    if not llm_request.rag_indexes:
+        logger.debug("RAG is disabled by request")
+        return None
+
+    rag_index = config.rag_index
+    if not isinstance(rag_index, (MultiIndex, RemoteIndex)):
+        # just one index is configured and it was validated already
+        return rag_index
+
+    # requested indexes are validated, but some of them might fail to load
+    names = [name for name in llm_request.rag_indexes if name in rag_index.names]
+    if len(names) != len(llm_request.rag_indexes):
+        logger.warning("Some of requested indexes are not loaded, using %s", names)
+    return rag_index.select(names) if names else None
+
+
 def store_conversation_history(
     user_id: str,
     conversation_id: str,
@@ -17,6 +17,7 @@ from ols.app.endpoints.ols import (
     calc_input_tokens,
     calc_output_tokens,
     consume_tokens,
+    conversation_history_loader,
     generate_response,
     get_available_quotas,
     get_topic_summary,
@@ -95,6 +96,7 @@ def conversation_request(
             llm_request,
             processed_request.previous_input,
             streaming=True,
+            history_loader=conversation_history_loader(processed_request),
         )
     )
 
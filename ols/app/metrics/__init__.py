@@ -1,12 +1,15 @@
 """Metrics and metric collectors."""
 
 from .metrics import (
+    index_load_duration_seconds,
     llm_calls_failures_total,
     llm_calls_total,
     llm_calls_validation_errors_total,
     llm_token_received_total,
     llm_token_sent_total,
     provider_model_configuration,
+    reranker_duration_seconds,
+    reranker_fallbacks_total,
     response_duration_seconds,
     rest_api_calls_total,
     setup_model_metrics,
@@ -16,12 +19,15 @@ from .token_counter import GenericTokenCounter, TokenMetricUpdater
 __all__ = [
     "GenericTokenCounter",
     "TokenMetricUpdater",
+    "index_load_duration_seconds",
     "llm_calls_failures_total",
     "llm_calls_total",
     "llm_calls_validation_errors_total",
     "llm_token_received_total",
     "llm_token_sent_total",
     "provider_model_configuration",
+    "reranker_duration_seconds",
+    "reranker_fallbacks_total",
     "response_duration_seconds",
     "rest_api_calls_total",
     "setup_model_metrics",
@@ -47,6 +47,21 @@ llm_token_received_total = Counter(
     "ols_llm_token_received_total", "LLM tokens received", ["provider", "model"]
 )
 
+reranker_duration_seconds = Histogram(
+    "ols_reranker_duration_seconds", "Reranker durations"
+)
+reranker_fallbacks_total = Counter(
+    "ols_reranker_fallbacks_total",
+    "Reranker fallbacks to original order",
+    ["reason"],
+)
+
+index_load_duration_seconds = Gauge(
+    "ols_index_load_duration_seconds",
+    "Durations of embedding model and index load phases at startup",
+    ["phase", "index"],
+)
+
 # metric that indicates what provider + model customers are using so we can
 # understand what is popular/important
 provider_model_configuration = Gauge(
@@ -10,6 +10,8 @@ from pydantic import (
     BaseModel,
     DirectoryPath,
     FilePath,
+    NonNegativeInt,
+    PositiveFloat,
     PositiveInt,
     field_validator,
     model_validator,
@@ -129,6 +131,11 @@ class AuthenticationConfig(BaseModel):
     skip_tls_verification: bool = False
     k8s_cluster_api: Optional[AnyHttpUrl] = None
     k8s_ca_cert_path: Optional[FilePath] = None
+    # seconds to keep results of successful and rejected token and access
+    # reviews, 0 disables caching of the results
+    review_cache_ttl: NonNegativeInt = constants.AUTH_REVIEW_CACHE_TTL
+    review_cache_negative_ttl: NonNegativeInt = constants.AUTH_REVIEW_CACHE_NEGATIVE_TTL
+    review_cache_max_entries: PositiveInt = constants.AUTH_REVIEW_CACHE_MAX_ENTRIES
 
     def validate_yaml(self) -> None:
         """Validate YAML containing authentication configuration section."""
@@ -631,6 +638,23 @@ class MCPServers(BaseModel):
         return self
 
 
+class PostgresPoolConfig(BaseModel):
+    """Postgres connection pool configuration."""
+
+    min_size: NonNegativeInt = constants.POSTGRES_POOL_MIN_SIZE
+    max_size: PositiveInt = constants.POSTGRES_POOL_MAX_SIZE
+    timeout: PositiveInt = constants.POSTGRES_POOL_TIMEOUT
+    max_lifetime: PositiveInt = constants.POSTGRES_POOL_MAX_LIFETIME
+    keepalive_interval: NonNegativeInt = constants.POSTGRES_POOL_KEEPALIVE_INTERVAL
+
+    @model_validator(mode="after")
+    def validate_sizes(self) -> Self:
+        """Validate that minimal size does not exceed maximal size."""
+        if self.min_size > self.max_size:
+            raise ValueError("min_size of the pool can not be larger than max_size")
+        return self
+
+
 class PostgresConfig(BaseModel):
     """Postgres configuration."""
 
@@ -644,6 +668,12 @@ class PostgresConfig(BaseModel):
     gss_encmode: str = constants.POSTGRES_CACHE_GSSENCMODE
     ca_cert_path: Optional[FilePath] = None
     max_entries: PositiveInt = constants.POSTGRES_CACHE_MAX_ENTRIES
+    eviction_interval: PositiveInt = constants.POSTGRES_CACHE_EVICTION_INTERVAL
+    eviction_inserts: PositiveInt = constants.POSTGRES_CACHE_EVICTION_INSERTS
+    eviction_batch_size: PositiveInt = constants.POSTGRES_CACHE_EVICTION_BATCH_SIZE
+    local_cache_max_entries: NonNegativeInt = constants.POSTGRES_CACHE_LOCAL_MAX_ENTRIES
+    value_format: constants.CacheValueFormat = constants.POSTGRES_CACHE_VALUE_FORMAT
+    pool: PostgresPoolConfig = PostgresPoolConfig()
 
     def __init__(self, **data: Any) -> None:
         """Initialize configuration."""
@@ -661,10 +691,40 @@ class PostgresConfig(BaseModel):
         return self
 
 
+class SQLiteCacheConfig(BaseModel):
+    """SQLite cache configuration."""
+
+    path: str
+    max_entries: PositiveInt = constants.SQLITE_CACHE_MAX_ENTRIES
+    timeout: PositiveFloat = constants.SQLITE_CACHE_TIMEOUT
+
+
+def _positive_int(data: dict, name: str, section: str) -> Optional[int]:
+    """Get optional positive integer option of the given config section."""
+    value = data.get(name)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+        if value <= 0:
+            raise ValueError
+    except ValueError as e:
+        raise checks.InvalidConfigurationError(
+            f"invalid {name} for {section}, {name} needs to be a positive integer"
+        ) from e
+    return value
+
+
 class InMemoryCacheConfig(BaseModel):
     """In-memory cache configuration."""
 
     max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None
+    shards: int = constants.IN_MEMORY_CACHE_SHARDS
+    # conversations are saved to the snapshot file on shutdown, and every
+    # `snapshot_interval` seconds when set, and restored on start-up
+    snapshot_path: Optional[str] = None
+    snapshot_interval: Optional[int] = None
 
     def __init__(self, data: Optional[dict] = None) -> None:
         """Initialize configuration and perform basic validation."""
@@ -684,10 +744,31 @@ class InMemoryCacheConfig(BaseModel):
                 " max_entries needs to be a non-negative integer"
             ) from e
 
+        self.max_bytes = _positive_int(data, "max_bytes", "memory conversation cache")
+        self.shards = (
+            _positive_int(data, "shards", "memory conversation cache")
+            or constants.IN_MEMORY_CACHE_SHARDS
+        )
+        self.snapshot_path = data.get("snapshot_path")
+        self.snapshot_interval = _positive_int(
+            data, "snapshot_interval", "memory conversation cache"
+        )
+        if self.snapshot_interval is not None and self.snapshot_path is None:
+            raise checks.InvalidConfigurationError(
+                "snapshot_interval for memory conversation cache"
+                " requires snapshot_path"
+            )
+
     def __eq__(self, other: object) -> bool:
         """Compare two objects for equality."""
         if isinstance(other, InMemoryCacheConfig):
-            return self.max_entries == other.max_entries
+            return (
+                self.max_entries == other.max_entries
+                and self.max_bytes == other.max_bytes
+                and self.shards == other.shards
+                and self.snapshot_path == other.snapshot_path
+                and self.snapshot_interval == other.snapshot_interval
+            )
         return False
 
     def validate_yaml(self) -> None:
@@ -747,6 +828,12 @@ class ConversationCacheConfig(BaseModel):
     type: Optional[str] = None
     memory: Optional[InMemoryCacheConfig] = None
     postgres: Optional[PostgresConfig] = None
+    sqlite: Optional[SQLiteCacheConfig] = None
+    # conversations expire when not used for `idle_ttl` seconds
+    # and `absolute_ttl` seconds after they were created
+    idle_ttl: Optional[int] = None
+    absolute_ttl: Optional[int] = None
+    sweep_interval: int = constants.CONVERSATION_CACHE_SWEEP_INTERVAL
 
     def __init__(self, data: Optional[dict] = None) -> None:
         """Initialize configuration and perform basic validation."""
@@ -754,6 +841,12 @@ class ConversationCacheConfig(BaseModel):
         if data is None:
             return
         self.type = data.get("type", None)
+        self.idle_ttl = _positive_int(data, "idle_ttl", "conversation cache")
+        self.absolute_ttl = _positive_int(data, "absolute_ttl", "conversation cache")
+        self.sweep_interval = (
+            _positive_int(data, "sweep_interval", "conversation cache")
+            or constants.CONVERSATION_CACHE_SWEEP_INTERVAL
+        )
         if self.type is not None:
             match self.type:
                 case constants.CACHE_TYPE_MEMORY:
@@ -774,6 +867,15 @@ class ConversationCacheConfig(BaseModel):
                     self.postgres = PostgresConfig(
                         **data.get(constants.CACHE_TYPE_POSTGRES)
                     )
+                case constants.CACHE_TYPE_SQLITE:
+                    if constants.CACHE_TYPE_SQLITE not in data:
+                        raise checks.InvalidConfigurationError(
+                            "SQLite conversation cache type is specified,"
+                            " but SQLite configuration is missing"
+                        )
+                    self.sqlite = SQLiteCacheConfig(
+                        **data.get(constants.CACHE_TYPE_SQLITE)
+                    )
                 case _:
                     raise checks.InvalidConfigurationError(
                         f"unknown conversation cache type: {self.type}"
@@ -786,6 +888,10 @@ class ConversationCacheConfig(BaseModel):
                 self.type == other.type
                 and self.memory == other.memory
                 and self.postgres == other.postgres
+                and self.sqlite == other.sqlite
+                and self.idle_ttl == other.idle_ttl
+                and self.absolute_ttl == other.absolute_ttl
+                and self.sweep_interval == other.sweep_interval
             )
         return False
 
@@ -797,7 +903,7 @@ class ConversationCacheConfig(BaseModel):
         match self.type:
             case constants.CACHE_TYPE_MEMORY:
                 self.memory.validate_yaml()
-            case constants.CACHE_TYPE_POSTGRES:
+            case constants.CACHE_TYPE_POSTGRES | constants.CACHE_TYPE_SQLITE:
                 pass  # it is validated by Pydantic already
             case _:
                 raise checks.InvalidConfigurationError(
@@ -824,14 +930,186 @@ class LoggingConfig(BaseModel):
         super().__init__(**data)
 
 
+class FaissConfig(BaseModel):
+    """FAISS vector store configuration (search of IVF and HNSW indexes)."""
+
+    index_type: Optional[constants.FaissIndexType] = None
+    nprobe: PositiveInt = constants.FAISS_IVF_NPROBE
+    ef_search: PositiveInt = constants.FAISS_HNSW_EF_SEARCH
+
+
+class DeduplicationConfig(BaseModel):
+    """Near-duplicate suppression and diversification of retrieved chunks.
+
+    Near-duplicate retrieved chunks are dropped, and retrieved chunks are
+    diversified by maximal marginal relevance when `mmr` is set.
+    """
+
+    similarity_threshold: float = constants.RAG_DEDUPLICATION_SIMILARITY_THRESHOLD
+    mmr: bool = False
+    mmr_lambda: float = constants.RAG_MMR_LAMBDA
+
+    @model_validator(mode="after")
+    def validate_yaml(self) -> Self:
+        """Validate deduplication config."""
+        if not 0 < self.similarity_threshold <= 1:
+            raise ValueError("similarity_threshold must be in range (0, 1]")
+        if not 0 <= self.mmr_lambda <= 1:
+            raise ValueError("mmr_lambda must be in range [0, 1]")
+        return self
+
+
+class RetrievalDepthConfig(BaseModel):
+    """Bounds of number of chunks retrieved for the available token budget.
+
+    Number of retrieved chunks is driven by the available token budget
+    instead of the fixed limit.
+    """
+
+    min_top_k: PositiveInt = constants.RAG_MIN_TOP_K
+    max_top_k: PositiveInt = constants.RAG_MAX_TOP_K
+
+    @model_validator(mode="after")
+    def validate_yaml(self) -> Self:
+        """Validate retrieval depth config."""
+        if self.min_top_k > self.max_top_k:
+            raise ValueError("min_top_k must not be greater than max_top_k")
+        return self
+
+
+class RetrievalSidecarConfig(BaseModel):
+    """Retrieval sidecar configuration.
+
+    Indexes are loaded and queried by a separate local process instead of
+    the API workers, which connect to it by the Unix socket.
+    """
+
+    socket_path: str = constants.RETRIEVAL_SIDECAR_SOCKET_PATH
+    timeout: PositiveInt = constants.RETRIEVAL_SIDECAR_TIMEOUT
+
+
+class DocstoreConfig(BaseModel):
+    """Docstore configuration of FAISS indexes.
+
+    Nodes of FAISS indexes can be read on demand from SQLite database
+    instead of loading the whole JSON docstore.
+    """
+
+    type: constants.DocstoreType = constants.DocstoreType.JSON
+    cache_size: PositiveInt = constants.SQLITE_DOCSTORE_CACHE_SIZE
+
+
+class PGVectorConfig(BaseModel):
+    """Pgvector vector store configuration (connection pool and ANN index)."""
+
+    pool_size: PositiveInt = constants.PGVECTOR_POOL_SIZE
+    max_overflow: NonNegativeInt = constants.PGVECTOR_MAX_OVERFLOW
+    pool_timeout: PositiveInt = constants.PGVECTOR_POOL_TIMEOUT
+    index_type: constants.PGVectorIndexType = constants.PGVectorIndexType.HNSW
+    create_index: bool = True
+    hnsw_m: PositiveInt = constants.PGVECTOR_HNSW_M
+    hnsw_ef_construction: PositiveInt = constants.PGVECTOR_HNSW_EF_CONSTRUCTION
+    ef_search: PositiveInt = constants.PGVECTOR_HNSW_EF_SEARCH
+    ivfflat_lists: PositiveInt = constants.PGVECTOR_IVFFLAT_LISTS
+    ivfflat_probes: PositiveInt = constants.PGVECTOR_IVFFLAT_PROBES
+
+
+class RerankerConfig(BaseModel):
+    """Cross-encoder reranker configuration.
+
+    Wider set of candidates is retrieved and reranked by a local
+    cross-encoder model.
+    """
+
+    model_path: DirectoryPath
+    candidates: PositiveInt = constants.RERANKER_CANDIDATES_LIMIT
+    top_n: PositiveInt = constants.RAG_CONTENT_LIMIT
+    latency_budget_ms: PositiveInt = constants.RERANKER_LATENCY_BUDGET_MS
+
+    @model_validator(mode="after")
+    def validate_yaml(self) -> Self:
+        """Validate reranker config."""
+        if self.top_n > self.candidates:
+            raise ValueError("top_n can not be greater than number of candidates")
+        return self
+
+
+class ReferenceContentIndex(BaseModel):
+    """Configuration of one index with reference content."""
+
+    name: Optional[str] = None
+    product_docs_index_path: Optional[FilePath] = None
+    product_docs_index_id: Optional[str] = None
+    keywords: list[str] = []
+    description: Optional[str] = None
+
+    def __init__(self, data: Optional[dict] = None) -> None:
+        """Initialize configuration and perform basic validation."""
+        super().__init__()
+        if data is None:
+            return
+
+        self.product_docs_index_path = data.get("product_docs_index_path", None)
+        self.product_docs_index_id = data.get("product_docs_index_id", None)
+        # index ID is used as index name when name is not specified explicitly
+        self.name = data.get("name", self.product_docs_index_id)
+        self.keywords = [keyword.lower() for keyword in data.get("keywords", [])]
+        self.description = data.get("description", None)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two objects for equality."""
+        if isinstance(other, ReferenceContentIndex):
+            return (
+                self.name == other.name
+                and self.product_docs_index_path == other.product_docs_index_path
+                and self.product_docs_index_id == other.product_docs_index_id
+                and self.keywords == other.keywords
+                and self.description == other.description
+            )
+        return False
+
+    def validate_yaml(self, vector_store_type: Optional[str]) -> None:
+        """Validate reference content index config."""
+        if self.name is None:
+            raise checks.InvalidConfigurationError("index name is missing")
+        if self.product_docs_index_id is None:
+            raise checks.InvalidConfigurationError(
+                f"product_docs_index_id is missing for index {self.name}"
+            )
+        if vector_store_type is None or vector_store_type == VectorStoreType.FAISS:
+            if self.product_docs_index_path is None:
+                raise checks.InvalidConfigurationError(
+                    f"product_docs_index_path is missing for index {self.name}"
+                )
+            checks.dir_check(self.product_docs_index_path, "Reference content path")
+
+
 class ReferenceContent(BaseModel):
-    """Reference content configuration."""
+    """Reference content configuration.
+
+    Reference content can be stored in one index, specified by
+    `product_docs_index_path` and `product_docs_index_id`, or in several
+    indexes listed in `indexes`. Both forms can be combined; the single
+    index is then handled as the first item in the list.
+    """
 
     vector_store_type: Optional[str] = None
     product_docs_index_path: Optional[FilePath] = None
     product_docs_index_id: Optional[str] = None
     embeddings_model_path: Optional[FilePath] = None
     postgres: Optional[PostgresConfig] = None
+    indexes: list[ReferenceContentIndex] = []
+    index_routing: str = constants.IndexRoutingMethod.ALL
+    # FAISS indexes are combined with lexical (BM25) index built from
+    # their docstores
+    hybrid_retrieval: bool = False
+    reranker: Optional[RerankerConfig] = None
+    faiss: Optional[FaissConfig] = None
+    pgvector: Optional[PGVectorConfig] = None
+    docstore: Optional[DocstoreConfig] = None
+    deduplication: Optional[DeduplicationConfig] = None
+    retrieval_depth: Optional[RetrievalDepthConfig] = None
+    retrieval_sidecar: Optional[RetrievalSidecarConfig] = None
 
     def __init__(self, data: Optional[dict] = None) -> None:
         """Initialize configuration and perform basic validation."""
@@ -856,6 +1134,31 @@ class ReferenceContent(BaseModel):
             and "postgres" in data
         ):
             self.postgres = PostgresConfig(**data.get("postgres"))
+        self.indexes = [
+            ReferenceContentIndex(index) for index in data.get("indexes", [])
+        ]
+        self.index_routing = data.get("index_routing", constants.IndexRoutingMethod.ALL)
+        self.hybrid_retrieval = data.get("hybrid_retrieval", False)
+        self._set_retrieval_options(data)
+
+    def _set_retrieval_options(self, data: dict) -> None:
+        """Set configuration of optional retrieval features."""
+        if "reranker" in data:
+            self.reranker = RerankerConfig(**data.get("reranker"))
+        if "faiss" in data:
+            self.faiss = FaissConfig(**data.get("faiss"))
+        if "pgvector" in data:
+            self.pgvector = PGVectorConfig(**data.get("pgvector"))
+        if "docstore" in data:
+            self.docstore = DocstoreConfig(**data.get("docstore"))
+        if "deduplication" in data:
+            self.deduplication = DeduplicationConfig(**data.get("deduplication"))
+        if "retrieval_depth" in data:
+            self.retrieval_depth = RetrievalDepthConfig(**data.get("retrieval_depth"))
+        if "retrieval_sidecar" in data:
+            self.retrieval_sidecar = RetrievalSidecarConfig(
+                **data.get("retrieval_sidecar")
+            )
 
     def __eq__(self, other: object) -> bool:
         """Compare two objects for equality."""
@@ -865,6 +1168,16 @@ class ReferenceContent(BaseModel):
                 and self.product_docs_index_path == other.product_docs_index_path
                 and self.product_docs_index_id == other.product_docs_index_id
                 and self.embeddings_model_path == other.embeddings_model_path
+                and self.indexes == other.indexes
+                and self.index_routing == other.index_routing
+                and self.hybrid_retrieval == other.hybrid_retrieval
+                and self.reranker == other.reranker
+                and self.faiss == other.faiss
+                and self.pgvector == other.pgvector
+                and self.docstore == other.docstore
+                and self.deduplication == other.deduplication
+                and self.retrieval_depth == other.retrieval_depth
+                and self.retrieval_sidecar == other.retrieval_sidecar
             ):
                 return (
                     self.vector_store_type != constants.VectorStoreType.POSTGRES
@@ -872,6 +1185,17 @@ class ReferenceContent(BaseModel):
                 )
         return False
 
+    def get_indexes(self) -> list[ReferenceContentIndex]:
+        """Return configuration of all indexes, including the single one."""
+        indexes = []
+        if self.product_docs_index_id is not None:
+            index = ReferenceContentIndex()
+            index.name = self.product_docs_index_id
+            index.product_docs_index_path = self.product_docs_index_path
+            index.product_docs_index_id = self.product_docs_index_id
+            indexes.append(index)
+        return indexes + self.indexes
+
     def validate_yaml(self) -> None:
         """Validate reference content config."""
         if (
@@ -894,18 +1218,53 @@ class ReferenceContent(BaseModel):
                     "product_docs_index_id is specified but product_docs_index_path is missing"
                 )
         elif self.vector_store_type == VectorStoreType.POSTGRES:
-            if self.product_docs_index_id is None:
-                raise checks.InvalidConfigurationError(
-                    "product_docs_index_id is missing"
-                )
-            if self.postgres is None:
-                raise checks.InvalidConfigurationError(
-                    "vector_store_type is set to 'postgres', but postgres configuration is missing"
-                )
+            self._validate_postgres()
 
         if self.embeddings_model_path is not None:
             checks.dir_check(self.embeddings_model_path, "Embeddings model path")
 
+        self._validate_indexes()
+
+    def _validate_postgres(self) -> None:
+        """Validate configuration specific to postgres vector store."""
+        if self.product_docs_index_id is None and not self.indexes:
+            raise checks.InvalidConfigurationError("product_docs_index_id is missing")
+        if self.postgres is None:
+            raise checks.InvalidConfigurationError(
+                "vector_store_type is set to 'postgres', but postgres configuration is missing"
+            )
+        if self.hybrid_retrieval:
+            raise checks.InvalidConfigurationError(
+                "hybrid_retrieval is supported for 'faiss' vector store only"
+            )
+        if (
+            self.docstore is not None
+            and self.docstore.type != constants.DocstoreType.JSON
+        ):
+            raise checks.InvalidConfigurationError(
+                "docstore type can be set for 'faiss' vector store only"
+            )
+
+    def _validate_indexes(self) -> None:
+        """Validate configuration of all indexes and the routing method."""
+        for index in self.indexes:
+            index.validate_yaml(self.vector_store_type)
+
+        index_names = [index.name for index in self.indexes]
+        if self.product_docs_index_id is not None:
+            index_names.insert(0, self.product_docs_index_id)
+        if len(index_names) != len(set(index_names)):
+            raise checks.InvalidConfigurationError(
+                f"index names must be unique, got {index_names}"
+            )
+
+        valid_index_routing_methods = list(constants.IndexRoutingMethod)
+        if self.index_routing not in valid_index_routing_methods:
+            raise checks.InvalidConfigurationError(
+                f"invalid index routing method: {self.index_routing}, supported methods"
+                f" are {valid_index_routing_methods}"
+            )
+
 
 class UserDataCollection(BaseModel):
     """User data collection configuration."""
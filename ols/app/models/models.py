@@ -71,6 +71,9 @@ class LLMRequest(BaseModel):
         model: The optional model.
         attachments: The optional attachments.
         media_type: The optional parameter for streaming response.
+        rag_indexes: The optional names of indexes used to retrieve RAG
+            context; all indexes selected by configured routing are used
+            when not specified, empty list disables RAG for the request.
 
     Example:
         ```python
@@ -85,6 +88,7 @@ class LLMRequest(BaseModel):
     system_prompt: Optional[str] = None
     attachments: Optional[list[Attachment]] = None
     media_type: Optional[str] = MEDIA_TYPE_TEXT
+    rag_indexes: Optional[list[str]] = None
 
     # provides examples for /docs endpoint
     model_config = {
@@ -571,6 +575,7 @@ class ReadinessResponse(BaseModel):
     Attributes:
         ready: The readiness of the service.
         reason: The reason for the readiness.
+        details: Durations of index load phases (in seconds).
 
     Example:
         ```python
@@ -580,6 +585,7 @@ class ReadinessResponse(BaseModel):
 
     ready: bool
     reason: str
+    details: Optional[dict[str, Any]] = None
 
     # provides examples for /docs endpoint
     model_config = {
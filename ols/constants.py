@@ -87,12 +87,21 @@ DEFAULT_TOKENIZER_MODEL = "cl100k_base"
 # Example: 1.05 means we increase by 5%.
 TOKEN_BUFFER_WEIGHT = 1.1
 
+# Number of the most recent conversation turns read from the cache for a
+# query; older turns are read only when the token budget for history is
+# not exhausted by them, the number of read turns is doubled each time.
+CONVERSATION_HISTORY_TAIL_TURNS = 10
+
 
 # RAG related constants
 
 # Minimum tokens to have some meaningful RAG context including special tags.
 MINIMUM_CONTEXT_TOKEN_LIMIT = 10
 
+# Node metadata key with token counts of chunk text precomputed at index time
+# (per model family, as model specific tags are part of the counted text).
+TOKEN_COUNTS_METADATA_KEY = "token_counts"  # noqa: S105  # nosec: B105
+
 # This is used to decide how many matching chunks we want to retrieve as context.
 # (in descending order of similarity between query & chunk)
 
@@ -112,16 +121,111 @@ RAG_CONTENT_LIMIT = 5
 # Range: 0 to 1
 RAG_SIMILARITY_CUTOFF = 0.3
 
+# Token-budget-adaptive retrieval depth: number of retrieved chunks is sized
+# from the tokens available for RAG context and the estimated number of tokens
+# of one chunk (updated from chunks actually used), within the given bounds.
+RAG_MIN_TOP_K = 2
+RAG_MAX_TOP_K = 20
+RAG_CHUNK_TOKENS_ESTIMATE = 400
+
+# Retrieval sidecar: local process serving indexes to API workers over Unix
+# socket; timeout (in seconds) of one retrieval request. The default socket
+# path is relative to the working directory of the service, in a directory
+# accessible by the service user only.
+RETRIEVAL_SIDECAR_SOCKET_PATH = "retrieval-sidecar/retrieval.sock"
+RETRIEVAL_SIDECAR_TIMEOUT = 10
+
+
+# Methods used to select which of the configured indexes are queried for
+# a given request (when the request itself does not specify the indexes).
+class IndexRoutingMethod(StrEnum):
+    """Supported index routing methods."""
+
+    ALL = "all"
+    KEYWORD = "keyword"
+    EMBEDDING = "embedding"
+
+
+# Minimum similarity between query and index description for the index to
+# be selected by embedding router. When no index reaches the cutoff, the
+# most similar index is used.
+RAG_INDEX_ROUTING_SIMILARITY_CUTOFF = 0.3
+
+# Manifest with content hashes of documentation files and chunks stored by
+# the index builder next to the index files, used by incremental rebuilds.
+INDEX_BUILD_MANIFEST_FILENAME = "build_manifest.json"
+
+# Lexical (BM25) index used together with the vector index for hybrid retrieval.
+# The index is persisted next to the vector index files.
+BM25_INDEX_FILENAME = "bm25_index.json"
+# BM25 term frequency saturation and document length normalization parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Minimal share of query terms (weighted by their IDF) a document has to
+# contain to be retrieved by lexical search; stopwords are not counted.
+BM25_MIN_QUERY_TERMS_SHARE = 0.5
+# Constant used by reciprocal rank fusion of vector and lexical search results;
+# higher value lowers the influence of top ranked results.
+RAG_RRF_K = 60
+
+# Cross-encoder reranker: number of candidate chunks retrieved for reranking
+# (only the best RAG_CONTENT_LIMIT chunks are used after reranking) and
+# per-request latency budget; original order is used when it is exceeded.
+RERANKER_CANDIDATES_LIMIT = 20
+RERANKER_LATENCY_BUDGET_MS = 300
+# Maximal number of requests waiting for the reranker worker or being scored.
+RERANKER_QUEUE_SIZE = 16
+
+# Near-duplicate suppression of retrieved chunks: chunks are compared by
+# Jaccard similarity of their word shingles (sequences of words of given size);
+# a chunk too similar to a better ranked one is dropped.
+RAG_DEDUPLICATION_SIMILARITY_THRESHOLD = 0.8
+RAG_DEDUPLICATION_SHINGLE_SIZE = 5
+# Weight of relevance versus diversity used by maximal marginal relevance
+RAG_MMR_LAMBDA = 0.7
+
 
 # cache constants
 CACHE_TYPE_MEMORY = "memory"
+# expired conversations are deleted in background every interval (in seconds)
+CONVERSATION_CACHE_SWEEP_INTERVAL = 60
 IN_MEMORY_CACHE_MAX_ENTRIES = 1000
+# conversations are split into shards with their own locks
+IN_MEMORY_CACHE_SHARDS = 16
 CACHE_TYPE_POSTGRES = "postgres"
 POSTGRES_CACHE_HOST = "localhost"
 POSTGRES_CACHE_PORT = 5432
 POSTGRES_CACHE_DBNAME = "cache"
 POSTGRES_CACHE_USER = "postgres"
 POSTGRES_CACHE_MAX_ENTRIES = 1000
+# old conversations are evicted in background every interval (in seconds)
+# or after given number of new conversations, in batches of given size
+POSTGRES_CACHE_EVICTION_INTERVAL = 60
+POSTGRES_CACHE_EVICTION_INSERTS = 100
+POSTGRES_CACHE_EVICTION_BATCH_SIZE = 1000
+
+
+# format of cache entries stored in Postgres
+class CacheValueFormat(StrEnum):
+    """Possible formats of stored cache entries."""
+
+    # readable by older versions of the service
+    JSON = "json"
+    # fields in fixed positions, compressed by zstd
+    COMPACT = "compact"
+
+
+POSTGRES_CACHE_VALUE_FORMAT = CacheValueFormat.COMPACT
+CACHE_COMPRESSION_LEVEL = 3
+# number of recently used conversations kept in process memory in front of
+# Postgres, zero disables the local cache
+POSTGRES_CACHE_LOCAL_MAX_ENTRIES = 0
+CACHE_TYPE_SQLITE = "sqlite"
+SQLITE_CACHE_MAX_ENTRIES = 1000
+# seconds to wait for the database locked by another connection
+SQLITE_CACHE_TIMEOUT = 5.0
+# compiled statements kept by every connection
+SQLITE_CACHE_CACHED_STATEMENTS = 32
 
 # look at https://www.postgresql.org/docs/current/libpq-connect.html#LIBPQ-CONNECT-SSLMODE
 # for all possible options
@@ -131,6 +235,21 @@ POSTGRES_CACHE_SSL_MODE = "prefer"
 # for all possible options
 POSTGRES_CACHE_GSSENCMODE = "prefer"
 
+# connection pool shared by all Postgres-backed components
+POSTGRES_POOL_MIN_SIZE = 1
+POSTGRES_POOL_MAX_SIZE = 20
+# seconds to wait for a free connection
+POSTGRES_POOL_TIMEOUT = 10
+# seconds after which a connection is closed and replaced
+POSTGRES_POOL_MAX_LIFETIME = 3600
+# seconds after which idle connection is checked by keep-alive, 0 disables it
+POSTGRES_POOL_KEEPALIVE_INTERVAL = 60
+
+# reconnection after failed storage operation
+POSTGRES_RECONNECT_ATTEMPTS = 3
+POSTGRES_RECONNECT_BACKOFF = 0.1
+POSTGRES_RECONNECT_BACKOFF_MAX = 2.0
+
 
 # default indentity for local testing and deployment
 # "nil" UUID is used on purpose, because it will be easier to
@@ -205,6 +324,15 @@ DEFAULT_AUTHENTICATION_MODULE = "k8s"
 # All supported authentication modules
 SUPPORTED_AUTHENTICATION_MODULES = {"k8s", "noop", "noop-with-token"}
 
+# Seconds to keep results of successful TokenReview and SubjectAccessReview
+AUTH_REVIEW_CACHE_TTL = 60
+
+# Seconds to keep results of rejected TokenReview and SubjectAccessReview
+AUTH_REVIEW_CACHE_NEGATIVE_TTL = 10
+
+# Max number of cached results of TokenReview and SubjectAccessReview
+AUTH_REVIEW_CACHE_MAX_ENTRIES = 10000
+
 # Default configuration file name for RCS
 DEFAULT_CONFIGURATION_FILE = "rcsconfig.yaml"
 
@@ -234,6 +362,58 @@ class VectorStoreType(StrEnum):
     POSTGRES = "postgres"
 
 
+# FAISS index types
+class FaissIndexType(StrEnum):
+    """Supported FAISS index types."""
+
+    FLAT = "flat"
+    IVF = "ivf"
+    HNSW = "hnsw"
+
+
+# Default FAISS search parameters: number of inverted lists visited by IVF
+# index search and size of dynamic candidate list used by HNSW index search.
+# Higher values mean better recall and slower search.
+FAISS_IVF_NPROBE = 16
+FAISS_HNSW_EF_SEARCH = 64
+
+
+# pgvector ANN index types
+class PGVectorIndexType(StrEnum):
+    """Supported pgvector index types."""
+
+    HNSW = "hnsw"
+    IVFFLAT = "ivfflat"
+
+
+# pgvector connection pool settings
+PGVECTOR_POOL_SIZE = 10
+PGVECTOR_MAX_OVERFLOW = 10
+PGVECTOR_POOL_TIMEOUT = 30
+
+# pgvector ANN index build and search parameters (pgvector defaults)
+PGVECTOR_HNSW_M = 16
+PGVECTOR_HNSW_EF_CONSTRUCTION = 64
+PGVECTOR_HNSW_EF_SEARCH = 40
+PGVECTOR_IVFFLAT_LISTS = 100
+PGVECTOR_IVFFLAT_PROBES = 10
+
+
+# Docstore (node text and metadata) types for FAISS indexes
+class DocstoreType(StrEnum):
+    """Supported docstore types."""
+
+    # whole docstore is deserialized into memory from llama-index JSON file
+    JSON = "json"
+    # nodes are read on demand from SQLite database stored next to the JSON file
+    SQLITE = "sqlite"
+
+
+SQLITE_DOCSTORE_FILENAME = "docstore.db"
+# Number of recently read nodes kept in memory by SQLite docstore
+SQLITE_DOCSTORE_CACHE_SIZE = 256
+
+
 # quota limiters constants
 USER_QUOTA_LIMITER = "user_limiter"
 CLUSTER_QUOTA_LIMITER = "cluster_limiter"
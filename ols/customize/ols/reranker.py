@@ -1,14 +1,175 @@
 """Reranker for post-processing the Vector DB search results."""
 
+from __future__ import annotations
+
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Any, Optional
+
+from ols.constants import RAG_SIMILARITY_CUTOFF, RERANKER_QUEUE_SIZE
 
-from llama_index.core.schema import NodeWithScore
+if TYPE_CHECKING:
+    from llama_index.core.schema import NodeWithScore
 
 logger = logging.getLogger(__name__)
 
+# one worker is enough, the model uses all CPU cores for one batch anyway
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+# requests waiting for the worker or being scored; requests wait for a free
+# slot and for their scores within their latency budget
+_slots = threading.BoundedSemaphore(RERANKER_QUEUE_SIZE)
+_models: dict[str, Any] = {}
+_models_lock = threading.Lock()
+_load_lock = threading.Lock()
+_load_future: Optional[Future] = None
+
+
+def rerank(
+    retrieved_nodes: list[NodeWithScore], query: Optional[str] = None
+) -> list[NodeWithScore]:
+    """Rerank Vector DB search results.
 
-def rerank(retrieved_nodes: list[NodeWithScore]) -> list[NodeWithScore]:
-    """Rerank Vector DB search results."""
+    When reranker is configured, (query, chunk) pairs are scored by a local
+    cross-encoder model in one batch and the best `top_n` chunks are
+    returned. Requests scored by the worker wait for it within their
+    latency budget. Original order is kept when the latency budget is
+    exceeded or the model fails, and while the model is being loaded.
+    """
     message = f"reranker.rerank() is called with {len(retrieved_nodes)} result(s)."
     logger.debug(message)
-    return retrieved_nodes
+
+    reranker_config = _get_reranker_config()
+    if reranker_config is None or query is None:
+        return retrieved_nodes
+
+    # nodes under cutoff are not used as RAG context, no need to rerank them
+    nodes = [
+        node
+        for node in retrieved_nodes
+        if node.get_score(raise_error=False) >= RAG_SIMILARITY_CUTOFF
+    ]
+    if len(nodes) < 2:
+        return nodes[: reranker_config.top_n]
+
+    # pylint: disable=C0415
+    from ols.app.metrics import reranker_duration_seconds, reranker_fallbacks_total
+
+    model_path = str(reranker_config.model_path)
+    if model_path not in _models:
+        logger.warning("Reranker model is not loaded yet, using original order")
+        reranker_fallbacks_total.labels("not_loaded").inc()
+        load_model()
+        return nodes[: reranker_config.top_n]
+
+    start = time.monotonic()
+    deadline = start + reranker_config.latency_budget_ms / 1000
+    try:
+        scores = _score_by_worker(
+            deadline, model_path, query, [n.get_text() for n in nodes]
+        )
+    except FutureTimeoutError:
+        logger.warning(
+            "Reranking exceeded latency budget %d ms, using original order",
+            reranker_config.latency_budget_ms,
+        )
+        reranker_fallbacks_total.labels("timeout").inc()
+        return nodes[: reranker_config.top_n]
+    except Exception as e:
+        logger.error("Reranking failed, using original order: %s", e)
+        reranker_fallbacks_total.labels("error").inc()
+        return nodes[: reranker_config.top_n]
+    finally:
+        reranker_duration_seconds.observe(time.monotonic() - start)
+
+    ranked = sorted(zip(scores, nodes), key=lambda pair: pair[0], reverse=True)
+    return [node for _, node in ranked[: reranker_config.top_n]]
+
+
+def _get_reranker_config() -> Any:
+    """Return reranker configuration, if any."""
+    # pylint: disable=C0415
+    from ols import config
+
+    reference_content = config.ols_config.reference_content
+    return reference_content.reranker if reference_content is not None else None
+
+
+def load_model() -> None:
+    """Start loading the configured cross-encoder model in background.
+
+    The model is loaded at startup, so the load does not count against the
+    latency budget of requests; requests fall back to the original order
+    until it is loaded. Nothing is submitted while a load is pending.
+    """
+    global _load_future  # pylint: disable=W0603
+    reranker_config = _get_reranker_config()
+    if reranker_config is None:
+        return
+    with _load_lock:
+        if _load_future is None or _load_future.done():
+            _load_future = _executor.submit(
+                _load_model, str(reranker_config.model_path)
+            )
+
+
+def _score_by_worker(
+    deadline: float, model_path: str, query: str, texts: list[str]
+) -> list[float]:
+    """Score texts by the reranker worker, waiting for it until the deadline.
+
+    Raises:
+        TimeoutError: When the texts are not scored before the deadline.
+    """
+    if not _slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+        raise FutureTimeoutError("Reranker queue is full")
+    try:
+        future = _executor.submit(_score_before, deadline, model_path, query, texts)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future.result(timeout=max(deadline - time.monotonic(), 0))
+
+
+def _score_before(
+    deadline: float, model_path: str, query: str, texts: list[str]
+) -> list[float]:
+    """Score texts unless the request gave up waiting for them already."""
+    if time.monotonic() >= deadline:
+        raise FutureTimeoutError("Reranking deadline passed in queue")
+    return _score(model_path, query, texts)
+
+
+def _load_model(model_path: str) -> None:
+    """Load (once) cross-encoder model stored in given path."""
+    with _models_lock:
+        if model_path in _models:
+            return
+        try:
+            # pylint: disable=C0415
+            from sentence_transformers import CrossEncoder
+
+            logger.info("Loading reranker model from %s", model_path)
+            _models[model_path] = CrossEncoder(model_path, device="cpu")
+            logger.info("Reranker model is loaded")
+        except Exception as e:
+            logger.error("Unable to load reranker model from %s: %s", model_path, e)
+
+
+def _get_model(model_path: str) -> Any:
+    """Return cross-encoder model loaded from given path."""
+    return _models[model_path]
+
+
+def _score(model_path: str, query: str, texts: list[str]) -> list[float]:
+    """Score all (query, text) pairs in one batch."""
+    model = _get_model(model_path)
+    scores = model.predict(
+        [(query, text) for text in texts],
+        batch_size=len(texts),
+        show_progress_bar=False,
+    )
+    return [float(score) for score in scores]
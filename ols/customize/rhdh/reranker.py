@@ -1,14 +1,24 @@
 """Reranker for post-processing the Vector DB search results."""
 
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING, Optional
 
-from llama_index.core.schema import NodeWithScore
+if TYPE_CHECKING:
+    from llama_index.core.schema import NodeWithScore
 
 logger = logging.getLogger(__name__)
 
 
-def rerank(retrieved_nodes: list[NodeWithScore]) -> list[NodeWithScore]:
+def rerank(
+    retrieved_nodes: list[NodeWithScore], query: Optional[str] = None
+) -> list[NodeWithScore]:
     """Rerank Vector DB search results."""
     message = f"reranker.rerank() is called with {len(retrieved_nodes)} result(s)."
     logger.debug(message)
     return retrieved_nodes
+
+
+def load_model() -> None:
+    """Load reranker model, there is none for this project."""
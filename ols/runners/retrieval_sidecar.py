@@ -0,0 +1,161 @@
+"""Retrieval sidecar runner.
+
+The sidecar is a local process that loads llama_index, the embedding model
+and indexes once and serves retrieval requests of API workers over a Unix
+socket; see `ols.src.rag_index.remote_index` for the protocol.
+"""
+
+import logging
+import multiprocessing
+import os
+import socketserver
+import stat
+import sys
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from ols.constants import (
+    CONFIGURATION_FILE_NAME_ENV_VARIABLE,
+    DEFAULT_CONFIGURATION_FILE,
+)
+from ols.src.rag_index.multi_index import MultiIndex
+from ols.src.rag_index.remote_index import (
+    OP_PING,
+    OP_RETRIEVE,
+    decode_request,
+    encode_error,
+    encode_nodes,
+    recv_frame,
+    send_frame,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Handler of one client connection, it can send several requests."""
+
+    server: "RetrievalServer"
+
+    def handle(self) -> None:
+        """Answer requests until the client closes the connection."""
+        while True:
+            try:
+                payload = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            send_frame(self.request, self.server.process(payload))
+
+
+class RetrievalServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Server answering retrieval requests, each connection in its thread.
+
+    Embedding and vector search release the GIL for most of their work,
+    so the threads retrieve in parallel.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, index: Any) -> None:
+        """Bind the server to the socket.
+
+        Args:
+            socket_path: Path of the Unix socket.
+            index: Loaded index, `None` when no index is configured.
+        """
+        self.index = index
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_bind(self) -> None:
+        """Bind the socket accessible by the service user only.
+
+        Stale socket of previous run is replaced; the socket is created
+        with restrictive umask, so it is never accessible by other users.
+        """
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        umask = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def process(self, payload: bytes) -> bytes:
+        """Process one request and return the response."""
+        try:
+            op, query, top_k, names = decode_request(payload)
+            if op == OP_PING:
+                return encode_nodes([])
+            if op != OP_RETRIEVE:
+                return encode_error(f"Unknown operation {op}")
+            index = self.index
+            if index is None:
+                return encode_nodes([])
+            if names and isinstance(index, MultiIndex):
+                index = index.select(names)
+            retriever = index.as_retriever(similarity_top_k=top_k)
+            return encode_nodes(retriever.retrieve(query))
+        except Exception as e:
+            logger.exception("Retrieval request failed")
+            return encode_error(str(e))
+
+
+def make_socket_directory(socket_path: str) -> None:
+    """Create directory of the socket accessible by the service user only.
+
+    Other users must not be able to replace the socket in the directory,
+    API workers would get RAG context from their process otherwise.
+    """
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    mode = os.stat(directory).st_mode
+    if mode & (stat.S_IWGRP | stat.S_IWOTH) and not mode & stat.S_ISVTX:
+        logger.warning(
+            "Directory %s of retrieval sidecar socket is writable by other users",
+            directory,
+        )
+
+
+def serve(config_file: str) -> None:
+    """Load indexes and serve them until the process is terminated."""
+    # pylint: disable=C0415
+    from ols import config
+    from ols.src.rag_index.index_loader import IndexLoader  # type: ignore [attr-defined]
+    from ols.utils.environments import configure_hugging_face_envs
+    from ols.utils.logging_configurator import configure_logging
+
+    config.reload_from_yaml_file(config_file)
+    configure_logging(config.ols_config.logging_config)
+    configure_hugging_face_envs(config.ols_config)
+    reference_content = config.ols_config.reference_content
+    socket_path = reference_content.retrieval_sidecar.socket_path
+
+    # socket is bound once indexes are loaded, so API workers are not
+    # ready before; stale socket of previous run refuses their connections
+    make_socket_directory(socket_path)
+    index = IndexLoader(reference_content).vector_index
+    with RetrievalServer(socket_path, index) as server:
+        logger.info("Retrieval sidecar listening on %s", socket_path)
+        server.serve_forever()
+
+
+def start_retrieval_sidecar(config_file: str) -> BaseProcess:
+    """Start retrieval sidecar in separate process."""
+    logger.info("Starting retrieval sidecar")
+    # spawned process does not inherit memory of the API process, so
+    # llama_index is imported by the sidecar only
+    process = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(config_file,), name="retrieval-sidecar", daemon=True
+    )
+    process.start()
+    return process
+
+
+if __name__ == "__main__":
+    serve(
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else os.environ.get(
+            CONFIGURATION_FILE_NAME_ENV_VARIABLE, DEFAULT_CONFIGURATION_FILE
+        )
+    )
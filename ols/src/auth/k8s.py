@@ -1,8 +1,13 @@
 """Manage authentication flow for FastAPI endpoints with K8S/OCP."""
 
+import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
-from typing import Optional, Self
+from typing import Any, Optional, Self, TypeVar
 
 import kubernetes.client
 from fastapi import HTTPException, Request
@@ -24,6 +29,8 @@ logger = logging.getLogger(__name__)
 
 CLUSTER_ID_LOCAL = "local"
 
+T = TypeVar("T")
+
 
 class ClusterIDUnavailableError(Exception):
     """Cluster ID is not available."""
@@ -180,6 +187,111 @@ class K8sClientSingleton:
         return cls._cluster_id
 
 
+class ReviewCache:
+    """Results of token and access reviews kept for a limited time.
+
+    The same bearer token is usually sent with many requests, so the results
+    of its reviews are reused instead of calling the Kubernetes API for every
+    request. Successful reviews are kept for `review_cache_ttl` seconds and
+    rejected ones for `review_cache_negative_ttl` seconds of the
+    authentication configuration; reviews that raise are not kept. The least
+    recently used results are dropped over `review_cache_max_entries`.
+
+    Reviews run in a worker thread, so they do not block the event loop, and
+    concurrent lookups of the same key wait for the review in progress.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._pending: dict[Any, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        """Return number of cached results."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    async def get(self, key: Any, review: Callable[..., T], *args: Any) -> T:
+        """Get cached result of the review, perform the review when missing.
+
+        Args:
+            key: Key identifying the review, must not contain the token.
+            review: Function performing the review.
+            args: Arguments of the review function.
+
+        Returns:
+            Result of the review.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, result = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                return result
+            del self._entries[key]
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._review(key, review, *args))
+            self._pending[key] = task
+        # cancelled request must not cancel the review awaited by others
+        return await asyncio.shield(task)
+
+    async def _review(self, key: Any, review: Callable[..., T], *args: Any) -> T:
+        """Perform the review in a worker thread and cache its result."""
+        try:
+            result = await asyncio.to_thread(review, *args)
+        finally:
+            del self._pending[key]
+        auth_config = config.ols_config.authentication_config
+        ttl = (
+            auth_config.review_cache_ttl
+            if result
+            else auth_config.review_cache_negative_ttl
+        )
+        if ttl > 0:
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > auth_config.review_cache_max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+
+# shared by all endpoints, as they review the same tokens
+review_cache = ReviewCache()
+
+
+def _token_digest(token: str) -> str:
+    """Get digest identifying the token in the review cache."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _review_token(token: str) -> Optional[kubernetes.client.V1TokenReviewStatus]:
+    """Perform a Kubernetes TokenReview, API errors are raised."""
+    auth_api = K8sClientSingleton.get_authn_api()
+    token_review = kubernetes.client.V1TokenReview(
+        spec=kubernetes.client.V1TokenReviewSpec(token=token)
+    )
+    response = auth_api.create_token_review(token_review)
+    if response.status.authenticated:
+        return response.status
+    return None
+
+
+def _token_review_failed(e: Exception) -> None:
+    """Handle error of TokenReview, API errors mean the token is not valid."""
+    if isinstance(e, ApiException):
+        logger.error("API exception during TokenReview: %s", e)
+        return
+    logger.error("Unexpected error during TokenReview - Unauthorized: %s", e)
+    raise HTTPException(
+        status_code=500,
+        detail={"response": "Forbidden: Unable to Review Token", "cause": str(e)},
+    ) from e
+
+
 def get_user_info(token: str) -> Optional[kubernetes.client.V1TokenReview]:
     """Perform a Kubernetes TokenReview to validate a given token.
 
@@ -189,24 +301,45 @@ def get_user_info(token: str) -> Optional[kubernetes.client.V1TokenReview]:
     Returns:
         The user information if the token is valid, None otherwise.
     """
-    auth_api = K8sClientSingleton.get_authn_api()
-    token_review = kubernetes.client.V1TokenReview(
-        spec=kubernetes.client.V1TokenReviewSpec(token=token)
-    )
     try:
-        response = auth_api.create_token_review(token_review)
-        if response.status.authenticated:
-            return response.status
-        return None
-    except ApiException as e:
-        logger.error("API exception during TokenReview: %s", e)
+        return _review_token(token)
+    except Exception as e:
+        _token_review_failed(e)
         return None
+
+
+async def get_cached_user_info(
+    token: str,
+) -> Optional[kubernetes.client.V1TokenReview]:
+    """Validate a given token, reusing the result of its recent TokenReview.
+
+    Args:
+        token: The bearer token to be validated.
+
+    Returns:
+        The user information if the token is valid, None otherwise.
+    """
+    try:
+        return await review_cache.get(_token_digest(token), _review_token, token)
     except Exception as e:
-        logger.error("Unexpected error during TokenReview - Unauthorized: %s", e)
-        raise HTTPException(
-            status_code=500,
-            detail={"response": "Forbidden: Unable to Review Token", "cause": str(e)},
-        ) from e
+        _token_review_failed(e)
+        return None
+
+
+def _review_access(user: kubernetes.client.V1UserInfo, path: str) -> bool:
+    """Perform a Kubernetes SubjectAccessReview of the path, return if allowed."""
+    authorization_api = K8sClientSingleton.get_authz_api()
+    sar = kubernetes.client.V1SubjectAccessReview(
+        spec=kubernetes.client.V1SubjectAccessReviewSpec(
+            user=user.username,
+            groups=user.groups,
+            non_resource_attributes=kubernetes.client.V1NonResourceAttributes(
+                path=path, verb="get"
+            ),
+        )
+    )
+    response = authorization_api.create_subject_access_review(sar)
+    return bool(response.status.allowed)
 
 
 def _extract_bearer_token(header: str) -> str:
@@ -274,32 +407,28 @@ class AuthDependency(AuthDependencyInterface):
                 status_code=401,
                 detail="Unauthorized: Bearer token not found or invalid",
             )
-        user_info = get_user_info(token)
+        user_info = await get_cached_user_info(token)
         if user_info is None:
             raise HTTPException(
                 status_code=403, detail="Forbidden: Invalid or expired token"
             )
         if user_info.user.username == "kube:admin":
             user_info.user.uid = K8sClientSingleton.get_cluster_id()
-        authorization_api = K8sClientSingleton.get_authz_api()
-
-        sar = kubernetes.client.V1SubjectAccessReview(
-            spec=kubernetes.client.V1SubjectAccessReviewSpec(
-                user=user_info.user.username,
-                groups=user_info.user.groups,
-                non_resource_attributes=kubernetes.client.V1NonResourceAttributes(
-                    path=self.virtual_path, verb="get"
-                ),
-            )
-        )
+
         try:
-            response = authorization_api.create_subject_access_review(sar)
-            if not response.status.allowed:
-                raise HTTPException(
-                    status_code=403, detail="Forbidden: User does not have access"
-                )
+            # access follows from the user and groups the token was issued for
+            allowed = await review_cache.get(
+                (_token_digest(token), self.virtual_path),
+                _review_access,
+                user_info.user,
+                self.virtual_path,
+            )
         except ApiException as e:
             logger.error("API exception during SubjectAccessReview: %s", e)
             raise HTTPException(status_code=403, detail="Internal server error") from e
+        if not allowed:
+            raise HTTPException(
+                status_code=403, detail="Forbidden: User does not have access"
+            )
 
         return user_info.user.uid, user_info.user.username, False, token
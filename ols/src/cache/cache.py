@@ -1,6 +1,7 @@
 """Abstract class that is parent for all cache implementations."""
 
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from ols.app.models.models import CacheEntry
 from ols.utils.suid import check_suid
@@ -44,7 +45,11 @@ class Cache(ABC):
 
     @abstractmethod
     def get(
-        self, user_id: str, conversation_id: str, skip_user_id_check: bool
+        self,
+        user_id: str,
+        conversation_id: str,
+        skip_user_id_check: bool,
+        limit: Optional[int] = None,
     ) -> list[CacheEntry]:
         """Abstract method to retrieve a value from the cache.
 
@@ -52,6 +57,7 @@ class Cache(ABC):
             user_id: User identification.
             conversation_id: Conversation ID unique for given user.
             skip_user_id_check: Skip user_id suid check.
+            limit: Number of the most recent entries to get, all when not set.
 
         Returns:
             The value (CacheEntry(s)) associated with the key, or None if not found.
@@ -0,0 +1,151 @@
+"""Encoding of cache entries stored as binary values.
+
+Cache entries used to be stored as JSON produced by `MessageEncoder`, with
+full messages including empty metadata and key names repeated in every
+value. The compact format stores the entry as a JSON array with the fields
+in fixed positions, message metadata only when it is not empty, and
+compresses it by zstd. Compact values start with a version byte, JSON
+values start with `{`, so both formats can be read.
+
+Attachment content can be stored outside of the entry, once for all
+entries with the same content; the entry then keeps just the attachment
+type and content type, and the content is identified by its digest.
+"""
+
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import zstandard
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ols import constants
+from ols.app.models.models import CacheEntry, MessageDecoder, MessageEncoder
+
+# the first byte of a value in compact format
+COMPACT_FORMAT_VERSION = 1
+# the first byte of a value in compact format without attachment content
+EXTERNAL_ATTACHMENTS_FORMAT_VERSION = 2
+
+
+def attachment_digest(content: str) -> str:
+    """Get digest identifying attachment content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _compact_message(message: Any) -> list:
+    """Convert message to a list, omitting empty metadata."""
+    compact = [message.content]
+    if message.response_metadata or message.additional_kwargs:
+        compact.extend([message.response_metadata, message.additional_kwargs])
+    return compact
+
+
+def _message(message_class: type, compact: list) -> Any:
+    """Construct message from a list created by `_compact_message`."""
+    message = message_class(content=compact[0])
+    if len(compact) > 1:
+        message.response_metadata = compact[1]
+        message.additional_kwargs = compact[2]
+    return message
+
+
+def compact_cache_entry(entry: dict[str, Any], with_content: bool = True) -> list:
+    """Convert cache entry dictionary to a list with fields in fixed positions.
+
+    Args:
+        entry: Cache entry as a dictionary, see `CacheEntry.to_dict`.
+        with_content: Include the content of attachments.
+
+    Returns:
+        Cache entry as a list that can be serialized to JSON.
+    """
+    fields: tuple[str, ...] = ("attachment_type", "content_type", "content")
+    if not with_content:
+        fields = fields[:2]
+    return [
+        _compact_message(entry["human_query"]),
+        _compact_message(entry["ai_response"]),
+        [[attachment[f] for f in fields] for attachment in entry["attachments"]],
+    ]
+
+
+def expand_cache_entry(compact: Sequence) -> dict[str, Any]:
+    """Convert list created by `compact_cache_entry` back to a dictionary."""
+    query, response, attachments = compact
+    return {
+        "human_query": _message(HumanMessage, query),
+        "ai_response": _message(AIMessage, response),
+        "attachments": [
+            {
+                "attachment_type": attachment_type,
+                "content_type": content_type,
+                "content": content,
+            }
+            for attachment_type, content_type, content in attachments
+        ],
+    }
+
+
+def encode_cache_entry(
+    cache_entry: CacheEntry,
+    value_format: str = constants.CacheValueFormat.COMPACT,
+    external_attachments: bool = False,
+) -> bytes:
+    """Encode cache entry to bytes in given format.
+
+    Args:
+        cache_entry: The entry to encode.
+        value_format: `compact` or `json` (the format used by older versions).
+        external_attachments: Leave out attachment content, which is stored
+            separately; supported by the compact format only.
+
+    Returns:
+        Encoded cache entry.
+    """
+    if value_format == constants.CacheValueFormat.JSON:
+        return json.dumps(cache_entry.to_dict(), cls=MessageEncoder).encode("utf-8")
+    version = (
+        EXTERNAL_ATTACHMENTS_FORMAT_VERSION
+        if external_attachments
+        else COMPACT_FORMAT_VERSION
+    )
+    compact = compact_cache_entry(cache_entry.to_dict(), not external_attachments)
+    text = json.dumps(compact, ensure_ascii=False, separators=(",", ":"))
+    return bytes([version]) + zstandard.compress(
+        text.encode("utf-8"), constants.CACHE_COMPRESSION_LEVEL
+    )
+
+
+def decode_cache_entry(
+    value: bytes, attachment_contents: Optional[Sequence[str]] = None
+) -> dict[str, Any]:
+    """Decode cache entry stored in any supported format.
+
+    Args:
+        value: Value created by `encode_cache_entry`.
+        attachment_contents: Content of attachments stored separately,
+            in order of the attachments of the entry.
+
+    Returns:
+        Cache entry as a dictionary, see `CacheEntry.to_dict`.
+
+    Raises:
+        ValueError: When the value format is not known.
+    """
+    if value[:1] == b"{":
+        return json.loads(str(value, "utf-8"), cls=MessageDecoder)
+    version = value[0] if value else None
+    if version not in (COMPACT_FORMAT_VERSION, EXTERNAL_ATTACHMENTS_FORMAT_VERSION):
+        raise ValueError(f"Unknown format of cache entry: {value[:1]!r}")
+    compact = json.loads(zstandard.decompress(value[1:]))
+    if version == EXTERNAL_ATTACHMENTS_FORMAT_VERSION:
+        attachments = compact[2]
+        contents = list(attachment_contents or [])
+        # content that is no longer stored is left empty
+        contents += [""] * (len(attachments) - len(contents))
+        compact[2] = [
+            [*attachment, content] for attachment, content in zip(attachments, contents)
+        ]
+    return expand_cache_entry(compact)
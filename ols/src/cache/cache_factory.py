@@ -5,6 +5,8 @@ from ols.app.models.config import ConversationCacheConfig
 from ols.src.cache.cache import Cache
 from ols.src.cache.in_memory_cache import InMemoryCache
 from ols.src.cache.postgres_cache import PostgresCache
+from ols.src.cache.sqlite_cache import SQLiteCache
+from ols.src.cache.tiered_cache import TieredCache
 
 
 class CacheFactory:
@@ -15,16 +17,35 @@ class CacheFactory:
         """Create an instance of Cache based on loaded configuration.
 
         Returns:
-            An instance of `Cache` (either `PostgresCache` or `InMemoryCache`).
+            An instance of `Cache` (`PostgresCache`, optionally behind
+            `TieredCache`, `SQLiteCache` or `InMemoryCache`).
         """
         match config.type:
             case constants.CACHE_TYPE_MEMORY:
-                return InMemoryCache(config.memory)
+                return InMemoryCache(
+                    config.memory,
+                    config.idle_ttl,
+                    config.absolute_ttl,
+                    config.sweep_interval,
+                )
             case constants.CACHE_TYPE_POSTGRES:
-                return PostgresCache(config.postgres)
+                cache = PostgresCache(
+                    config.postgres, config.idle_ttl, config.absolute_ttl
+                )
+                if config.postgres.local_cache_max_entries > 0:
+                    return TieredCache(cache, config.postgres.local_cache_max_entries)
+                return cache
+            case constants.CACHE_TYPE_SQLITE:
+                return SQLiteCache(
+                    config.sqlite,
+                    config.idle_ttl,
+                    config.absolute_ttl,
+                    config.sweep_interval,
+                )
             case _:
                 raise ValueError(
                     f"Invalid cache type: {config.type}. "
-                    f"Use '{constants.CACHE_TYPE_POSTGRES}' or "
+                    f"Use '{constants.CACHE_TYPE_POSTGRES}', "
+                    f"'{constants.CACHE_TYPE_SQLITE}' or "
                     f"'{constants.CACHE_TYPE_MEMORY}' options."
                 )
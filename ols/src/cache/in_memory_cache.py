@@ -2,41 +2,337 @@
 
 from __future__ import annotations
 
+import atexit
+import heapq
+import io
+import itertools
+import json
+import logging
+import os
+import tempfile
 import threading
-from collections import deque
-from typing import TYPE_CHECKING, Any
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Optional
 
+import zstandard
+
+from ols import constants
 from ols.app.models.models import CacheEntry
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from ols.app.models.config import InMemoryCacheConfig
 # pylint: disable-next=C0413
 from ols.src.cache.cache import Cache
+from ols.src.cache.cache_encoding import compact_cache_entry, expand_cache_entry
+from ols.utils.storage_metrics import conversation_cache_evictions_total
+
+logger = logging.getLogger(__name__)
+
+
+class _Conversation:
+    """Conversation stored in the cache."""
+
+    __slots__ = (
+        "accessed",
+        "conversation_id",
+        "created",
+        "history",
+        "size",
+        "topic_summary",
+        "touched",
+        "user_id",
+    )
+
+    def __init__(self, user_id: str, conversation_id: str, topic_summary: str) -> None:
+        """Initialize empty conversation."""
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.topic_summary = topic_summary
+        self.history: list[dict[str, Any]] = []
+        # approximate number of bytes of the history
+        self.size = 0
+        # sequence number of the last access, to compare age across shards
+        self.touched = 0
+        # time of creation and of the last access, for expiration
+        self.created = self.accessed = time.time()
+
+
+class _Shard:
+    """Part of the cache with its own lock."""
+
+    __slots__ = ("conversations", "created", "lock", "users")
+
+    def __init__(self) -> None:
+        """Initialize empty shard."""
+        self.lock = threading.Lock()
+        # conversations by compound key, the least recently used first
+        self.conversations: OrderedDict[str, _Conversation] = OrderedDict()
+        # the same conversations, the oldest first
+        self.created: dict[str, _Conversation] = {}
+        # conversation IDs of each user, in order of creation
+        self.users: dict[str, dict[str, None]] = {}
+
+
+# the first line of the snapshot file
+SNAPSHOT_HEADER = {"format": "ols-conversations", "version": 1}
+
+
+def _entry_size(entry: dict[str, Any]) -> int:
+    """Get approximate number of bytes taken by cache entry dictionary."""
+    size = len(str(entry["human_query"].content))
+    if entry["ai_response"] is not None:
+        size += len(str(entry["ai_response"].content))
+    for attachment in entry["attachments"]:
+        size += len(attachment["content"])
+    return size
+
+
+def _snapshot_line(value: Any) -> bytes:
+    """Serialize value to one line of the snapshot."""
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return f"{text}\n".encode("utf-8")
+
+
+def _shard_records(shard: _Shard) -> list[tuple[int, list]]:
+    """Get conversations of the shard, the least recently used first."""
+    with shard.lock:
+        # history is only appended to, so a copy of the list is enough
+        return [
+            (
+                conversation.touched,
+                [
+                    conversation.user_id,
+                    conversation.conversation_id,
+                    conversation.topic_summary,
+                    conversation.created,
+                    conversation.accessed,
+                    conversation.history.copy(),
+                ],
+            )
+            for conversation in shard.conversations.values()
+        ]
 
 
 class InMemoryCache(Cache):
-    """An in-memory LRU cache implementation in O(1) time."""
+    """An in-memory LRU cache implementation in O(1) time.
+
+    Conversations are split into shards by user ID, so threads working
+    with conversations of different users mostly do not wait for each
+    other. Every shard keeps its conversations ordered from the least
+    recently used, so accessing a conversation is O(1). When the number of
+    conversations or their total size exceeds the limits, the least
+    recently used conversation of all shards is evicted; finding it needs
+    to look at the oldest conversation of each shard only.
+
+    Conversations not used for `idle_ttl` seconds, or created more than
+    `absolute_ttl` seconds ago, are removed by a background sweeper. As
+    shards keep conversations in order of both access and creation, the
+    sweeper visits the expired conversations only.
+
+    When `snapshot_path` is configured, conversations are restored from
+    the snapshot file when the cache is created, and saved to it on exit
+    and every `snapshot_interval` seconds. The snapshot is a zstd stream of
+    JSON lines, one conversation per line from the least recently used,
+    written conversation by conversation, so saving does not copy the
+    cache contents.
+    """
 
     _instance = None
     _lock = threading.Lock()
 
-    def __new__(cls: type[InMemoryCache], config: InMemoryCacheConfig) -> InMemoryCache:
+    def __new__(
+        cls: type[InMemoryCache],
+        config: InMemoryCacheConfig,
+        idle_ttl: Optional[int] = None,
+        absolute_ttl: Optional[int] = None,
+        sweep_interval: int = constants.CONVERSATION_CACHE_SWEEP_INTERVAL,
+    ) -> InMemoryCache:
         """Implement Singleton pattern with thread safety."""
         with cls._lock:
             if not cls._instance:
                 cls._instance = super().__new__(cls)
-                cls._instance.initialize_cache(config)
+                cls._instance.initialize_cache(
+                    config, idle_ttl, absolute_ttl, sweep_interval
+                )
         return cls._instance
 
-    def initialize_cache(self, config: InMemoryCacheConfig) -> None:
+    def initialize_cache(
+        self,
+        config: InMemoryCacheConfig,
+        idle_ttl: Optional[int] = None,
+        absolute_ttl: Optional[int] = None,
+        sweep_interval: int = constants.CONVERSATION_CACHE_SWEEP_INTERVAL,
+    ) -> None:
         """Initialize the InMemoryCache."""
         # pylint: disable=W0201
         self.capacity = config.max_entries
-        self.deque: deque[str] = deque()
-        self.cache: dict[str, dict[str, Any]] = {}
+        self.max_bytes = config.max_bytes
+        self.idle_ttl = idle_ttl
+        self.absolute_ttl = absolute_ttl
+        self.sweep_interval = sweep_interval
+        self._shards = [_Shard() for _ in range(config.shards)]
+        self._clock = itertools.count(1)
+        # totals of all shards, guarded by their own lock
+        self._totals_lock = threading.Lock()
+        self._entries = 0
+        self._bytes = 0
+        self._eviction_lock = threading.Lock()
+        expiring = idle_ttl is not None or absolute_ttl is not None
+        if expiring and getattr(self, "_sweeper", None) is None:
+            self._sweeper = threading.Thread(
+                target=self._sweep_periodically,
+                name="memory-cache-sweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
+
+        self.snapshot_path = config.snapshot_path
+        self.snapshot_interval = config.snapshot_interval
+        self._snapshot_lock = threading.Lock()
+        if self.snapshot_path is None:
+            return
+        if os.path.exists(self.snapshot_path):
+            self.load_snapshot(self.snapshot_path)
+        if not getattr(self, "_snapshot_on_exit", False):
+            self._snapshot_on_exit = True
+            atexit.register(self._save_configured_snapshot)
+        if self.snapshot_interval and getattr(self, "_snapshotter", None) is None:
+            self._snapshotter = threading.Thread(
+                target=self._snapshot_periodically,
+                name="memory-cache-snapshotter",
+                daemon=True,
+            )
+            self._snapshotter.start()
+
+    @property
+    def size(self) -> int:
+        """Number of cached conversations."""
+        return self._entries
+
+    @property
+    def bytes(self) -> int:
+        """Approximate number of bytes taken by cached conversations."""
+        return self._bytes
+
+    def _shard(self, user_id: str) -> _Shard:
+        """Get shard with conversations of given user."""
+        return self._shards[hash(user_id) % len(self._shards)]
+
+    def _update_totals(self, entries: int, size: int) -> None:
+        """Update totals by changes of one shard."""
+        with self._totals_lock:
+            self._entries += entries
+            self._bytes += size
+
+    def _over_limits(self) -> bool:
+        """Check if the cache exceeds its capacity or size limit."""
+        if self.capacity is not None and self._entries > self.capacity:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        """Evict the least recently used conversations while over limits."""
+        with self._eviction_lock:
+            while self._over_limits():
+                oldest: Optional[tuple[int, _Shard, str]] = None
+                for shard in self._shards:
+                    with shard.lock:
+                        if not shard.conversations:
+                            continue
+                        key, conversation = next(iter(shard.conversations.items()))
+                        if oldest is None or conversation.touched < oldest[0]:
+                            oldest = (conversation.touched, shard, key)
+                if oldest is None:
+                    return
+                _, shard, key = oldest
+                with shard.lock:
+                    # the conversation might have been used or deleted meanwhile
+                    candidate = shard.conversations.get(key)
+                    if candidate is None or candidate.touched != oldest[0]:
+                        continue
+                    self._remove(shard, key)
+                conversation_cache_evictions_total.labels("memory", "capacity").inc()
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Remove conversations that exceeded their idle or absolute TTL.
+
+        Args:
+            now: Current time, `time.time()` when not set.
+
+        Returns:
+            Number of removed conversations.
+        """
+        now = time.time() if now is None else now
+        idle = absolute = 0
+        for shard in self._shards:
+            with shard.lock:
+                if self.idle_ttl is not None:
+                    idle += self._expire(
+                        shard.conversations, "accessed", now - self.idle_ttl, shard
+                    )
+                if self.absolute_ttl is not None:
+                    absolute += self._expire(
+                        shard.created, "created", now - self.absolute_ttl, shard
+                    )
+        if idle:
+            conversation_cache_evictions_total.labels("memory", "idle").inc(idle)
+        if absolute:
+            conversation_cache_evictions_total.labels("memory", "absolute").inc(
+                absolute
+            )
+        return idle + absolute
+
+    def _expire(
+        self,
+        conversations: dict[str, _Conversation],
+        attribute: str,
+        deadline: float,
+        shard: _Shard,
+    ) -> int:
+        """Remove conversations ordered by attribute up to the deadline."""
+        expired = []
+        for key, conversation in conversations.items():
+            if getattr(conversation, attribute) > deadline:
+                break
+            expired.append(key)
+        for key in expired:
+            self._remove(shard, key)
+        return len(expired)
+
+    def _sweep_periodically(self) -> None:
+        """Remove expired conversations periodically."""
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                expired = self.expire()
+                if expired:
+                    logger.info("Removed %d expired conversations", expired)
+            except Exception as e:
+                logger.error("Removal of expired conversations failed: %s", e)
+
+    def _remove(self, shard: _Shard, key: str) -> bool:
+        """Remove conversation from the shard, its lock must be held."""
+        conversation = shard.conversations.pop(key, None)
+        if conversation is None:
+            return False
+        del shard.created[key]
+        user_conversations = shard.users[conversation.user_id]
+        del user_conversations[conversation.conversation_id]
+        if not user_conversations:
+            del shard.users[conversation.user_id]
+        self._update_totals(-1, -conversation.size)
+        return True
 
     def get(
-        self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
+        self,
+        user_id: str,
+        conversation_id: str,
+        skip_user_id_check: bool = False,
+        limit: Optional[int] = None,
     ) -> list[CacheEntry]:
         """Get the value associated with the given key.
 
@@ -44,18 +340,25 @@ class InMemoryCache(Cache):
           user_id: User identification.
           conversation_id: Conversation ID unique for given user.
           skip_user_id_check: Skip user_id suid check.
+          limit: Number of the most recent entries to get, all when not set.
 
         Returns:
           The value associated with the key, or `None` if the key is not present.
         """
         key = super().construct_key(user_id, conversation_id, skip_user_id_check)
+        shard = self._shard(user_id)
 
-        if key not in self.cache:
-            return None
-
-        self.deque.remove(key)
-        self.deque.appendleft(key)
-        value = self.cache[key]["history"].copy()
+        with shard.lock:
+            conversation = shard.conversations.get(key)
+            if conversation is None:
+                return None
+            shard.conversations.move_to_end(key)
+            conversation.touched = next(self._clock)
+            conversation.accessed = time.time()
+            if limit is None:
+                value = conversation.history.copy()
+            else:
+                value = conversation.history[-limit:] if limit > 0 else []
         return [CacheEntry.from_dict(cache_entry) for cache_entry in value]
 
     def insert_or_append(
@@ -77,19 +380,26 @@ class InMemoryCache(Cache):
         """
         key = super().construct_key(user_id, conversation_id, skip_user_id_check)
         value = cache_entry.to_dict()
+        size = _entry_size(value)
+        shard = self._shard(user_id)
 
-        with self._lock:
-            if key not in self.cache:
-                if len(self.deque) == self.capacity:
-                    oldest = self.deque.pop()
-                    del self.cache[oldest]
-                self.cache[key] = {"topic_summary": topic_summary, "history": [value]}
+        with shard.lock:
+            conversation = shard.conversations.get(key)
+            created = conversation is None
+            if conversation is None:
+                conversation = _Conversation(user_id, conversation_id, topic_summary)
+                shard.conversations[key] = conversation
+                shard.created[key] = conversation
+                shard.users.setdefault(user_id, {})[conversation_id] = None
             else:
-                self.deque.remove(key)
-                old_value = self.cache[key]
-                old_value["history"].append(value)
-                self.cache[key] = old_value
-            self.deque.appendleft(key)
+                shard.conversations.move_to_end(key)
+            conversation.history.append(value)
+            conversation.size += size
+            conversation.touched = next(self._clock)
+            conversation.accessed = time.time()
+        self._update_totals(int(created), size)
+        if self._over_limits():
+            self._evict()
 
     def delete(
         self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
@@ -105,15 +415,10 @@ class InMemoryCache(Cache):
             bool: True if entries were deleted, False if key wasn't found.
         """
         key = super().construct_key(user_id, conversation_id, skip_user_id_check)
+        shard = self._shard(user_id)
 
-        with self._lock:
-            if key not in self.cache:
-                return False
-
-            # Remove from both cache and deque
-            del self.cache[key]
-            self.deque.remove(key)
-            return True
+        with shard.lock:
+            return self._remove(shard, key)
 
     def list(
         self, user_id: str, skip_user_id_check: bool = False
@@ -127,24 +432,20 @@ class InMemoryCache(Cache):
         Returns:
             A list of dictionaries containing conversation_id and topic_summary
         """
-        conversations = []
         super()._check_user_id(user_id, skip_user_id_check)
         prefix = f"{user_id}{Cache.COMPOUND_KEY_SEPARATOR}"
+        shard = self._shard(user_id)
 
-        with self._lock:
-            for key, value in self.cache.items():
-                if key.startswith(prefix):
-                    # Extract conversation_id from the key
-                    conversation_id = key[len(prefix) :]
-                    topic_summary = value.get("topic_summary", "")
-                    conversations.append(
-                        {
-                            "conversation_id": conversation_id,
-                            "topic_summary": topic_summary,
-                        }
-                    )
-
-        return conversations
+        with shard.lock:
+            return [
+                {
+                    "conversation_id": conversation_id,
+                    "topic_summary": shard.conversations[
+                        prefix + conversation_id
+                    ].topic_summary,
+                }
+                for conversation_id in shard.users.get(user_id, {})
+            ]
 
     def ready(self) -> bool:
         """Check if the cache is ready.
@@ -155,3 +456,124 @@ class InMemoryCache(Cache):
             True if the cache is ready, False otherwise.
         """
         return True
+
+    def save_snapshot(self, path: Optional[str] = None) -> int:
+        """Save all conversations to the snapshot file.
+
+        The snapshot is written to a temporary file that replaces the
+        previous snapshot once complete.
+
+        Args:
+            path: Path of the snapshot file, `snapshot_path` when not set.
+
+        Returns:
+            Number of saved conversations.
+        """
+        path = path or self.snapshot_path
+        if path is None:
+            raise ValueError("Path of the snapshot file is not set")
+        compressor = zstandard.ZstdCompressor(level=constants.CACHE_COMPRESSION_LEVEL)
+        saved = 0
+        with self._snapshot_lock:
+            # unique name, as workers of the service can save at the same time
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    with compressor.stream_writer(f, closefd=False) as writer:
+                        writer.write(_snapshot_line(SNAPSHOT_HEADER))
+                        # shards are ordered from the least recently used already
+                        for _, record in heapq.merge(
+                            *(_shard_records(shard) for shard in self._shards),
+                            key=itemgetter(0),
+                        ):
+                            *fields, history = record
+                            entries = [compact_cache_entry(entry) for entry in history]
+                            writer.write(_snapshot_line([*fields, entries]))
+                            saved += 1
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        logger.info("Saved %d conversations to snapshot %s", saved, path)
+        return saved
+
+    def load_snapshot(self, path: str) -> int:
+        """Restore conversations from the snapshot file.
+
+        A snapshot that cannot be read is logged and the conversations read
+        before the error are kept.
+
+        Args:
+            path: Path of the snapshot file.
+
+        Returns:
+            Number of restored conversations.
+        """
+        loaded = 0
+        try:
+            with (
+                open(path, "rb") as f,
+                zstandard.ZstdDecompressor().stream_reader(f) as reader,
+            ):
+                lines = io.TextIOWrapper(reader, encoding="utf-8")
+                if json.loads(lines.readline() or "null") != SNAPSHOT_HEADER:
+                    raise ValueError("Unknown format of snapshot")
+                for line in lines:
+                    self._restore(*json.loads(line))
+                    loaded += 1
+        except (OSError, ValueError, zstandard.ZstdError) as e:
+            logger.error("Cannot restore conversations from %s: %s", path, e)
+        for shard in self._shards:
+            with shard.lock:
+                shard.created = dict(
+                    sorted(shard.created.items(), key=lambda item: item[1].created)
+                )
+        if self._over_limits():
+            self._evict()
+        logger.info("Restored %d conversations from snapshot %s", loaded, path)
+        return loaded
+
+    def _restore(
+        self,
+        user_id: str,
+        conversation_id: str,
+        topic_summary: str,
+        created: float,
+        accessed: float,
+        entries: Sequence[Sequence],
+    ) -> None:
+        """Store conversation read from snapshot as the most recently used."""
+        key = f"{user_id}{Cache.COMPOUND_KEY_SEPARATOR}{conversation_id}"
+        conversation = _Conversation(user_id, conversation_id, topic_summary)
+        conversation.history = [expand_cache_entry(entry) for entry in entries]
+        conversation.size = sum(_entry_size(entry) for entry in conversation.history)
+        conversation.created = created
+        conversation.accessed = accessed
+        shard = self._shard(user_id)
+        with shard.lock:
+            if key in shard.conversations:
+                return
+            conversation.touched = next(self._clock)
+            shard.conversations[key] = conversation
+            shard.created[key] = conversation
+            shard.users.setdefault(user_id, {})[conversation_id] = None
+        self._update_totals(1, conversation.size)
+
+    def _save_configured_snapshot(self) -> None:
+        """Save snapshot to the configured path, if any, logging errors."""
+        if self.snapshot_path is None:
+            return
+        try:
+            self.save_snapshot()
+        except Exception as e:
+            logger.error("Saving of conversations snapshot failed: %s", e)
+
+    def _snapshot_periodically(self) -> None:
+        """Save snapshot periodically."""
+        while self.snapshot_interval:
+            time.sleep(self.snapshot_interval)
+            self._save_configured_snapshot()
@@ -1,16 +1,29 @@
 """Cache that uses Postgres to store cached values."""
 
-import json
 import logging
-from typing import Any
+import threading
+from collections.abc import Sequence
+from typing import Any, Optional
 
 import psycopg2
 
+from ols import constants
 from ols.app.models.config import PostgresConfig
-from ols.app.models.models import CacheEntry, MessageDecoder, MessageEncoder
+from ols.app.models.models import CacheEntry
 from ols.src.cache.cache import Cache
+from ols.src.cache.cache_encoding import (
+    attachment_digest,
+    decode_cache_entry,
+    encode_cache_entry,
+)
 from ols.src.cache.cache_error import CacheError
-from ols.utils.connection_decorator import connection
+from ols.utils.connection_decorator import (
+    UnconfirmedWriteError,
+    connection,
+    is_connection_error,
+)
+from ols.utils.postgres_pool import PostgresPool, get_pool
+from ols.utils.storage_metrics import conversation_cache_evictions_total
 
 logger = logging.getLogger(__name__)
 
@@ -18,146 +31,384 @@ logger = logging.getLogger(__name__)
 class PostgresCache(Cache):
     """Cache that uses Postgres to store cached values.
 
-    The cache itself is stored in following table:
+    Every conversation has a header row in the following table:
 
     ```
-         Column      |            Type             | Nullable | Default | Storage  |
-    -----------------+-----------------------------+----------+---------+----------+
-     user_id         | text                        | not null |         | extended |
-     conversation_id | text                        | not null |         | extended |
-     topic_summary   | text                        | not null |         | extended |
-     value           | bytea                       |          |         | extended |
-     updated_at      | timestamp without time zone |          |         | plain    |
+         Column      |            Type             | Nullable | Default |
+    -----------------+-----------------------------+----------+---------+
+     user_id         | text                        | not null |         |
+     conversation_id | text                        | not null |         |
+     topic_summary   | text                        |          |         |
+     turns           | integer                     | not null | 0       |
+     updated_at      | timestamp without time zone |          |         |
+     created_at      | timestamp without time zone |          | now()   |
     Indexes:
-        "cache_pkey" PRIMARY KEY, btree (user_id, conversation_id)
-        "cache_key_key" UNIQUE CONSTRAINT, btree (key)
-        "timestamps" btree (updated_at)
-    Access method: heap
+        "conversations_pkey" PRIMARY KEY, btree (user_id, conversation_id)
+        "conversations_updated_at" btree (updated_at)
+        "conversations_created_at" btree (created_at)
     ```
+
+    and every turn (cache entry) of the conversation is stored in its own row:
+
+    ```
+         Column      |            Type             | Nullable | Default |
+    -----------------+-----------------------------+----------+---------+
+     user_id         | text                        | not null |         |
+     conversation_id | text                        | not null |         |
+     seq             | integer                     | not null |         |
+     value           | bytea                       | not null |         |
+     created_at      | timestamp without time zone |          |         |
+     attachments     | text[]                      |          |         |
+    Indexes:
+        "conversation_turns_pkey" PRIMARY KEY, btree (user_id, conversation_id, seq)
+        "conversation_turns_attachments" gin (attachments)
+    Foreign-key constraints:
+        (user_id, conversation_id) REFERENCES conversations ON DELETE CASCADE
+    ```
+
+    Attachment content is stored once for all turns, of all users, that
+    attach the same content; turns refer to it by its digest:
+
+    ```
+         Column      |            Type             | Nullable | Default |
+    -----------------+-----------------------------+----------+---------+
+     digest          | text                        | not null |         |
+     content         | text                        | not null |         |
+     used_at         | timestamp without time zone |          |         |
+    Indexes:
+        "conversation_attachments_pkey" PRIMARY KEY, btree (digest)
+    ```
+
+    Appending a turn is a single statement that bumps the `turns` counter
+    of the header (locking the header row, so concurrent turns of the same
+    conversation get distinct sequence numbers) and inserts the new turn.
+    Conversations stored by previous versions in the `cache` table (whole
+    history in one `bytea` value) are migrated on start-up; the old table
+    is kept renamed to `cache_legacy`.
+
+    Conversations over capacity are evicted by a background janitor, so
+    inserts do not count conversations. The janitor runs periodically and
+    after a number of new conversations; it uses the row count estimate
+    maintained by Postgres statistics and deletes the oldest conversations
+    in batches. Before that, it deletes conversations not updated for the
+    idle TTL or created before the absolute TTL, when configured.
+    Attachments no longer referred to by any turn are deleted by the
+    janitor as well, after a grace period that protects attachments of
+    turns being appended.
     """
 
-    CREATE_CACHE_TABLE = """
-        CREATE TABLE IF NOT EXISTS cache (
+    CREATE_CONVERSATIONS_TABLE = """
+        CREATE TABLE IF NOT EXISTS conversations (
             user_id         text NOT NULL,
             conversation_id text NOT NULL,
-            value           bytea,
             topic_summary   text,
+            turns           integer NOT NULL DEFAULT 0,
             updated_at      timestamp,
+            created_at      timestamp DEFAULT CURRENT_TIMESTAMP,
             PRIMARY KEY(user_id, conversation_id)
         );
         """
 
+    # conversations table created by previous versions, the absolute TTL
+    # of conversations stored already starts at the upgrade
+    ADD_CONVERSATION_CREATED_AT_COLUMN = """
+        ALTER TABLE conversations
+            ADD COLUMN IF NOT EXISTS created_at timestamp DEFAULT CURRENT_TIMESTAMP
+        """
+
+    CREATE_TURNS_TABLE = """
+        CREATE TABLE IF NOT EXISTS conversation_turns (
+            user_id         text NOT NULL,
+            conversation_id text NOT NULL,
+            seq             integer NOT NULL,
+            value           bytea NOT NULL,
+            created_at      timestamp,
+            attachments     text[],
+            PRIMARY KEY(user_id, conversation_id, seq),
+            FOREIGN KEY(user_id, conversation_id)
+                REFERENCES conversations(user_id, conversation_id)
+                ON DELETE CASCADE
+        );
+        """
+
+    CREATE_ATTACHMENTS_TABLE = """
+        CREATE TABLE IF NOT EXISTS conversation_attachments (
+            digest          text PRIMARY KEY,
+            content         text NOT NULL,
+            used_at         timestamp
+        );
+        """
+
+    # turns table created by previous versions
+    ADD_TURN_ATTACHMENTS_COLUMN = """
+        ALTER TABLE conversation_turns ADD COLUMN IF NOT EXISTS attachments text[]
+        """
+
     CREATE_INDEX = """
-        CREATE INDEX IF NOT EXISTS timestamps
-            ON cache (updated_at)
+        CREATE INDEX IF NOT EXISTS conversations_updated_at
+            ON conversations (updated_at)
         """
 
-    SELECT_CONVERSATION_HISTORY_STATEMENT = """
-        SELECT value
+    CREATE_CREATED_AT_INDEX = """
+        CREATE INDEX IF NOT EXISTS conversations_created_at
+            ON conversations (created_at)
+        """
+
+    CREATE_ATTACHMENTS_INDEX = """
+        CREATE INDEX IF NOT EXISTS conversation_turns_attachments
+            ON conversation_turns USING GIN (attachments)
+        """
+
+    # serializes migration when several instances start at once
+    MIGRATION_LOCK_STATEMENT = """
+        SELECT pg_advisory_xact_lock(hashtext('ols_cache_migration'))
+        """
+
+    LEGACY_TABLE_EXISTS_STATEMENT = """
+        SELECT to_regclass('cache') IS NOT NULL
+        """
+
+    MIGRATE_CONVERSATIONS_STATEMENT = """
+        INSERT INTO conversations(user_id, conversation_id, topic_summary, turns, updated_at)
+        SELECT user_id, conversation_id, topic_summary,
+               COALESCE(json_array_length(convert_from(value, 'UTF8')::json), 0),
+               updated_at
           FROM cache
-         WHERE user_id=%s AND conversation_id=%s LIMIT 1
+        ON CONFLICT DO NOTHING
+        """
+
+    MIGRATE_TURNS_STATEMENT = """
+        INSERT INTO conversation_turns(user_id, conversation_id, seq, value, created_at)
+        SELECT c.user_id, c.conversation_id, t.seq, convert_to(t.turn::text, 'UTF8'),
+               c.updated_at
+          FROM cache c,
+               json_array_elements(convert_from(c.value, 'UTF8')::json)
+                   WITH ORDINALITY AS t(turn, seq)
+        ON CONFLICT DO NOTHING
         """
 
-    UPDATE_CONVERSATION_HISTORY_STATEMENT = """
-        UPDATE cache
-           SET value=%s, updated_at=CURRENT_TIMESTAMP
+    RENAME_LEGACY_TABLE_STATEMENT = """
+        ALTER TABLE cache RENAME TO cache_legacy
+        """
+
+    SELECT_CONVERSATION_HISTORY_STATEMENT = """
+        SELECT t.value,
+               -- content of the turn attachments, in order of their digests
+               ARRAY(SELECT COALESCE(a.content, '')
+                       FROM unnest(t.attachments) WITH ORDINALITY AS r(digest, n)
+                       LEFT JOIN conversation_attachments a ON a.digest = r.digest
+                      ORDER BY r.n)
+          FROM conversation_turns t
+         WHERE t.user_id=%s AND t.conversation_id=%s
+         ORDER BY t.seq
+        """
+
+    SELECT_CONVERSATION_HISTORY_TAIL_STATEMENT = """
+        SELECT t.value,
+               -- content of the turn attachments, in order of their digests
+               ARRAY(SELECT COALESCE(a.content, '')
+                       FROM unnest(t.attachments) WITH ORDINALITY AS r(digest, n)
+                       LEFT JOIN conversation_attachments a ON a.digest = r.digest
+                      ORDER BY r.n)
+          FROM (SELECT seq, value, attachments
+                  FROM conversation_turns
+                 WHERE user_id=%s AND conversation_id=%s
+                 ORDER BY seq DESC
+                 LIMIT %s) AS t
+         ORDER BY t.seq
+        """
+
+    SELECT_CONVERSATION_VERSION_STATEMENT = """
+        SELECT turns, updated_at
+          FROM conversations
          WHERE user_id=%s AND conversation_id=%s
         """
 
-    INSERT_CONVERSATION_HISTORY_STATEMENT = """
-        INSERT INTO cache(user_id, conversation_id, value, topic_summary, updated_at)
-        VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+    # returns True when the conversation was created by the statement,
+    # and the new version of the conversation; time of use of attachments
+    # stored already is refreshed when it approaches the grace period
+    APPEND_CONVERSATION_TURN_STATEMENT = """
+        WITH attachment AS (
+            INSERT INTO conversation_attachments(digest, content, used_at)
+            SELECT digest, content, CURRENT_TIMESTAMP
+              FROM unnest(%s::text[], %s::text[]) AS a(digest, content)
+            ON CONFLICT (digest) DO UPDATE
+               SET used_at=CURRENT_TIMESTAMP
+             WHERE conversation_attachments.used_at
+                   < CURRENT_TIMESTAMP - interval '1 hour'
+        ), header AS (
+            INSERT INTO conversations(user_id, conversation_id, topic_summary, turns, updated_at)
+            VALUES (%s, %s, %s, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (user_id, conversation_id) DO UPDATE
+               SET turns=conversations.turns + 1, updated_at=CURRENT_TIMESTAMP
+            RETURNING turns, updated_at, xmax = 0 AS created
+        ), turn AS (
+            INSERT INTO conversation_turns(user_id, conversation_id, seq, value,
+                                           attachments, created_at)
+            SELECT %s, %s, turns, %s, %s, CURRENT_TIMESTAMP FROM header
+        )
+        SELECT created, turns, updated_at FROM header
         """
 
     DELETE_CONVERSATION_HISTORY_STATEMENT = """
-        DELETE FROM cache
+        DELETE FROM conversations
+         WHERE (user_id, conversation_id) in
+               (SELECT user_id, conversation_id FROM conversations
+                 ORDER BY updated_at LIMIT %s)
+        """
+
+    DELETE_IDLE_CONVERSATIONS_STATEMENT = """
+        DELETE FROM conversations
+         WHERE (user_id, conversation_id) in
+               (SELECT user_id, conversation_id FROM conversations
+                 WHERE updated_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+                 LIMIT %s)
+        """
+
+    DELETE_OLD_CONVERSATIONS_STATEMENT = """
+        DELETE FROM conversations
          WHERE (user_id, conversation_id) in
-               (SELECT user_id, conversation_id FROM cache ORDER BY updated_at LIMIT
+               (SELECT user_id, conversation_id FROM conversations
+                 WHERE created_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+                 LIMIT %s)
         """
 
-    QUERY_CACHE_SIZE = """
-        SELECT count(*) FROM cache;
+    # attachments used by a turn being appended are not deleted, as their
+    # time of use is refreshed well before the grace period ends
+    DELETE_UNUSED_ATTACHMENTS_STATEMENT = """
+        DELETE FROM conversation_attachments
+         WHERE used_at < CURRENT_TIMESTAMP - interval '1 day'
+           AND digest IN
+               (SELECT digest FROM conversation_attachments a
+                 WHERE used_at < CURRENT_TIMESTAMP - interval '1 day'
+                   AND NOT EXISTS
+                       (SELECT 1 FROM conversation_turns t
+                         WHERE t.attachments @> ARRAY[a.digest])
+                 LIMIT %s)
+        """
+
+    # live rows counted by statistics collector, planner estimate when
+    # statistics are not available yet
+    QUERY_CACHE_SIZE_ESTIMATE = """
+        SELECT COALESCE(
+            (SELECT n_live_tup FROM pg_stat_user_tables
+              WHERE relid = 'conversations'::regclass),
+            (SELECT GREATEST(reltuples, 0)::bigint FROM pg_class
+              WHERE oid = 'conversations'::regclass))
+        """
+
+    # only one instance of the service evicts at a time; the lock is
+    # released with the transaction, even when the eviction fails
+    EVICTION_LOCK_STATEMENT = """
+        SELECT pg_try_advisory_xact_lock(hashtext('ols_cache_eviction'))
         """
 
     DELETE_SINGLE_CONVERSATION_STATEMENT = """
-        DELETE FROM cache
+        DELETE FROM conversations
          WHERE user_id=%s AND conversation_id=%s
+        RETURNING conversation_id
         """
 
     LIST_CONVERSATIONS_STATEMENT = """
         SELECT conversation_id, topic_summary
-        FROM cache
+        FROM conversations
         WHERE user_id=%s
         ORDER BY updated_at DESC
     """
 
-    def __init__(self, config: PostgresConfig) -> None:
+    def __init__(
+        self,
+        config: PostgresConfig,
+        idle_ttl: Optional[int] = None,
+        absolute_ttl: Optional[int] = None,
+    ) -> None:
         """Create a new instance of Postgres cache."""
         self.postgres_config = config
+        self.pool: Optional[PostgresPool] = None
+        # tables are created and migrated once per process, not on reconnect
+        self._initialized = False
 
         # initialize connection to DB
         self.connect()
         self.capacity = config.max_entries
+        self.idle_ttl = idle_ttl
+        self.absolute_ttl = absolute_ttl
+
+        # conversations created since the last eviction
+        self._created_conversations = 0
+        self._created_lock = threading.Lock()
+        self._eviction_requested = threading.Event()
+        threading.Thread(
+            target=self._evict_periodically, name="postgres-cache-janitor", daemon=True
+        ).start()
 
-    # pylint: disable=W0201
     def connect(self) -> None:
-        """Initialize connection to database."""
+        """Initialize connection pool and tables in database.
+
+        Tables are initialized by the first successful connect only,
+        reconnecting just acquires the connection pool again.
+        """
         logger.info("Connecting to storage")
-        # make sure the connection will have known state
+        # make sure the pool will have known state
         # even if PG is not alive
-        self.connection = None
-        config = self.postgres_config
-        self.connection = psycopg2.connect(
-            host=config.host,
-            port=config.port,
-            user=config.user,
-            password=config.password,
-            dbname=config.dbname,
-            sslmode=config.ssl_mode,
-            sslrootcert=config.ca_cert_path,
-            gssencmode=config.gss_encmode,
-        )
+        self.pool = None
+        pool = get_pool(self.postgres_config)
+        if self._initialized:
+            self.pool = pool
+            return
+        conn = pool.getconn()
         try:
-            self.initialize_cache()
+            conn.autocommit = False
+            self.initialize_cache(conn)
         except Exception as e:
-            self.connection.close()
+            pool.putconn(conn, discard=True)
             logger.exception("Error initializing Postgres cache:\n%s", e)
             raise
-        self.connection.autocommit = True
+        pool.putconn(conn)
+        self._initialized = True
+        self.pool = pool
 
     def connected(self) -> bool:
-        """Check if connection to cache is alive."""
-        if self.connection is None:
+        """Check if connection pool to storage is initialized.
+
+        Connections are not probed, failed operation reconnects instead.
+        """
+        if self.pool is None:
             logger.warning("Not connected, need to reconnect later")
             return False
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-            logger.info("Connection to storage is ok")
-            return True
-        except psycopg2.OperationalError as e:
-            logger.error("Disconnected from storage: %s", e)
-            return False
+        return True
 
-    def initialize_cache(self) -> None:
+    def initialize_cache(self, conn: psycopg2.extensions.connection) -> None:
         """Initialize cache - clean it up etc."""
         # cursor as context manager is not used there on purpose
         # any CREATE statement can raise it's own exception
         # and it should not interfere with other statements
-        cursor = self.connection.cursor()
+        cursor = conn.cursor()
 
-        logger.info("Initializing table for cache")
-        cursor.execute(PostgresCache.CREATE_CACHE_TABLE)
+        logger.info("Initializing tables for cache")
+        cursor.execute(PostgresCache.CREATE_CONVERSATIONS_TABLE)
+        cursor.execute(PostgresCache.CREATE_TURNS_TABLE)
+        cursor.execute(PostgresCache.CREATE_ATTACHMENTS_TABLE)
+        cursor.execute(PostgresCache.ADD_CONVERSATION_CREATED_AT_COLUMN)
+        cursor.execute(PostgresCache.ADD_TURN_ATTACHMENTS_COLUMN)
 
         logger.info("Initializing index for cache")
         cursor.execute(PostgresCache.CREATE_INDEX)
+        cursor.execute(PostgresCache.CREATE_CREATED_AT_INDEX)
+        cursor.execute(PostgresCache.CREATE_ATTACHMENTS_INDEX)
+
+        PostgresCache._migrate_legacy_table(cursor)
 
         cursor.close()
-        self.connection.commit()
+        conn.commit()
 
     @connection
     def get(
-        self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
+        self,
+        user_id: str,
+        conversation_id: str,
+        skip_user_id_check: bool = False,
+        limit: Optional[int] = None,
     ) -> list[CacheEntry]:
         """Get the value associated with the given key.
 
@@ -165,6 +416,7 @@ class PostgresCache(Cache):
             user_id: User identification.
             conversation_id: Conversation ID unique for given user.
             skip_user_id_check: Skip user_id suid check.
+            limit: Number of the most recent entries to get, all when not set.
 
         Returns:
             The value associated with the key, or None if not found.
@@ -172,18 +424,14 @@ class PostgresCache(Cache):
         # just check if user_id and conversation_id are UUIDs
         super().construct_key(user_id, conversation_id, skip_user_id_check)
 
-        with self.connection.cursor() as cursor:
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             try:
-                value = PostgresCache._select(cursor, user_id, conversation_id)
-                if value is None:
-                    return []
-                history = [CacheEntry.from_dict(cache_entry) for cache_entry in value]
-                return history
+                value = PostgresCache._select(cursor, user_id, conversation_id, limit)
+                return [CacheEntry.from_dict(cache_entry) for cache_entry in value]
             except psycopg2.DatabaseError as e:
                 logger.error("PostgresCache.get %s", e)
                 raise CacheError("PostgresCache.get", e) from e
 
-    @connection
     def insert_or_append(
         self,
         user_id: str,
@@ -201,33 +449,92 @@ class PostgresCache(Cache):
             topic_summary: Summary of the conversation's initial topic.
             skip_user_id_check: Skip user_id suid check.
         """
-        value = cache_entry.to_dict()
-        # the whole operation is run in one transaction
-        with self.connection.cursor() as cursor:
+        self.append(user_id, conversation_id, cache_entry, topic_summary)
+
+    @connection
+    def append(
+        self,
+        user_id: str,
+        conversation_id: str,
+        cache_entry: CacheEntry,
+        topic_summary: str = "",
+    ) -> Optional[tuple]:
+        """Append entry to conversation and return the new conversation version.
+
+        Args:
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            cache_entry: The `CacheEntry` object to store.
+            topic_summary: Summary of the conversation's initial topic.
+
+        Returns:
+            Version of the conversation, see `version`.
+
+        Raises:
+            UnconfirmedWriteError: When the connection failed while the entry
+                was being written, so it is not known if it was stored.
+        """
+        value_format = self.postgres_config.value_format
+        attachments: dict[str, str] = {}
+        references = None
+        if value_format == constants.CacheValueFormat.COMPACT:
+            # attachment content is stored once per digest
+            value = encode_cache_entry(cache_entry, value_format, True)
+            contents = [attachment.content for attachment in cache_entry.attachments]
+            references = [attachment_digest(content) for content in contents]
+            attachments = dict(zip(references, contents))
+        else:
+            value = encode_cache_entry(cache_entry, value_format)
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             try:
-                old_value = self._select(cursor, user_id, conversation_id)
-                if old_value:
-                    old_value.append(value)
-                    PostgresCache._update(
-                        cursor,
-                        user_id,
-                        conversation_id,
-                        json.dumps(old_value, cls=MessageEncoder).encode("utf-8"),
-                    )
-                else:
-                    PostgresCache._insert(
-                        cursor,
-                        user_id,
-                        conversation_id,
-                        json.dumps([value], cls=MessageEncoder).encode("utf-8"),
-                        topic_summary,
-                    )
-                    PostgresCache._cleanup(cursor, self.capacity)
-                # commit is implicit at this point
+                created, version = PostgresCache._append(
+                    cursor,
+                    user_id,
+                    conversation_id,
+                    value,
+                    topic_summary,
+                    attachments,
+                    references,
+                )
+                if created:
+                    self._conversation_created()
+                return version
             except psycopg2.DatabaseError as e:
                 logger.error("PostgresCache.insert_or_append: %s", e)
+                if is_connection_error(e):
+                    # retry after reconnect could store the entry twice
+                    raise UnconfirmedWriteError(
+                        "PostgresCache.insert_or_append", e
+                    ) from e
                 raise CacheError("PostgresCache.insert_or_append", e) from e
 
+    @connection
+    def version(self, user_id: str, conversation_id: str) -> Optional[tuple]:
+        """Get version of the conversation without reading its history.
+
+        Version consists of the number of turns and time of the last
+        update, so it changes with every appended turn and when the
+        conversation is deleted and created again.
+
+        Args:
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+
+        Returns:
+            Version of the conversation, or None if not found.
+        """
+        with self.pool.connection() as conn, conn.cursor() as cursor:
+            try:
+                cursor.execute(
+                    PostgresCache.SELECT_CONVERSATION_VERSION_STATEMENT,
+                    (user_id, conversation_id),
+                )
+                row = cursor.fetchone()
+                return None if row is None else tuple(row)
+            except psycopg2.DatabaseError as e:
+                logger.error("PostgresCache.version: %s", e)
+                raise CacheError("PostgresCache.version", e) from e
+
     @connection
     def delete(
         self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
@@ -243,7 +550,7 @@ class PostgresCache(Cache):
             bool: True if the conversation was deleted, False if not found.
 
         """
-        with self.connection.cursor() as cursor:
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             try:
                 return PostgresCache._delete(cursor, user_id, conversation_id)
             except psycopg2.DatabaseError as e:
@@ -264,7 +571,7 @@ class PostgresCache(Cache):
              A list of dictionaries containing conversation_id and topic_summary
 
         """
-        with self.connection.cursor() as cursor:
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             try:
                 cursor.execute(PostgresCache.LIST_CONVERSATIONS_STATEMENT, (user_id,))
                 rows = cursor.fetchall()
@@ -278,91 +585,222 @@ class PostgresCache(Cache):
     def ready(self) -> bool:
         """Check if the cache is ready.
 
-        Postgres cache checks if the connection is alive.
+        Postgres cache checks if a connection from the pool is alive.
 
         Returns:
             True if the cache is ready, False otherwise.
         """
-        # TODO: when the connection is closed and the database is back online,
-        # we need to reestablish the connection => implement this there?
-        # (it will be reconnected on any other DB operation anyway)
-        if self.connection is None or self.connection.closed == 1:
+        if self.pool is None:
             return False
+        if self.pool.in_use >= self.postgres_config.pool.max_size:
+            # all connections are busy, so the database is reachable
+            return True
         try:
-            return self.connection.poll() == psycopg2.extensions.POLL_OK
+            with self.pool.connection() as conn:
+                return conn.poll() == psycopg2.extensions.POLL_OK
         except (psycopg2.OperationalError, psycopg2.InterfaceError):
             # OperationalError - the once alive connection is closed
             # InterfaceError - cannot reach the database server
             return False
 
-    @staticmethod
-    def _select(
-        cursor: psycopg2.extensions.cursor,
-        user_id: str,
-        conversation_id: str,
-        skip_user_id_check: bool = False,
-    ) -> Any:
-        """Select conversation history for given user_id and conversation_id."""
-        cursor.execute(
-            PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
-            (user_id, conversation_id),
-        )
-        value = cursor.fetchone()
+    def _conversation_created(self) -> None:
+        """Count new conversation, request eviction after enough of them."""
+        with self._created_lock:
+            self._created_conversations += 1
+            if self._created_conversations < self.postgres_config.eviction_inserts:
+                return
+            self._created_conversations = 0
+        self._eviction_requested.set()
+
+    def _evict_periodically(self) -> None:
+        """Evict conversations over capacity periodically or when requested."""
+        while True:
+            self._eviction_requested.wait(self.postgres_config.eviction_interval)
+            self._eviction_requested.clear()
+            try:
+                self.evict()
+            except Exception as e:
+                logger.error("Eviction of old conversations failed: %s", e)
 
-        # check if history exists at all
-        if value is None:
-            return None
+    @connection
+    def evict(self) -> int:
+        """Delete expired conversations and the oldest ones exceeding capacity.
 
-        # check the retrieved value
-        if len(value) != 1:
-            raise ValueError("Invalid value read from cache:", value)
+        Conversations are deleted in batches within one transaction, which
+        holds the eviction lock.
 
-        # convert from memoryview object to a string
-        text_value = str(value[0], "utf-8")
-        deserialized = json.loads(text_value, cls=MessageDecoder)
+        Returns:
+            Number of deleted conversations.
+        """
+        batch_size = self.postgres_config.eviction_batch_size
+        deleted = 0
+        with self.pool.connection() as conn:
+            # pool rolls back the transaction when the connection is returned
+            # without commit, releasing the lock
+            conn.autocommit = False
+            with conn.cursor() as cursor:
+                cursor.execute(PostgresCache.EVICTION_LOCK_STATEMENT)
+                if not cursor.fetchone()[0]:
+                    logger.debug("Conversations are evicted by another instance")
+                    return 0
+                expired = self._expire(
+                    cursor,
+                    PostgresCache.DELETE_IDLE_CONVERSATIONS_STATEMENT,
+                    self.idle_ttl,
+                    "idle",
+                )
+                expired += self._expire(
+                    cursor,
+                    PostgresCache.DELETE_OLD_CONVERSATIONS_STATEMENT,
+                    self.absolute_ttl,
+                    "absolute",
+                )
+                if expired:
+                    logger.info("Deleted %d expired conversations", expired)
+                cursor.execute(PostgresCache.QUERY_CACHE_SIZE_ESTIMATE)
+                value = cursor.fetchone()
+                excess = 0 if value is None or value[0] is None else value[0]
+                excess -= self.capacity
+                while deleted < excess:
+                    limit = min(batch_size, excess - deleted)
+                    cursor.execute(
+                        PostgresCache.DELETE_CONVERSATION_HISTORY_STATEMENT, (limit,)
+                    )
+                    count = cursor.rowcount
+                    deleted += count
+                    if count < limit:
+                        break
+                self._delete_unused_attachments(cursor)
+            conn.commit()
+        if deleted:
+            logger.info("Evicted %d old conversations", deleted)
+            conversation_cache_evictions_total.labels("postgres", "capacity").inc(
+                deleted
+            )
+        return expired + deleted
+
+    def _expire(
+        self,
+        cursor: psycopg2.extensions.cursor,
+        statement: str,
+        ttl: Optional[int],
+        reason: str,
+    ) -> int:
+        """Delete conversations expired by given TTL in batches."""
+        if ttl is None:
+            return 0
+        batch_size = self.postgres_config.eviction_batch_size
+        deleted = 0
+        while True:
+            cursor.execute(statement, (ttl, batch_size))
+            count = cursor.rowcount
+            deleted += count
+            if count < batch_size:
+                break
+        if deleted:
+            conversation_cache_evictions_total.labels("postgres", reason).inc(deleted)
+        return deleted
+
+    def _delete_unused_attachments(self, cursor: psycopg2.extensions.cursor) -> None:
+        """Delete attachments not referred to by any conversation turn."""
+        batch_size = self.postgres_config.eviction_batch_size
+        deleted = 0
+        while True:
+            cursor.execute(
+                PostgresCache.DELETE_UNUSED_ATTACHMENTS_STATEMENT, (batch_size,)
+            )
+            count = cursor.rowcount
+            deleted += count
+            if count < batch_size:
+                break
+        if deleted:
+            logger.info("Deleted %d unused attachments", deleted)
 
-        # try to deserialize the value
-        return deserialized
+    @staticmethod
+    def _migrate_legacy_table(cursor: psycopg2.extensions.cursor) -> None:
+        """Migrate conversations stored in one row each to row per turn."""
+        cursor.execute(PostgresCache.MIGRATION_LOCK_STATEMENT)
+        cursor.execute(PostgresCache.LEGACY_TABLE_EXISTS_STATEMENT)
+        value = cursor.fetchone()
+        if value is None or not value[0]:
+            return
+        logger.info("Migrating conversation history from legacy cache table")
+        cursor.execute(PostgresCache.MIGRATE_CONVERSATIONS_STATEMENT)
+        cursor.execute(PostgresCache.MIGRATE_TURNS_STATEMENT)
+        cursor.execute(PostgresCache.RENAME_LEGACY_TABLE_STATEMENT)
 
     @staticmethod
-    def _update(
+    def _select(
         cursor: psycopg2.extensions.cursor,
         user_id: str,
         conversation_id: str,
-        value: bytes,
-    ) -> None:
-        """Update conversation history for given user_id and conversation_id."""
-        cursor.execute(
-            PostgresCache.UPDATE_CONVERSATION_HISTORY_STATEMENT,
-            (value, user_id, conversation_id),
-        )
+        limit: Optional[int] = None,
+    ) -> Any:
+        """Select conversation history for given user_id and conversation_id."""
+        if limit is None:
+            cursor.execute(
+                PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
+                (user_id, conversation_id),
+            )
+        else:
+            cursor.execute(
+                PostgresCache.SELECT_CONVERSATION_HISTORY_TAIL_STATEMENT,
+                (user_id, conversation_id, limit),
+            )
+        rows = cursor.fetchall()
+
+        history = []
+        for row in rows:
+            # check the retrieved value and attachment content
+            if len(row) != 2:
+                raise ValueError("Invalid value read from cache:", row)
+            # convert from memoryview object to bytes
+            history.append(decode_cache_entry(bytes(row[0]), row[1]))
+        return history
 
     @staticmethod
-    def _insert(
+    def _append(
         cursor: psycopg2.extensions.cursor,
         user_id: str,
         conversation_id: str,
         value: bytes,
         topic_summary: str,
-    ) -> None:
-        """Insert new conversation history for given user_id and conversation_id."""
+        attachments: Optional[dict[str, str]] = None,
+        references: Optional[Sequence[str]] = None,
+    ) -> tuple[bool, Optional[tuple]]:
+        """Append turn to conversation.
+
+        Args:
+            cursor: Database cursor.
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            value: Encoded cache entry.
+            topic_summary: Summary of the conversation's initial topic.
+            attachments: Attachment content stored separately, by its digest.
+            references: Digests of the turn attachments, in their order.
+
+        Returns:
+            True if conversation was created, and the new conversation version.
+        """
+        attachments = attachments or {}
         cursor.execute(
-            PostgresCache.INSERT_CONVERSATION_HISTORY_STATEMENT,
-            (user_id, conversation_id, value, topic_summary),
+            PostgresCache.APPEND_CONVERSATION_TURN_STATEMENT,
+            (
+                list(attachments.keys()),
+                list(attachments.values()),
+                user_id,
+                conversation_id,
+                topic_summary,
+                user_id,
+                conversation_id,
+                value,
+                references,
+            ),
         )
-
-    @staticmethod
-    def _cleanup(cursor: psycopg2.extensions.cursor, capacity: int) -> None:
-        """Perform cleanup old conversation histories."""
-        cursor.execute(PostgresCache.QUERY_CACHE_SIZE)
-        value = cursor.fetchone()
-        if value is not None:
-            count = value[0]
-            limit = count - capacity
-            if limit > 0:
-                cursor.execute(
-                    f"{PostgresCache.DELETE_CONVERSATION_HISTORY_STATEMENT} {count - capacity})"
-                )
+        row = cursor.fetchone()
+        if row is None:
+            return False, None
+        return bool(row[0]), tuple(row[1:])
 
     @staticmethod
     def _delete(
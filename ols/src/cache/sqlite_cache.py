@@ -0,0 +1,356 @@
+"""Cache that uses SQLite database file to store cached values."""
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from ols import constants
+from ols.app.models.config import SQLiteCacheConfig
+from ols.app.models.models import CacheEntry
+from ols.src.cache.cache import Cache
+from ols.src.cache.cache_encoding import decode_cache_entry, encode_cache_entry
+from ols.src.cache.cache_error import CacheError
+from ols.utils.storage_metrics import conversation_cache_evictions_total
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache(Cache):
+    """Cache that uses SQLite database file to store cached values.
+
+    Conversations survive restarts of the service without a database
+    server, so the cache suits deployments with one replica. The schema
+    follows the Postgres cache: a header row of every conversation in the
+    `conversations` table and a row of every turn in `conversation_turns`,
+    so appending a turn neither reads nor rewrites the history.
+
+    The database is used in WAL mode, so readers do not wait for the
+    writer. Every thread has its own connection, which keeps the compiled
+    statements in its statement cache. Times are stored as seconds since
+    the epoch. When a new conversation exceeds the capacity, the least
+    recently updated conversations are deleted in the same transaction.
+    """
+
+    CREATE_CONVERSATIONS_TABLE = """
+        CREATE TABLE IF NOT EXISTS conversations (
+            user_id         text NOT NULL,
+            conversation_id text NOT NULL,
+            topic_summary   text,
+            turns           integer NOT NULL DEFAULT 0,
+            updated_at      real NOT NULL,
+            created_at      real NOT NULL,
+            PRIMARY KEY(user_id, conversation_id)
+        ) WITHOUT ROWID
+        """
+
+    CREATE_TURNS_TABLE = """
+        CREATE TABLE IF NOT EXISTS conversation_turns (
+            user_id         text NOT NULL,
+            conversation_id text NOT NULL,
+            seq             integer NOT NULL,
+            value           blob NOT NULL,
+            PRIMARY KEY(user_id, conversation_id, seq),
+            FOREIGN KEY(user_id, conversation_id)
+                REFERENCES conversations(user_id, conversation_id)
+                ON DELETE CASCADE
+        ) WITHOUT ROWID
+        """
+
+    CREATE_UPDATED_AT_INDEX = """
+        CREATE INDEX IF NOT EXISTS conversations_updated_at
+            ON conversations (updated_at)
+        """
+
+    CREATE_CREATED_AT_INDEX = """
+        CREATE INDEX IF NOT EXISTS conversations_created_at
+            ON conversations (created_at)
+        """
+
+    # a negative limit means no limit in SQLite
+    SELECT_CONVERSATION_HISTORY_STATEMENT = """
+        SELECT value
+          FROM (SELECT seq, value
+                  FROM conversation_turns
+                 WHERE user_id=? AND conversation_id=?
+                 ORDER BY seq DESC
+                 LIMIT ?)
+         ORDER BY seq
+        """
+
+    # returns the number of turns including the appended one
+    UPSERT_CONVERSATION_STATEMENT = """
+        INSERT INTO conversations(user_id, conversation_id, topic_summary, turns,
+                                  updated_at, created_at)
+        VALUES (?, ?, ?, 1, ?, ?)
+        ON CONFLICT (user_id, conversation_id) DO UPDATE
+           SET turns=turns + 1, updated_at=excluded.updated_at
+        RETURNING turns
+        """
+
+    INSERT_CONVERSATION_TURN_STATEMENT = """
+        INSERT INTO conversation_turns(user_id, conversation_id, seq, value)
+        VALUES (?, ?, ?, ?)
+        """
+
+    DELETE_SINGLE_CONVERSATION_STATEMENT = """
+        DELETE FROM conversations
+         WHERE user_id=? AND conversation_id=?
+        """
+
+    LIST_CONVERSATIONS_STATEMENT = """
+        SELECT conversation_id, topic_summary
+          FROM conversations
+         WHERE user_id=?
+         ORDER BY updated_at DESC
+        """
+
+    # keeps the given number of the most recently updated conversations
+    DELETE_CONVERSATIONS_OVER_CAPACITY_STATEMENT = """
+        DELETE FROM conversations
+         WHERE (user_id, conversation_id) IN
+               (SELECT user_id, conversation_id FROM conversations
+                 ORDER BY updated_at DESC
+                 LIMIT -1 OFFSET ?)
+        """
+
+    DELETE_IDLE_CONVERSATIONS_STATEMENT = """
+        DELETE FROM conversations
+         WHERE updated_at < ?
+        """
+
+    DELETE_OLD_CONVERSATIONS_STATEMENT = """
+        DELETE FROM conversations
+         WHERE created_at < ?
+        """
+
+    def __init__(
+        self,
+        config: SQLiteCacheConfig,
+        idle_ttl: Optional[int] = None,
+        absolute_ttl: Optional[int] = None,
+        sweep_interval: int = constants.CONVERSATION_CACHE_SWEEP_INTERVAL,
+    ) -> None:
+        """Create a new instance of SQLite cache."""
+        self.sqlite_config = config
+        self.capacity = config.max_entries
+        self.idle_ttl = idle_ttl
+        self.absolute_ttl = absolute_ttl
+        self.sweep_interval = sweep_interval
+        self._connections = threading.local()
+        self.initialize_cache(self._connection())
+        if idle_ttl is not None or absolute_ttl is not None:
+            threading.Thread(
+                target=self._sweep_periodically,
+                name="sqlite-cache-sweeper",
+                daemon=True,
+            ).start()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get connection of the current thread, open it on the first use."""
+        conn = getattr(self._connections, "conn", None)
+        if conn is None:
+            # transactions are started explicitly
+            conn = sqlite3.connect(
+                self.sqlite_config.path,
+                isolation_level=None,
+                timeout=self.sqlite_config.timeout,
+                cached_statements=constants.SQLITE_CACHE_CACHED_STATEMENTS,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            # durable after checkpoint, enough for a cache
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._connections.conn = conn
+        return conn
+
+    @staticmethod
+    def initialize_cache(conn: sqlite3.Connection) -> None:
+        """Initialize tables and indexes of the cache."""
+        logger.info("Initializing tables for cache")
+        conn.execute(SQLiteCache.CREATE_CONVERSATIONS_TABLE)
+        conn.execute(SQLiteCache.CREATE_TURNS_TABLE)
+        conn.execute(SQLiteCache.CREATE_UPDATED_AT_INDEX)
+        conn.execute(SQLiteCache.CREATE_CREATED_AT_INDEX)
+
+    def get(
+        self,
+        user_id: str,
+        conversation_id: str,
+        skip_user_id_check: bool = False,
+        limit: Optional[int] = None,
+    ) -> list[CacheEntry]:
+        """Get the value associated with the given key.
+
+        Args:
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            skip_user_id_check: Skip user_id suid check.
+            limit: Number of the most recent entries to get, all when not set.
+
+        Returns:
+            The value associated with the key, or None if not found.
+        """
+        # just check if user_id and conversation_id are UUIDs
+        super().construct_key(user_id, conversation_id, skip_user_id_check)
+        try:
+            rows = (
+                self._connection()
+                .execute(
+                    SQLiteCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
+                    (user_id, conversation_id, -1 if limit is None else limit),
+                )
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            logger.error("SQLiteCache.get %s", e)
+            raise CacheError("SQLiteCache.get", e) from e
+        return [CacheEntry.from_dict(decode_cache_entry(row[0])) for row in rows]
+
+    def insert_or_append(
+        self,
+        user_id: str,
+        conversation_id: str,
+        cache_entry: CacheEntry,
+        topic_summary: str = "",
+        skip_user_id_check: bool = False,
+    ) -> None:
+        """Set the value associated with the given key.
+
+        Args:
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            cache_entry: The `CacheEntry` object to store.
+            topic_summary: Summary of the conversation's initial topic.
+            skip_user_id_check: Skip user_id suid check.
+        """
+        value = encode_cache_entry(cache_entry)
+        now = time.time()
+        conn = self._connection()
+        try:
+            # write lock is taken at once, so the transaction does not fail
+            # when another connection writes between its reads and writes
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                (turns,) = conn.execute(
+                    SQLiteCache.UPSERT_CONVERSATION_STATEMENT,
+                    (user_id, conversation_id, topic_summary, now, now),
+                ).fetchone()
+                conn.execute(
+                    SQLiteCache.INSERT_CONVERSATION_TURN_STATEMENT,
+                    (user_id, conversation_id, turns, value),
+                )
+                evicted = 0
+                if turns == 1:
+                    evicted = conn.execute(
+                        SQLiteCache.DELETE_CONVERSATIONS_OVER_CAPACITY_STATEMENT,
+                        (self.capacity,),
+                    ).rowcount
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.error("SQLiteCache.insert_or_append: %s", e)
+            raise CacheError("SQLiteCache.insert_or_append", e) from e
+        if evicted:
+            conversation_cache_evictions_total.labels("sqlite", "capacity").inc(evicted)
+
+    def delete(
+        self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
+    ) -> bool:
+        """Delete conversation history for a given user_id and conversation_id.
+
+        Args:
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            skip_user_id_check: Skip user_id suid check.
+
+        Returns:
+            bool: True if the conversation was deleted, False if not found.
+        """
+        try:
+            cursor = self._connection().execute(
+                SQLiteCache.DELETE_SINGLE_CONVERSATION_STATEMENT,
+                (user_id, conversation_id),
+            )
+        except sqlite3.Error as e:
+            logger.error("SQLiteCache.delete: %s", e)
+            raise CacheError("SQLiteCache.delete", e) from e
+        return cursor.rowcount > 0
+
+    def list(
+        self, user_id: str, skip_user_id_check: bool = False
+    ) -> list[dict[str, str]]:
+        """List all conversations for a given user_id.
+
+        Args:
+            user_id: User identification.
+            skip_user_id_check: Skip user_id suid check.
+
+        Returns:
+            A list of dictionaries containing conversation_id and topic_summary
+        """
+        try:
+            rows = (
+                self._connection()
+                .execute(SQLiteCache.LIST_CONVERSATIONS_STATEMENT, (user_id,))
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            logger.error("SQLiteCache.list: %s", e)
+            raise CacheError("SQLiteCache.list", e) from e
+        return [{"conversation_id": row[0], "topic_summary": row[1]} for row in rows]
+
+    def ready(self) -> bool:
+        """Check if the cache is ready.
+
+        SQLite cache checks if the database can be read.
+
+        Returns:
+            True if the cache is ready, False otherwise.
+        """
+        try:
+            self._connection().execute("SELECT 1 FROM conversations LIMIT 1")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Delete conversations that exceeded their idle or absolute TTL.
+
+        Args:
+            now: Current time, `time.time()` when not set.
+
+        Returns:
+            Number of deleted conversations.
+        """
+        now = time.time() if now is None else now
+        deleted = 0
+        for statement, ttl, reason in (
+            (SQLiteCache.DELETE_IDLE_CONVERSATIONS_STATEMENT, self.idle_ttl, "idle"),
+            (
+                SQLiteCache.DELETE_OLD_CONVERSATIONS_STATEMENT,
+                self.absolute_ttl,
+                "absolute",
+            ),
+        ):
+            if ttl is None:
+                continue
+            count = self._connection().execute(statement, (now - ttl,)).rowcount
+            if count:
+                conversation_cache_evictions_total.labels("sqlite", reason).inc(count)
+            deleted += count
+        return deleted
+
+    def _sweep_periodically(self) -> None:
+        """Delete expired conversations periodically."""
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                expired = self.expire()
+                if expired:
+                    logger.info("Deleted %d expired conversations", expired)
+            except Exception as e:
+                logger.error("Deletion of expired conversations failed: %s", e)
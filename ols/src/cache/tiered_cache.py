@@ -0,0 +1,178 @@
+"""Cache keeping recently used conversations in memory in front of Postgres."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from ols.app.models.models import CacheEntry
+from ols.src.cache.cache import Cache
+from ols.src.cache.postgres_cache import PostgresCache
+from ols.utils.storage_metrics import conversation_cache_lookups_total
+
+
+class TieredCache(Cache):
+    """Bounded local LRU cache of conversations with write-through to Postgres.
+
+    Follow-up turns of a conversation are usually served by the same
+    instance of the service, so its history is kept in memory and only its
+    version (number of turns and time of the last update) is read from
+    Postgres. When the conversation was changed by another instance, the
+    versions differ and the history is reloaded from Postgres. All writes
+    go to Postgres first, so it always holds the complete history.
+
+    History read with a limit is fetched and kept only partially, as the
+    most recent turns; it serves requests for at most that many turns.
+    """
+
+    def __init__(self, remote: PostgresCache, max_entries: int) -> None:
+        """Create local cache in front of the given Postgres cache."""
+        self.remote = remote
+        self.capacity = max_entries
+        # (version, most recent turns) of conversations, the least recently
+        # used first; number of turns is the first item of the version
+        self._local: OrderedDict[str, tuple[Any, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store(self, key: str, version: Any, history: list[dict]) -> None:
+        """Store conversation locally, its lock must be held."""
+        self._local[key] = (version, history)
+        self._local.move_to_end(key)
+        while len(self._local) > self.capacity:
+            self._local.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        """Remove conversation from the local cache."""
+        with self._lock:
+            self._local.pop(key, None)
+
+    def get(
+        self,
+        user_id: str,
+        conversation_id: str,
+        skip_user_id_check: bool = False,
+        limit: Optional[int] = None,
+    ) -> list[CacheEntry]:
+        """Get the value associated with the given key.
+
+        Args:
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            skip_user_id_check: Skip user_id suid check.
+            limit: Number of the most recent entries to get, all when not set.
+
+        Returns:
+            The value associated with the key, or None if not found.
+        """
+        key = super().construct_key(user_id, conversation_id, skip_user_id_check)
+        # version has to be read before history, so history concurrently
+        # appended by another instance makes the local copy stale, not wrong
+        version = self.remote.version(user_id, conversation_id)
+        if version is None:
+            self._forget(key)
+            conversation_cache_lookups_total.labels("local", "miss").inc()
+            conversation_cache_lookups_total.labels("remote", "miss").inc()
+            return None
+
+        with self._lock:
+            local = self._local.get(key)
+            if local is not None and local[0] == version:
+                turns = len(local[1])
+                complete = turns == version[0]
+                if complete or (limit is not None and limit <= turns):
+                    self._local.move_to_end(key)
+                    history = local[1]
+                else:
+                    history = None
+            else:
+                history = None
+        if history is not None:
+            conversation_cache_lookups_total.labels("local", "hit").inc()
+        else:
+            conversation_cache_lookups_total.labels("local", "miss").inc()
+            entries = self.remote.get(user_id, conversation_id, True, limit=limit)
+            if entries is None:
+                conversation_cache_lookups_total.labels("remote", "miss").inc()
+                return None
+            conversation_cache_lookups_total.labels("remote", "hit").inc()
+            history = [cache_entry.to_dict() for cache_entry in entries]
+            with self._lock:
+                self._store(key, version, history)
+
+        if limit is not None:
+            history = history[-limit:] if limit > 0 else []
+        return [CacheEntry.from_dict(cache_entry) for cache_entry in history]
+
+    def insert_or_append(
+        self,
+        user_id: str,
+        conversation_id: str,
+        cache_entry: CacheEntry,
+        topic_summary: str = "",
+        skip_user_id_check: bool = False,
+    ) -> None:
+        """Store the value in Postgres and append it to the local copy.
+
+        Args:
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            cache_entry: The `CacheEntry` object to store.
+            topic_summary: Summary of the conversation's initial topic.
+            skip_user_id_check: Skip user_id suid check.
+        """
+        key = super().construct_key(user_id, conversation_id, skip_user_id_check)
+        version = self.remote.append(
+            user_id, conversation_id, cache_entry, topic_summary
+        )
+        if version is None:
+            self._forget(key)
+            return
+        turns = version[0]
+        value = cache_entry.to_dict()
+        with self._lock:
+            local = self._local.get(key)
+            if turns == 1:
+                self._store(key, version, [value])
+            elif local is not None and local[0][0] == turns - 1:
+                # no other instance appended meanwhile
+                self._store(key, version, [*local[1], value])
+            else:
+                self._local.pop(key, None)
+
+    def delete(
+        self, user_id: str, conversation_id: str, skip_user_id_check: bool = False
+    ) -> bool:
+        """Delete conversation history for a given user_id and conversation_id.
+
+        Args:
+            user_id: User identification.
+            conversation_id: Conversation ID unique for given user.
+            skip_user_id_check: Skip user_id suid check.
+
+        Returns:
+            bool: True if the conversation was deleted, False if not found.
+        """
+        key = super().construct_key(user_id, conversation_id, skip_user_id_check)
+        self._forget(key)
+        return self.remote.delete(user_id, conversation_id, skip_user_id_check)
+
+    def list(
+        self, user_id: str, skip_user_id_check: bool = False
+    ) -> list[dict[str, str]]:
+        """List all conversations for a given user_id.
+
+        Args:
+            user_id: User identification.
+            skip_user_id_check: Skip user_id suid check.
+
+        Returns:
+            A list of dictionaries containing conversation_id and topic_summary
+        """
+        return self.remote.list(user_id, skip_user_id_check)
+
+    def ready(self) -> bool:
+        """Check if the cache is ready.
+
+        Returns:
+            True if Postgres cache is ready, False otherwise.
+        """
+        return self.remote.ready()
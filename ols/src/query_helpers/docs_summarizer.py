@@ -1,12 +1,13 @@
 """A class for summarizing documentation context."""
 
+from __future__ import annotations
+
+import asyncio
 import logging
-from typing import Any, AsyncGenerator, Optional
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Callable, Optional
 
 from langchain.chains import LLMChain
 from langchain_core.messages import AIMessage, BaseMessage
-from langchain_core.prompts import ChatPromptTemplate
-from llama_index.core import VectorStoreIndex
 
 from ols import config
 from ols.app.metrics import TokenMetricUpdater
@@ -19,8 +20,20 @@ from ols.src.prompts.prompt_generator import (
     restructure_rag_context,
 )
 from ols.src.query_helpers.query_helper import QueryHelper
+from ols.src.rag_index.deduplication import diversify
+from ols.src.rag_index.retrieval_depth import (
+    chunk_tokens_estimate,
+    get_next_top_k,
+    get_top_k,
+)
 from ols.utils.token_handler import TokenHandler
 
+if TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
+    from llama_index.core import VectorStoreIndex
+
+    from ols.app.models.config import DeduplicationConfig, RetrievalDepthConfig
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,11 +59,92 @@ class DocsSummarizer(QueryHelper):
             self.provider, self.model, self.generic_llm_params
         )
 
+    @staticmethod
+    def _get_similarity_top_k() -> int:
+        """Get number of chunks to retrieve, wider set is retrieved for reranker."""
+        reference_content = config.ols_config.reference_content
+        if reference_content is not None and reference_content.reranker is not None:
+            return reference_content.reranker.candidates
+        return RAG_CONTENT_LIMIT
+
+    @staticmethod
+    def _get_deduplication() -> Optional[DeduplicationConfig]:
+        """Get configuration of near-duplicate chunks suppression."""
+        reference_content = config.ols_config.reference_content
+        if reference_content is None:
+            return None
+        return reference_content.deduplication
+
+    @staticmethod
+    def _get_retrieval_depth() -> Optional[RetrievalDepthConfig]:
+        """Get bounds of budget-driven retrieval, reranker uses fixed depth."""
+        reference_content = config.ols_config.reference_content
+        if reference_content is None or reference_content.reranker is not None:
+            return None
+        return reference_content.retrieval_depth
+
+    def _retrieve_rag_chunks(
+        self,
+        query: str,
+        vector_index: VectorStoreIndex,
+        token_handler: TokenHandler,
+        available_tokens: int,
+    ) -> tuple[list[RagChunk], int]:
+        """Retrieve RAG chunks fitting into the available tokens.
+
+        Args:
+            query: The query to retrieve chunks for.
+            vector_index: Vector index to get RAG data/context.
+            token_handler: Token handler used to truncate the context.
+            available_tokens: Tokens available for RAG context.
+
+        Returns:
+            list of `RagChunk` objects, available tokens after context usage
+        """
+        retrieval_depth = self._get_retrieval_depth()
+        if retrieval_depth is None:
+            top_k = self._get_similarity_top_k()
+        else:
+            top_k = get_top_k(retrieval_depth, available_tokens, chunk_tokens_estimate)
+
+        while True:
+            retriever = vector_index.as_retriever(similarity_top_k=top_k)
+            retrieved_nodes = retriever.retrieve(query)
+            nodes = diversify(retrieved_nodes, self._get_deduplication())
+            nodes = reranker.rerank(nodes, query)
+            rag_chunks, remaining_tokens = token_handler.truncate_rag_context(
+                nodes, self.model, available_tokens
+            )
+            if retrieval_depth is None:
+                return rag_chunks, remaining_tokens
+            next_top_k = get_next_top_k(
+                retrieval_depth,
+                top_k,
+                retrieved_nodes,
+                remaining_tokens,
+                chunk_tokens_estimate,
+            )
+            if next_top_k is None:
+                break
+            logger.debug(
+                "%d tokens left after %d chunk(s), retrieving %d chunks",
+                remaining_tokens,
+                len(rag_chunks),
+                next_top_k,
+            )
+            top_k = next_top_k
+
+        chunk_tokens_estimate.update(
+            available_tokens - remaining_tokens, len(rag_chunks)
+        )
+        return rag_chunks, remaining_tokens
+
     def _prepare_prompt(
         self,
         query: str,
         vector_index: Optional[VectorStoreIndex] = None,
         history: Optional[list[BaseMessage]] = None,
+        history_loader: Optional[Callable[[int], list[BaseMessage]]] = None,
     ) -> tuple[ChatPromptTemplate, dict[str, str], list[RagChunk], bool]:
         """Summarize the given query based on the provided conversation context.
 
@@ -58,6 +152,9 @@ class DocsSummarizer(QueryHelper):
             query: The query to be summarized.
             vector_index: Vector index to get RAG data/context.
             history: The history of the conversation (if available).
+            history_loader: Function loading the given number of the most
+                recent turns of the conversation, when the history is just
+                its tail.
 
         Returns:
             A tuple containing the final prompt, input values, RAG chunks,
@@ -95,11 +192,8 @@ class DocsSummarizer(QueryHelper):
 
         # Retrieve RAG content
         if vector_index:
-            retriever = vector_index.as_retriever(similarity_top_k=RAG_CONTENT_LIMIT)
-            retrieved_nodes = retriever.retrieve(query)
-            retrieved_nodes = reranker.rerank(retrieved_nodes)
-            rag_chunks, available_tokens = token_handler.truncate_rag_context(
-                retrieved_nodes, self.model, available_tokens
+            rag_chunks, available_tokens = self._retrieve_rag_chunks(
+                query, vector_index, token_handler, available_tokens
             )
         else:
             logger.warning("Proceeding without RAG content. Check start up messages.")
@@ -109,8 +203,8 @@ class DocsSummarizer(QueryHelper):
             logger.debug("Using llm to answer the query without reference content")
 
         # Truncate history
-        history, truncated = token_handler.limit_conversation_history(
-            history or [], self.model, available_tokens
+        history, truncated = self._limit_history(
+            token_handler, history or [], history_loader, available_tokens
         )
 
         final_prompt, llm_input_values = GeneratePrompt(
@@ -128,15 +222,42 @@ class DocsSummarizer(QueryHelper):
 
         return final_prompt, llm_input_values, rag_chunks, truncated
 
+    def _limit_history(
+        self,
+        token_handler: TokenHandler,
+        history: list[BaseMessage],
+        history_loader: Optional[Callable[[int], list[BaseMessage]]],
+        available_tokens: int,
+    ) -> tuple[list[BaseMessage], bool]:
+        """Limit history to available tokens, loading older turns if they fit."""
+        limited, truncated = token_handler.limit_conversation_history(
+            history, self.model, available_tokens
+        )
+        # every turn consists of query and response
+        turns = len(history) // 2
+        while not truncated and history_loader is not None and turns > 0:
+            # the whole tail fits, so older turns might fit as well
+            turns *= 2
+            history = history_loader(turns)
+            logger.debug("Loaded %d messages of conversation history", len(history))
+            limited, truncated = token_handler.limit_conversation_history(
+                history, self.model, available_tokens
+            )
+            if len(history) < 2 * turns:
+                # the whole conversation is loaded
+                break
+        return limited, truncated
+
     def create_response(
         self,
         query: str,
         vector_index: Optional[VectorStoreIndex] = None,
         history: Optional[list[str]] = None,
+        history_loader: Optional[Callable[[int], list[BaseMessage]]] = None,
     ) -> SummarizerResponse:
         """Create a response for the given query based on the provided conversation context."""
         final_prompt, llm_input_values, rag_chunks, truncated = self._prepare_prompt(
-            query, vector_index, history
+            query, vector_index, history, history_loader
         )
 
         print(final_prompt.format(**llm_input_values))
@@ -170,10 +291,13 @@ class DocsSummarizer(QueryHelper):
         query: str,
         vector_index: Optional[VectorStoreIndex] = None,
         history: Optional[list[str]] = None,
+        history_loader: Optional[Callable[[int], list[BaseMessage]]] = None,
     ) -> AsyncGenerator[str, SummarizerResponse]:
         """Generate a response for the given query based on the provided conversation context."""
-        final_prompt, llm_input_values, rag_chunks, truncated = self._prepare_prompt(
-            query, vector_index, history
+        # retrieval (vector DB queries) is blocking, so it must not run in the
+        # event loop; otherwise streaming requests would be serialized
+        final_prompt, llm_input_values, rag_chunks, truncated = await asyncio.to_thread(
+            self._prepare_prompt, query, vector_index, history, history_loader
         )
 
         with TokenMetricUpdater(
@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING, Optional
 
 import psycopg2
 
+from ols.utils.postgres_pool import PostgresPool, get_pool
+
 if TYPE_CHECKING:
     from ols.app.models.config import PostgresConfig
 
@@ -41,48 +43,36 @@ class QuotaLimiter(ABC):
     def __init__(self) -> None:
         """Initialize connection config."""
         self.connection_config: Optional[PostgresConfig] = None
+        self.pool: Optional[PostgresPool] = None
 
     @abstractmethod
-    def _initialize_tables(self) -> None:
+    def _initialize_tables(self, conn: psycopg2.extensions.connection) -> None:
         """Initialize tables and indexes."""
 
     # pylint: disable=W0201
     def connect(self) -> None:
-        """Initialize connection to database."""
+        """Initialize connection pool and tables in database."""
         logger.info("Establishing connection to storage")
-        config = self.connection_config
-        # make sure the connection will have known state
-        self.connection = None
-        self.connection = psycopg2.connect(
-            host=config.host,
-            port=config.port,
-            user=config.user,
-            password=config.password,
-            dbname=config.dbname,
-            sslmode=config.ssl_mode,
-            # sslrootcert=config.ca_cert_path,
-            gssencmode=config.gss_encmode,
-        )
-
+        # make sure the pool will have known state
+        self.pool = None
+        pool = get_pool(self.connection_config)
+        conn = pool.getconn()
         try:
-            self._initialize_tables()
+            conn.autocommit = False
+            self._initialize_tables(conn)
         except Exception as e:
-            self.connection.close()
+            pool.putconn(conn, discard=True)
             logger.exception("Error initializing Postgres database:\n%s", e)
             raise
-
-        self.connection.autocommit = True
+        pool.putconn(conn)
+        self.pool = pool
 
     def connected(self) -> bool:
-        """Check if connection to cache is alive."""
-        if self.connection is None:
+        """Check if connection pool to storage is initialized.
+
+        Connections are not probed, failed operation reconnects instead.
+        """
+        if self.pool is None:
             logger.warning("Not connected, need to reconnect later")
             return False
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-            logger.info("Connection to storage is ok")
-            return True
-        except psycopg2.OperationalError as e:
-            logger.error("Disconnected from storage: %s", e)
-            return False
+        return True
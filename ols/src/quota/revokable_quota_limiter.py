@@ -3,6 +3,8 @@
 import logging
 from datetime import datetime
 
+import psycopg2
+
 from ols.app.models.config import PostgresConfig
 from ols.src.quota.quota_exceed_error import QuotaExceedError
 from ols.src.quota.quota_limiter import QuotaLimiter
@@ -67,14 +69,14 @@ class RevokableQuotaLimiter(QuotaLimiter):
         """Retrieve available quota for given subject."""
         if self.subject_type == "c":
             subject_id = ""
-        with self.connection.cursor() as cursor:
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             cursor.execute(
                 RevokableQuotaLimiter.SELECT_QUOTA,
                 (subject_id, self.subject_type),
             )
             value = cursor.fetchone()
             if value is None:
-                self._init_quota(subject_id)
+                self._init_quota(conn, subject_id)
                 return self.initial_quota
             return value[0]
 
@@ -86,12 +88,12 @@ class RevokableQuotaLimiter(QuotaLimiter):
         # timestamp to be used
         revoked_at = datetime.now()
 
-        with self.connection.cursor() as cursor:
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             cursor.execute(
                 RevokableQuotaLimiter.SET_AVAILABLE_QUOTA,
                 (self.initial_quota, revoked_at, subject_id, self.subject_type),
             )
-            self.connection.commit()
+            conn.commit()
 
     @connection
     def increase_quota(self, subject_id: str = "") -> None:
@@ -101,12 +103,12 @@ class RevokableQuotaLimiter(QuotaLimiter):
         # timestamp to be used
         updated_at = datetime.now()
 
-        with self.connection.cursor() as cursor:
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             cursor.execute(
                 RevokableQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
                 (self.increase_by, updated_at, subject_id, self.subject_type),
             )
-            self.connection.commit()
+            conn.commit()
 
     def ensure_available_quota(self, subject_id: str = "") -> None:
         """Ensure that there's avaiable quota left."""
@@ -138,7 +140,7 @@ class RevokableQuotaLimiter(QuotaLimiter):
         )
         to_be_consumed = input_tokens + output_tokens
 
-        with self.connection.cursor() as cursor:
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             # timestamp to be used
             updated_at = datetime.now()
 
@@ -146,22 +148,24 @@ class RevokableQuotaLimiter(QuotaLimiter):
                 RevokableQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
                 (-to_be_consumed, updated_at, subject_id, self.subject_type),
             )
-            self.connection.commit()
+            conn.commit()
 
-    def _initialize_tables(self) -> None:
+    def _initialize_tables(self, conn: psycopg2.extensions.connection) -> None:
         """Initialize tables used by quota limiter."""
         logger.info("Initializing tables for quota limiter")
-        cursor = self.connection.cursor()
+        cursor = conn.cursor()
         cursor.execute(RevokableQuotaLimiter.CREATE_QUOTA_TABLE)
         cursor.close()
-        self.connection.commit()
+        conn.commit()
 
-    def _init_quota(self, subject_id: str = "") -> None:
-        """Initialize quota for given ID."""
+    def _init_quota(
+        self, conn: psycopg2.extensions.connection, subject_id: str = ""
+    ) -> None:
+        """Initialize quota for given ID using borrowed connection."""
         # timestamp to be used
         revoked_at = datetime.now()
 
-        with self.connection.cursor() as cursor:
+        with conn.cursor() as cursor:
             cursor.execute(
                 RevokableQuotaLimiter.INIT_QUOTA,
                 (
@@ -172,4 +176,4 @@ class RevokableQuotaLimiter(QuotaLimiter):
                     revoked_at,
                 ),
             )
-            self.connection.commit()
+            conn.commit()
@@ -8,6 +8,7 @@ import psycopg2
 
 from ols.app.models.config import PostgresConfig
 from ols.utils.connection_decorator import connection
+from ols.utils.postgres_pool import PostgresPool, get_pool
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,7 @@ class TokenUsageHistory:
         # store connection configuration, will be used
         # by reconnection logic if needed
         self.connection_config: Optional[PostgresConfig] = config
+        self.pool: Optional[PostgresPool] = None
 
         # initialize connection to DB
         self.connect()
@@ -75,7 +77,7 @@ class TokenUsageHistory:
         # timestamp to be used
         updated_at = datetime.now()
 
-        with self.connection.cursor() as cursor:
+        with self.pool.connection() as conn, conn.cursor() as cursor:
             cursor.execute(
                 TokenUsageHistory.CONSUME_TOKENS_FOR_USER,
                 {
@@ -88,48 +90,36 @@ class TokenUsageHistory:
                 },
             )
 
-    # pylint: disable=W0201
     def connect(self) -> None:
-        """Initialize connection to database."""
-        config = self.connection_config
-        # make sure the connection will have known state
-        self.connection = None
-        self.connection = psycopg2.connect(
-            host=config.host,
-            port=config.port,
-            user=config.user,
-            password=config.password,
-            dbname=config.dbname,
-            sslmode=config.ssl_mode,
-            # sslrootcert=config.ca_cert_path,
-            gssencmode=config.gss_encmode,
-        )
+        """Initialize connection pool and tables in database."""
+        # make sure the pool will have known state
+        self.pool = None
+        pool = get_pool(self.connection_config)
+        conn = pool.getconn()
         try:
-            self._initialize_tables()
+            conn.autocommit = False
+            self._initialize_tables(conn)
         except Exception as e:
-            self.connection.close()
+            pool.putconn(conn, discard=True)
             logger.exception("Error initializing Postgres database:\n%s", e)
             raise
-        self.connection.autocommit = True
+        pool.putconn(conn)
+        self.pool = pool
 
     def connected(self) -> bool:
-        """Check if connection to cache is alive."""
-        if self.connection is None:
+        """Check if connection pool to storage is initialized.
+
+        Connections are not probed, failed operation reconnects instead.
+        """
+        if self.pool is None:
             logger.warning("Not connected, need to reconnect later")
             return False
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-            logger.info("Connection to storage is ok")
-            return True
-        except psycopg2.OperationalError as e:
-            logger.error("Disconnected from storage: %s", e)
-            return False
+        return True
 
-    def _initialize_tables(self) -> None:
+    def _initialize_tables(self, conn: psycopg2.extensions.connection) -> None:
         """Initialize tables used by quota limiter."""
         logger.info("Initializing tables for token usage history")
-        cursor = self.connection.cursor()
+        cursor = conn.cursor()
         cursor.execute(TokenUsageHistory.CREATE_TOKEN_USAGE_TABLE)
         cursor.close()
-        self.connection.commit()
+        conn.commit()
@@ -0,0 +1,203 @@
+"""Lexical (BM25) index used together with the vector index."""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Iterable, Optional
+
+from ols.constants import (
+    BM25_B,
+    BM25_INDEX_FILENAME,
+    BM25_K1,
+    BM25_MIN_QUERY_TERMS_SHARE,
+)
+
+logger = logging.getLogger(__name__)
+
+# identifiers like `--dry-run`, `CrashLoopBackOff`, `ocp-4.15` or `v1/pods`
+# are kept as one token; their parts are emitted as separate tokens as well
+TOKEN_PATTERN = re.compile(r"\w+(?:[-.:/]\w+)*")
+TOKEN_PART_SEPARATOR = re.compile(r"[-.:/]")
+
+# common English words ignored in queries; documents sharing just these
+# words with the query are not related to it
+STOPWORDS = frozenset(
+    (
+        "a about am an and any are as at be been but by can could did do does"
+        " for from had has have how i if in into is it its me my no not of on"
+        " or our should so than that the their them then there these they"
+        " this those to was we were what when where which who why will with"
+        " would you your"
+    ).split()
+)
+
+# docstore of persisted llama-index index
+DOCSTORE_FILENAME = "docstore.json"
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase tokens."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        parts = TOKEN_PART_SEPARATOR.split(token)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+
+def docstore_fingerprint(persist_dir: str, index_id: Optional[str]) -> str:
+    """Identify docstore of persisted index the lexical index is built from.
+
+    Any tool persisting the vector index rewrites its docstore file, so the
+    docstore is identified by the index ID and size and modification time
+    of the file.
+    """
+    try:
+        stat = os.stat(os.path.join(persist_dir, DOCSTORE_FILENAME))
+    except OSError:
+        return str(index_id)
+    return f"{index_id}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class BM25Index:
+    """Inverted index scoring documents by the Okapi BM25 function."""
+
+    def __init__(
+        self,
+        node_ids: list[str],
+        doc_lengths: list[int],
+        postings: dict[str, list[list[int]]],
+        fingerprint: Optional[str] = None,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            node_ids: IDs of indexed nodes; position in the list is document number.
+            doc_lengths: Number of tokens in each document.
+            postings: Term to list of `[document number, term frequency]` pairs.
+            fingerprint: Fingerprint of the docstore the index is built from.
+        """
+        self.fingerprint = fingerprint
+        self._node_ids = node_ids
+        self._doc_lengths = doc_lengths
+        self._postings = postings
+        avg_doc_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+        avg_doc_length = avg_doc_length or 1.0
+        # length normalization is precomputed for each document
+        self._length_norms = [
+            BM25_K1 * (1 - BM25_B + BM25_B * length / avg_doc_length)
+            for length in doc_lengths
+        ]
+        docs_count = len(node_ids)
+        self._idf = {
+            term: math.log(1 + (docs_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in postings.items()
+        }
+        # IDF of a term no document contains
+        self._unknown_term_idf = math.log(1 + (docs_count + 0.5) / 0.5)
+
+    @classmethod
+    def from_texts(
+        cls, texts: Iterable[tuple[str, str]], fingerprint: Optional[str] = None
+    ) -> "BM25Index":
+        """Build the index from `(node ID, text)` pairs."""
+        node_ids = []
+        doc_lengths = []
+        postings: dict[str, list[list[int]]] = {}
+        for doc, (node_id, text) in enumerate(texts):
+            tokens = tokenize(text)
+            node_ids.append(node_id)
+            doc_lengths.append(len(tokens))
+            for term, frequency in Counter(tokens).items():
+                postings.setdefault(term, []).append([doc, frequency])
+        logger.info(
+            "BM25 index built from %d documents, %d terms",
+            len(node_ids),
+            len(postings),
+        )
+        return cls(node_ids, doc_lengths, postings, fingerprint)
+
+    @classmethod
+    def from_docstore(
+        cls, docstore: Any, fingerprint: Optional[str] = None
+    ) -> "BM25Index":
+        """Build the index from nodes stored in llama-index docstore."""
+        return cls.from_texts(
+            ((node_id, node.get_content()) for node_id, node in docstore.docs.items()),
+            fingerprint,
+        )
+
+    @classmethod
+    def from_persist_dir(cls, persist_dir: str) -> "BM25Index":
+        """Load the index persisted in given directory."""
+        with open(
+            os.path.join(persist_dir, BM25_INDEX_FILENAME), encoding="utf-8"
+        ) as fin:
+            data = json.load(fin)
+        return cls(
+            data["node_ids"],
+            data["doc_lengths"],
+            data["postings"],
+            data.get("fingerprint"),
+        )
+
+    @staticmethod
+    def exists(persist_dir: str) -> bool:
+        """Check if the index is persisted in given directory."""
+        return os.path.isfile(os.path.join(persist_dir, BM25_INDEX_FILENAME))
+
+    def persist(self, persist_dir: str) -> None:
+        """Persist the index into given directory."""
+        with open(
+            os.path.join(persist_dir, BM25_INDEX_FILENAME), "w", encoding="utf-8"
+        ) as fout:
+            json.dump(
+                {
+                    "fingerprint": self.fingerprint,
+                    "node_ids": self._node_ids,
+                    "doc_lengths": self._doc_lengths,
+                    "postings": self._postings,
+                },
+                fout,
+                separators=(",", ":"),
+            )
+
+    def retrieve(self, query: str, top_k: int) -> list[tuple[str, float]]:
+        """Retrieve IDs of nodes matching the query.
+
+        Only documents containing at least `BM25_MIN_QUERY_TERMS_SHARE` of
+        the query terms, weighted by their IDF, are relevant. Terms unknown
+        to the index count with the highest IDF, so a query about other
+        topics does not match documents sharing one common word with it.
+
+        Returns:
+            Up to `top_k` pairs of node ID and BM25 score, best match first.
+        """
+        terms = set(tokenize(query)) - STOPWORDS
+        query_weight = sum(
+            self._idf.get(term, self._unknown_term_idf) for term in terms
+        )
+        scores: dict[int, float] = {}
+        matched_weights: dict[int, float] = {}
+        for term in terms:
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc, frequency in self._postings[term]:
+                scores[doc] = scores.get(doc, 0.0) + idf * frequency * (BM25_K1 + 1) / (
+                    frequency + self._length_norms[doc]
+                )
+                matched_weights[doc] = matched_weights.get(doc, 0.0) + idf
+        min_weight = BM25_MIN_QUERY_TERMS_SHARE * query_weight
+        relevant = (
+            (doc, score)
+            for doc, score in scores.items()
+            if matched_weights[doc] >= min_weight
+        )
+        best = heapq.nlargest(top_k, relevant, key=lambda item: item[1])
+        return [(self._node_ids[doc], score) for doc, score in best]
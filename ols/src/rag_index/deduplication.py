@@ -0,0 +1,109 @@
+"""Near-duplicate suppression and diversification of retrieved chunks.
+
+Documentation of several product versions contains many nearly identical
+pages, so retrieval often returns several chunks with almost the same text.
+Such chunks consume context tokens without adding any information.
+"""
+
+import logging
+import re
+from typing import Any, Optional
+
+from ols.app.models.config import DeduplicationConfig
+from ols.constants import (
+    RAG_DEDUPLICATION_SHINGLE_SIZE,
+    RAG_DEDUPLICATION_SIMILARITY_THRESHOLD,
+    RAG_MMR_LAMBDA,
+    RAG_SIMILARITY_CUTOFF,
+)
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = RAG_DEDUPLICATION_SHINGLE_SIZE) -> frozenset[int]:
+    """Get hashes of all sequences of `size` consecutive words of the text."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return frozenset([hash(tuple(words))])
+    return frozenset(
+        hash(tuple(words[i : i + size])) for i in range(len(words) - size + 1)
+    )
+
+
+def jaccard_similarity(first: frozenset[int], second: frozenset[int]) -> float:
+    """Get Jaccard similarity of two sets of shingles."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def deduplicate(
+    retrieved_nodes: list[Any],
+    similarity_threshold: float = RAG_DEDUPLICATION_SIMILARITY_THRESHOLD,
+) -> list[Any]:
+    """Drop nodes too similar to any better ranked node, the order is kept."""
+    kept: list[tuple[Any, frozenset[int]]] = []
+    for node in retrieved_nodes:
+        node_shingles = shingles(node.get_text())
+        if any(
+            jaccard_similarity(node_shingles, kept_shingles) >= similarity_threshold
+            for _, kept_shingles in kept
+        ):
+            continue
+        kept.append((node, node_shingles))
+    return [node for node, _ in kept]
+
+
+def maximal_marginal_relevance(
+    retrieved_nodes: list[Any], mmr_lambda: float = RAG_MMR_LAMBDA
+) -> list[Any]:
+    """Reorder nodes by maximal marginal relevance.
+
+    Nodes are selected greedily; each time the node with the best balance
+    of its retrieval score and dissimilarity to already selected nodes
+    is selected.
+    """
+    candidates = [
+        (node, node.get_score(raise_error=False), shingles(node.get_text()))
+        for node in retrieved_nodes
+    ]
+    # maximal similarity of each candidate to already selected nodes
+    redundancy = [0.0] * len(candidates)
+    selected: list[int] = []
+    while len(selected) < len(candidates):
+        best = max(
+            (i for i in range(len(candidates)) if i not in selected),
+            key=lambda i: mmr_lambda * candidates[i][1]
+            - (1 - mmr_lambda) * redundancy[i],
+        )
+        selected.append(best)
+        for i, candidate in enumerate(candidates):
+            redundancy[i] = max(
+                redundancy[i], jaccard_similarity(candidate[2], candidates[best][2])
+            )
+    return [candidates[i][0] for i in selected]
+
+
+def diversify(
+    retrieved_nodes: list[Any], deduplication_config: Optional[DeduplicationConfig]
+) -> list[Any]:
+    """Drop near-duplicate nodes and apply MMR, if configured."""
+    if deduplication_config is None:
+        return retrieved_nodes
+    # nodes under cutoff are not used as RAG context; they must not get
+    # in front of the relevant ones by MMR
+    relevant_nodes = [
+        node
+        for node in retrieved_nodes
+        if node.get_score(raise_error=False) >= RAG_SIMILARITY_CUTOFF
+    ]
+    nodes = deduplicate(relevant_nodes, deduplication_config.similarity_threshold)
+    if len(nodes) < len(relevant_nodes):
+        logger.debug(
+            "%d near-duplicate chunk(s) dropped", len(relevant_nodes) - len(nodes)
+        )
+    if deduplication_config.mmr:
+        nodes = maximal_marginal_relevance(nodes, deduplication_config.mmr_lambda)
+    return nodes
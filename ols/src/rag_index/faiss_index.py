@@ -0,0 +1,130 @@
+"""Helpers for approximate-nearest-neighbour FAISS indexes."""
+
+import logging
+import math
+from typing import Any, Optional
+
+from ols.app.models.config import FaissConfig
+from ols.constants import FaissIndexType
+
+logger = logging.getLogger(__name__)
+
+# FAISS needs at least this number of training points per IVF inverted list
+IVF_MIN_POINTS_PER_LIST = 39
+
+
+def _unwrap(index: Any) -> Any:
+    """Return the innermost index of ID map / pre-transform wrappers."""
+    # pylint: disable=C0415
+    import faiss
+
+    index = faiss.downcast_index(index)
+    while isinstance(index, (faiss.IndexIDMap, faiss.IndexPreTransform)):
+        index = faiss.downcast_index(index.index)
+    return index
+
+
+def get_index_type(index: Any) -> Optional[FaissIndexType]:
+    """Detect type of FAISS index, None is returned for unsupported types."""
+    # pylint: disable=C0415
+    import faiss
+
+    if faiss.try_extract_index_ivf(index) is not None:
+        return FaissIndexType.IVF
+    inner_index = _unwrap(index)
+    if isinstance(inner_index, faiss.IndexHNSW):
+        return FaissIndexType.HNSW
+    if isinstance(inner_index, faiss.IndexFlat):
+        return FaissIndexType.FLAT
+    return None
+
+
+def set_search_parameters(index: Any, faiss_config: FaissConfig) -> None:
+    """Set search parameters of IVF or HNSW index according to configuration."""
+    # pylint: disable=C0415
+    import faiss
+
+    index_type = get_index_type(index)
+    if faiss_config.index_type is not None and faiss_config.index_type != index_type:
+        logger.warning(
+            "FAISS index type is configured as %s, but the persisted index is %s",
+            faiss_config.index_type,
+            index_type,
+        )
+    if index_type == FaissIndexType.IVF:
+        faiss.extract_index_ivf(index).nprobe = faiss_config.nprobe
+        logger.info("FAISS IVF index nprobe set to %d", faiss_config.nprobe)
+    elif index_type == FaissIndexType.HNSW:
+        _unwrap(index).hnsw.efSearch = faiss_config.ef_search
+        logger.info("FAISS HNSW index efSearch set to %d", faiss_config.ef_search)
+
+
+def build_index(
+    vectors: Any,
+    index_type: FaissIndexType,
+    metric_type: int,
+    nlist: Optional[int] = None,
+    hnsw_m: int = 32,
+    ef_construction: int = 200,
+) -> Any:
+    """Build FAISS index of given type containing given vectors.
+
+    Vectors are added in the given order, so their positions (IDs used
+    by llama-index FAISS vector store) are kept.
+
+    Args:
+        vectors: Two-dimensional float32 numpy array.
+        index_type: Type of index to build.
+        metric_type: FAISS metric type, for example `faiss.METRIC_INNER_PRODUCT`.
+        nlist: Number of IVF inverted lists; derived from number of vectors
+            when not set.
+        hnsw_m: Number of neighbours of each HNSW graph node.
+        ef_construction: Size of dynamic candidate list used by HNSW build.
+
+    Returns:
+        Built FAISS index.
+    """
+    # pylint: disable=C0415
+    import faiss
+
+    count, dimension = vectors.shape
+    index: faiss.Index
+    match index_type:
+        case FaissIndexType.FLAT:
+            index = faiss.IndexFlat(dimension, metric_type)
+        case FaissIndexType.IVF:
+            if nlist is None:
+                nlist = min(int(4 * math.sqrt(count)), count // IVF_MIN_POINTS_PER_LIST)
+            nlist = max(nlist, 1)
+            quantizer = faiss.IndexFlat(dimension, metric_type)
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, metric_type)
+            logger.info("Training IVF index with %d lists", nlist)
+            index.train(vectors)
+        case FaissIndexType.HNSW:
+            hnsw_index = faiss.IndexHNSWFlat(dimension, hnsw_m, metric_type)
+            hnsw_index.hnsw.efConstruction = ef_construction
+            index = hnsw_index
+        case _:
+            raise ValueError(f"Unsupported FAISS index type {index_type}")
+    index.add(vectors)
+    return index
+
+
+def get_vectors(index: Any) -> Any:
+    """Get all vectors stored in FAISS index, ordered by their positions."""
+    # pylint: disable=C0415
+    import faiss
+
+    ivf_index = faiss.try_extract_index_ivf(index)
+    if ivf_index is not None:
+        # IVF index needs mapping from positions to inverted lists
+        ivf_index.make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def convert_index(index: Any, index_type: FaissIndexType, **kwargs: Any) -> Any:
+    """Convert (flat) FAISS index to index of given type.
+
+    Keyword arguments are passed to `build_index`.
+    """
+    return build_index(get_vectors(index), index_type, index.metric_type, **kwargs)
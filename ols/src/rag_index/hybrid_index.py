@@ -0,0 +1,156 @@
+"""Vector index combined with lexical (BM25) index."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from ols.constants import RAG_RRF_K, RAG_SIMILARITY_CUTOFF
+from ols.src.rag_index.bm25_index import BM25Index
+
+logger = logging.getLogger(__name__)
+
+
+class HybridIndex:
+    """Vector index combined with lexical (BM25) index.
+
+    Both indexes are queried in parallel and results are fused by
+    reciprocal rank fusion. The object mimics the part of llama-index
+    index interface used by the docs summarizer.
+    """
+
+    def __init__(
+        self,
+        vector_index: Any,
+        lexical_index: BM25Index,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        """Initialize the hybrid index.
+
+        Args:
+            vector_index: Loaded llama-index vector index.
+            lexical_index: Lexical index built from the vector index docstore.
+            executor: Executor used to run lexical search in parallel.
+        """
+        self._vector_index = vector_index
+        self._lexical_index = lexical_index
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="lexical_retrieval"
+        )
+
+    @property
+    def docstore(self) -> Any:
+        """Docstore of the vector index."""
+        return self._vector_index.docstore
+
+    def as_retriever(self, similarity_top_k: int, **kwargs: Any) -> "HybridRetriever":
+        """Return retriever querying both indexes."""
+        return HybridRetriever(self, similarity_top_k, **kwargs)
+
+    def retrieve(self, query: Any, similarity_top_k: int, **kwargs: Any) -> list[Any]:
+        """Retrieve nodes from both indexes and fuse the results."""
+        query_str = query if isinstance(query, str) else query.query_str
+        lexical_future = self._executor.submit(
+            self._lexical_index.retrieve, query_str, similarity_top_k
+        )
+        vector_nodes = self._vector_index.as_retriever(
+            similarity_top_k=similarity_top_k, **kwargs
+        ).retrieve(query)
+        lexical_results = lexical_future.result()
+        return reciprocal_rank_fusion(
+            vector_nodes,
+            self._get_lexical_nodes(lexical_results),
+            similarity_top_k,
+        )
+
+    def _get_lexical_nodes(self, lexical_results: list[tuple[str, float]]) -> list:
+        """Get nodes for IDs returned by lexical search."""
+        # pylint: disable=C0415
+        from llama_index.core.schema import NodeWithScore
+
+        nodes = []
+        for node_id, score in lexical_results:
+            node = self.docstore.get_node(node_id, raise_error=False)
+            if node is None:
+                logger.warning("Node %s not found in docstore", node_id)
+                continue
+            nodes.append(NodeWithScore(node=node, score=score))
+        return nodes
+
+
+class HybridRetriever:
+    """Retriever for hybrid index."""
+
+    def __init__(
+        self, hybrid_index: HybridIndex, similarity_top_k: int, **kwargs: Any
+    ) -> None:
+        """Initialize the retriever."""
+        self._hybrid_index = hybrid_index
+        self._similarity_top_k = similarity_top_k
+        self._kwargs = kwargs
+
+    def retrieve(self, query: Any) -> list[Any]:
+        """Retrieve nodes for given query."""
+        return self._hybrid_index.retrieve(
+            query, self._similarity_top_k, **self._kwargs
+        )
+
+
+def reciprocal_rank_fusion(
+    vector_nodes: list[Any], lexical_nodes: list[Any], top_k: int
+) -> list[Any]:
+    """Fuse vector and lexical search results by their ranks.
+
+    Each node gets `1 / (RAG_RRF_K + rank)` for every result list it
+    appears in; vector search results under the similarity cutoff are
+    dropped before fusion. Lexical (BM25) scores are not comparable to
+    similarity scores that are used for cutoff later, so fused scores are
+    mapped to the similarity range: every fused node passed the relevance
+    check of one of the searches (similarity cutoff, or the share of query
+    terms checked by `BM25Index.retrieve`), so it gets at least the cutoff,
+    and the best fused node gets the best vector score. Nodes found by
+    lexical search only, for example for error codes or CLI flags, are
+    kept then.
+
+    Args:
+        vector_nodes: Nodes retrieved by vector search, best match first.
+        lexical_nodes: Nodes retrieved by lexical search, best match first.
+        top_k: Maximum number of nodes to return.
+
+    Returns:
+        Fused nodes in descending order of their scores.
+    """
+    if not lexical_nodes:
+        return vector_nodes[:top_k]
+
+    # irrelevant vector search results must not be promoted by fusion
+    vector_nodes = [
+        node
+        for node in vector_nodes
+        if node.get_score(raise_error=False) >= RAG_SIMILARITY_CUTOFF
+    ]
+    fused_scores: dict[str, float] = {}
+    nodes: dict[str, Any] = {}
+    for results in (vector_nodes, lexical_nodes):
+        for rank, node in enumerate(results, start=1):
+            fused_scores[node.node_id] = fused_scores.get(node.node_id, 0.0) + 1 / (
+                RAG_RRF_K + rank
+            )
+            # prefer node with similarity score from vector search
+            nodes.setdefault(node.node_id, node)
+
+    # there may be no relevant vector search result for pure keyword query
+    best_score = max(
+        (node.get_score(raise_error=False) for node in vector_nodes),
+        default=RAG_SIMILARITY_CUTOFF,
+    )
+    best_score = max(best_score, RAG_SIMILARITY_CUTOFF)
+    best_fused_score = max(fused_scores.values())
+    fused = sorted(fused_scores, key=fused_scores.__getitem__, reverse=True)[:top_k]
+    for node_id in fused:
+        nodes[node_id].score = RAG_SIMILARITY_CUTOFF + (
+            fused_scores[node_id] / best_fused_score
+        ) * (best_score - RAG_SIMILARITY_CUTOFF)
+    logger.debug(
+        "Fused %d vector and %d lexical nodes", len(vector_nodes), len(lexical_nodes)
+    )
+    return [nodes[node_id] for node_id in fused]
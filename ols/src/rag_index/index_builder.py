@@ -0,0 +1,330 @@
+"""Offline builder of FAISS vector store that can be loaded by `IndexLoader`.
+
+Documentation files are split into chunks, which are embedded in batches
+by a pool of worker processes. Content hashes of files and chunks are
+stored in a manifest next to the index files, so rebuild of the index
+reuses embeddings of unchanged chunks and embeds just the changed ones.
+
+NOTE: this module imports llama_index, so it needs to be imported lazily.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import faiss
+import numpy as np
+from llama_index.core import StorageContext
+from llama_index.core.data_structs.data_structs import IndexDict
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import BaseNode, Document, MetadataMode
+from llama_index.core.storage.docstore import SimpleDocumentStore
+from llama_index.core.storage.index_store import SimpleIndexStore
+from llama_index.vector_stores.faiss import FaissVectorStore
+
+from ols.constants import (
+    BM25_INDEX_FILENAME,
+    INDEX_BUILD_MANIFEST_FILENAME,
+    SQLITE_DOCSTORE_FILENAME,
+    TOKEN_COUNTS_METADATA_KEY,
+    FaissIndexType,
+)
+from ols.src.rag_index.faiss_index import build_index, get_vectors
+from ols.utils.token_handler import TokenHandler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 380
+DEFAULT_CHUNK_OVERLAP = 0
+DEFAULT_EMBED_BATCH_SIZE = 32
+DOCS_FILE_SUFFIXES = (".md", ".adoc", ".txt")
+
+# name of file with FAISS index in llama-index persist directory
+VECTOR_STORE_FILENAME = "default__vector_store.json"
+# files derived from the index by `IndexLoader`, stale after rebuild
+DERIVED_FILENAMES = (BM25_INDEX_FILENAME, SQLITE_DOCSTORE_FILENAME)
+# metadata that is not part of embedded text or text passed to LLM
+EXCLUDED_METADATA_KEYS = ["docs_url", TOKEN_COUNTS_METADATA_KEY]
+
+# embedding model of worker process
+_worker_embed_model: Any = None
+
+
+def _init_worker(embed_model_factory: Callable[[], Any]) -> None:
+    """Load embedding model in worker process."""
+    global _worker_embed_model  # pylint: disable=global-statement
+    _worker_embed_model = embed_model_factory()
+
+
+def _embed_batch(texts: list[str]) -> list[list[float]]:
+    """Embed batch of texts in worker process."""
+    return _worker_embed_model.get_text_embedding_batch(texts)
+
+
+def _hash(text: str) -> str:
+    """Get content hash of text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _get_title(content: str, relative_path: str) -> str:
+    """Get title of document from its first heading, file name is the fallback."""
+    for line in content.splitlines():
+        if line.startswith(("# ", "= ")):
+            return line[2:].strip()
+    return Path(relative_path).stem
+
+
+@dataclass
+class BuildStats:
+    """Statistics of index build."""
+
+    files: int = 0
+    changed_files: int = 0
+    chunks: int = 0
+    embedded_chunks: int = 0
+
+
+class IndexBuilder:
+    """Build FAISS vector store from documentation files."""
+
+    def __init__(
+        self,
+        embed_model_factory: Callable[[], Any],
+        embed_model_name: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        workers: int = 1,
+        batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+        docs_url_base: str = "",
+        index_type: FaissIndexType = FaissIndexType.FLAT,
+    ) -> None:
+        """Initialize builder.
+
+        Args:
+            embed_model_factory: Picklable callable returning llama-index
+                embedding model; it is called in every worker process.
+            embed_model_name: Name of the embedding model, stored in manifest.
+            chunk_size: Chunk size in tokens.
+            chunk_overlap: Chunk overlap in tokens.
+            workers: Number of embedding processes, the model is run in the
+                current process when it is not greater than one.
+            batch_size: Number of chunks embedded at once.
+            docs_url_base: URL prepended to file path to get `docs_url`.
+            index_type: Type of FAISS index to build.
+        """
+        self._embed_model_factory = embed_model_factory
+        self._workers = workers
+        self._batch_size = batch_size
+        self._index_type = index_type
+        self._splitter = SentenceSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+        self._token_handler = TokenHandler()
+        # embeddings can be reused only when these settings don't change
+        self._settings = {
+            "embed_model": embed_model_name,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "docs_url_base": docs_url_base,
+        }
+
+    def _load_previous_build(
+        self, output_dir: str
+    ) -> tuple[dict[str, Any], Any, dict[str, Any]]:
+        """Load manifest, docstore and node vectors of previous build.
+
+        Returns:
+            Files from manifest, docstore and vectors by node ID.
+        """
+        manifest_path = os.path.join(output_dir, INDEX_BUILD_MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            return {}, None, {}
+        with open(manifest_path, encoding="utf-8") as fin:
+            manifest = json.load(fin)
+        if manifest["settings"] != self._settings:
+            logger.info("Build settings changed, all chunks will be embedded")
+            return {}, None, {}
+
+        docstore = SimpleDocumentStore.from_persist_dir(output_dir)
+        index_struct = SimpleIndexStore.from_persist_dir(output_dir).get_index_struct(
+            manifest["index_id"]
+        )
+        vectors = get_vectors(
+            faiss.read_index(os.path.join(output_dir, VECTOR_STORE_FILENAME))
+        )
+        node_vectors = {
+            node_id: vectors[int(position)]
+            for position, node_id in index_struct.nodes_dict.items()
+        }
+        return manifest["files"], docstore, node_vectors
+
+    def _split_file(self, relative_path: str, content: str) -> list[BaseNode]:
+        """Split documentation file into chunks."""
+        docs_url_base = self._settings["docs_url_base"]
+        document = Document(
+            text=content,
+            id_=relative_path,
+            metadata={
+                "docs_url": f"{docs_url_base}{relative_path}",
+                "title": _get_title(content, relative_path),
+            },
+            excluded_embed_metadata_keys=EXCLUDED_METADATA_KEYS,
+            excluded_llm_metadata_keys=EXCLUDED_METADATA_KEYS,
+        )
+        nodes = self._splitter.get_nodes_from_documents([document])
+        for node in nodes:
+            node.metadata[TOKEN_COUNTS_METADATA_KEY] = (
+                self._token_handler.count_rag_context_tokens(node.get_content())
+            )
+        return nodes
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in batches, using pool of processes when configured."""
+        batches = [
+            texts[i : i + self._batch_size]
+            for i in range(0, len(texts), self._batch_size)
+        ]
+        if not batches:
+            return []
+        if self._workers <= 1:
+            embed_model = self._embed_model_factory()
+            results = [embed_model.get_text_embedding_batch(batch) for batch in batches]
+        else:
+            # model libraries are not fork-safe, so worker processes are spawned
+            with ProcessPoolExecutor(
+                max_workers=min(self._workers, len(batches)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._embed_model_factory,),
+            ) as executor:
+                results = list(executor.map(_embed_batch, batches))
+        return [vector for batch in results for vector in batch]
+
+    def build(self, docs_dir: str, output_dir: str, index_id: str) -> BuildStats:
+        """Build index from documentation files, reusing the previous build.
+
+        Args:
+            docs_dir: Directory with documentation files.
+            output_dir: Directory where the index is stored; previous build
+                stored in it is used for incremental rebuild.
+            index_id: ID of the index.
+
+        Returns:
+            Statistics of the build.
+        """
+        previous_files, previous_docstore, previous_vectors = self._load_previous_build(
+            output_dir
+        )
+        previous_chunks = {
+            chunk_hash: node_id
+            for file in previous_files.values()
+            for node_id, chunk_hash in file["chunks"]
+        }
+
+        stats = BuildStats()
+        files: dict[str, Any] = {}
+        nodes: list[BaseNode] = []
+        vectors: list[Optional[Any]] = []
+        for path in sorted(Path(docs_dir).rglob("*")):
+            if not path.is_file() or path.suffix not in DOCS_FILE_SUFFIXES:
+                continue
+            relative_path = path.relative_to(docs_dir).as_posix()
+            content = path.read_text(encoding="utf-8")
+            file_hash = _hash(content)
+            stats.files += 1
+
+            previous_file = previous_files.get(relative_path)
+            if previous_file is not None and previous_file["hash"] == file_hash:
+                file_nodes = previous_docstore.get_nodes(
+                    [node_id for node_id, _ in previous_file["chunks"]]
+                )
+                chunk_hashes = [chunk_hash for _, chunk_hash in previous_file["chunks"]]
+            else:
+                stats.changed_files += 1
+                file_nodes = self._split_file(relative_path, content)
+                chunk_hashes = [
+                    _hash(node.get_content(metadata_mode=MetadataMode.EMBED))
+                    for node in file_nodes
+                ]
+
+            # chunks with the same content are not embedded again, even when
+            # the file containing them has changed
+            vectors.extend(
+                previous_vectors.get(previous_chunks.get(chunk_hash))
+                for chunk_hash in chunk_hashes
+            )
+            nodes.extend(file_nodes)
+            files[relative_path] = {
+                "hash": file_hash,
+                "chunks": [
+                    [node.node_id, chunk_hash]
+                    for node, chunk_hash in zip(file_nodes, chunk_hashes)
+                ],
+            }
+        if not nodes:
+            raise ValueError(f"No documentation files found in {docs_dir}")
+
+        pending = [
+            position for position, vector in enumerate(vectors) if vector is None
+        ]
+        logger.info("Embedding %d of %d chunks", len(pending), len(nodes))
+        embeddings = self._embed(
+            [
+                nodes[position].get_content(metadata_mode=MetadataMode.EMBED)
+                for position in pending
+            ]
+        )
+        for position, embedding in zip(pending, embeddings):
+            vectors[position] = embedding
+        stats.chunks = len(nodes)
+        stats.embedded_chunks = len(pending)
+
+        self._persist(nodes, vectors, output_dir, index_id)
+        with open(
+            os.path.join(output_dir, INDEX_BUILD_MANIFEST_FILENAME),
+            "w",
+            encoding="utf-8",
+        ) as fout:
+            json.dump(
+                {"index_id": index_id, "settings": self._settings, "files": files},
+                fout,
+            )
+        return stats
+
+    def _persist(
+        self,
+        nodes: list[BaseNode],
+        vectors: list[Any],
+        output_dir: str,
+        index_id: str,
+    ) -> None:
+        """Persist nodes and their vectors as llama-index FAISS vector store."""
+        faiss_index = build_index(
+            np.array(vectors, dtype=np.float32),
+            self._index_type,
+            faiss.METRIC_INNER_PRODUCT,
+        )
+        docstore = SimpleDocumentStore()
+        docstore.add_documents(nodes, allow_update=True)
+        # FAISS vector store identifies vectors by their positions
+        index_struct = IndexDict(index_id=index_id)
+        for position, node in enumerate(nodes):
+            index_struct.add_node(node, text_id=str(position))
+        index_store = SimpleIndexStore()
+        index_store.add_index_struct(index_struct)
+
+        StorageContext.from_defaults(
+            docstore=docstore,
+            index_store=index_store,
+            vector_store=FaissVectorStore(faiss_index=faiss_index),
+        ).persist(persist_dir=output_dir)
+        for filename in DERIVED_FILENAMES:
+            path = os.path.join(output_dir, filename)
+            if os.path.exists(path):
+                os.remove(path)
@@ -1,14 +1,75 @@
 # type: ignore  # noqa: PGH003
 """Module for loading index."""
 
+import copy
 import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Any, Optional
 
-from ols.app.models.config import ReferenceContent
-from ols.constants import VectorStoreType
+from ols.app.models.config import (
+    FaissConfig,
+    PGVectorConfig,
+    ReferenceContent,
+    ReferenceContentIndex,
+)
+from ols.constants import DocstoreType, VectorStoreType
+from ols.src.rag_index.bm25_index import BM25Index, docstore_fingerprint
+from ols.src.rag_index.faiss_index import set_search_parameters
+from ols.src.rag_index.hybrid_index import HybridIndex
+from ols.src.rag_index.index_router import IndexRouter
+from ols.src.rag_index.multi_index import MultiIndex
+from ols.src.rag_index.pgvector_index import (
+    create_engines,
+    ensure_ann_index,
+    get_table_name,
+)
 
 logger = logging.getLogger(__name__)
 
+# Durations (in seconds) of index load phases, exposed by readiness endpoint.
+# Phases of individual indexes are stored under "indexes" key.
+index_load_durations: dict[str, Any] = {}
+_index_load_durations_lock = threading.Lock()
+
+
+def get_index_load_durations() -> dict[str, Any]:
+    """Get copy of durations of index load phases finished so far."""
+    with _index_load_durations_lock:
+        return copy.deepcopy(index_load_durations)
+
+
+@contextmanager
+def timed_phase(phase: str, index_name: Optional[str] = None) -> Iterator[None]:
+    """Measure duration of index load phase, store it and expose it as metric."""
+    # pylint: disable=C0415
+    from ols.app.metrics import index_load_duration_seconds
+
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        duration = time.monotonic() - start
+        with _index_load_durations_lock:
+            if index_name is None:
+                index_load_durations[phase] = round(duration, 3)
+            else:
+                index_durations = index_load_durations.setdefault("indexes", {})
+                index_durations.setdefault(index_name, {})[phase] = round(duration, 3)
+        index_load_duration_seconds.labels(phase=phase, index=index_name or "").set(
+            duration
+        )
+        logger.info(
+            "Index load phase %s%s took %.3fs",
+            phase,
+            f" of index {index_name}" if index_name else "",
+            duration,
+        )
+
 
 # NOTE: Loading/importing something from llama_index bumps memory
 # consumption up to ~400MiB. To avoid loading llama_index in all cases,
@@ -60,12 +121,10 @@ class IndexLoader:
         if self._index_config is None:
             logger.warning("Config for reference content is not set.")
         else:
-            self._index_path = self._index_config.product_docs_index_path
-            self._index_id = self._index_config.product_docs_index_id
+            self._indexes_config = self._index_config.get_indexes()
 
             self._embed_model_path = self._index_config.embeddings_model_path
-            self._embed_model = self._get_embed_model()
-            self._load_index()
+            self._load_indexes()
 
     def _get_embed_model(self) -> Any:
         """Get embed model according to configuration."""
@@ -82,64 +141,213 @@ class IndexLoader:
         logger.warning("Embedding model is set to default")
         return "local:sentence-transformers/all-mpnet-base-v2"
 
-    def _set_context(self) -> None:
-        """Set storage/service context required for index load."""
+    def _set_settings(self) -> None:
+        """Set global settings required for index load."""
         logger.debug("Using %s as embedding model for index", str(self._embed_model))
         logger.info("Setting up settings for index load...")
         Settings.embed_model = self._embed_model
         Settings.llm = resolve_llm(None)
-        logger.info("Setting up storage context for index load...")
-        # pylint: disable=W0201
+
+    def _load_embed_model(self) -> None:
+        """Load embedding model and set it in global settings."""
+        with timed_phase("embedding_model"):
+            self._embed_model = self._get_embed_model()
+            self._set_settings()
+
+    def _get_storage_context(self, index_config: ReferenceContentIndex) -> Any:
+        """Get storage context required for index load."""
+        logger.info("Setting up storage context for index %s...", index_config.name)
         if self._vector_store_type == VectorStoreType.FAISS:
-            self._vector_store = FaissVectorStore.from_persist_dir(self._index_path)
-            self._storage_context = StorageContext.from_defaults(
-                vector_store=self._vector_store,
-                persist_dir=self._index_path,
-            )
-        elif self._vector_store_type == VectorStoreType.POSTGRES:
-            postgres = self._index_config.postgres
-            user = postgres.user
-            password = postgres.password
-            host = postgres.host
-            port = postgres.port
-            dbname = postgres.dbname
-            table_name = self._index_id.replace("-", "_")
-            embed_dim = Settings.embed_model._model.get_sentence_embedding_dimension()
-
-            self._vector_store = PGVectorStore.from_params(
-                database=dbname,
-                host=host,
-                password=password,
-                port=port,
-                user=user,
+            index_path = index_config.product_docs_index_path
+            with timed_phase("vector_store", index_config.name):
+                vector_store = FaissVectorStore.from_persist_dir(index_path)
+                # approximate indexes (IVF, HNSW) need their search parameters set
+                set_search_parameters(
+                    vector_store.client, self._index_config.faiss or FaissConfig()
+                )
+            with timed_phase("docstore", index_config.name):
+                return StorageContext.from_defaults(
+                    docstore=self._load_docstore(index_path),
+                    vector_store=vector_store,
+                    persist_dir=index_path,
+                )
+        # Postgres vector store; there is one table per index
+        table_name = index_config.product_docs_index_id.replace("-", "_")
+        embed_dim = Settings.embed_model._model.get_sentence_embedding_dimension()
+        engine, async_engine = self._pg_engines
+        with timed_phase("vector_store", index_config.name):
+            try:
+                ensure_ann_index(
+                    engine,
+                    get_table_name(index_config.product_docs_index_id),
+                    self._pgvector_config,
+                )
+            except Exception as err:
+                logger.error("Unable to check/create ANN index: %s", err)
+
+            vector_store = PGVectorStore(
                 table_name=table_name,
                 embed_dim=embed_dim,
+                engine=engine,
+                async_engine=async_engine,
             )
-            self._storage_context = StorageContext.from_defaults(
-                vector_store=self._vector_store,
+        return StorageContext.from_defaults(vector_store=vector_store)
+
+    def _load_docstore(self, index_path: str) -> Any:
+        """Load SQLite docstore when configured, None means default JSON docstore."""
+        docstore_config = self._index_config.docstore
+        if docstore_config is None or docstore_config.type == DocstoreType.JSON:
+            return None
+        # pylint: disable=C0415
+        from ols.src.rag_index.sqlite_docstore import load_docstore
+
+        try:
+            return load_docstore(str(index_path), docstore_config.cache_size)
+        except (OSError, sqlite3.Error) as err:
+            logger.warning(
+                "SQLite docstore can not be created, using JSON docstore: %s", err
             )
+            return None
+
+    def _load_index(
+        self,
+        index_config: ReferenceContentIndex,
+        storage_context: Optional[Future] = None,
+    ) -> Any:
+        """Load one vector index, return None when index can not be loaded.
 
-    def _load_index(self) -> None:
-        """Load vector index."""
+        Storage context of FAISS index is read in advance, the future
+        with the storage context is passed in then.
+        """
         if self._vector_store_type == VectorStoreType.FAISS:
-            if self._index_path is None:
+            if index_config.product_docs_index_path is None:
                 logger.warning("Index path is not set.")
-            else:
-                try:
-                    self._set_context()
-                    logger.info("Loading vector index...")
-                    self._index = load_index_from_storage(
-                        storage_context=self._storage_context,
-                        index_id=self._index_id,
+                return None
+            try:
+                if storage_context is None:
+                    context = self._get_storage_context(index_config)
+                else:
+                    context = storage_context.result()
+                logger.info("Loading vector index %s...", index_config.name)
+                with timed_phase("index", index_config.name):
+                    index = load_index_from_storage(
+                        storage_context=context,
+                        index_id=index_config.product_docs_index_id,
                     )
-                    logger.info("Vector index is loaded.")
-                except Exception as err:
-                    logger.exception("Error loading vector index:", exc_info=err)
-        elif self._vector_store_type == VectorStoreType.POSTGRES:
-            self._set_context()
-            self._index = VectorStoreIndex.from_vector_store(
-                vector_store=self._vector_store,
+                logger.info("Vector index %s is loaded.", index_config.name)
+                if self._index_config.hybrid_retrieval:
+                    with timed_phase("lexical_index", index_config.name):
+                        return self._add_lexical_index(index, index_config)
+                return index
+            except Exception as err:
+                logger.exception("Error loading vector index:", exc_info=err)
+                return None
+        context = self._get_storage_context(index_config)
+        with timed_phase("index", index_config.name):
+            return VectorStoreIndex.from_vector_store(
+                vector_store=context.vector_store,
+            )
+
+    def _add_lexical_index(
+        self, index: Any, index_config: ReferenceContentIndex
+    ) -> HybridIndex:
+        """Combine vector index with lexical index stored next to it.
+
+        Lexical index is built from the docstore when it is not persisted
+        yet, or when it was built from another docstore (the vector index
+        was rebuilt since); it is persisted then, so the build is done just
+        once.
+        """
+        index_path = str(index_config.product_docs_index_path)
+        fingerprint = docstore_fingerprint(
+            index_path, index_config.product_docs_index_id
+        )
+        lexical_index = None
+        if BM25Index.exists(index_path):
+            lexical_index = BM25Index.from_persist_dir(index_path)
+            if lexical_index.fingerprint != fingerprint:
+                logger.info("Lexical index %s is outdated", index_config.name)
+                lexical_index = None
+        if lexical_index is None:
+            logger.info("Building lexical index %s...", index_config.name)
+            lexical_index = BM25Index.from_docstore(index.docstore, fingerprint)
+            try:
+                lexical_index.persist(index_path)
+            except OSError as err:
+                logger.warning("Lexical index can not be persisted: %s", err)
+        logger.info("Lexical index %s is loaded.", index_config.name)
+        return HybridIndex(index, lexical_index)
+
+    def _load_indexes(self) -> None:
+        """Load embedding model and all configured vector indexes concurrently.
+
+        Embedding model load, FAISS index read and docstore deserialization
+        don't depend on each other, so they run in parallel.
+        """
+        if not self._indexes_config:
+            self._embed_model = self._get_embed_model()
+            logger.warning("Index path is not set.")
+            return
+
+        with _index_load_durations_lock:
+            index_load_durations.clear()
+        with (
+            timed_phase("total"),
+            ThreadPoolExecutor(
+                max_workers=len(self._indexes_config) + 1,
+                thread_name_prefix="index_loader",
+            ) as executor,
+        ):
+            embed_model_loaded = executor.submit(self._load_embed_model)
+            storage_contexts = {}
+            if self._vector_store_type == VectorStoreType.FAISS:
+                storage_contexts = {
+                    index.name: executor.submit(self._get_storage_context, index)
+                    for index in self._indexes_config
+                    if index.product_docs_index_path is not None
+                }
+            try:
+                embed_model_loaded.result()
+            except Exception as err:
+                # errors from FAISS index load are not fatal, postgres ones are
+                if self._vector_store_type != VectorStoreType.FAISS:
+                    raise
+                logger.exception("Error loading vector index:", exc_info=err)
+                return
+
+            if self._vector_store_type == VectorStoreType.POSTGRES:
+                # connection pool is shared by all indexes
+                self._pgvector_config = self._index_config.pgvector or PGVectorConfig()
+                self._pg_engines = create_engines(
+                    self._index_config.postgres, self._pgvector_config
+                )
+
+            loaded = dict(
+                zip(
+                    [index.name for index in self._indexes_config],
+                    executor.map(
+                        lambda index: self._load_index(
+                            index, storage_contexts.get(index.name)
+                        ),
+                        self._indexes_config,
+                    ),
+                )
             )
+        indexes = {name: index for name, index in loaded.items() if index is not None}
+        if not indexes:
+            return
+
+        if len(self._indexes_config) == 1:
+            # just one index is configured, no need to route queries
+            self._index = next(iter(indexes.values()))
+            return
+
+        router = IndexRouter(
+            self._index_config.index_routing,
+            [index for index in self._indexes_config if index.name in indexes],
+            Settings.embed_model,
+        )
+        self._index = MultiIndex(indexes, router)
 
     @property
     def vector_index(self) -> Optional[ReferenceContent]:
@@ -0,0 +1,117 @@
+"""Selection of indexes that are queried for given question."""
+
+import logging
+import threading
+from typing import Any, Optional
+
+import numpy as np
+
+from ols.app.models.config import ReferenceContentIndex
+from ols.constants import RAG_INDEX_ROUTING_SIMILARITY_CUTOFF, IndexRoutingMethod
+
+logger = logging.getLogger(__name__)
+
+
+class IndexRouter:
+    """Select indexes to be queried for given question.
+
+    Indexes without routing hints (keywords for keyword routing, description
+    for embedding routing) are always selected. When no index is selected,
+    all indexes are used for keyword routing and the most similar index is
+    used for embedding routing.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        indexes: list[ReferenceContentIndex],
+        embed_model: Any = None,
+    ) -> None:
+        """Initialize the router."""
+        self._method = method
+        # names are set for all indexes once the configuration is validated
+        self._indexes = {
+            index.name: index for index in indexes if index.name is not None
+        }
+        self._embed_model = embed_model
+        # description embeddings are computed lazily on first routing
+        self._description_embeddings: Optional[dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def route(self, query: str) -> tuple[list[str], Optional[list[float]]]:
+        """Select indexes for the query.
+
+        Args:
+            query: The question asked by user.
+
+        Returns:
+            Names of selected indexes and query embedding, when it was
+            computed by router (it can be reused for retrieval then).
+        """
+        match self._method:
+            case IndexRoutingMethod.KEYWORD:
+                selected = self._route_by_keywords(query)
+                embedding = None
+            case IndexRoutingMethod.EMBEDDING:
+                selected, embedding = self._route_by_embedding(query)
+            case _:
+                selected = list(self._indexes)
+                embedding = None
+        logger.debug("Indexes selected for query: %s", selected)
+        return selected, embedding
+
+    def _route_by_keywords(self, query: str) -> list[str]:
+        """Select indexes with keywords found in the query."""
+        query = query.lower()
+        selected = [
+            name
+            for name, index in self._indexes.items()
+            if not index.keywords or any(keyword in query for keyword in index.keywords)
+        ]
+        return selected or list(self._indexes)
+
+    def _route_by_embedding(self, query: str) -> tuple[list[str], list[float]]:
+        """Select indexes with description similar to the query."""
+        description_embeddings = self._get_description_embeddings()
+        query_embedding = self._embed_model.get_query_embedding(query)
+        query_vector = _normalize(np.asarray(query_embedding))
+
+        similarities = {
+            name: float(np.dot(query_vector, description_embedding))
+            for name, description_embedding in description_embeddings.items()
+        }
+        selected = [
+            name
+            for name in self._indexes
+            if name not in similarities
+            or similarities[name] >= RAG_INDEX_ROUTING_SIMILARITY_CUTOFF
+        ]
+        if not selected:
+            selected = [max(similarities, key=similarities.__getitem__)]
+        return selected, query_embedding
+
+    def _get_description_embeddings(self) -> dict[str, Any]:
+        """Compute (once) normalized embeddings of index descriptions."""
+        with self._lock:
+            if self._description_embeddings is None:
+                described = {
+                    name: index.description
+                    for name, index in self._indexes.items()
+                    if index.description
+                }
+                embeddings = (
+                    self._embed_model.get_text_embedding_batch(list(described.values()))
+                    if described
+                    else []
+                )
+                self._description_embeddings = {
+                    name: _normalize(np.asarray(embedding))
+                    for name, embedding in zip(described, embeddings)
+                }
+            return self._description_embeddings
+
+
+def _normalize(vector: Any) -> Any:
+    """Normalize vector to unit length, so dot product is cosine similarity."""
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
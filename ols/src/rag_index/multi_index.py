@@ -0,0 +1,137 @@
+"""Set of vector indexes that are queried together."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from ols.constants import RAG_SIMILARITY_CUTOFF
+from ols.src.rag_index.index_router import IndexRouter
+
+logger = logging.getLogger(__name__)
+
+
+class MultiIndex:
+    """Set of vector indexes that are queried together.
+
+    The object mimics the part of llama-index index interface used by
+    the docs summarizer, so it can be used instead of a single index.
+    """
+
+    def __init__(
+        self,
+        indexes: dict[str, Any],
+        router: Optional[IndexRouter] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        """Initialize the set of indexes.
+
+        Args:
+            indexes: Loaded indexes, keyed by index name.
+            router: Router selecting indexes for given query. All indexes
+                are queried when router is not set.
+            executor: Executor used to query indexes in parallel.
+        """
+        self._indexes = indexes
+        self._router = router
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=len(indexes), thread_name_prefix="rag_retrieval"
+        )
+
+    @property
+    def names(self) -> list[str]:
+        """Names of all indexes in the set."""
+        return list(self._indexes)
+
+    def select(self, names: list[str]) -> "MultiIndex":
+        """Return set consisting of selected indexes only, without routing.
+
+        Raises:
+            ValueError: When any of selected indexes is not known.
+        """
+        unknown = [name for name in names if name not in self._indexes]
+        if unknown:
+            raise ValueError(
+                f"Unknown index(es) {unknown}, available indexes are {self.names}"
+            )
+        return MultiIndex(
+            {name: self._indexes[name] for name in names}, executor=self._executor
+        )
+
+    def as_retriever(
+        self, similarity_top_k: int, **kwargs: Any
+    ) -> "MultiIndexRetriever":
+        """Return retriever querying all selected indexes."""
+        return MultiIndexRetriever(self, similarity_top_k, **kwargs)
+
+    def retrieve(self, query: str, similarity_top_k: int, **kwargs: Any) -> list[Any]:
+        """Retrieve nodes from indexes selected for the query."""
+        names, embedding = (
+            self._router.route(query) if self._router else (self.names, None)
+        )
+
+        query_bundle: Any = query
+        if embedding is not None:
+            # pylint: disable=C0415
+            from llama_index.core.schema import QueryBundle
+
+            # reuse the embedding computed by router
+            query_bundle = QueryBundle(query_str=query, embedding=embedding)
+
+        retrievers = [
+            self._indexes[name].as_retriever(
+                similarity_top_k=similarity_top_k, **kwargs
+            )
+            for name in names
+        ]
+        results = list(
+            self._executor.map(
+                lambda retriever: retriever.retrieve(query_bundle), retrievers
+            )
+        )
+        return merge_retrieved_nodes(results, similarity_top_k)
+
+
+class MultiIndexRetriever:
+    """Retriever for set of indexes."""
+
+    def __init__(
+        self, multi_index: MultiIndex, similarity_top_k: int, **kwargs: Any
+    ) -> None:
+        """Initialize the retriever."""
+        self._multi_index = multi_index
+        self._similarity_top_k = similarity_top_k
+        self._kwargs = kwargs
+
+    def retrieve(self, query: str) -> list[Any]:
+        """Retrieve nodes for given query."""
+        return self._multi_index.retrieve(query, self._similarity_top_k, **self._kwargs)
+
+
+def merge_retrieved_nodes(results: list[list[Any]], top_k: int) -> list[Any]:
+    """Merge nodes retrieved from several indexes.
+
+    All indexes are embedded by the same model, so similarity scores of
+    nodes from different indexes are comparable and the nodes are merged
+    by their scores as they are. Nodes under the similarity cutoff are
+    dropped, so an index without relevant nodes contributes nothing.
+
+    Args:
+        results: Nodes retrieved from individual indexes, in descending
+            order of scores.
+        top_k: Maximum number of nodes to return.
+
+    Returns:
+        Nodes from all indexes in descending order of scores.
+    """
+    if len(results) == 1:
+        return results[0][:top_k]
+
+    merged = [
+        node
+        for nodes in results
+        for node in nodes
+        if node.get_score(raise_error=False) >= RAG_SIMILARITY_CUTOFF
+    ]
+    merged.sort(key=lambda node: node.get_score(), reverse=True)
+    logger.debug("Merged %d nodes from %d indexes", len(merged), len(results))
+    return merged[:top_k]
@@ -0,0 +1,159 @@
+"""Connection pooling and ANN index management for pgvector store."""
+
+import logging
+from typing import Any, Optional
+
+from ols.app.models.config import PGVectorConfig, PostgresConfig
+from ols.constants import PGVectorIndexType
+
+logger = logging.getLogger(__name__)
+
+# llama-index PGVectorStore prefixes table names and queries by cosine distance
+TABLE_NAME_PREFIX = "data_"
+DISTANCE_OPERATOR_CLASS = "vector_cosine_ops"
+
+FIND_ANN_INDEX_STATEMENT = """
+    SELECT indexname, indexdef
+      FROM pg_indexes
+     WHERE schemaname = :schema_name
+       AND tablename = :table_name
+"""
+
+
+def get_table_name(index_id: str) -> str:
+    """Get name of table used by PGVectorStore for given index ID."""
+    return (TABLE_NAME_PREFIX + index_id.replace("-", "_")).lower()
+
+
+def _search_settings(pgvector_config: PGVectorConfig) -> dict[str, str]:
+    """Get session settings with ANN index search parameters."""
+    return {
+        "hnsw.ef_search": str(pgvector_config.ef_search),
+        "ivfflat.probes": str(pgvector_config.ivfflat_probes),
+    }
+
+
+def create_engines(
+    postgres_config: PostgresConfig, pgvector_config: PGVectorConfig
+) -> tuple[Any, Any]:
+    """Create pooled sync (psycopg2) and async (asyncpg) SQLAlchemy engines.
+
+    Search parameters of ANN indexes are set for each pooled connection,
+    so they don't need to be set by every query.
+
+    Returns:
+        Sync engine and async engine.
+    """
+    # pylint: disable=C0415
+    from sqlalchemy import URL, create_engine
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = URL.create(
+        "postgresql+psycopg2",
+        username=postgres_config.user,
+        password=postgres_config.password,
+        host=postgres_config.host,
+        port=postgres_config.port,
+        database=postgres_config.dbname,
+    )
+    pool_kwargs = {
+        "pool_size": pgvector_config.pool_size,
+        "max_overflow": pgvector_config.max_overflow,
+        "pool_timeout": pgvector_config.pool_timeout,
+        "pool_pre_ping": True,
+    }
+    search_settings = _search_settings(pgvector_config)
+
+    engine = create_engine(
+        url,
+        connect_args={
+            "sslmode": postgres_config.ssl_mode,
+            "options": " ".join(
+                f"-c {name}={value}" for name, value in search_settings.items()
+            ),
+        },
+        **pool_kwargs,
+    )
+    async_engine = create_async_engine(
+        url.set(drivername="postgresql+asyncpg"),
+        connect_args={
+            "ssl": postgres_config.ssl_mode,
+            "server_settings": search_settings,
+        },
+        **pool_kwargs,
+    )
+    return engine, async_engine
+
+
+def find_ann_index(
+    connection: Any, table_name: str, schema_name: str = "public"
+) -> Optional[PGVectorIndexType]:
+    """Find type of ANN index on the embedding column of given table."""
+    # pylint: disable=C0415
+    from sqlalchemy import text
+
+    rows = connection.execute(
+        text(FIND_ANN_INDEX_STATEMENT),
+        {"schema_name": schema_name, "table_name": table_name},
+    ).fetchall()
+    for index_name, index_definition in rows:
+        definition = index_definition.lower()
+        if "(embedding" not in definition:
+            continue
+        for index_type in PGVectorIndexType:
+            if f"using {index_type}" in definition:
+                logger.debug("Found %s index %s", index_type, index_name)
+                return index_type
+    return None
+
+
+def ensure_ann_index(
+    engine: Any,
+    table_name: str,
+    pgvector_config: PGVectorConfig,
+    schema_name: str = "public",
+) -> Optional[PGVectorIndexType]:
+    """Check for ANN index on the embedding column, create it when missing.
+
+    Without ANN index every query leads to sequential scan of the table.
+    The index is created concurrently, so the table is not locked for other
+    service replicas.
+
+    Returns:
+        Type of existing (or created) ANN index, None when there is none.
+    """
+    # pylint: disable=C0415
+    from sqlalchemy import text
+
+    # CREATE INDEX CONCURRENTLY can not run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        index_type = find_ann_index(conn, table_name, schema_name)
+        if index_type is not None:
+            logger.info("Table %s has %s index", table_name, index_type)
+            return index_type
+        if not pgvector_config.create_index:
+            logger.warning(
+                "Table %s has no ANN index, queries will use sequential scans",
+                table_name,
+            )
+            return None
+
+        index_type = pgvector_config.index_type
+        if index_type == PGVectorIndexType.HNSW:
+            parameters = (
+                f"m = {pgvector_config.hnsw_m}, "
+                f"ef_construction = {pgvector_config.hnsw_ef_construction}"
+            )
+        else:
+            parameters = f"lists = {pgvector_config.ivfflat_lists}"
+        logger.info("Creating %s index on table %s...", index_type, table_name)
+        conn.execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table_name}_embedding_idx "
+                f"ON {schema_name}.{table_name} "
+                f"USING {index_type} (embedding {DISTANCE_OPERATOR_CLASS}) "
+                f"WITH ({parameters})"
+            )
+        )
+        logger.info("Index on table %s is created", table_name)
+        return index_type
@@ -0,0 +1,266 @@
+"""Client of retrieval sidecar, index served by another local process.
+
+The sidecar process loads llama_index, the embedding model and indexes
+once; API workers just send queries over a Unix socket and get retrieved
+nodes back, so they don't need to import llama_index at all.
+
+Messages are framed by 4-byte big-endian length. A request consists of
+operation code, top_k, number of selected index names, and length-prefixed
+UTF-8 strings: the query followed by the index names. A response consists
+of status, number of nodes and, for each node, its score followed by
+length-prefixed node ID, text and metadata (compact JSON). Error response
+contains length-prefixed error message instead.
+"""
+
+import json
+import logging
+import socket
+import struct
+from typing import Any, Optional
+
+from ols.app.models.config import RetrievalSidecarConfig
+
+logger = logging.getLogger(__name__)
+
+OP_RETRIEVE = 1
+OP_PING = 2
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# upper bound of accepted frame, protects against reading garbage as length
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+_LENGTH = struct.Struct("!I")
+_REQUEST_HEADER = struct.Struct("!BHH")
+_RESPONSE_HEADER = struct.Struct("!BH")
+_SCORE = struct.Struct("!d")
+
+
+class RetrievalProtocolError(Exception):
+    """Malformed message or error reported by the other side."""
+
+
+def _pack_str(value: str) -> bytes:
+    """Pack string prefixed by its length."""
+    data = value.encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+
+class _Reader:
+    """Sequential reader of message fields."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize the reader."""
+        self._data = memoryview(data)
+        self._offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple[Any, ...]:
+        """Read fixed-size fields."""
+        try:
+            values = fmt.unpack_from(self._data, self._offset)
+        except struct.error as e:
+            raise RetrievalProtocolError("Truncated message") from e
+        self._offset += fmt.size
+        return values
+
+    def read_str(self) -> str:
+        """Read length-prefixed string."""
+        (length,) = self.unpack(_LENGTH)
+        if self._offset + length > len(self._data):
+            raise RetrievalProtocolError("Truncated message")
+        value = bytes(self._data[self._offset : self._offset + length])
+        self._offset += length
+        return value.decode("utf-8")
+
+
+def send_frame(sock: socket.socket, payload: bytes) -> None:
+    """Send message prefixed by its length."""
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Receive given number of bytes."""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by the other side")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def recv_frame(sock: socket.socket) -> bytes:
+    """Receive message prefixed by its length."""
+    (length,) = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+    if length > MAX_FRAME_SIZE:
+        raise RetrievalProtocolError(f"Frame of {length} bytes is too large")
+    return _recv_exactly(sock, length)
+
+
+def encode_request(
+    op: int, query: str = "", top_k: int = 0, names: Optional[list[str]] = None
+) -> bytes:
+    """Encode request to the sidecar."""
+    names = names or []
+    return (
+        _REQUEST_HEADER.pack(op, top_k, len(names))
+        + _pack_str(query)
+        + b"".join(_pack_str(name) for name in names)
+    )
+
+
+def decode_request(payload: bytes) -> tuple[int, str, int, list[str]]:
+    """Decode request to the sidecar.
+
+    Returns:
+        Operation code, query, top_k and names of selected indexes.
+    """
+    reader = _Reader(payload)
+    op, top_k, names_count = reader.unpack(_REQUEST_HEADER)
+    query = reader.read_str()
+    names = [reader.read_str() for _ in range(names_count)]
+    return op, query, top_k, names
+
+
+def encode_nodes(nodes: list[Any]) -> bytes:
+    """Encode retrieved nodes as successful response."""
+    parts = [_RESPONSE_HEADER.pack(STATUS_OK, len(nodes))]
+    for node in nodes:
+        parts.append(_SCORE.pack(node.get_score(raise_error=False)))
+        parts.append(_pack_str(node.node_id))
+        parts.append(_pack_str(node.get_text()))
+        parts.append(_pack_str(json.dumps(node.metadata, separators=(",", ":"))))
+    return b"".join(parts)
+
+
+def encode_error(message: str) -> bytes:
+    """Encode error response."""
+    return _RESPONSE_HEADER.pack(STATUS_ERROR, 0) + _pack_str(message)
+
+
+def decode_nodes(payload: bytes) -> list["RemoteNode"]:
+    """Decode response with retrieved nodes.
+
+    Raises:
+        RetrievalProtocolError: When the sidecar reported an error.
+    """
+    reader = _Reader(payload)
+    status, count = reader.unpack(_RESPONSE_HEADER)
+    if status != STATUS_OK:
+        raise RetrievalProtocolError(f"Retrieval failed: {reader.read_str()}")
+    nodes = []
+    for _ in range(count):
+        (score,) = reader.unpack(_SCORE)
+        node_id = reader.read_str()
+        text = reader.read_str()
+        metadata = json.loads(reader.read_str())
+        nodes.append(RemoteNode(node_id, text, score, metadata))
+    return nodes
+
+
+class RemoteNode:
+    """Node retrieved by the sidecar.
+
+    The object mimics the part of llama-index `NodeWithScore` interface
+    used to build RAG context.
+    """
+
+    def __init__(
+        self, node_id: str, text: str, score: float, metadata: dict[str, Any]
+    ) -> None:
+        """Initialize the node."""
+        self.node_id = node_id
+        self.score = score
+        self.metadata = metadata
+        self._text = text
+
+    def get_text(self) -> str:
+        """Get text of the node."""
+        return self._text
+
+    def get_score(self, raise_error: bool = False) -> float:
+        """Get score of the node."""
+        return self.score
+
+
+class RemoteIndex:
+    """Index served by retrieval sidecar.
+
+    The object mimics the part of llama-index index interface used by
+    the docs summarizer, and index selection of `MultiIndex`.
+    """
+
+    def __init__(
+        self,
+        sidecar_config: RetrievalSidecarConfig,
+        names: list[str],
+        selected: Optional[list[str]] = None,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            sidecar_config: Configuration of the sidecar.
+            names: Names of all indexes served by the sidecar.
+            selected: Names of indexes to query, all indexes when not set.
+        """
+        self._config = sidecar_config
+        self._names = names
+        self._selected = selected
+
+    @property
+    def names(self) -> list[str]:
+        """Names of all indexes served by the sidecar."""
+        return list(self._names)
+
+    def select(self, names: list[str]) -> "RemoteIndex":
+        """Return index querying selected indexes only.
+
+        Raises:
+            ValueError: When any of selected indexes is not known.
+        """
+        unknown = [name for name in names if name not in self._names]
+        if unknown:
+            raise ValueError(
+                f"Unknown index(es) {unknown}, available indexes are {self._names}"
+            )
+        return RemoteIndex(self._config, self._names, names)
+
+    def _request(self, payload: bytes) -> bytes:
+        """Send request to the sidecar and return its response."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self._config.timeout)
+            sock.connect(self._config.socket_path)
+            send_frame(sock, payload)
+            return recv_frame(sock)
+
+    def is_ready(self) -> bool:
+        """Check if the sidecar has loaded indexes and accepts requests."""
+        try:
+            decode_nodes(self._request(encode_request(OP_PING)))
+        except (OSError, RetrievalProtocolError) as e:
+            logger.debug("Retrieval sidecar is not ready: %s", e)
+            return False
+        return True
+
+    def retrieve(self, query: str, top_k: int) -> list[RemoteNode]:
+        """Retrieve nodes for given query from the sidecar."""
+        return decode_nodes(
+            self._request(encode_request(OP_RETRIEVE, query, top_k, self._selected))
+        )
+
+    def as_retriever(self, similarity_top_k: int, **kwargs: Any) -> "RemoteRetriever":
+        """Return retriever of the index."""
+        return RemoteRetriever(self, similarity_top_k)
+
+
+class RemoteRetriever:
+    """Retriever for index served by the sidecar."""
+
+    def __init__(self, remote_index: RemoteIndex, similarity_top_k: int) -> None:
+        """Initialize the retriever."""
+        self._remote_index = remote_index
+        self._similarity_top_k = similarity_top_k
+
+    def retrieve(self, query: str) -> list[RemoteNode]:
+        """Retrieve nodes for given query."""
+        return self._remote_index.retrieve(query, self._similarity_top_k)
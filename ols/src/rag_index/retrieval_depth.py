@@ -0,0 +1,87 @@
+"""Number of retrieved chunks driven by the available token budget.
+
+Models with small context window can use just a few chunks, so retrieving
+more of them is wasted work; models with large context window can use
+more chunks than the fixed limit. The number of chunks is therefore sized
+from the tokens available for RAG context and the estimated number of
+tokens of one chunk; when budget is left after the retrieved chunks are
+used, more chunks are retrieved.
+"""
+
+import math
+import threading
+from typing import Any, Optional
+
+from ols.app.models.config import RetrievalDepthConfig
+from ols.constants import RAG_CHUNK_TOKENS_ESTIMATE, RAG_SIMILARITY_CUTOFF
+
+
+class ChunkTokensEstimate:
+    """Running estimate of number of tokens of one RAG chunk."""
+
+    def __init__(
+        self, initial: float = RAG_CHUNK_TOKENS_ESTIMATE, smoothing: float = 0.1
+    ) -> None:
+        """Initialize the estimate.
+
+        Args:
+            initial: Estimate used before any chunk is observed.
+            smoothing: Weight of the newly observed chunks.
+        """
+        self._value = initial
+        self._smoothing = smoothing
+        self._lock = threading.Lock()
+
+    def get(self) -> float:
+        """Get the estimated number of tokens of one chunk."""
+        return self._value
+
+    def update(self, tokens: int, chunks: int) -> None:
+        """Update the estimate by tokens used by given number of chunks."""
+        if chunks <= 0:
+            return
+        with self._lock:
+            self._value += self._smoothing * (tokens / chunks - self._value)
+
+
+# estimate shared by all requests
+chunk_tokens_estimate = ChunkTokensEstimate()
+
+
+def get_top_k(
+    retrieval_depth_config: RetrievalDepthConfig,
+    available_tokens: int,
+    estimate: ChunkTokensEstimate,
+) -> int:
+    """Get number of chunks expected to fill the available tokens."""
+    top_k = math.ceil(available_tokens / max(estimate.get(), 1))
+    return max(
+        retrieval_depth_config.min_top_k,
+        min(retrieval_depth_config.max_top_k, top_k),
+    )
+
+
+def get_next_top_k(
+    retrieval_depth_config: RetrievalDepthConfig,
+    top_k: int,
+    retrieved_nodes: list[Any],
+    remaining_tokens: int,
+    estimate: ChunkTokensEstimate,
+) -> Optional[int]:
+    """Get number of chunks to retrieve next, None when retrieval is finished.
+
+    Retrieval is finished when the upper bound is reached, index has no
+    more chunks, the worst retrieved chunk is under the similarity cutoff
+    (so the next ones would be too), or the remaining budget is too small
+    for another chunk.
+    """
+    if top_k >= retrieval_depth_config.max_top_k or len(retrieved_nodes) < top_k:
+        return None
+    if retrieved_nodes[-1].get_score(raise_error=False) < RAG_SIMILARITY_CUTOFF:
+        return None
+    if remaining_tokens < estimate.get():
+        return None
+    return min(
+        retrieval_depth_config.max_top_k,
+        top_k + math.ceil(remaining_tokens / max(estimate.get(), 1)),
+    )
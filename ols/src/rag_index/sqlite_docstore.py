@@ -0,0 +1,205 @@
+"""Docstore reading nodes on demand from SQLite database.
+
+llama-index stores docstore of persisted index as one JSON file that is
+deserialized into memory as a whole. Only the retrieved nodes are needed
+to answer a query, so the docstore can be converted into SQLite database
+stored next to the JSON file and the nodes can be read when retrieved.
+
+NOTE: this module imports llama_index, so it needs to be imported lazily.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from llama_index.core.storage.docstore.keyval_docstore import KVDocumentStore
+from llama_index.core.storage.docstore.types import DEFAULT_PERSIST_FNAME
+from llama_index.core.storage.kvstore.types import DEFAULT_COLLECTION, BaseKVStore
+
+from ols.constants import SQLITE_DOCSTORE_CACHE_SIZE, SQLITE_DOCSTORE_FILENAME
+
+logger = logging.getLogger(__name__)
+
+CREATE_TABLE_STATEMENT = """
+    CREATE TABLE kvstore (
+        collection TEXT NOT NULL,
+        key        TEXT NOT NULL,
+        value      TEXT NOT NULL,
+        PRIMARY KEY (collection, key)
+    ) WITHOUT ROWID
+"""
+
+INSERT_STATEMENT = "INSERT INTO kvstore (collection, key, value) VALUES (?, ?, ?)"
+
+SELECT_STATEMENT = "SELECT value FROM kvstore WHERE collection = ? AND key = ?"
+
+SELECT_ALL_STATEMENT = "SELECT key, value FROM kvstore WHERE collection = ?"
+
+# identifies JSON docstore the database was converted from
+CREATE_SOURCE_TABLE_STATEMENT = "CREATE TABLE source (signature TEXT NOT NULL)"
+
+INSERT_SOURCE_STATEMENT = "INSERT INTO source (signature) VALUES (?)"
+
+SELECT_SOURCE_STATEMENT = "SELECT signature FROM source"
+
+
+class SQLiteKVStore(BaseKVStore):
+    """Read-only key-value store backed by SQLite database.
+
+    Values are read on demand; recently read values are kept in LRU cache.
+    """
+
+    def __init__(
+        self, db_path: str, cache_size: int = SQLITE_DOCSTORE_CACHE_SIZE
+    ) -> None:
+        """Open the database in read-only mode."""
+        self._connection = sqlite3.connect(
+            f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        # connection is shared by request threads
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[tuple[str, str], Optional[str]] = OrderedDict()
+        self._cache_size = cache_size
+
+    def get(self, key: str, collection: str = DEFAULT_COLLECTION) -> Optional[dict]:
+        """Get value for given key."""
+        cache_key = (collection, key)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                value = self._cache[cache_key]
+            else:
+                row = self._connection.execute(
+                    SELECT_STATEMENT, (collection, key)
+                ).fetchone()
+                value = None if row is None else row[0]
+                self._cache[cache_key] = value
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        # every caller gets its own copy of the value
+        return None if value is None else json.loads(value)
+
+    async def aget(
+        self, key: str, collection: str = DEFAULT_COLLECTION
+    ) -> Optional[dict]:
+        """Get value for given key."""
+        return self.get(key, collection)
+
+    def get_all(self, collection: str = DEFAULT_COLLECTION) -> dict[str, dict]:
+        """Get all values in collection, bypassing the cache."""
+        with self._lock:
+            rows = self._connection.execute(
+                SELECT_ALL_STATEMENT, (collection,)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    async def aget_all(self, collection: str = DEFAULT_COLLECTION) -> dict[str, dict]:
+        """Get all values in collection, bypassing the cache."""
+        return self.get_all(collection)
+
+    def put(self, key: str, val: dict, collection: str = DEFAULT_COLLECTION) -> None:
+        """Store is read-only."""
+        raise NotImplementedError("SQLite docstore is read-only")
+
+    async def aput(
+        self, key: str, val: dict, collection: str = DEFAULT_COLLECTION
+    ) -> None:
+        """Store is read-only."""
+        raise NotImplementedError("SQLite docstore is read-only")
+
+    def delete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        """Store is read-only."""
+        raise NotImplementedError("SQLite docstore is read-only")
+
+    async def adelete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        """Store is read-only."""
+        raise NotImplementedError("SQLite docstore is read-only")
+
+
+def _source_signature(persist_dir: str) -> Optional[str]:
+    """Identify JSON docstore by its size and modification time."""
+    try:
+        stat = os.stat(os.path.join(persist_dir, DEFAULT_PERSIST_FNAME))
+    except OSError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def exists(persist_dir: str) -> bool:
+    """Check if SQLite docstore converted from the current JSON docstore exists.
+
+    The database converted from another JSON docstore (the index was
+    rebuilt since) is outdated; the database is used as is when there is
+    no JSON docstore.
+    """
+    db_path = os.path.join(persist_dir, SQLITE_DOCSTORE_FILENAME)
+    if not os.path.exists(db_path):
+        return False
+    signature = _source_signature(persist_dir)
+    if signature is None:
+        return True
+    try:
+        connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = connection.execute(SELECT_SOURCE_STATEMENT).fetchone()
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        # database written by older version
+        return False
+    return row is not None and row[0] == signature
+
+
+def convert_docstore(persist_dir: str) -> None:
+    """Convert JSON docstore in given directory into SQLite database.
+
+    The database is written into temporary file that is renamed once
+    complete, so partially written database is never used.
+    """
+    # taken before reading, so a docstore written meanwhile is converted again
+    signature = _source_signature(persist_dir)
+    with open(
+        os.path.join(persist_dir, DEFAULT_PERSIST_FNAME), encoding="utf-8"
+    ) as fin:
+        data = json.load(fin)
+
+    fd, tmp_path = tempfile.mkstemp(dir=persist_dir, suffix=".tmp")
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(tmp_path)
+        try:
+            with connection:
+                connection.execute(CREATE_TABLE_STATEMENT)
+                connection.execute(CREATE_SOURCE_TABLE_STATEMENT)
+                connection.execute(INSERT_SOURCE_STATEMENT, (signature,))
+                for collection, values in data.items():
+                    connection.executemany(
+                        INSERT_STATEMENT,
+                        (
+                            (collection, key, json.dumps(value))
+                            for key, value in values.items()
+                        ),
+                    )
+        finally:
+            connection.close()
+        os.replace(tmp_path, os.path.join(persist_dir, SQLITE_DOCSTORE_FILENAME))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_docstore(
+    persist_dir: str, cache_size: int = SQLITE_DOCSTORE_CACHE_SIZE
+) -> KVDocumentStore:
+    """Load SQLite docstore from given directory, convert JSON docstore first if needed."""
+    if not exists(persist_dir):
+        logger.info("Converting docstore in %s to SQLite database...", persist_dir)
+        convert_docstore(persist_dir)
+    return KVDocumentStore(
+        SQLiteKVStore(os.path.join(persist_dir, SQLITE_DOCSTORE_FILENAME), cache_size)
+    )
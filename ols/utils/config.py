@@ -16,6 +16,7 @@ from ols.src.quota.token_usage_history import TokenUsageHistory
 # as the index_loader.py is excluded from type checks, it confuses
 # mypy a bit, hence the [attr-defined] bellow
 from ols.src.rag_index.index_loader import IndexLoader  # type: ignore [attr-defined]
+from ols.src.rag_index.remote_index import RemoteIndex
 from ols.utils.redactor import Redactor
 
 # NOTE: Loading/importing something from llama_index bumps memory
@@ -114,9 +115,22 @@ class AppConfig:
         """Return the RAG index."""
         # TODO: OLS-380 Config object mirrors configuration
         if self._rag_index is None:
-            self._rag_index = IndexLoader(
-                self.ols_config.reference_content
-            ).vector_index
+            reference_content = self.ols_config.reference_content
+            if (
+                reference_content is not None
+                and reference_content.retrieval_sidecar is not None
+            ):
+                # indexes are loaded by the sidecar process
+                self._rag_index = RemoteIndex(
+                    reference_content.retrieval_sidecar,
+                    [
+                        index.name
+                        for index in reference_content.get_indexes()
+                        if index.name is not None
+                    ],
+                )
+            else:
+                self._rag_index = IndexLoader(reference_content).vector_index
         return self._rag_index
 
     def reload_empty(self) -> None:
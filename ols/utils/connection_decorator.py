@@ -1,11 +1,70 @@
 """Decocator that makes sure the object is 'connected' according to it's connected predicate."""
 
+import functools
+import logging
+import time
 from typing import Any, Callable
 
+import psycopg2
+
+from ols.constants import (
+    POSTGRES_RECONNECT_ATTEMPTS,
+    POSTGRES_RECONNECT_BACKOFF,
+    POSTGRES_RECONNECT_BACKOFF_MAX,
+)
+
+logger = logging.getLogger(__name__)
+
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+class UnconfirmedWriteError(Exception):
+    """Connection failed after a write was sent, so it might be done already.
+
+    Operation failing with this error is not retried after reconnect, as
+    the write could be done twice.
+    """
+
+
+def is_connection_error(e: BaseException) -> bool:
+    """Check if exception, or the exception it was raised from, is connection failure."""
+    return isinstance(e, CONNECTION_ERRORS) or isinstance(
+        e.__cause__, CONNECTION_ERRORS
+    )
+
+
+def reconnect(connectable: Any) -> None:
+    """Connect again, waiting between attempts with exponential backoff.
+
+    Raises:
+        The error of the last attempt when all attempts failed.
+    """
+    delay = POSTGRES_RECONNECT_BACKOFF
+    for attempt in range(1, POSTGRES_RECONNECT_ATTEMPTS + 1):
+        try:
+            connectable.connect()
+            return
+        except CONNECTION_ERRORS as e:
+            if attempt == POSTGRES_RECONNECT_ATTEMPTS:
+                raise
+            logger.warning(
+                "Reconnection attempt %d failed, retrying in %.1fs: %s",
+                attempt,
+                delay,
+                e,
+            )
+            time.sleep(delay)
+            delay = min(delay * 2, POSTGRES_RECONNECT_BACKOFF_MAX)
+
 
 def connection(f: Callable) -> Callable:
     """Decocator that makes sure the object is 'connected' according to it's connected predicate.
 
+    The decorated method is executed optimistically, without checking that
+    the connection is alive first. When it fails on connection error, the
+    object is reconnected and the method is retried once, unless the error
+    is `UnconfirmedWriteError`.
+
     Example:
     ```python
     @connection
@@ -14,9 +73,17 @@ def connection(f: Callable) -> Callable:
     ```
     """
 
+    @functools.wraps(f)
     def wrapper(connectable: Any, *args: Any, **kwargs: Any) -> Callable:
         if not connectable.connected():
             connectable.connect()
+        try:
+            return f(connectable, *args, **kwargs)
+        except Exception as e:
+            if not is_connection_error(e) or isinstance(e, UnconfirmedWriteError):
+                raise
+            logger.warning("Storage connection failed, reconnecting: %s", e)
+        reconnect(connectable)
         return f(connectable, *args, **kwargs)
 
     return wrapper
@@ -0,0 +1,313 @@
+"""Connection pool shared by all Postgres-backed components.
+
+Conversation cache, quota limiters and token usage history used to open
+one connection each and share it by all threads of the service, so
+concurrent requests were serialized on the connection. Components now
+borrow a connection from a pool for each operation. Components configured
+with the same connection parameters share one pool, so the number of
+connections to the database is bounded by the pool size.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+from ols.app.models.config import PostgresConfig
+from ols.utils.connection_decorator import is_connection_error
+from ols.utils.storage_metrics import (
+    postgres_pool_connections,
+    postgres_pool_saturation,
+    postgres_pool_timeouts_total,
+    postgres_pool_wait_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(psycopg2.Error):
+    """No connection became free in time.
+
+    It is not a connection error, so saturated pool is not reconnected and
+    the operation is not retried, which would wait for the pool again.
+    """
+
+
+class PostgresPool:
+    """Bounded pool of Postgres connections.
+
+    Connections are in autocommit mode when borrowed; a component that
+    needs a transaction switches autocommit off and the pool restores it
+    when the connection is returned. Connections are not checked when
+    borrowed; connections idle for a long time are checked by background
+    keep-alive instead, so they are not closed by the server or firewalls.
+    """
+
+    def __init__(self, config: PostgresConfig) -> None:
+        """Initialize the pool and open its minimal number of connections."""
+        self.config = config
+        self.name = f"{config.host}:{config.port}/{config.dbname}"
+        self._min_size = config.pool.min_size
+        self._max_size = config.pool.max_size
+        self._timeout = config.pool.timeout
+        self._max_lifetime = config.pool.max_lifetime
+        self._keepalive_interval = config.pool.keepalive_interval
+        # free connections with their creation and return time,
+        # the most recently returned last
+        self._idle: list[tuple[Any, float, float]] = []
+        self._created: dict[int, float] = {}
+        self._slots = threading.BoundedSemaphore(self._max_size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        for _ in range(self._min_size):
+            now = time.monotonic()
+            self._idle.append((self._connect(), now, now))
+        self._update_metrics()
+        self._stopped = threading.Event()
+        if self._keepalive_interval > 0:
+            threading.Thread(
+                target=self._keepalive, name="postgres-pool-keepalive", daemon=True
+            ).start()
+
+    @property
+    def size(self) -> int:
+        """Number of open connections."""
+        return self._in_use + len(self._idle)
+
+    @property
+    def in_use(self) -> int:
+        """Number of borrowed connections."""
+        return self._in_use
+
+    def _connect(self) -> Any:
+        """Open a new connection to the database."""
+        config = self.config
+        logger.info("Opening connection to Postgres %s", self.name)
+        conn = psycopg2.connect(
+            host=config.host,
+            port=config.port,
+            user=config.user,
+            password=config.password,
+            dbname=config.dbname,
+            sslmode=config.ssl_mode,
+            sslrootcert=config.ca_cert_path,
+            gssencmode=config.gss_encmode,
+        )
+        conn.autocommit = True
+        return conn
+
+    def _expired(self, created: float) -> bool:
+        """Check if connection reached its maximal lifetime."""
+        return time.monotonic() - created > self._max_lifetime
+
+    def getconn(self) -> Any:
+        """Borrow a connection, opening a new one when no idle one is usable.
+
+        Raises:
+            PoolTimeoutError: When all connections are in use for longer
+                than the pool timeout.
+        """
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self._timeout):
+            postgres_pool_timeouts_total.labels(self.name).inc()
+            raise PoolTimeoutError(
+                f"No connection of pool {self.name} became free "
+                f"in {self._timeout} seconds"
+            )
+        postgres_pool_wait_seconds.labels(self.name).observe(time.monotonic() - start)
+        try:
+            idle = self._take_idle()
+            if idle is None:
+                conn, created = self._connect(), time.monotonic()
+            else:
+                conn, created = idle
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._created[id(conn)] = created
+            self._in_use += 1
+        self._update_metrics()
+        return conn
+
+    def _take_idle(self) -> Optional[tuple[Any, float]]:
+        """Take idle connection, closing the expired ones."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn, created, _ = self._idle.pop()
+            if not self._expired(created):
+                return conn, created
+            self._close(conn)
+
+    def putconn(self, conn: Any, discard: bool = False) -> None:
+        """Return borrowed connection to the pool.
+
+        Args:
+            conn: Connection obtained by `getconn`.
+            discard: Close the connection instead, it is broken.
+        """
+        with self._lock:
+            created = self._created.pop(id(conn), 0.0)
+            self._in_use -= 1
+        try:
+            if discard or self._expired(created):
+                self._close(conn)
+                return
+            try:
+                if (
+                    conn.info.transaction_status
+                    != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+                ):
+                    conn.rollback()
+                conn.autocommit = True
+            except psycopg2.Error as e:
+                logger.warning("Closing connection that can not be reset: %s", e)
+                self._close(conn)
+                return
+            with self._lock:
+                self._idle.append((conn, created, time.monotonic()))
+        finally:
+            self._slots.release()
+            self._update_metrics()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of the `with` block.
+
+        Connection is closed when the database or the connection failed,
+        after other errors the pending transaction is rolled back. Idle
+        connections are closed too on connection failure, as they were
+        most likely broken by the same cause, e.g. database restart.
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+        except BaseException as e:
+            if is_connection_error(e):
+                self.putconn(conn, discard=True)
+                self._close_idle()
+            else:
+                self.putconn(conn)
+            raise
+        self.putconn(conn)
+
+    def _close_idle(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._close(conn)
+        self._update_metrics()
+
+    def close(self) -> None:
+        """Stop keep-alive and close idle connections.
+
+        Borrowed connections are still returned to the pool.
+        """
+        self._stopped.set()
+        self._close_idle()
+
+    def _keepalive(self) -> None:
+        """Periodically check idle connections until the pool is closed."""
+        while not self._stopped.wait(self._keepalive_interval):
+            try:
+                self.check_idle()
+            except Exception:
+                logger.exception("Keep-alive of pool %s failed", self.name)
+
+    def check_idle(self) -> None:
+        """Check connections idle for longer than keep-alive interval.
+
+        Connections that fail the check or reached their lifetime are
+        closed, so requests do not get a broken connection.
+        """
+        now = time.monotonic()
+        interval = self._keepalive_interval
+        with self._lock:
+            stale = [e for e in self._idle if now - e[2] >= interval]
+            self._idle = [e for e in self._idle if now - e[2] < interval]
+        checked = []
+        for conn, created, released in stale:
+            if self._expired(created):
+                self._close(conn)
+                continue
+            # connection being checked counts to the pool size
+            if not self._slots.acquire(blocking=False):
+                checked.append((conn, created, released))
+                continue
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                checked.append((conn, created, time.monotonic()))
+            except psycopg2.Error as e:
+                logger.warning("Closing broken idle connection: %s", e)
+                self._close(conn)
+            finally:
+                self._slots.release()
+        with self._lock:
+            # checked connections were idle for the longest time
+            self._idle[:0] = checked
+        self._update_metrics()
+
+    @staticmethod
+    def _close(conn: Any) -> None:
+        """Close connection, ignoring errors of already broken ones."""
+        try:
+            conn.close()
+        except psycopg2.Error as e:
+            logger.debug("Error closing connection: %s", e)
+
+    def _update_metrics(self) -> None:
+        """Update gauges with number of connections by state."""
+        in_use, idle = self._in_use, len(self._idle)
+        postgres_pool_connections.labels(self.name, "in_use").set(in_use)
+        postgres_pool_connections.labels(self.name, "idle").set(idle)
+        postgres_pool_saturation.labels(self.name).set(in_use / self._max_size)
+
+
+_pools: dict[tuple, PostgresPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(config: PostgresConfig) -> tuple:
+    """Get connection parameters identifying the pool."""
+    return (
+        config.host,
+        config.port,
+        config.dbname,
+        config.user,
+        config.password,
+        config.ssl_mode,
+        str(config.ca_cert_path),
+        config.gss_encmode,
+    )
+
+
+def get_pool(config: PostgresConfig) -> PostgresPool:
+    """Get pool for given connection parameters, creating it when needed.
+
+    Pool settings of the component that creates the pool are used.
+    """
+    key = _pool_key(config)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = PostgresPool(config)
+            _pools[key] = pool
+        return pool
+
+
+def close_pools() -> None:
+    """Close idle connections of all pools and forget the pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,43 @@
+"""Prometheus metrics of conversation cache and Postgres connection pools.
+
+Unlike `ols.app.metrics`, this module does not need the service
+configuration to be loaded, so storage components import it when used by
+the quota scheduler and tools as well. The metrics are exposed by the
+/metrics endpoint all the same.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# reason is `capacity`, `idle` or `absolute` (TTL)
+conversation_cache_evictions_total = Counter(
+    "ols_conversation_cache_evictions_total",
+    "Conversations evicted from cache by backend and reason",
+    ["backend", "reason"],
+)
+# hit rate of a tier is hits / (hits + misses)
+conversation_cache_lookups_total = Counter(
+    "ols_conversation_cache_lookups_total",
+    "Conversation history lookups by cache tier and result",
+    ["tier", "result"],
+)
+
+postgres_pool_wait_seconds = Histogram(
+    "ols_postgres_pool_wait_seconds",
+    "Time spent waiting for a Postgres connection from the pool",
+    ["pool"],
+)
+postgres_pool_timeouts_total = Counter(
+    "ols_postgres_pool_timeouts_total",
+    "Postgres connection requests that timed out waiting for the pool",
+    ["pool"],
+)
+postgres_pool_connections = Gauge(
+    "ols_postgres_pool_connections",
+    "Postgres connections of the pool by state",
+    ["pool", "state"],
+)
+postgres_pool_saturation = Gauge(
+    "ols_postgres_pool_saturation",
+    "Ratio of Postgres connections in use to the maximal pool size",
+    ["pool"],
+)
@@ -1,10 +1,11 @@
 """Utility to handle tokens."""
 
+from __future__ import annotations
+
 import logging
 from math import ceil
+from typing import TYPE_CHECKING, Any, Optional
 
-from langchain_core.messages import BaseMessage
-from llama_index.core.schema import NodeWithScore
 from tiktoken import get_encoding
 
 from ols.app.models.models import RagChunk
@@ -13,13 +14,22 @@ from ols.constants import (
     MINIMUM_CONTEXT_TOKEN_LIMIT,
     RAG_SIMILARITY_CUTOFF,
     TOKEN_BUFFER_WEIGHT,
+    TOKEN_COUNTS_METADATA_KEY,
+    ModelFamily,
 )
 from ols.src.prompts.prompt_generator import (
     restructure_history,
+    restructure_rag_context,
     restructure_rag_context_post,
     restructure_rag_context_pre,
 )
 
+# imported just for type hints; API workers using retrieval sidecar don't
+# load llama_index at all
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+    from llama_index.core.schema import NodeWithScore
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,6 +49,7 @@ class TokenHandler:
         """Initialize the class instance."""
         # Note: We need an approximate tokens count.
         # For different models, exact tokens may vary due to different tokenizer.
+        self._encoding_name = encoding_name
         self._encoder = get_encoding(encoding_name)
 
     def text_to_tokens(self, text: str) -> list[int]:
@@ -71,6 +82,48 @@ class TokenHandler:
         # We increase by certain percentage to nearest integer (ceil).
         return ceil(len(tokens) * TOKEN_BUFFER_WEIGHT)
 
+    @staticmethod
+    def _get_model_family(model: str) -> ModelFamily:
+        """Get model family determining tags used to wrap RAG context."""
+        if ModelFamily.GRANITE in model:
+            return ModelFamily.GRANITE
+        return ModelFamily.GPT
+
+    def count_rag_context_tokens(self, text: str) -> dict[str, Any]:
+        """Count tokens of RAG context text wrapped for each model family.
+
+        The result is meant to be stored in node metadata at index time
+        (under `TOKEN_COUNTS_METADATA_KEY`), so chunks don't need to be
+        tokenized for every request.
+
+        Args:
+            text: node text, ex: "This is my doc"
+
+        Returns:
+            Encoding name, text length and token count per model family.
+        """
+        token_counts: dict[str, Any] = {
+            "encoding": self._encoding_name,
+            "text_length": len(text),
+        }
+        for model_family in ModelFamily:
+            wrapped_text = restructure_rag_context_pre(text, model_family)
+            token_counts[model_family] = len(self.text_to_tokens(wrapped_text))
+        return token_counts
+
+    def _get_precomputed_token_count(
+        self, metadata: dict[str, Any], text: str, model: str
+    ) -> Optional[int]:
+        """Get token count stored in node metadata, if it is valid for the text."""
+        token_counts = metadata.get(TOKEN_COUNTS_METADATA_KEY)
+        if (
+            not token_counts
+            or token_counts.get("encoding") != self._encoding_name
+            or token_counts.get("text_length") != len(text)
+        ):
+            return None
+        return token_counts.get(TokenHandler._get_model_family(model))
+
     def calculate_and_check_available_tokens(
         self, prompt: str, context_window_size: int, max_tokens_for_response: int
     ) -> int:
@@ -139,6 +192,8 @@ class TokenHandler:
             # Prepend all model specific tags, so that those will be considered for
             # token calculation. This requires formatting again after truncation,
             # whenever there are tags required at the end.
+            # Token count is usually precomputed at index time; text is tokenized
+            # only when the count is not available or the text must be truncated.
             # Alternative to this is to calculate tokens for special tags before
             # and add the number accordingly.
             # Example: Once token is calculated;
@@ -149,9 +204,16 @@ class TokenHandler:
             #    tokens_count += 3
             # ```
             node_text = node.get_text()
-            node_text = restructure_rag_context_pre(node_text, model)
-            tokens = self.text_to_tokens(node_text)
-            tokens_count = TokenHandler._get_token_count(tokens)
+            tokens = None
+            exact_tokens_count = self._get_precomputed_token_count(
+                node.metadata, node_text, model
+            )
+            if exact_tokens_count is None:
+                tokens = self.text_to_tokens(
+                    restructure_rag_context_pre(node_text, model)
+                )
+                exact_tokens_count = len(tokens)
+            tokens_count = ceil(exact_tokens_count * TOKEN_BUFFER_WEIGHT)
             logger.debug("RAG content tokens count: %d.", tokens_count)
 
             available_tokens = min(tokens_count, max_tokens)
@@ -161,8 +223,16 @@ class TokenHandler:
                 logger.debug("%d tokens are less than threshold.", available_tokens)
                 break
 
-            node_text = self.tokens_to_text(tokens[:available_tokens])
-            node_text = restructure_rag_context_post(node_text, model)
+            if exact_tokens_count <= available_tokens:
+                # whole chunk fits
+                node_text = restructure_rag_context(node_text, model)
+            else:
+                if tokens is None:
+                    tokens = self.text_to_tokens(
+                        restructure_rag_context_pre(node_text, model)
+                    )
+                node_text = self.tokens_to_text(tokens[:available_tokens])
+                node_text = restructure_rag_context_post(node_text, model)
             rag_chunks.append(
                 RagChunk(
                     text=node_text,
@@ -12,7 +12,9 @@ from ols.constants import (
     DEFAULT_CONFIGURATION_FILE,
     RHDH_CONFIGURATION_FILE_NAME_ENV_VARIABLE,
 )
+from ols.customize import reranker
 from ols.runners.quota_scheduler import start_quota_scheduler
+from ols.runners.retrieval_sidecar import start_retrieval_sidecar
 from ols.runners.uvicorn import start_uvicorn
 from ols.src.auth.auth import use_k8s_auth
 from ols.utils.certificates import generate_certificates_file
@@ -83,6 +85,15 @@ if __name__ == "__main__":
     # init loading of query redactor
     config.query_redactor  # pylint: disable=W0104
 
+    # reranker model is loaded in background, outside of request latency budget
+    reranker.load_model()
+
+    # conversations are restored from the in-memory cache snapshot before
+    # the service starts, so the cache is complete once it is ready
+    memory_cache_config = config.ols_config.conversation_cache.memory
+    if memory_cache_config is not None and memory_cache_config.snapshot_path:
+        config.conversation_cache  # pylint: disable=W0104
+
     if config.dev_config.pyroscope_url:
         start_with_pyroscope_enabled(config, logger)
     else:
@@ -90,6 +101,12 @@ if __name__ == "__main__":
             "Pyroscope url is not specified. To enable profiling please set `pyroscope_url` "
             "in the `dev_config` section of the configuration file."
         )
+    # indexes are loaded by the sidecar process, when configured, so the
+    # API workers don't need to load llama_index at all
+    reference_content = config.ols_config.reference_content
+    if reference_content is not None and reference_content.retrieval_sidecar:
+        start_retrieval_sidecar(cfg_file)
+
     # create and start the rag_index_thread - allows loading index in
     # parallel with starting the Uvicorn server
     rag_index_thread = threading.Thread(target=load_index)
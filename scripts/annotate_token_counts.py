@@ -0,0 +1,76 @@
+"""Utility script to store chunk token counts into persisted vector db.
+
+Token counts of every chunk are computed once and stored in node metadata,
+so the service doesn't need to tokenize static documentation chunks for
+every request.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from llama_index.core.storage.docstore import SimpleDocumentStore
+
+# search path accordingly
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+# pylint: disable-next=C0413
+from ols.constants import DEFAULT_TOKENIZER_MODEL, TOKEN_COUNTS_METADATA_KEY
+
+# pylint: disable-next=C0413
+from ols.utils.token_handler import TokenHandler
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Store chunk token counts into persisted vector db"
+    )
+    parser.add_argument(
+        "-p",
+        "--db-path",
+        required=True,
+        help="path to the vector db (llama-index persist directory)",
+    )
+    parser.add_argument(
+        "-e",
+        "--encoding",
+        default=DEFAULT_TOKENIZER_MODEL,
+        help="tokenizer encoding used by the service",
+    )
+    return parser.parse_args()
+
+
+def annotate_nodes(nodes, token_handler):
+    """Store token counts into metadata of given nodes."""
+    for node in nodes:
+        node.metadata[TOKEN_COUNTS_METADATA_KEY] = (
+            token_handler.count_rag_context_tokens(node.get_text())
+        )
+        # token counts must not be part of embedded or generated text
+        for excluded_keys in (
+            node.excluded_embed_metadata_keys,
+            node.excluded_llm_metadata_keys,
+        ):
+            if TOKEN_COUNTS_METADATA_KEY not in excluded_keys:
+                excluded_keys.append(TOKEN_COUNTS_METADATA_KEY)
+
+
+def main():
+    """Annotate nodes in vector db docstore."""
+    args = parse_args()
+
+    start = time.monotonic()
+    docstore = SimpleDocumentStore.from_persist_dir(args.db_path)
+    nodes = list(docstore.docs.values())
+    annotate_nodes(nodes, TokenHandler(args.encoding))
+    docstore.add_documents(nodes, allow_update=True)
+    docstore.persist(os.path.join(args.db_path, "docstore.json"))
+    print(f"{len(nodes)} nodes annotated in {time.monotonic() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Utility script to measure context tokens saved by deduplication of chunks.
+
+Questions from evaluation data are searched in the FAISS vector store and
+the retrieved chunks are turned into RAG context with and without
+near-duplicate suppression (and optionally MMR). Tokens used by the context
+are reported together with coverage of reference answers words by the
+context, which shows whether the dropped chunks carried any information.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from llama_index.core import Settings, StorageContext, load_index_from_storage
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+from llama_index.vector_stores.faiss import FaissVectorStore
+
+# search path accordingly
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+# pylint: disable-next=C0413
+from ols.app.models.config import DeduplicationConfig
+
+# pylint: disable-next=C0413
+from ols.constants import (
+    RAG_DEDUPLICATION_SIMILARITY_THRESHOLD,
+    RAG_MMR_LAMBDA,
+    RAG_SIMILARITY_CUTOFF,
+)
+
+# pylint: disable-next=C0413
+from ols.src.rag_index.deduplication import diversify
+
+# pylint: disable-next=C0413
+from ols.utils.token_handler import TokenHandler
+
+DEFAULT_QUESTIONS_FILE = os.path.join(
+    os.path.dirname(__file__), "evaluation", "eval_data", "question_answer_pair.json"
+)
+WORD_PATTERN = re.compile(r"\w{4,}")
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure context tokens saved by deduplication of chunks"
+    )
+    parser.add_argument(
+        "-p", "--db-path", required=True, help="path to the FAISS vector db"
+    )
+    parser.add_argument("-x", "--product-index", required=True, help="ID of the index")
+    parser.add_argument(
+        "-m",
+        "--model-path",
+        default="./embeddings_model",
+        help="path to the embedding model",
+    )
+    parser.add_argument(
+        "-q",
+        "--questions-file",
+        default=DEFAULT_QUESTIONS_FILE,
+        help="JSON file with evaluation questions",
+    )
+    parser.add_argument(
+        "-k", "--top-k", type=int, default=5, help="number of retrieved chunks"
+    )
+    parser.add_argument(
+        "-t",
+        "--max-tokens",
+        type=int,
+        default=2000,
+        help="maximum number of tokens of RAG context",
+    )
+    parser.add_argument(
+        "-s",
+        "--similarity-threshold",
+        type=float,
+        default=RAG_DEDUPLICATION_SIMILARITY_THRESHOLD,
+        help="similarity of chunks considered to be duplicates",
+    )
+    parser.add_argument(
+        "--mmr", action="store_true", help="reorder chunks by MMR as well"
+    )
+    parser.add_argument(
+        "--mmr-lambda",
+        type=float,
+        default=RAG_MMR_LAMBDA,
+        help="weight of relevance against diversity for MMR",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="JSON file where the results will be stored",
+    )
+    return parser.parse_args()
+
+
+def load_questions(questions_file):
+    """Load evaluation questions with words of their reference answers."""
+    with open(questions_file, encoding="utf-8") as fin:
+        data = json.load(fin)
+    questions = {}
+    for item in data["evaluation"].values():
+        answer_words = {
+            word
+            for answer in item["answer"].values()
+            for text in answer["text"]
+            for word in WORD_PATTERN.findall(text.lower())
+        }
+        questions.setdefault(item["question"], set()).update(answer_words)
+    for question in data["questions_pool"]["valid_questions"]:
+        questions.setdefault(question, set())
+    return questions
+
+
+def measure(token_handler, retrieved_nodes, answer_words, max_tokens):
+    """Measure tokens, chunks and answer coverage of RAG context."""
+    rag_chunks, available_tokens = token_handler.truncate_rag_context(
+        retrieved_nodes, "", max_tokens
+    )
+    context_words = set(
+        WORD_PATTERN.findall(" ".join(chunk.text for chunk in rag_chunks).lower())
+    )
+    return {
+        "tokens": max_tokens - available_tokens,
+        "chunks": len(rag_chunks),
+        "covered": len(answer_words & context_words),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+
+    Settings.embed_model = HuggingFaceEmbedding(model_name=args.model_path)
+    Settings.llm = None
+    storage_context = StorageContext.from_defaults(
+        vector_store=FaissVectorStore.from_persist_dir(args.db_path),
+        persist_dir=args.db_path,
+    )
+    index = load_index_from_storage(storage_context, index_id=args.product_index)
+    retriever = index.as_retriever(similarity_top_k=args.top_k)
+    deduplication_config = DeduplicationConfig(
+        similarity_threshold=args.similarity_threshold,
+        mmr=args.mmr,
+        mmr_lambda=args.mmr_lambda,
+    )
+    token_handler = TokenHandler()
+
+    questions = load_questions(args.questions_file)
+    print(f"Retrieving chunks for {len(questions)} questions")
+    totals = {"answer_words": 0, "baseline": {}, "deduplicated": {}}
+    results = []
+    for question, answer_words in questions.items():
+        retrieved_nodes = [
+            node
+            for node in retriever.retrieve(question)
+            if node.get_score(raise_error=False) >= RAG_SIMILARITY_CUTOFF
+        ]
+        result = {
+            "question": question,
+            "baseline": measure(
+                token_handler, retrieved_nodes, answer_words, args.max_tokens
+            ),
+            "deduplicated": measure(
+                token_handler,
+                diversify(retrieved_nodes, deduplication_config),
+                answer_words,
+                args.max_tokens,
+            ),
+        }
+        results.append(result)
+        totals["answer_words"] += len(answer_words)
+        for variant in ("baseline", "deduplicated"):
+            for key, value in result[variant].items():
+                totals[variant][key] = totals[variant].get(key, 0) + value
+
+    print(f"{'variant':<14}{'tokens':>9}{'chunks':>9}{'coverage':>10}")
+    for variant in ("baseline", "deduplicated"):
+        coverage = totals[variant]["covered"] / max(totals["answer_words"], 1)
+        print(
+            f"{variant:<14}{totals[variant]['tokens']:>9}"
+            f"{totals[variant]['chunks']:>9}{coverage:>10.3f}"
+        )
+    saved = totals["baseline"]["tokens"] - totals["deduplicated"]["tokens"]
+    print(
+        f"Tokens saved: {saved} "
+        f"({saved / max(totals['baseline']['tokens'], 1):.1%})"
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fout:
+            json.dump({"totals": totals, "questions": results}, fout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Utility script to measure recall and latency of approximate FAISS indexes.
+
+Questions from evaluation data are searched in the reference (flat) index
+and in the approximate (IVF or HNSW) index for several values of search
+parameter (`nprobe` or `efSearch`). Recall is computed against results
+returned by the reference index.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import faiss
+import numpy as np
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+# search path accordingly
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+# pylint: disable-next=C0413
+from ols.app.models.config import FaissConfig
+
+# pylint: disable-next=C0413
+from ols.constants import FaissIndexType
+
+# pylint: disable-next=C0413
+from ols.src.rag_index.faiss_index import get_index_type, set_search_parameters
+
+VECTOR_STORE_FILENAME = "default__vector_store.json"
+DEFAULT_QUESTIONS_FILE = os.path.join(
+    os.path.dirname(__file__), "evaluation", "eval_data", "question_answer_pair.json"
+)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure recall and latency of approximate FAISS index"
+    )
+    parser.add_argument(
+        "-r",
+        "--reference-db-path",
+        required=True,
+        help="path to the vector db with flat index",
+    )
+    parser.add_argument(
+        "-p",
+        "--db-path",
+        required=True,
+        help="path to the vector db with IVF or HNSW index",
+    )
+    parser.add_argument(
+        "-m",
+        "--model-path",
+        default="./embeddings_model",
+        help="path to the embedding model",
+    )
+    parser.add_argument(
+        "-q",
+        "--questions-file",
+        default=DEFAULT_QUESTIONS_FILE,
+        help="JSON file with evaluation questions",
+    )
+    parser.add_argument(
+        "-k",
+        "--top-k",
+        type=int,
+        default=5,
+        help="number of retrieved chunks",
+    )
+    parser.add_argument(
+        "-s",
+        "--search-params",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16, 32, 64, 128],
+        help="values of nprobe (IVF) or efSearch (HNSW) to measure",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="JSON file where the results will be stored",
+    )
+    return parser.parse_args()
+
+
+def load_questions(questions_file):
+    """Load evaluation questions and questions from questions pool."""
+    with open(questions_file, encoding="utf-8") as fin:
+        data = json.load(fin)
+    questions = [item["question"] for item in data["evaluation"].values()]
+    questions.extend(data["questions_pool"]["valid_questions"])
+    return list(dict.fromkeys(questions))
+
+
+def measure(index, queries, ground_truth, top_k):
+    """Measure recall against ground truth and per query search latency."""
+    latencies = []
+    hits = 0
+    for query, expected in zip(queries, ground_truth):
+        start = time.perf_counter()
+        _, ids = index.search(query.reshape(1, -1), top_k)
+        latencies.append(time.perf_counter() - start)
+        hits += len(set(ids[0]) & set(expected))
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "recall": hits / (len(queries) * top_k),
+        "latency_mean_ms": float(latencies_ms.mean()),
+        "latency_p95_ms": float(np.percentile(latencies_ms, 95)),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+
+    reference = faiss.read_index(
+        os.path.join(args.reference_db_path, VECTOR_STORE_FILENAME)
+    )
+    index = faiss.read_index(os.path.join(args.db_path, VECTOR_STORE_FILENAME))
+    index_type = get_index_type(index)
+    if index_type not in {FaissIndexType.IVF, FaissIndexType.HNSW}:
+        sys.exit(f"IVF or HNSW index is expected, {index_type} index found")
+
+    questions = load_questions(args.questions_file)
+    print(f"Embedding {len(questions)} questions")
+    embed_model = HuggingFaceEmbedding(model_name=args.model_path)
+    queries = np.array(
+        [embed_model.get_query_embedding(question) for question in questions],
+        dtype=np.float32,
+    )
+    _, ground_truth = reference.search(queries, args.top_k)
+
+    results = [
+        {"index": "flat", **measure(reference, queries, ground_truth, args.top_k)}
+    ]
+    for value in args.search_params:
+        set_search_parameters(index, FaissConfig(nprobe=value, ef_search=value))
+        results.append(
+            {
+                "index": index_type,
+                "search_param": value,
+                **measure(index, queries, ground_truth, args.top_k),
+            }
+        )
+
+    print(f"{'index':<6}{'param':>7}{'recall':>9}{'mean ms':>10}{'p95 ms':>10}")
+    for result in results:
+        print(
+            f"{result['index']:<6}{result.get('search_param', '-'):>7}"
+            f"{result['recall']:>9.3f}{result['latency_mean_ms']:>10.3f}"
+            f"{result['latency_p95_ms']:>10.3f}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fout:
+            json.dump(results, fout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
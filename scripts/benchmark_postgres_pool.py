@@ -0,0 +1,153 @@
+"""Utility script to measure Postgres storage throughput with concurrent queries.
+
+Every simulated `/v1/query` call performs the storage operations of the
+real endpoint: conversation history is read, user and cluster quota is
+checked, the new turn is appended to the history and consumed tokens are
+recorded. Calls run in concurrent threads, as in the service threadpool,
+and the benchmark is repeated for each pool size; pool of size 1 behaves
+like the former single connection shared by all threads.
+
+A local Postgres instance is needed, for example:
+
+    podman run --rm -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+# search path accordingly
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+# pylint: disable-next=C0413
+from ols.app.models.config import PostgresConfig, PostgresPoolConfig
+
+# pylint: disable-next=C0413
+from ols.app.models.models import CacheEntry
+
+# pylint: disable-next=C0413
+from ols.src.cache.postgres_cache import PostgresCache
+
+# pylint: disable-next=C0413
+from ols.src.quota.cluster_quota_limiter import ClusterQuotaLimiter
+
+# pylint: disable-next=C0413
+from ols.src.quota.token_usage_history import TokenUsageHistory
+
+# pylint: disable-next=C0413
+from ols.src.quota.user_quota_limiter import UserQuotaLimiter
+
+# pylint: disable-next=C0413
+from ols.utils.postgres_pool import close_pools
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure Postgres storage throughput with concurrent queries"
+    )
+    parser.add_argument("--host", default="localhost", help="Postgres host")
+    parser.add_argument("--port", type=int, default=5432, help="Postgres port")
+    parser.add_argument("--dbname", default="postgres", help="database name")
+    parser.add_argument("--user", default="postgres", help="database user")
+    parser.add_argument("--password", default="postgres", help="database password")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=32, help="number of worker threads"
+    )
+    parser.add_argument(
+        "-n", "--queries", type=int, default=2000, help="number of queries"
+    )
+    parser.add_argument(
+        "-s",
+        "--pool-sizes",
+        default="1,4,16",
+        help="comma separated maximal pool sizes to compare",
+    )
+    return parser.parse_args()
+
+
+def query(storage, user_id, conversation_id):
+    """Perform storage operations of one query, return its duration."""
+    cache, user_quota, cluster_quota, token_usage = storage
+    start = time.perf_counter()
+    cache.get(user_id, conversation_id, skip_user_id_check=True)
+    user_quota.ensure_available_quota(user_id)
+    cluster_quota.ensure_available_quota()
+    cache.insert_or_append(
+        user_id,
+        conversation_id,
+        CacheEntry(query=HumanMessage("what is a pod?"), response=AIMessage("...")),
+        skip_user_id_check=True,
+    )
+    token_usage.consume_tokens(user_id, "provider", "model", 100, 20)
+    user_quota.consume_tokens(100, 20, user_id)
+    cluster_quota.consume_tokens(100, 20)
+    return time.perf_counter() - start
+
+
+def run(args, pool_size):
+    """Run the benchmark with given pool size."""
+    close_pools()
+    config = PostgresConfig(
+        host=args.host,
+        port=args.port,
+        dbname=args.dbname,
+        user=args.user,
+        password=args.password,
+        ssl_mode="disable",
+        pool=PostgresPoolConfig(min_size=1, max_size=pool_size, timeout=60),
+    )
+    quota = 10**12
+    storage = (
+        PostgresCache(config),
+        UserQuotaLimiter(config, quota),
+        ClusterQuotaLimiter(config, quota),
+        TokenUsageHistory(config),
+    )
+    users = [str(uuid.uuid4()) for _ in range(args.concurrency)]
+    conversations = [str(uuid.uuid4()) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        durations = list(
+            executor.map(
+                lambda i: query(storage, users[i % len(users)], conversations[i]),
+                range(args.queries),
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    durations.sort()
+    print(
+        f"pool size {pool_size:3d}: "
+        f"{args.queries / elapsed:8.1f} queries/s, "
+        f"p50 {statistics.median(durations) * 1000:7.2f} ms, "
+        f"p95 {durations[int(len(durations) * 0.95)] * 1000:7.2f} ms"
+    )
+
+    # remove benchmark data
+    with storage[0].pool.connection() as conn, conn.cursor() as cursor:
+        cursor.execute("DELETE FROM conversations WHERE user_id = ANY(%s)", (users,))
+        cursor.execute("DELETE FROM quota_limits WHERE id = ANY(%s)", (users,))
+        cursor.execute("DELETE FROM token_usage WHERE user_id = ANY(%s)", (users,))
+
+
+def main():
+    """Compare throughput of concurrent queries for different pool sizes."""
+    args = parse_args()
+    print(f"{args.queries} queries in {args.concurrency} threads")
+    for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+        run(args, pool_size)
+    close_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Utility script to build FAISS vector store from documentation files.
+
+When the output directory contains index built previously (with the same
+settings), embeddings of unchanged chunks are reused and just the changed
+documentation files are embedded.
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+# search path accordingly
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+# pylint: disable-next=C0413
+from ols.constants import FaissIndexType
+
+# pylint: disable-next=C0413
+from ols.src.rag_index.index_builder import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_EMBED_BATCH_SIZE,
+    IndexBuilder,
+)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Build FAISS vector store from documentation files"
+    )
+    parser.add_argument(
+        "-f",
+        "--folder",
+        required=True,
+        help="directory with documentation files (markdown, asciidoc, text)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-path",
+        required=True,
+        help="path where the vector db will be stored",
+    )
+    parser.add_argument(
+        "-i",
+        "--index-id",
+        required=True,
+        help="ID of the index (product_docs_index_id)",
+    )
+    parser.add_argument(
+        "-m",
+        "--model-path",
+        default="./embeddings_model",
+        help="path to the embedding model",
+    )
+    parser.add_argument(
+        "-u",
+        "--docs-url-base",
+        default="",
+        help="URL prepended to documentation file path to get its URL",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="chunk size in tokens",
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=DEFAULT_CHUNK_OVERLAP,
+        help="chunk overlap in tokens",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of embedding processes",
+    )
+    parser.add_argument(
+        "-b",
+        "--batch-size",
+        type=int,
+        default=DEFAULT_EMBED_BATCH_SIZE,
+        help="number of chunks embedded at once",
+    )
+    parser.add_argument(
+        "-t",
+        "--index-type",
+        choices=list(FaissIndexType),
+        default=FaissIndexType.FLAT,
+        help="type of FAISS index",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Build the index."""
+    args = parse_args()
+
+    builder = IndexBuilder(
+        partial(HuggingFaceEmbedding, model_name=args.model_path),
+        os.path.basename(os.path.normpath(args.model_path)),
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        docs_url_base=args.docs_url_base,
+        index_type=args.index_type,
+    )
+    start = time.monotonic()
+    stats = builder.build(args.folder, args.output_path, args.index_id)
+    print(
+        f"Index built in {time.monotonic() - start:.2f}s: "
+        f"{stats.files} files ({stats.changed_files} changed), "
+        f"{stats.chunks} chunks ({stats.embedded_chunks} embedded)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Utility script to convert flat FAISS vector store to IVF or HNSW index."""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+
+import faiss
+
+# search path accordingly
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+# pylint: disable-next=C0413
+from ols.constants import FaissIndexType
+
+# pylint: disable-next=C0413
+from ols.src.rag_index.faiss_index import convert_index, get_index_type
+
+# name of file with FAISS index in llama-index persist directory
+VECTOR_STORE_FILENAME = "default__vector_store.json"
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Convert flat FAISS vector store to approximate index"
+    )
+    parser.add_argument(
+        "-p",
+        "--db-path",
+        required=True,
+        help="path to the vector db with flat index",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-path",
+        required=True,
+        help="path where the converted vector db will be stored",
+    )
+    parser.add_argument(
+        "-t",
+        "--index-type",
+        choices=[FaissIndexType.IVF, FaissIndexType.HNSW],
+        default=FaissIndexType.HNSW,
+        help="type of the new index",
+    )
+    parser.add_argument(
+        "--nlist",
+        type=int,
+        default=None,
+        help="number of IVF inverted lists (derived from vectors count by default)",
+    )
+    parser.add_argument(
+        "--hnsw-m",
+        type=int,
+        default=32,
+        help="number of neighbours of each HNSW graph node",
+    )
+    parser.add_argument(
+        "--ef-construction",
+        type=int,
+        default=200,
+        help="size of dynamic candidate list used by HNSW build",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Convert vector store."""
+    args = parse_args()
+
+    index = faiss.read_index(os.path.join(args.db_path, VECTOR_STORE_FILENAME))
+    index_type = get_index_type(index)
+    if index_type != FaissIndexType.FLAT:
+        sys.exit(f"Only flat index can be converted, {index_type} index found")
+    print(f"Converting flat index with {index.ntotal} vectors to {args.index_type}")
+
+    start = time.monotonic()
+    converted = convert_index(
+        index,
+        args.index_type,
+        nlist=args.nlist,
+        hnsw_m=args.hnsw_m,
+        ef_construction=args.ef_construction,
+    )
+    print(f"Index converted in {time.monotonic() - start:.2f}s")
+
+    # docstore and index store are kept, just vector store is replaced
+    shutil.copytree(args.db_path, args.output_path, dirs_exist_ok=True)
+    faiss.write_index(converted, os.path.join(args.output_path, VECTOR_STORE_FILENAME))
+    print(f"Converted vector db stored into {args.output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmarks for encoding of cache entries.
+
+Size of the encoded entry is recorded in `extra_info` of every benchmark,
+so formats can be compared by storage size as well.
+"""
+
+# pylint: disable=W0621
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ols import constants
+from ols.app.models.models import Attachment, CacheEntry
+from ols.src.cache.cache_encoding import decode_cache_entry, encode_cache_entry
+
+FORMATS = [constants.CacheValueFormat.JSON, constants.CacheValueFormat.COMPACT]
+
+RESPONSE = """To scale a deployment, use the `oc scale` command:
+
+```
+oc scale deployment/my-app --replicas=3
+```
+
+Alternatively set `spec.replicas` in the deployment manifest and apply it.
+The number of running pods can be checked by `oc get pods`.
+"""
+
+
+@pytest.fixture(params=["short", "long", "attachment"])
+def cache_entry(request):
+    """Cache entries of different sizes."""
+    query = HumanMessage("how do I scale a deployment?")
+    match request.param:
+        case "short":
+            return CacheEntry(query=query, response=AIMessage("Use `oc scale`."))
+        case "long":
+            return CacheEntry(query=query, response=AIMessage(RESPONSE * 10))
+        case _:
+            manifest = "\n".join(f"  label{i}: value{i}" for i in range(200))
+            return CacheEntry(
+                query=query,
+                response=AIMessage(RESPONSE),
+                attachments=[
+                    Attachment(
+                        attachment_type="configuration",
+                        content_type="application/yaml",
+                        content=f"kind: Deployment\nmetadata:\n{manifest}\n",
+                    )
+                ],
+            )
+
+
+@pytest.mark.parametrize("value_format", FORMATS)
+def test_encode(benchmark, cache_entry, value_format):
+    """Benchmark encoding of cache entry."""
+    value = benchmark(encode_cache_entry, cache_entry, value_format)
+    benchmark.extra_info["size"] = len(value)
+
+
+@pytest.mark.parametrize("value_format", FORMATS)
+def test_decode(benchmark, cache_entry, value_format):
+    """Benchmark decoding of cache entry."""
+    value = encode_cache_entry(cache_entry, value_format)
+    benchmark.extra_info["size"] = len(value)
+    benchmark(decode_cache_entry, value)
@@ -0,0 +1,113 @@
+"""Benchmarks comparing conversation cache backends.
+
+Postgres cache is benchmarked only when a database is available; its
+connection parameters are read from `OLS_BENCHMARK_POSTGRES_*` environment
+variables (`HOST`, `PORT`, `DBNAME`, `USER`, `PASSWORD`).
+"""
+
+# pylint: disable=W0621
+
+import itertools
+import os
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ols import constants
+from ols.app.models.config import InMemoryCacheConfig, PostgresConfig, SQLiteCacheConfig
+from ols.app.models.models import CacheEntry
+from ols.src.cache.in_memory_cache import InMemoryCache
+from ols.src.cache.postgres_cache import PostgresCache
+from ols.src.cache.sqlite_cache import SQLiteCache
+from ols.utils import suid
+
+CONVERSATIONS = 1_000
+TURNS = 5
+
+cache_entry = CacheEntry(
+    query=HumanMessage("what is a pod?"), response=AIMessage("pod is ... " * 20)
+)
+
+
+def postgres_config():
+    """Get configuration of Postgres used by benchmarks, if any."""
+    host = os.environ.get("OLS_BENCHMARK_POSTGRES_HOST")
+    if host is None:
+        pytest.skip("OLS_BENCHMARK_POSTGRES_HOST is not set")
+    return PostgresConfig(
+        host=host,
+        port=int(os.environ.get("OLS_BENCHMARK_POSTGRES_PORT", "5432")),
+        dbname=os.environ.get("OLS_BENCHMARK_POSTGRES_DBNAME", "cache"),
+        user=os.environ.get("OLS_BENCHMARK_POSTGRES_USER", "postgres"),
+        password=os.environ.get("OLS_BENCHMARK_POSTGRES_PASSWORD"),
+        max_entries=CONVERSATIONS * 2,
+    )
+
+
+@pytest.fixture(
+    scope="module",
+    params=[
+        constants.CACHE_TYPE_MEMORY,
+        constants.CACHE_TYPE_SQLITE,
+        constants.CACHE_TYPE_POSTGRES,
+    ],
+)
+def populated_cache(request, tmp_path_factory):
+    """Cache of given type with conversations of several turns."""
+    match request.param:
+        case constants.CACHE_TYPE_MEMORY:
+            config = InMemoryCacheConfig({"max_entries": CONVERSATIONS * 2})
+            cache = InMemoryCache(config)
+            cache.initialize_cache(config)
+        case constants.CACHE_TYPE_SQLITE:
+            path = tmp_path_factory.mktemp("sqlite") / "cache.db"
+            cache = SQLiteCache(
+                SQLiteCacheConfig(path=str(path), max_entries=CONVERSATIONS * 2)
+            )
+        case _:
+            cache = PostgresCache(postgres_config())
+    conversation_id = suid.get_suid()
+    for i in range(CONVERSATIONS):
+        for _ in range(TURNS):
+            cache.insert_or_append(f"user{i}", conversation_id, cache_entry, "", True)
+    yield cache, conversation_id
+    for i in range(CONVERSATIONS):
+        cache.delete(f"user{i}", conversation_id, True)
+
+
+def test_get(benchmark, populated_cache):
+    """Benchmark reading whole conversation history."""
+    cache, conversation_id = populated_cache
+    users = itertools.cycle(range(CONVERSATIONS))
+
+    def get():
+        cache.get(f"user{next(users)}", conversation_id, True)
+
+    benchmark(get)
+
+
+def test_get_tail(benchmark, populated_cache):
+    """Benchmark reading the last turn of conversation history."""
+    cache, conversation_id = populated_cache
+    users = itertools.cycle(range(CONVERSATIONS))
+
+    def get():
+        cache.get(f"user{next(users)}", conversation_id, True, limit=1)
+
+    benchmark(get)
+
+
+def test_append(benchmark, populated_cache):
+    """Benchmark appending turn to conversation."""
+    cache, _ = populated_cache
+    conversation_id = suid.get_suid()
+
+    benchmark(cache.insert_or_append, "user", conversation_id, cache_entry, "", True)
+    cache.delete("user", conversation_id, True)
+
+
+def test_list(benchmark, populated_cache):
+    """Benchmark listing conversations of a user."""
+    cache, _ = populated_cache
+
+    benchmark(cache.list, f"user{CONVERSATIONS - 1}", True)
@@ -0,0 +1,78 @@
+"""Benchmarks for the in-memory conversation cache."""
+
+# pylint: disable=W0621
+
+import itertools
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ols.app.models.config import InMemoryCacheConfig
+from ols.app.models.models import CacheEntry
+from ols.src.cache.in_memory_cache import InMemoryCache
+from ols.utils import suid
+
+cache_entry = CacheEntry(
+    query=HumanMessage("what is a pod?"), response=AIMessage("pod is ...")
+)
+
+
+@pytest.fixture(scope="module", params=[1_000, 100_000, 1_000_000])
+def populated_cache(request):
+    """Cache filled up to its capacity, with one conversation per user."""
+    conversations = request.param
+    config = InMemoryCacheConfig({"max_entries": conversations})
+    cache = InMemoryCache(config)
+    cache.initialize_cache(config)
+    conversation_id = suid.get_suid()
+    for i in range(conversations):
+        cache.insert_or_append(f"user{i}", conversation_id, cache_entry, "", True)
+    return cache, conversation_id, conversations
+
+
+def test_get(benchmark, populated_cache):
+    """Benchmark reading conversation from full cache."""
+    cache, conversation_id, conversations = populated_cache
+    users = itertools.cycle(range(0, conversations, 7))
+
+    def get():
+        cache.get(f"user{next(users)}", conversation_id, True)
+
+    benchmark(get)
+
+
+def test_insert_with_eviction(benchmark, populated_cache):
+    """Benchmark storing new conversation to full cache, evicting the oldest one."""
+    cache, conversation_id, _ = populated_cache
+    users = itertools.count()
+
+    def insert():
+        cache.insert_or_append(
+            f"new-user{next(users)}", conversation_id, cache_entry, "", True
+        )
+
+    benchmark(insert)
+
+
+def test_append(benchmark, populated_cache):
+    """Benchmark appending to conversation in full cache."""
+    cache, _, _ = populated_cache
+    conversation_id = suid.get_suid()
+
+    benchmark(cache.insert_or_append, "user", conversation_id, cache_entry, "", True)
+
+
+def test_list(benchmark, populated_cache):
+    """Benchmark listing conversations of a user in full cache."""
+    cache, _, conversations = populated_cache
+
+    benchmark(cache.list, f"user{conversations - 1}", True)
+
+
+def test_save_snapshot(benchmark, populated_cache, tmp_path):
+    """Benchmark saving snapshot of full cache."""
+    cache, _, _ = populated_cache
+
+    benchmark.pedantic(
+        cache.save_snapshot, args=(str(tmp_path / "snapshot"),), rounds=3
+    )
@@ -270,18 +270,14 @@ def test_conversation_in_postgres_cache(postgres_connection) -> None:
     assert conversation is not None
     assert updated_at is not None
 
-    # deserialize conversation into list of messages
-    deserialized = json.loads(conversation)
-    assert deserialized is not None
-
-    # we expect one question + one answer
-    assert len(deserialized) == 2
+    # we expect one turn with question and answer
+    assert len(conversation) == 1
 
     # question check
-    assert "what is kubernetes?" in deserialized[0].content
+    assert "what is kubernetes?" in conversation[0].query.content
 
     # trivial check for answer (exact check is done in different tests)
-    assert "Kubernetes" in deserialized[1].content
+    assert "Kubernetes" in conversation[0].response.content
 
     # second question
     client_utils.perform_query(pytest.client, cid, "what is openshift virtualization?")
@@ -289,24 +285,20 @@ def test_conversation_in_postgres_cache(postgres_connection) -> None:
     conversation, updated_at = read_conversation_history(postgres_connection, cid)
     assert conversation is not None
 
-    # unpickle conversation into list of messages
-    deserialized = json.loads(conversation, errors="strict")
-    assert deserialized is not None
-
-    # we expect one question + one answer
-    assert len(deserialized) == 4
+    # we expect two turns
+    assert len(conversation) == 2
 
     # first question
-    assert "what is kubernetes?" in deserialized[0].content
+    assert "what is kubernetes?" in conversation[0].query.content
 
     # first answer
-    assert "Kubernetes" in deserialized[1].content
+    assert "Kubernetes" in conversation[0].response.content
 
     # second question
-    assert "what is openshift virtualization?" in deserialized[2].content
+    assert "what is openshift virtualization?" in conversation[1].query.content
 
     # second answer
-    assert "OpenShift" in deserialized[3].content
+    assert "OpenShift" in conversation[1].response.content
 
 
 @pytest.mark.cluster
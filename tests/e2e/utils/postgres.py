@@ -4,6 +4,9 @@ import os
 
 import psycopg2
 
+from ols.app.models.models import CacheEntry
+from ols.src.cache.cache_encoding import decode_cache_entry
+
 
 def _get_env(env_name):
     if env_name not in os.environ:
@@ -35,15 +38,27 @@ def retrieve_connection():
 
 def read_conversation_history_count(postgres_connection):
     """Read number of items in conversation history."""
-    query = "SELECT count(*) FROM cache;"
+    query = "SELECT count(*) FROM conversations;"
     with postgres_connection.cursor() as cursor:
         cursor.execute(query)
         return cursor.fetchone()
 
 
 def read_conversation_history(postgres_connection, conversation_id):
-    """Read number of items in conversation history."""
-    query = "SELECT value, updated_at FROM cache WHERE conversation_id = %s"
+    """Read conversation history turns, decoded from any value format."""
+    query = """
+        SELECT t.value, c.updated_at
+          FROM conversations c
+          JOIN conversation_turns t USING (user_id, conversation_id)
+         WHERE c.conversation_id = %s
+         ORDER BY t.seq
+        """
     with postgres_connection.cursor() as cursor:
         cursor.execute(query, (conversation_id,))
-        return cursor.fetchone()
+        rows = cursor.fetchall()
+    if not rows:
+        return None, None
+    history = [
+        CacheEntry.from_dict(decode_cache_entry(bytes(value))) for value, _ in rows
+    ]
+    return history, rows[0][1]
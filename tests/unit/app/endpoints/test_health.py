@@ -17,6 +17,7 @@ from ols.app.endpoints.health import (
 from ols.app.models.config import InMemoryCacheConfig
 from ols.app.models.models import LivenessResponse, ReadinessResponse
 from ols.src.cache.in_memory_cache import InMemoryCache
+from ols.src.rag_index.remote_index import RemoteIndex
 
 
 def mock_cache():
@@ -197,6 +198,45 @@ def test_readiness_probe_get_method_index_not_ready():
             readiness_probe_get_method()
 
 
+def test_readiness_probe_get_method_remote_index():
+    """Test the readiness_probe function when index is served by sidecar."""
+    remote_index = Mock(RemoteIndex)
+    with patch("ols.config._rag_index", new=remote_index):
+        remote_index.is_ready.return_value = False
+        assert not index_is_ready()
+
+        remote_index.is_ready.return_value = True
+        assert index_is_ready()
+
+
+def test_readiness_probe_get_method_index_load_details():
+    """Test that durations of index load phases are part of readiness response."""
+    durations = {"embedding_model": 4.2, "indexes": {"ocp": {"vector_store": 1.5}}}
+    with (
+        patch("ols.config._conversation_cache", create=True, new=mock_cache()),
+        patch("ols.app.endpoints.health.llm_is_ready_persistent_state", new=True),
+        patch(
+            "ols.app.endpoints.health.get_index_load_durations",
+            return_value=durations,
+        ),
+    ):
+        config.ols_config.reference_content = "something else than None"
+
+        # index is still being loaded
+        config._rag_index = None
+        with pytest.raises(HTTPException) as exc_info:
+            readiness_probe_get_method()
+        assert exc_info.value.detail["index_load"] == durations
+
+        # index is loaded
+        config._rag_index = True
+        response = readiness_probe_get_method()
+        assert response == ReadinessResponse(
+            ready=True, reason="service is ready", details=durations
+        )
+        config.ols_config.reference_content = None
+
+
 def test_readiness_probe_get_method_cache_not_ready():
     """Test the readiness_probe function when cache is not ready."""
     # simulate that the cache is not ready
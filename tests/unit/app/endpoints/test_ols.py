@@ -17,17 +17,22 @@ from ols import config, constants
 config.ols_config.authentication_config.module = "k8s"
 
 from ols.app.endpoints import ols  # noqa:E402
-from ols.app.models.config import UserDataCollection  # noqa:E402
+from ols.app.models.config import (  # noqa:E402
+    ReferenceContentIndex,
+    UserDataCollection,
+)
 from ols.app.models.models import (  # noqa:E402
     Attachment,
     CacheEntry,
     LLMRequest,
+    ProcessedRequest,
     RagChunk,
     SummarizerResponse,
     TokenCounter,
 )
 from ols.customize import prompts  # noqa:E402
 from ols.src.llms.llm_loader import LLMConfigurationError  # noqa:E402
+from ols.src.rag_index.multi_index import MultiIndex  # noqa:E402
 from ols.utils import suid  # noqa:E402
 from ols.utils.errors_parsing import DEFAULT_ERROR_MESSAGE  # noqa:E402
 from ols.utils.redactor import Redactor, RegexFilter  # noqa:E402
@@ -119,6 +124,53 @@ def test_retrieve_previous_input_for_previous_history():
         assert previous_input == "input"
 
 
+@pytest.mark.usefixtures("_load_config")
+def test_retrieve_previous_input_tail():
+    """Check that only the tail of history is retrieved when limit is set."""
+    conversation_id = suid.get_suid()
+    with patch("ols.config.conversation_cache.get") as get:
+        get.return_value = []
+        ols.retrieve_previous_input(
+            constants.DEFAULT_USER_UID, conversation_id, limit=3
+        )
+        get.assert_called_once_with(
+            constants.DEFAULT_USER_UID, conversation_id, False, limit=3
+        )
+
+
+@pytest.mark.usefixtures("_load_config")
+def test_conversation_history_loader():
+    """Check that longer history is loaded only when just its tail was retrieved."""
+    conversation_id = suid.get_suid()
+    entry = CacheEntry(query=HumanMessage("query"), response=AIMessage("response"))
+
+    def processed_request(previous_input):
+        return ProcessedRequest(
+            user_id=constants.DEFAULT_USER_UID,
+            conversation_id=conversation_id,
+            query_without_attachments="query",
+            previous_input=previous_input,
+            attachments=[],
+            valid=True,
+            timestamps={},
+            skip_user_id_check=False,
+            user_token="",
+        )
+
+    short = [entry] * (constants.CONVERSATION_HISTORY_TAIL_TURNS - 1)
+    assert ols.conversation_history_loader(processed_request(short)) is None
+
+    tail = [entry] * constants.CONVERSATION_HISTORY_TAIL_TURNS
+    history_loader = ols.conversation_history_loader(processed_request(tail))
+    with patch("ols.config.conversation_cache.get") as get:
+        get.return_value = [entry] * 15
+        history = history_loader(20)
+    get.assert_called_once_with(
+        constants.DEFAULT_USER_UID, conversation_id, False, limit=20
+    )
+    assert history == [HumanMessage("query"), AIMessage("response")] * 15
+
+
 @pytest.mark.usefixtures("_load_config")
 def test_retrieve_attachments_on_no_input():
     """Check the function to retrieve attachments from payload when attachments are not send."""
@@ -1448,3 +1500,54 @@ def test_get_available_quotas_two_quota_limiters():
         "MockQuotaLimiter1": 10,
         "MockQuotaLimiter2": 20,
     }
+
+
+@pytest.mark.usefixtures("_load_config")
+def test_validate_requested_rag_indexes():
+    """Test the function validate_requested_rag_indexes."""
+    config.ols_config.reference_content.indexes = [
+        ReferenceContentIndex({"name": "ocp", "product_docs_index_id": "ocp-4.15"}),
+        ReferenceContentIndex({"name": "aap", "product_docs_index_id": "aap-2.4"}),
+    ]
+
+    # indexes are not specified in request
+    ols.validate_requested_rag_indexes(LLMRequest(query="q"))
+
+    # known indexes
+    ols.validate_requested_rag_indexes(LLMRequest(query="q", rag_indexes=["aap"]))
+
+    # unknown index
+    with pytest.raises(HTTPException, match="Unable to process this request"):
+        ols.validate_requested_rag_indexes(
+            LLMRequest(query="q", rag_indexes=["aap", "rhel"])
+        )
+
+
+@pytest.mark.usefixtures("_load_config")
+def test_select_rag_index():
+    """Test the function select_rag_index."""
+    multi_index = MultiIndex({"ocp": Mock(), "aap": Mock()})
+    config._rag_index = multi_index
+
+    # indexes are not specified in request
+    assert ols.select_rag_index(LLMRequest(query="q")) is multi_index
+
+    # RAG is disabled by request
+    assert ols.select_rag_index(LLMRequest(query="q", rag_indexes=[])) is None
+
+    # subset of indexes
+    selected = ols.select_rag_index(LLMRequest(query="q", rag_indexes=["aap"]))
+    assert selected.names == ["aap"]
+
+    # requested index is not loaded
+    assert ols.select_rag_index(LLMRequest(query="q", rag_indexes=["rhel"])) is None
+
+
+@pytest.mark.usefixtures("_load_config")
+def test_select_rag_index_single_index():
+    """Test the function select_rag_index when just one index is loaded."""
+    index = Mock()
+    config._rag_index = index
+
+    assert ols.select_rag_index(LLMRequest(query="q", rag_indexes=["ocp"])) is index
+    assert ols.select_rag_index(LLMRequest(query="q", rag_indexes=[])) is None
@@ -13,6 +13,7 @@ from ols.app.models.config import (
     AuthenticationConfig,
     Config,
     ConversationCacheConfig,
+    DeduplicationConfig,
     DevConfig,
     InMemoryCacheConfig,
     LLMProviders,
@@ -27,6 +28,7 @@ from ols.app.models.config import (
     QueryFilter,
     QuotaHandlersConfig,
     ReferenceContent,
+    ReferenceContentIndex,
     SseTransportConfig,
     StdioTransportConfig,
     TLSConfig,
@@ -1953,6 +1955,13 @@ def test_postgres_config_default_values():
     assert postgres_config.dbname == constants.POSTGRES_CACHE_DBNAME
     assert postgres_config.user == constants.POSTGRES_CACHE_USER
     assert postgres_config.max_entries == constants.POSTGRES_CACHE_MAX_ENTRIES
+    assert (
+        postgres_config.eviction_interval == constants.POSTGRES_CACHE_EVICTION_INTERVAL
+    )
+    assert postgres_config.local_cache_max_entries == 0
+    assert postgres_config.value_format == constants.CacheValueFormat.COMPACT
+    assert postgres_config.pool.min_size == constants.POSTGRES_POOL_MIN_SIZE
+    assert postgres_config.pool.max_size == constants.POSTGRES_POOL_MAX_SIZE
 
 
 def test_postgres_config_correct_values():
@@ -1989,6 +1998,17 @@ def test_postgres_config_wrong_port():
         )
 
 
+def test_postgres_config_pool():
+    """Test the pool settings of PostgresConfig model."""
+    postgres_config = PostgresConfig(pool={"max_size": 5, "timeout": 3})
+    assert postgres_config.pool.max_size == 5
+    assert postgres_config.pool.timeout == 3
+    assert postgres_config.pool.max_lifetime == constants.POSTGRES_POOL_MAX_LIFETIME
+
+    with pytest.raises(ValidationError, match="min_size of the pool"):
+        PostgresConfig(pool={"min_size": 5, "max_size": 2})
+
+
 def test_postgres_config_equality():
     """Test the PostgresConfig equality check."""
     postgres_config_1 = PostgresConfig()
@@ -2032,6 +2052,20 @@ def test_memory_cache_config():
 
     memory_cache_config = InMemoryCacheConfig()
     assert memory_cache_config.max_entries is None
+    assert memory_cache_config.max_bytes is None
+    assert memory_cache_config.shards == constants.IN_MEMORY_CACHE_SHARDS
+
+    memory_cache_config = InMemoryCacheConfig({"max_bytes": 1024, "shards": 4})
+    assert memory_cache_config.max_bytes == 1024
+    assert memory_cache_config.shards == 4
+    assert memory_cache_config.snapshot_path is None
+    assert memory_cache_config.snapshot_interval is None
+
+    memory_cache_config = InMemoryCacheConfig(
+        {"snapshot_path": "data/snapshot", "snapshot_interval": "300"}
+    )
+    assert memory_cache_config.snapshot_path == "data/snapshot"
+    assert memory_cache_config.snapshot_interval == 300
 
 
 def test_memory_cache_config_improper_entries():
@@ -2047,6 +2081,22 @@ def test_memory_cache_config_improper_entries():
         )
 
 
+@pytest.mark.parametrize("option", ["max_bytes", "shards", "snapshot_interval"])
+def test_memory_cache_config_improper_limits(option):
+    """Test the MemoryCacheConfig model if improper positive integer is used."""
+    with pytest.raises(
+        InvalidConfigurationError,
+        match=f"invalid {option} for memory conversation cache",
+    ):
+        InMemoryCacheConfig({option: 0, "snapshot_path": "data/snapshot"})
+
+
+def test_memory_cache_config_snapshot_interval_without_path():
+    """Test that periodic snapshot requires snapshot path."""
+    with pytest.raises(InvalidConfigurationError, match="requires snapshot_path"):
+        InMemoryCacheConfig({"snapshot_interval": 60})
+
+
 def test_memory_config_equality():
     """Test the MemoryConfig equality check."""
     memory_config_1 = InMemoryCacheConfig()
@@ -2096,10 +2146,19 @@ def test_conversation_cache_config():
     assert conversation_cache_config.postgres.user == "user"
     assert conversation_cache_config.postgres.ssl_mode == "allow"
 
+    conversation_cache_config = ConversationCacheConfig(
+        {"type": "sqlite", "sqlite": {"path": "data/cache.db", "max_entries": 10}}
+    )
+    assert conversation_cache_config.type == "sqlite"
+    assert conversation_cache_config.sqlite.path == "data/cache.db"
+    assert conversation_cache_config.sqlite.max_entries == 10
+    assert conversation_cache_config.sqlite.timeout == constants.SQLITE_CACHE_TIMEOUT
+
     conversation_cache_config = ConversationCacheConfig()
     assert conversation_cache_config.type is None
     assert conversation_cache_config.memory is None
     assert conversation_cache_config.postgres is None
+    assert conversation_cache_config.sqlite is None
 
     with pytest.raises(
         InvalidConfigurationError,
@@ -2113,6 +2172,49 @@ def test_conversation_cache_config():
     ):
         ConversationCacheConfig({"type": "postgres"})
 
+    with pytest.raises(
+        InvalidConfigurationError,
+        match="SQLite conversation cache type is specified, but SQLite configuration is missing",
+    ):
+        ConversationCacheConfig({"type": "sqlite"})
+
+    with pytest.raises(ValidationError, match="path"):
+        ConversationCacheConfig({"type": "sqlite", "sqlite": {}})
+
+
+def test_conversation_cache_config_ttl():
+    """Test the ConversationCacheConfig expiration settings."""
+    conversation_cache_config = ConversationCacheConfig(
+        {"type": "memory", "memory": {}}
+    )
+    assert conversation_cache_config.idle_ttl is None
+    assert conversation_cache_config.absolute_ttl is None
+    assert (
+        conversation_cache_config.sweep_interval
+        == constants.CONVERSATION_CACHE_SWEEP_INTERVAL
+    )
+
+    conversation_cache_config = ConversationCacheConfig(
+        {
+            "type": "memory",
+            "memory": {},
+            "idle_ttl": "3600",
+            "absolute_ttl": 86400,
+            "sweep_interval": 10,
+        }
+    )
+    assert conversation_cache_config.idle_ttl == 3600
+    assert conversation_cache_config.absolute_ttl == 86400
+    assert conversation_cache_config.sweep_interval == 10
+
+    for name in ("idle_ttl", "absolute_ttl", "sweep_interval"):
+        for value in (0, -1, "foo"):
+            with pytest.raises(
+                InvalidConfigurationError,
+                match=f"{name} needs to be a positive integer",
+            ):
+                ConversationCacheConfig({"type": "memory", "memory": {}, name: value})
+
 
 def test_conversation_cache_config_validation():
     """Test the ConversationCacheConfig validation."""
@@ -2145,6 +2247,10 @@ def test_conversation_cache_config_equality():
     conversation_cache_config_2.type = "some non-default type"
     assert conversation_cache_config_1 != conversation_cache_config_2
 
+    conversation_cache_config_2.type = conversation_cache_config_1.type
+    conversation_cache_config_2.idle_ttl = 60
+    assert conversation_cache_config_1 != conversation_cache_config_2
+
     # compare with value of different type
     other_value = "foo"
     assert conversation_cache_config_1 != other_value
@@ -2905,6 +3011,230 @@ def test_reference_content_yaml_validation():
     reference_content.validate_yaml()
 
 
+def test_reference_content_index_constructor():
+    """Test the ReferenceContentIndex constructor."""
+    index = ReferenceContentIndex(
+        {
+            "product_docs_index_id": "id",
+            "product_docs_index_path": "/path/1/",
+            "keywords": ["OpenShift", "oc"],
+            "description": "OpenShift documentation",
+        }
+    )
+    # index ID is used as a name by default
+    assert index.name == "id"
+    assert index.product_docs_index_id == "id"
+    assert index.product_docs_index_path == "/path/1/"
+    assert index.keywords == ["openshift", "oc"]
+    assert index.description == "OpenShift documentation"
+
+
+def test_reference_content_index_yaml_validation():
+    """Test the ReferenceContentIndex YAML validation method."""
+    index = ReferenceContentIndex(
+        {"product_docs_index_id": "id", "product_docs_index_path": "."}
+    )
+    # should not raise an exception
+    index.validate_yaml(VectorStoreType.FAISS)
+
+    # non-existing docs index path
+    index.product_docs_index_path = "foo"
+    with pytest.raises(InvalidConfigurationError):
+        index.validate_yaml(VectorStoreType.FAISS)
+
+    # docs index path is not needed for postgres
+    index.product_docs_index_path = None
+    index.validate_yaml(VectorStoreType.POSTGRES)
+    with pytest.raises(InvalidConfigurationError, match="path is missing"):
+        index.validate_yaml(VectorStoreType.FAISS)
+
+    # index ID is always required
+    index.product_docs_index_id = None
+    with pytest.raises(InvalidConfigurationError, match="id is missing"):
+        index.validate_yaml(VectorStoreType.POSTGRES)
+
+
+def test_reference_content_multiple_indexes():
+    """Test the ReferenceContent with multiple indexes."""
+    reference_content = ReferenceContent(
+        {
+            "product_docs_index_id": "ocp",
+            "product_docs_index_path": ".",
+            "indexes": [
+                {"name": "aap", "product_docs_index_id": "aap-2.4"},
+                {"name": "rhel", "product_docs_index_id": "rhel-9"},
+            ],
+            "index_routing": "keyword",
+        }
+    )
+    assert reference_content.index_routing == "keyword"
+    assert [index.name for index in reference_content.get_indexes()] == [
+        "ocp",
+        "aap",
+        "rhel",
+    ]
+
+    # indexes stored in FAISS need to have path specified
+    with pytest.raises(InvalidConfigurationError, match="path is missing"):
+        reference_content.validate_yaml()
+
+    for index in reference_content.indexes:
+        index.product_docs_index_path = "."
+    # should not raise an exception
+    reference_content.validate_yaml()
+
+    # index names must be unique
+    reference_content.indexes[1].name = "ocp"
+    with pytest.raises(InvalidConfigurationError, match="must be unique"):
+        reference_content.validate_yaml()
+
+    # unknown routing method
+    reference_content.indexes[1].name = "rhel"
+    reference_content.index_routing = "foo"
+    with pytest.raises(InvalidConfigurationError, match="invalid index routing"):
+        reference_content.validate_yaml()
+
+
+def test_reference_content_hybrid_retrieval():
+    """Test the ReferenceContent with hybrid retrieval enabled."""
+    reference_content = ReferenceContent(
+        {
+            "product_docs_index_id": "ocp",
+            "product_docs_index_path": ".",
+            "hybrid_retrieval": True,
+        }
+    )
+    assert reference_content.hybrid_retrieval
+    assert reference_content != ReferenceContent(
+        {"product_docs_index_id": "ocp", "product_docs_index_path": "."}
+    )
+    # should not raise an exception
+    reference_content.validate_yaml()
+
+    # hybrid retrieval is not supported for postgres
+    reference_content.vector_store_type = VectorStoreType.POSTGRES
+    reference_content.postgres = PostgresConfig()
+    with pytest.raises(InvalidConfigurationError, match="faiss"):
+        reference_content.validate_yaml()
+
+
+def test_reference_content_reranker():
+    """Test the ReferenceContent with reranker configured."""
+    reference_content = ReferenceContent(
+        {"reranker": {"model_path": ".", "candidates": 10, "top_n": 3}}
+    )
+    assert reference_content.reranker.candidates == 10
+    assert reference_content.reranker.top_n == 3
+    assert (
+        reference_content.reranker.latency_budget_ms
+        == constants.RERANKER_LATENCY_BUDGET_MS
+    )
+
+    # more chunks than candidates can not be selected
+    with pytest.raises(ValidationError, match="top_n"):
+        ReferenceContent({"reranker": {"model_path": ".", "candidates": 2}})
+
+    # model path needs to be a directory
+    with pytest.raises(ValidationError):
+        ReferenceContent({"reranker": {"model_path": "/dev/null"}})
+
+
+def test_reference_content_pgvector():
+    """Test the ReferenceContent with pgvector store configured."""
+    reference_content = ReferenceContent(
+        {
+            "product_docs_index_id": "ocp",
+            "vector_store_type": "postgres",
+            "postgres": {},
+            "pgvector": {"pool_size": 5, "index_type": "ivfflat"},
+        }
+    )
+    assert reference_content.pgvector.pool_size == 5
+    assert reference_content.pgvector.index_type == constants.PGVectorIndexType.IVFFLAT
+    assert reference_content.pgvector.ef_search == constants.PGVECTOR_HNSW_EF_SEARCH
+    assert reference_content != ReferenceContent(
+        {
+            "product_docs_index_id": "ocp",
+            "vector_store_type": "postgres",
+            "postgres": {},
+        }
+    )
+
+    # unknown index type
+    with pytest.raises(ValidationError):
+        ReferenceContent({"pgvector": {"index_type": "flat"}})
+
+    # pool needs at least one connection
+    with pytest.raises(ValidationError):
+        ReferenceContent({"pgvector": {"pool_size": 0}})
+
+
+def test_reference_content_docstore():
+    """Test the ReferenceContent with SQLite docstore configured."""
+    reference_content = ReferenceContent(
+        {
+            "product_docs_index_id": "ocp",
+            "product_docs_index_path": ".",
+            "docstore": {"type": "sqlite", "cache_size": 100},
+        }
+    )
+    assert reference_content.docstore.type == constants.DocstoreType.SQLITE
+    assert reference_content.docstore.cache_size == 100
+    # should not raise an exception
+    reference_content.validate_yaml()
+
+    # unknown docstore type
+    with pytest.raises(ValidationError):
+        ReferenceContent({"docstore": {"type": "redis"}})
+
+    # SQLite docstore is not supported for postgres
+    reference_content.vector_store_type = VectorStoreType.POSTGRES
+    reference_content.postgres = PostgresConfig()
+    with pytest.raises(InvalidConfigurationError, match="docstore"):
+        reference_content.validate_yaml()
+
+
+def test_reference_content_deduplication():
+    """Test the ReferenceContent with deduplication of chunks configured."""
+    reference_content = ReferenceContent({"deduplication": {"mmr": True}})
+    assert reference_content.deduplication.mmr
+    assert reference_content.deduplication.mmr_lambda == constants.RAG_MMR_LAMBDA
+    assert (
+        reference_content.deduplication.similarity_threshold
+        == constants.RAG_DEDUPLICATION_SIMILARITY_THRESHOLD
+    )
+    assert reference_content != ReferenceContent({})
+
+    with pytest.raises(ValidationError, match="similarity_threshold"):
+        DeduplicationConfig(similarity_threshold=0)
+    with pytest.raises(ValidationError, match="mmr_lambda"):
+        DeduplicationConfig(mmr_lambda=1.5)
+
+
+def test_reference_content_retrieval_depth():
+    """Test the ReferenceContent with retrieval depth configured."""
+    reference_content = ReferenceContent({"retrieval_depth": {"max_top_k": 10}})
+    assert reference_content.retrieval_depth.min_top_k == constants.RAG_MIN_TOP_K
+    assert reference_content.retrieval_depth.max_top_k == 10
+    assert reference_content != ReferenceContent({})
+
+    with pytest.raises(ValidationError, match="min_top_k"):
+        ReferenceContent({"retrieval_depth": {"min_top_k": 10, "max_top_k": 5}})
+
+
+def test_reference_content_retrieval_sidecar():
+    """Test the ReferenceContent with retrieval sidecar configured."""
+    reference_content = ReferenceContent(
+        {"retrieval_sidecar": {"socket_path": "/run/ols/retrieval.sock"}}
+    )
+    assert reference_content.retrieval_sidecar.socket_path == "/run/ols/retrieval.sock"
+    assert (
+        reference_content.retrieval_sidecar.timeout
+        == constants.RETRIEVAL_SIDECAR_TIMEOUT
+    )
+    assert reference_content != ReferenceContent({})
+
+
 def test_config_no_query_filter_node():
     """Test the Config model when query filter is not set at all."""
     config = Config(
@@ -3282,6 +3612,26 @@ def test_authentication_config_validation_proper_config():
     )
 
 
+def test_authentication_config_review_cache():
+    """Test the configuration of the cache of token and access reviews."""
+    cfg = AuthenticationConfig()
+    assert cfg.review_cache_ttl == constants.AUTH_REVIEW_CACHE_TTL
+    assert cfg.review_cache_negative_ttl == constants.AUTH_REVIEW_CACHE_NEGATIVE_TTL
+    assert cfg.review_cache_max_entries == constants.AUTH_REVIEW_CACHE_MAX_ENTRIES
+
+    cfg = AuthenticationConfig(
+        review_cache_ttl=0, review_cache_negative_ttl=5, review_cache_max_entries=10
+    )
+    assert cfg.review_cache_ttl == 0
+    assert cfg.review_cache_negative_ttl == 5
+    assert cfg.review_cache_max_entries == 10
+
+    with pytest.raises(ValidationError):
+        AuthenticationConfig(review_cache_ttl=-1)
+    with pytest.raises(ValidationError):
+        AuthenticationConfig(review_cache_max_entries=0)
+
+
 def test_authentication_config_wrong_module():
     """Test method to validate authentication config when wrong module is specified."""
     #  no module
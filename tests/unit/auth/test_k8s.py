@@ -1,6 +1,8 @@
 """Unit tests for auth/k8s module."""
 
+import asyncio
 import os
+import threading
 from typing import Optional
 from unittest.mock import MagicMock, patch
 
@@ -15,6 +17,8 @@ from ols.src.auth.k8s import (
     AuthDependency,
     ClusterIDUnavailableError,
     K8sClientSingleton,
+    ReviewCache,
+    review_cache,
 )
 from tests.mock_classes.mock_k8s_api import (
     MockK8sResponseStatus,
@@ -33,6 +37,12 @@ def _setup():
     auth_dependency = AuthDependency(virtual_path="/ols-access")
 
 
+@pytest.fixture(autouse=True)
+def _clear_review_cache():
+    """Start every test without cached reviews."""
+    review_cache.clear()
+
+
 @pytest.mark.usefixtures("_setup")
 def test_singleton_pattern():
     """Test if K8sClientSingleton is really a singleton."""
@@ -125,7 +135,7 @@ async def test_cluster_id_is_used_for_kube_admin():
 
         with (
             patch(
-                "ols.src.auth.k8s.get_user_info",
+                "ols.src.auth.k8s._review_token",
                 return_value=MockK8sResponseStatus(
                     True, True, "kube:admin", "some-uuid", "ols-group"
                 ),
@@ -222,3 +232,163 @@ def test_get_cluster_id_outside_of_cluster():
         # ensure cluster_id is None to trigger the condition
         K8sClientSingleton._cluster_id = None
         assert K8sClientSingleton.get_cluster_id() == CLUSTER_ID_LOCAL
+
+
+def valid_token_request():
+    """Request with the valid token."""
+    return Request(
+        scope={"type": "http", "headers": [(b"authorization", b"Bearer valid-token")]}
+    )
+
+
+@pytest.mark.usefixtures("_setup")
+@pytest.mark.asyncio
+async def test_auth_dependency_reuses_reviews():
+    """Test that reviews of the token are reused by following requests."""
+    with (
+        patch("ols.src.auth.k8s.K8sClientSingleton.get_authn_api") as mock_authn_api,
+        patch("ols.src.auth.k8s.K8sClientSingleton.get_authz_api") as mock_authz_api,
+    ):
+        token_review = mock_authn_api.return_value.create_token_review
+        token_review.side_effect = mock_token_review_response
+        access_review = mock_authz_api.return_value.create_subject_access_review
+        access_review.side_effect = mock_subject_access_review_response
+
+        for _ in range(3):
+            user_uid, *_ = await auth_dependency(valid_token_request())
+            assert user_uid == "valid-uid"
+        assert token_review.call_count == 1
+        assert access_review.call_count == 1
+
+        # access to another path is reviewed, the token is not
+        other_path = AuthDependency(virtual_path="/ols-metrics-access")
+        await other_path(valid_token_request())
+        assert token_review.call_count == 1
+        assert access_review.call_count == 2
+        assert (
+            access_review.call_args.args[0].spec.non_resource_attributes.path
+            == "/ols-metrics-access"
+        )
+
+        # token is not kept in the cache
+        assert "valid-token" not in str(list(review_cache._entries))
+
+
+@pytest.mark.usefixtures("_setup")
+@pytest.mark.asyncio
+async def test_auth_dependency_reuses_rejected_reviews():
+    """Test that rejected tokens are reviewed again after negative TTL only."""
+    auth_config = config.ols_config.authentication_config
+    with (
+        patch("ols.src.auth.k8s.K8sClientSingleton.get_authn_api") as mock_authn_api,
+        patch("ols.src.auth.k8s.time.monotonic", return_value=1000.0) as mock_time,
+    ):
+        token_review = mock_authn_api.return_value.create_token_review
+        token_review.side_effect = mock_token_review_response
+        request = Request(
+            scope={
+                "type": "http",
+                "headers": [(b"authorization", b"Bearer invalid-token")],
+            }
+        )
+
+        for _ in range(2):
+            with pytest.raises(HTTPException, match="Invalid or expired token"):
+                await auth_dependency(request)
+        assert token_review.call_count == 1
+
+        mock_time.return_value += auth_config.review_cache_negative_ttl
+        with pytest.raises(HTTPException, match="Invalid or expired token"):
+            await auth_dependency(request)
+        assert token_review.call_count == 2
+
+
+@pytest.mark.usefixtures("_setup")
+@pytest.mark.asyncio
+async def test_auth_dependency_does_not_cache_errors():
+    """Test that reviews failed on API errors are performed again."""
+    with (
+        patch("ols.src.auth.k8s.K8sClientSingleton.get_authn_api") as mock_authn_api,
+        patch("ols.src.auth.k8s.K8sClientSingleton.get_authz_api") as mock_authz_api,
+    ):
+        token_review = mock_authn_api.return_value.create_token_review
+        token_review.side_effect = ApiException(status=500)
+        access_review = mock_authz_api.return_value.create_subject_access_review
+        access_review.side_effect = ApiException(status=500)
+
+        with pytest.raises(HTTPException, match="Invalid or expired token"):
+            await auth_dependency(valid_token_request())
+
+        token_review.side_effect = mock_token_review_response
+        with pytest.raises(HTTPException, match="Internal server error"):
+            await auth_dependency(valid_token_request())
+
+        access_review.side_effect = mock_subject_access_review_response
+        user_uid, *_ = await auth_dependency(valid_token_request())
+        assert user_uid == "valid-uid"
+        assert token_review.call_count == 2
+        assert access_review.call_count == 2
+
+
+@pytest.mark.usefixtures("_setup")
+@pytest.mark.asyncio
+async def test_auth_dependency_review_cache_disabled():
+    """Test that reviews are not cached with zero TTL."""
+    config.ols_config.authentication_config.review_cache_ttl = 0
+    with (
+        patch("ols.src.auth.k8s.K8sClientSingleton.get_authn_api") as mock_authn_api,
+        patch("ols.src.auth.k8s.K8sClientSingleton.get_authz_api") as mock_authz_api,
+    ):
+        token_review = mock_authn_api.return_value.create_token_review
+        token_review.side_effect = mock_token_review_response
+        mock_authz_api.return_value.create_subject_access_review.side_effect = (
+            mock_subject_access_review_response
+        )
+
+        await auth_dependency(valid_token_request())
+        await auth_dependency(valid_token_request())
+
+        assert token_review.call_count == 2
+        assert len(review_cache) == 0
+
+
+@pytest.mark.usefixtures("_setup")
+@pytest.mark.asyncio
+async def test_review_cache_coalesces_lookups():
+    """Test that concurrent lookups of the same key wait for one review."""
+    cache = ReviewCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def review(value):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        return value
+
+    lookups = [asyncio.ensure_future(cache.get("key", review, i)) for i in range(5)]
+    await asyncio.to_thread(started.wait, 5)
+    release.set()
+
+    assert await asyncio.gather(*lookups) == [0] * 5
+    assert calls == [0]
+    assert await cache.get("key", review, 1) == 0
+    assert calls == [0]
+
+
+@pytest.mark.usefixtures("_setup")
+@pytest.mark.asyncio
+async def test_review_cache_max_entries():
+    """Test that the least recently used results are dropped."""
+    config.ols_config.authentication_config.review_cache_max_entries = 2
+    cache = ReviewCache()
+
+    await cache.get("a", str, "a")
+    await cache.get("b", str, "b")
+    await cache.get("a", str, "x")
+    await cache.get("c", str, "c")
+
+    assert len(cache) == 2
+    assert await cache.get("a", str, "x") == "a"
+    assert await cache.get("b", str, "y") == "y"
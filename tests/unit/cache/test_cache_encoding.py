@@ -0,0 +1,103 @@
+"""Unit tests for encoding of cache entries."""
+
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ols import constants
+from ols.app.models.models import Attachment, CacheEntry, MessageEncoder
+from ols.src.cache.cache_encoding import (
+    attachment_digest,
+    decode_cache_entry,
+    encode_cache_entry,
+)
+
+cache_entry = CacheEntry(
+    query=HumanMessage("how do I scale deployment?"),
+    response=AIMessage(
+        "Use `oc scale`.",
+        response_metadata={"finish_reason": "stop"},
+        additional_kwargs={"refusal": None},
+    ),
+    attachments=[
+        Attachment(
+            attachment_type="configuration",
+            content_type="application/yaml",
+            content="kind: Deployment\nmetadata:\n  name: čaj\n",
+        )
+    ],
+)
+
+
+@pytest.mark.parametrize(
+    "value_format",
+    [constants.CacheValueFormat.COMPACT, constants.CacheValueFormat.JSON],
+)
+def test_round_trip(value_format):
+    """Test that decoded entry is the same as the encoded one."""
+    value = encode_cache_entry(cache_entry, value_format)
+
+    decoded = CacheEntry.from_dict(decode_cache_entry(value))
+
+    assert decoded == cache_entry
+    assert decoded.response.response_metadata == {"finish_reason": "stop"}
+    assert decoded.response.additional_kwargs == {"refusal": None}
+
+
+def test_decode_json_format():
+    """Test that values stored by older versions are readable."""
+    value = json.dumps(cache_entry.to_dict(), cls=MessageEncoder).encode("utf-8")
+
+    assert CacheEntry.from_dict(decode_cache_entry(value)) == cache_entry
+
+
+def test_compact_format_is_smaller():
+    """Test that compact format is versioned and smaller than JSON."""
+    entry = CacheEntry(
+        query=HumanMessage("what is a pod? " * 20), response=AIMessage("pod " * 200)
+    )
+    compact = encode_cache_entry(entry)
+    legacy = encode_cache_entry(entry, constants.CacheValueFormat.JSON)
+
+    assert compact[0] == 1
+    assert len(compact) < len(legacy) / 4
+
+
+def test_external_attachments():
+    """Test that attachment content can be stored outside of the entry."""
+    value = encode_cache_entry(cache_entry, external_attachments=True)
+
+    assert value[0] == 2
+    content = cache_entry.attachments[0].content
+    decoded = decode_cache_entry(value, [content])
+    assert CacheEntry.from_dict(decoded) == cache_entry
+
+
+def test_external_attachments_missing_content():
+    """Test that attachment with content no longer stored is read empty."""
+    value = encode_cache_entry(cache_entry, external_attachments=True)
+
+    attachments = decode_cache_entry(value)["attachments"]
+
+    assert attachments == [
+        {
+            "attachment_type": "configuration",
+            "content_type": "application/yaml",
+            "content": "",
+        }
+    ]
+
+
+def test_attachment_digest():
+    """Test that the same content has the same digest."""
+    assert attachment_digest("kind: Pod") == attachment_digest("kind: Pod")
+    assert attachment_digest("kind: Pod") != attachment_digest("kind: Job")
+    assert len(attachment_digest("")) == 64
+
+
+@pytest.mark.parametrize("value", [b"", b"\x7f..."])
+def test_decode_unknown_format(value):
+    """Test that value in unknown format is refused."""
+    with pytest.raises(ValueError, match="Unknown format of cache entry"):
+        decode_cache_entry(value)
@@ -10,6 +10,8 @@ from ols.src.cache.cache_factory import (
     CacheFactory,
     InMemoryCache,
     PostgresCache,
+    SQLiteCache,
+    TieredCache,
 )
 
 
@@ -62,7 +64,58 @@ def test_conversation_cache_in_postgres(postgres_cache_config):
     assert isinstance(cache, PostgresCache), type(cache)
 
 
+def test_conversation_cache_in_postgres_with_local_cache():
+    """Check if TieredCache is returned when local cache is enabled."""
+    config = ConversationCacheConfig(
+        {
+            "type": constants.CACHE_TYPE_POSTGRES,
+            constants.CACHE_TYPE_POSTGRES: {"local_cache_max_entries": 100},
+        }
+    )
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect"):
+        cache = CacheFactory.conversation_cache(config)
+
+    assert isinstance(cache, TieredCache), type(cache)
+    assert isinstance(cache.remote, PostgresCache)
+    assert cache.capacity == 100
+
+
+def test_conversation_cache_in_postgres_with_ttl():
+    """Check if expiration settings are passed to the cache."""
+    config = ConversationCacheConfig(
+        {
+            "type": constants.CACHE_TYPE_POSTGRES,
+            constants.CACHE_TYPE_POSTGRES: {},
+            "idle_ttl": 3600,
+            "absolute_ttl": 86400,
+        }
+    )
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect"):
+        cache = CacheFactory.conversation_cache(config)
+
+    assert cache.idle_ttl == 3600
+    assert cache.absolute_ttl == 86400
+
+
 def test_conversation_cache_wrong_cache(invalid_cache_type_config):
     """Check if wrong cache configuration is detected properly."""
     with pytest.raises(ValueError, match="Invalid cache type"):
         CacheFactory.conversation_cache(invalid_cache_type_config)
+
+
+def test_conversation_cache_in_sqlite(tmp_path):
+    """Check if SQLiteCache is returned by factory with proper configuration."""
+    config = ConversationCacheConfig(
+        {
+            "type": constants.CACHE_TYPE_SQLITE,
+            constants.CACHE_TYPE_SQLITE: {"path": str(tmp_path / "cache.db")},
+            "idle_ttl": 3600,
+        }
+    )
+    cache = CacheFactory.conversation_cache(config)
+
+    assert isinstance(cache, SQLiteCache), type(cache)
+    assert cache.capacity == constants.SQLITE_CACHE_MAX_ENTRIES
+    assert cache.idle_ttl == 3600
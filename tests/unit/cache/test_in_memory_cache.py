@@ -1,5 +1,8 @@
 """Unit tests for InMemoryCache class."""
 
+import threading
+from unittest.mock import patch
+
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage
 
@@ -96,6 +99,21 @@ def test_insert_or_append_overflow(cache):
     )
 
 
+def test_get_tail(cache):
+    """Test that only the most recent entries are returned when limit is set."""
+    cache.insert_or_append(constants.DEFAULT_USER_UID, conversation_id, cache_entry_1)
+    cache.insert_or_append(constants.DEFAULT_USER_UID, conversation_id, cache_entry_2)
+
+    assert cache.get(constants.DEFAULT_USER_UID, conversation_id, limit=1) == [
+        cache_entry_2
+    ]
+    assert cache.get(constants.DEFAULT_USER_UID, conversation_id, limit=5) == [
+        cache_entry_1,
+        cache_entry_2,
+    ]
+    assert cache.get(constants.DEFAULT_USER_UID, conversation_id, limit=0) == []
+
+
 def test_get_nonexistent_user(cache):
     """Test how non-existent items are handled by the cache."""
     # this UUID is different from DEFAULT_USER_UID
@@ -277,3 +295,232 @@ def test_singleton_pattern():
     cache1 = InMemoryCache(mc)
     cache2 = InMemoryCache(mc)
     assert cache1 is cache2
+
+
+def test_get_refreshes_conversation(cache):
+    """Test that the least recently used conversation is evicted, not the oldest."""
+    cache.capacity = 2
+    conversation_ids = [suid.get_suid() for _ in range(3)]
+    cache.insert_or_append(
+        constants.DEFAULT_USER_UID, conversation_ids[0], cache_entry_1
+    )
+    cache.insert_or_append(
+        constants.DEFAULT_USER_UID, conversation_ids[1], cache_entry_1
+    )
+
+    cache.get(constants.DEFAULT_USER_UID, conversation_ids[0])
+    cache.insert_or_append(
+        constants.DEFAULT_USER_UID, conversation_ids[2], cache_entry_1
+    )
+
+    assert cache.get(constants.DEFAULT_USER_UID, conversation_ids[1]) is None
+    assert cache.get(constants.DEFAULT_USER_UID, conversation_ids[0]) == [cache_entry_1]
+    assert cache.size == 2
+    assert [c["conversation_id"] for c in cache.list(constants.DEFAULT_USER_UID)] == [
+        conversation_ids[0],
+        conversation_ids[2],
+    ]
+
+
+def test_max_bytes_overflow():
+    """Test that conversations over the size limit are evicted."""
+    mc = InMemoryCacheConfig({"max_entries": 100, "max_bytes": 100, "shards": 4})
+    cache = InMemoryCache(mc)
+    cache.initialize_cache(mc)
+    entry = CacheEntry(query=HumanMessage("q" * 20), response=AIMessage("a" * 20))
+
+    for i in range(3):
+        cache.insert_or_append(f"user{i}", conversation_id, entry, "", True)
+
+    assert cache.size == 2
+    assert cache.bytes == 80
+    assert cache.get("user0", conversation_id, True) is None
+    assert cache.get("user2", conversation_id, True) == [entry]
+
+
+def test_concurrent_access():
+    """Test that the cache stays consistent when used by many threads."""
+    mc = InMemoryCacheConfig({"max_entries": 50, "shards": 4})
+    cache = InMemoryCache(mc)
+    cache.initialize_cache(mc)
+    conversation_ids = [suid.get_suid() for _ in range(20)]
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(300):
+                user_id = f"user{(n + i) % 10}"
+                conv_id = conversation_ids[i % len(conversation_ids)]
+                cache.insert_or_append(user_id, conv_id, cache_entry_1, "", True)
+                cache.get(user_id, conv_id, True)
+                cache.list(user_id, True)
+                if i % 7 == 0:
+                    cache.delete(user_id, conv_id, True)
+        except Exception as e:  # pylint: disable=W0718
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    conversations = [
+        conversation
+        for shard in cache._shards
+        for conversation in shard.conversations.values()
+    ]
+    assert cache.size == len(conversations) <= 50
+    assert cache.bytes == sum(conversation.size for conversation in conversations)
+    assert sum(len(conv.history) for conv in conversations) > 0
+
+
+def test_expire():
+    """Test that conversations expire after their idle or absolute TTL."""
+    mc = InMemoryCacheConfig({"max_entries": 10})
+    cache = InMemoryCache(mc)
+    conversation_ids = [suid.get_suid() for _ in range(3)]
+    cache.initialize_cache(mc, idle_ttl=100, absolute_ttl=1000)
+    with patch("ols.src.cache.in_memory_cache.time.time") as mock_time:
+        for i, conv_id in enumerate(conversation_ids):
+            mock_time.return_value = 1000.0 + i * 10
+            cache.insert_or_append(
+                user_provided_user_id, conv_id, cache_entry_1, "", True
+            )
+        # the first conversation is kept active
+        for now in range(1050, 2000, 50):
+            mock_time.return_value = float(now)
+            cache.get(user_provided_user_id, conversation_ids[0], True)
+
+        assert cache.expire(now=1100.0) == 0
+        # not used for more than idle TTL
+        assert cache.expire(now=1125.0) == 2
+        assert cache.size == 1
+        # created more than absolute TTL ago, even when active
+        assert cache.expire(now=1999.0) == 0
+        assert cache.expire(now=2000.0) == 1
+
+    assert cache.size == 0
+    assert cache.bytes == 0
+    assert cache.list(user_provided_user_id, True) == []
+
+
+def test_expire_disabled(cache):
+    """Test that conversations do not expire without TTL."""
+    cache.insert_or_append(
+        user_provided_user_id, conversation_id, cache_entry_1, "", True
+    )
+
+    assert cache.expire(now=10**12) == 0
+    assert cache.size == 1
+
+
+@pytest.fixture
+def without_snapshot():
+    """Reinitialize the cache singleton without snapshot after the test."""
+    yield
+    mc = InMemoryCacheConfig({"max_entries": "10"})
+    InMemoryCache(mc).initialize_cache(mc)
+
+
+@pytest.mark.usefixtures("without_snapshot")
+def test_snapshot(tmp_path):
+    """Test that conversations are restored from snapshot in LRU order."""
+    path = str(tmp_path / "snapshot")
+    mc = InMemoryCacheConfig({"max_entries": 10, "shards": 4})
+    cache = InMemoryCache(mc)
+    cache.initialize_cache(mc)
+    users = [f"user{i}" for i in range(5)]
+    for user in users:
+        cache.insert_or_append(user, conversation_id, cache_entry_1, user, True)
+    cache.insert_or_append(users[1], conversation_id, cache_entry_2, "", True)
+    # the first user's conversation becomes the most recently used
+    cache.get(users[0], conversation_id, True)
+
+    assert cache.save_snapshot(path) == 5
+
+    restored_config = InMemoryCacheConfig(
+        {"max_entries": 4, "shards": 2, "snapshot_path": path}
+    )
+    cache.initialize_cache(restored_config)
+
+    # the least recently used conversation did not fit into the capacity
+    assert cache.size == 4
+    assert cache.get(users[2], conversation_id, True) is None
+    assert cache.get(users[0], conversation_id, True) == [cache_entry_1]
+    assert cache.get(users[1], conversation_id, True) == [cache_entry_1, cache_entry_2]
+    assert cache.list(users[3], True) == [
+        {"conversation_id": conversation_id, "topic_summary": users[3]}
+    ]
+    assert cache.bytes == sum(
+        conversation.size
+        for shard in cache._shards
+        for conversation in shard.conversations.values()
+    )
+
+
+@pytest.mark.usefixtures("without_snapshot")
+def test_snapshot_keeps_expiration_times(tmp_path):
+    """Test that restored conversations keep their creation and access time."""
+    path = str(tmp_path / "snapshot")
+    mc = InMemoryCacheConfig({"max_entries": 10})
+    cache = InMemoryCache(mc)
+    cache.initialize_cache(mc)
+    with patch("ols.src.cache.in_memory_cache.time.time") as mock_time:
+        mock_time.return_value = 1000.0
+        cache.insert_or_append(
+            user_provided_user_id, conversation_id, cache_entry_1, "", True
+        )
+    cache.save_snapshot(path)
+
+    cache.initialize_cache(
+        InMemoryCacheConfig({"max_entries": 10, "snapshot_path": path}), idle_ttl=100
+    )
+
+    assert cache.size == 1
+    assert cache.expire(now=1101.0) == 1
+
+
+@pytest.mark.usefixtures("without_snapshot")
+@pytest.mark.parametrize("content", [b"", b"not a snapshot"])
+def test_snapshot_unreadable(tmp_path, content):
+    """Test that unreadable snapshot leaves the cache empty."""
+    path = tmp_path / "snapshot"
+    path.write_bytes(content)
+    mc = InMemoryCacheConfig({"max_entries": 10, "snapshot_path": str(path)})
+    cache = InMemoryCache(mc)
+    cache.initialize_cache(mc)
+
+    assert cache.size == 0
+    cache.insert_or_append(
+        user_provided_user_id, conversation_id, cache_entry_1, "", True
+    )
+    assert cache.save_snapshot() == 1
+    assert cache.load_snapshot(str(path)) == 1
+
+
+@pytest.mark.usefixtures("without_snapshot")
+def test_snapshot_save_failure(tmp_path):
+    """Test that failed save keeps the previous snapshot and no temporary file."""
+    path = tmp_path / "snapshot"
+    mc = InMemoryCacheConfig({"max_entries": 10, "snapshot_path": str(path)})
+    cache = InMemoryCache(mc)
+    cache.initialize_cache(mc)
+    cache.insert_or_append(
+        user_provided_user_id, conversation_id, cache_entry_1, "", True
+    )
+    assert cache.save_snapshot() == 1
+    snapshot = path.read_bytes()
+
+    cache.insert_or_append(
+        user_provided_user_id, conversation_id, cache_entry_2, "", True
+    )
+    with (
+        patch("ols.src.cache.in_memory_cache.os.replace", side_effect=OSError),
+        pytest.raises(OSError),
+    ):
+        cache.save_snapshot()
+
+    assert [p.name for p in tmp_path.iterdir()] == ["snapshot"]
+    assert path.read_bytes() == snapshot
@@ -1,20 +1,25 @@
 """Unit tests for PostgresCache class."""
 
 import json
-from unittest.mock import MagicMock, call, patch
+from datetime import datetime
+from unittest.mock import MagicMock, PropertyMock, call, patch
 
 import psycopg2
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage
+from prometheus_client import REGISTRY
 
 from ols.app.models.config import PostgresConfig
-from ols.app.models.models import CacheEntry, MessageDecoder, MessageEncoder
+from ols.app.models.models import Attachment, CacheEntry, MessageEncoder
+from ols.src.cache.cache_encoding import attachment_digest, encode_cache_entry
 from ols.src.cache.cache_error import CacheError
 from ols.src.cache.postgres_cache import PostgresCache
 from ols.utils import suid
+from ols.utils.connection_decorator import UnconfirmedWriteError
 
 user_id = suid.get_suid()
 conversation_id = suid.get_suid()
+updated_at = datetime(2025, 1, 1, 12, 0, 0)
 cache_entry_1 = CacheEntry(
     query=HumanMessage("用户消息"), response=AIMessage("人工智能信息")
 )
@@ -42,11 +47,34 @@ def test_init_cache_failure_detection():
         mock_connect.return_value.close.assert_called_once_with()
 
 
+@pytest.mark.parametrize("legacy_table_exists", [True, False])
+def test_init_cache_migration(legacy_table_exists):
+    """Test that conversations from legacy table are migrated."""
+    with patch("psycopg2.connect") as mock_connect:
+        mock_cursor = mock_connect.return_value.cursor.return_value
+        mock_cursor.fetchone.return_value = (legacy_table_exists,)
+
+        PostgresCache(PostgresConfig())
+
+    migration_calls = [
+        call(PostgresCache.MIGRATE_CONVERSATIONS_STATEMENT),
+        call(PostgresCache.MIGRATE_TURNS_STATEMENT),
+        call(PostgresCache.RENAME_LEGACY_TABLE_STATEMENT),
+    ]
+    mock_cursor.execute.assert_any_call(PostgresCache.MIGRATION_LOCK_STATEMENT)
+    if legacy_table_exists:
+        mock_cursor.execute.assert_has_calls(migration_calls, any_order=False)
+    else:
+        assert migration_calls[0] not in mock_cursor.execute.call_args_list
+    # migration is committed together with tables creation
+    mock_connect.return_value.commit.assert_called_once_with()
+
+
 def test_get_operation_on_empty_cache():
     """Test the Cache.get operation on empty cache."""
     # mock the query result - empty cache
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = None
+    mock_cursor.fetchall.return_value = []
 
     # do not use real PostgreSQL instance
     with patch("psycopg2.connect") as mock_connect:
@@ -62,11 +90,8 @@ def test_get_operation_on_empty_cache():
     conversation = cache.get(user_id, conversation_id)
     assert conversation == []
 
-    # multiple DB operations must be performed:
-    # 1. check if connection to DB is alive
-    # 2. select conversation from DB
+    # conversation is selected without checking the connection first
     calls = [
-        call("SELECT 1"),
         call(
             PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
             (user_id, conversation_id),
@@ -75,14 +100,14 @@ def test_get_operation_on_empty_cache():
     mock_cursor.execute.assert_has_calls(calls, any_order=False)
 
     # Verify the query execution
-    mock_cursor.fetchone.assert_called_once()
+    mock_cursor.fetchall.assert_called_once()
 
 
 def test_get_operation_invalid_value():
     """Test the Cache.get operation when invalid value is returned from cache."""
     # mock the query result
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = "Invalid value"
+    mock_cursor.fetchall.return_value = ["Invalid value"]
 
     # do not use real PostgreSQL instance
     with patch("psycopg2.connect") as mock_connect:
@@ -98,11 +123,8 @@ def test_get_operation_invalid_value():
         with pytest.raises(ValueError, match="Invalid value read from cache:"):
             cache.get(user_id, conversation_id)
 
-    # multiple DB operations must be performed:
-    # 1. check if connection to DB is alive
-    # 2. select conversation from DB
+    # conversation is selected without checking the connection first
     calls = [
-        call("SELECT 1"),
         call(
             PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
             (user_id, conversation_id),
@@ -111,7 +133,7 @@ def test_get_operation_invalid_value():
     mock_cursor.execute.assert_has_calls(calls, any_order=False)
 
     # Verify the query execution
-    mock_cursor.fetchone.assert_called_once()
+    mock_cursor.fetchall.assert_called_once()
 
 
 def test_get_operation_valid_value():
@@ -120,12 +142,20 @@ def test_get_operation_valid_value():
         cache_entry_1,
         cache_entry_2,
     ]
-    conversation = json.dumps([ce.to_dict() for ce in history], cls=MessageEncoder)
-    as_memview = memoryview(bytearray(conversation, "utf-8"))
+    # every turn is stored in its own row, older turns in JSON format
+    rows = [
+        (
+            memoryview(
+                json.dumps(cache_entry_1.to_dict(), cls=MessageEncoder).encode("utf-8")
+            ),
+            [],
+        ),
+        (memoryview(encode_cache_entry(cache_entry_2)), []),
+    ]
 
     # mock the query result
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = (as_memview,)
+    mock_cursor.fetchall.return_value = rows
 
     # do not use real PostgreSQL instance
     with patch("psycopg2.connect") as mock_connect:
@@ -141,11 +171,8 @@ def test_get_operation_valid_value():
     # unjsond history should be returned
     assert cache.get(user_id, conversation_id) == history
 
-    # multiple DB operations must be performed:
-    # 1. check if connection to DB is alive
-    # 2. select conversation from DB
+    # conversation is selected without checking the connection first
     calls = [
-        call("SELECT 1"),
         call(
             PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
             (user_id, conversation_id),
@@ -154,14 +181,48 @@ def test_get_operation_valid_value():
     mock_cursor.execute.assert_has_calls(calls, any_order=False)
 
     # Verify the query execution
-    mock_cursor.fetchone.assert_called_once()
+    mock_cursor.fetchall.assert_called_once()
+
+
+def test_get_operation_last_entries():
+    """Test the Cache.get operation when just the last entries are requested."""
+    rows = [
+        (
+            memoryview(
+                json.dumps(cache_entry_2.to_dict(), cls=MessageEncoder).encode()
+            ),
+            [],
+        )
+    ]
+
+    # mock the query result
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = rows
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+
+        # initialize Postgres cache
+        config = PostgresConfig()
+        cache = PostgresCache(config)
+
+    assert cache.get(user_id, conversation_id, limit=1) == [cache_entry_2]
+
+    # just the last rows are selected
+    mock_cursor.execute.assert_called_with(
+        PostgresCache.SELECT_CONVERSATION_HISTORY_TAIL_STATEMENT,
+        (user_id, conversation_id, 1),
+    )
 
 
 def test_get_operation_on_exception():
     """Test the Cache.get operation when exception is thrown."""
     # mock the query
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.side_effect = psycopg2.DatabaseError("PLSQL error")
+    mock_cursor.fetchall.side_effect = psycopg2.DatabaseError("PLSQL error")
 
     # do not use real PostgreSQL instance
     with patch("psycopg2.connect") as mock_connect:
@@ -178,11 +239,44 @@ def test_get_operation_on_exception():
         cache.get(user_id, conversation_id)
 
 
+def test_get_operation_on_lost_connection():
+    """Test that Cache.get reconnects and retries when connection was lost."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = []
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig())
+        assert mock_connect.call_count == 1
+
+        mock_cursor.execute.side_effect = [
+            psycopg2.OperationalError("server closed the connection"),
+            None,
+        ]
+        assert cache.get(user_id, conversation_id) == []
+
+    # broken connection was replaced by a new one
+    assert mock_connect.call_count == 2
+    assert (
+        mock_cursor.execute.call_args_list
+        == [
+            call(
+                PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
+                (user_id, conversation_id),
+            )
+        ]
+        * 2
+    )
+
+
 def test_get_operation_on_disconnected_db():
     """Test the Cache.get operation when DB is not connected."""
     # mock the query
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = None
+    mock_cursor.fetchall.return_value = []
 
     # do not use real PostgreSQL instance
     with patch("psycopg2.connect") as mock_connect:
@@ -194,7 +288,7 @@ def test_get_operation_on_disconnected_db():
         config = PostgresConfig()
         cache = PostgresCache(config)
         # simulate DB disconnection
-        cache.connection = None
+        cache.pool = None
         assert not cache.connected()
         # DB operation should connect automatically
         cache.get(user_id, conversation_id)
@@ -209,14 +303,41 @@ def test_get_operation_on_disconnected_db():
     mock_cursor.execute.assert_has_calls(calls, any_order=False)
 
 
+def test_reconnect_does_not_initialize_again():
+    """Test that tables are initialized by the first connect only."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = []
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig())
+        init_cursor = mock_connect.return_value.cursor.return_value
+        init_statements = init_cursor.execute.call_count
+        assert init_statements > 0
+
+        # simulate DB disconnection
+        cache.pool = None
+        cache.get(user_id, conversation_id)
+        assert cache.connected()
+
+    assert init_cursor.execute.call_count == init_statements
+    mock_cursor.execute.assert_called_once_with(
+        PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
+        (user_id, conversation_id),
+    )
+
+
 def test_insert_or_append_operation():
     """Test the Cache.insert_or_append operation for first item to be inserted."""
     history = cache_entry_1
-    conversation = json.dumps([history.to_dict()], cls=MessageEncoder)
+    value = encode_cache_entry(history, external_attachments=True)
 
-    # mock the query result
+    # mock the query result - new conversation was created
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = None
+    mock_cursor.fetchone.return_value = (True, 1, updated_at)
 
     # do not use real PostgreSQL instance
     with patch("psycopg2.connect") as mock_connect:
@@ -234,38 +355,33 @@ def test_insert_or_append_operation():
         # to insert new conversation history
         cache.insert_or_append(user_id, conversation_id, history, test_topic)
 
-    # multiple DB operations must be performed:
-    calls = [
-        call(
-            PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
-            (user_id, conversation_id),
-        ),
+    # conversations are not counted on insert, eviction runs in background
+    assert mock_cursor.execute.call_args_list == [
         call(
-            PostgresCache.INSERT_CONVERSATION_HISTORY_STATEMENT,
-            (user_id, conversation_id, conversation.encode("utf-8"), test_topic),
+            PostgresCache.APPEND_CONVERSATION_TURN_STATEMENT,
+            (
+                [],
+                [],
+                user_id,
+                conversation_id,
+                test_topic,
+                user_id,
+                conversation_id,
+                value,
+                [],
+            ),
         ),
-        call(PostgresCache.QUERY_CACHE_SIZE),
     ]
-    mock_cursor.execute.assert_has_calls(calls, any_order=False)
 
 
 def test_insert_or_append_operation_append_item():
     """Test the Cache.insert_or_append operation for more item to be inserted."""
-    stored_history = cache_entry_1
-
-    old_conversation = json.dumps([stored_history.to_dict()], cls=MessageEncoder)
-    as_memview = memoryview(bytearray(old_conversation, "utf-8"))
-
     appended_history = cache_entry_2
+    value = encode_cache_entry(appended_history, external_attachments=True)
 
-    # create json object in the exactly same format
-    whole_history = json.loads(old_conversation, cls=MessageDecoder)
-    whole_history.append(appended_history.to_dict())
-    new_conversation = json.dumps(whole_history, cls=MessageEncoder)
-
-    # mock the query result
+    # mock the query result - conversation existed already
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = (as_memview,)
+    mock_cursor.fetchone.return_value = (False, 2, updated_at)
 
     # do not use real PostgreSQL instance
     with patch("psycopg2.connect") as mock_connect:
@@ -281,18 +397,113 @@ def test_insert_or_append_operation_append_item():
         # to append new history to the old one
         cache.insert_or_append(user_id, conversation_id, appended_history)
 
-    # multiple DB operations must be performed:
-    calls = [
+    # just the new turn is inserted, the history is not read nor rewritten
+    assert mock_cursor.execute.call_args_list == [
         call(
-            PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
-            (user_id, conversation_id),
-        ),
-        call(
-            PostgresCache.UPDATE_CONVERSATION_HISTORY_STATEMENT,
-            (new_conversation.encode("utf-8"), user_id, conversation_id),
+            PostgresCache.APPEND_CONVERSATION_TURN_STATEMENT,
+            ([], [], user_id, conversation_id, "", user_id, conversation_id, value, []),
         ),
     ]
-    mock_cursor.execute.assert_has_calls(calls, any_order=False)
+
+
+def test_append_returns_version():
+    """Test that appending returns the new version of the conversation."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (False, 2, updated_at)
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig())
+
+        assert cache.append(user_id, conversation_id, cache_entry_1) == (
+            2,
+            updated_at,
+        )
+
+
+def test_append_stores_attachments_once():
+    """Test that content of the same attachments is stored just once."""
+    attachment = Attachment(
+        attachment_type="log", content_type="text/plain", content="error: oops"
+    )
+    cache_entry = CacheEntry(
+        query=HumanMessage("what is wrong?"),
+        response=AIMessage("oops"),
+        attachments=[attachment, attachment],
+    )
+    digest = attachment_digest("error: oops")
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (False, 2, updated_at)
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig())
+        cache.append(user_id, conversation_id, cache_entry)
+
+        params = mock_cursor.execute.call_args.args[1]
+        assert params[:2] == ([digest], ["error: oops"])
+        assert params[-1] == [digest, digest]
+
+        # content is read from the attachments table
+        mock_cursor.fetchall.return_value = [
+            (memoryview(params[-2]), ["error: oops", "error: oops"])
+        ]
+        assert cache.get(user_id, conversation_id) == [cache_entry]
+
+
+def test_append_json_format_keeps_attachments():
+    """Test that attachment content is kept in values in JSON format."""
+    cache_entry = CacheEntry(
+        query=HumanMessage("what is wrong?"),
+        response=AIMessage("oops"),
+        attachments=[
+            Attachment(attachment_type="log", content_type="text/plain", content="oops")
+        ],
+    )
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (True, 1, updated_at)
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig(value_format="json"))
+        cache.append(user_id, conversation_id, cache_entry)
+
+    params = mock_cursor.execute.call_args.args[1]
+    assert params[:2] == ([], [])
+    assert params[-2] == encode_cache_entry(cache_entry, "json")
+    assert params[-1] is None
+
+
+@pytest.mark.parametrize(
+    "row, expected", [((3, updated_at), (3, updated_at)), (None, None)]
+)
+def test_version(row, expected):
+    """Test reading conversation version without its history."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = row
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig())
+
+        assert cache.version(user_id, conversation_id) == expected
+
+    mock_cursor.execute.assert_called_once_with(
+        PostgresCache.SELECT_CONVERSATION_VERSION_STATEMENT,
+        (user_id, conversation_id),
+    )
 
 
 def test_insert_or_append_operation_on_exception():
@@ -318,14 +529,37 @@ def test_insert_or_append_operation_on_exception():
             cache.insert_or_append(user_id, conversation_id, history)
 
 
+def test_insert_or_append_operation_on_lost_connection():
+    """Test that Cache.insert_or_append is not retried after the write was sent."""
+    mock_cursor = MagicMock()
+    mock_cursor.execute.side_effect = psycopg2.OperationalError(
+        "server closed the connection"
+    )
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig())
+
+        # the turn might be stored already, retry could store it twice
+        with pytest.raises(UnconfirmedWriteError, match="server closed"):
+            cache.insert_or_append(user_id, conversation_id, cache_entry_1)
+
+    assert mock_cursor.execute.call_count == 1
+    # broken connection was discarded
+    mock_connect.return_value.close.assert_called()
+
+
 def test_insert_or_append_operation_on_disconnected_db():
     """Test the Cache.insert_or_append operation when DB is not connected."""
     history = cache_entry_1
-    conversation = json.dumps([history.to_dict()], cls=MessageEncoder)
+    value = encode_cache_entry(history, external_attachments=True)
 
     # mock the query
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = None
+    mock_cursor.fetchone.return_value = (True, 1, updated_at)
 
     # do not use real PostgreSQL instance
     with patch("psycopg2.connect") as mock_connect:
@@ -339,26 +573,29 @@ def test_insert_or_append_operation_on_disconnected_db():
         config = PostgresConfig()
         cache = PostgresCache(config)
         # simulate DB disconnection
-        cache.connection = None
+        cache.pool = None
         assert not cache.connected()
         # DB operation should connect automatically
         cache.insert_or_append(user_id, conversation_id, cache_entry_1, test_topic)
         assert cache.connected()
 
-    # multiple DB operations must be performed:
-    calls = [
+    # conversations are not counted on insert, eviction runs in background
+    assert mock_cursor.execute.call_args_list == [
         call(
-            PostgresCache.SELECT_CONVERSATION_HISTORY_STATEMENT,
-            (user_id, conversation_id),
-        ),
-        call(
-            PostgresCache.INSERT_CONVERSATION_HISTORY_STATEMENT,
-            (user_id, conversation_id, conversation.encode("utf-8"), test_topic),
+            PostgresCache.APPEND_CONVERSATION_TURN_STATEMENT,
+            (
+                [],
+                [],
+                user_id,
+                conversation_id,
+                test_topic,
+                user_id,
+                conversation_id,
+                value,
+                [],
+            ),
         ),
-        call(PostgresCache.QUERY_CACHE_SIZE),
-        call("SELECT 1"),
     ]
-    mock_cursor.execute.assert_has_calls(calls, any_order=False)
 
 
 def test_list_operation():
@@ -395,11 +632,8 @@ def test_list_operation():
     ]
     assert result == expected_result
 
-    # multiple DB operations must be performed:
-    # 1. check if connection to DB is alive
-    # 2. list conversations from DB
+    # conversations are listed without checking the connection first
     calls = [
-        call("SELECT 1"),
         call(PostgresCache.LIST_CONVERSATIONS_STATEMENT, (user_id,)),
     ]
     mock_cursor.execute.assert_has_calls(calls, any_order=False)
@@ -445,7 +679,7 @@ def test_list_operation_on_disconnected_db():
         config = PostgresConfig()
         cache = PostgresCache(config)
         # simulate DB disconnection
-        cache.connection = None
+        cache.pool = None
         assert not cache.connected()
         # DB operation should connect automatically
         cache.list(user_id, conversation_id)
@@ -481,11 +715,8 @@ def test_delete_operation():
     # Verify the result
     assert result is True
 
-    # multiple DB operations must be performed:
-    # 1. check if connection to DB is alive
-    # 2. delete one conversation from DB
+    # conversation is deleted without checking the connection first
     calls = [
-        call("SELECT 1"),
         call(
             PostgresCache.DELETE_SINGLE_CONVERSATION_STATEMENT,
             (user_id, conversation_id),
@@ -519,11 +750,8 @@ def test_delete_operation_not_found():
     # Verify the result
     assert result is False
 
-    # multiple DB operations must be performed:
-    # 1. check if connection to DB is alive
-    # 2. delete one conversation from DB
+    # conversation is deleted without checking the connection first
     calls = [
-        call("SELECT 1"),
         call(
             PostgresCache.DELETE_SINGLE_CONVERSATION_STATEMENT,
             (user_id, conversation_id),
@@ -552,7 +780,7 @@ def test_delete_operation_on_exception():
         cache = PostgresCache(config)
 
         # Verify that the exception is raised
-        with pytest.raises(psycopg2.DatabaseError, match="PLSQL error"):
+        with pytest.raises(CacheError, match="PLSQL error"):
             cache.delete(user_id, conversation_id)
 
 
@@ -572,7 +800,7 @@ def test_delete_operation_on_disconnected_db():
         config = PostgresConfig()
         cache = PostgresCache(config)
         # simulate DB disconnection
-        cache.connection = None
+        cache.pool = None
         assert not cache.connected()
         # DB operation should connect automatically
         cache.delete(user_id, conversation_id)
@@ -589,67 +817,199 @@ def test_delete_operation_on_disconnected_db():
     mock_cursor.execute.assert_has_calls(calls, any_order=False)
 
 
-def test_cleanup_method_when_clean_not_needed():
-    """Test the static method that cleans up PG cache."""
+@pytest.mark.parametrize(
+    ("estimate", "rowcounts", "expected_limits"),
+    [
+        # capacity is not reached
+        (200, [], []),
+        # one batch is enough
+        (1100, [100], [100]),
+        # several batches are needed, the last one is smaller
+        (1600, [250, 250, 100], [250, 250, 100]),
+        # table contains less rows than estimated
+        (1600, [250, 30], [250, 250]),
+    ],
+)
+def test_evict(estimate, rowcounts, expected_limits):
+    """Test that conversations over capacity are deleted in batches."""
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = (200,)
-    capacity = 1000
+    mock_cursor.fetchone.side_effect = [(True,), (estimate,)]
+    # no unused attachments are found
+    type(mock_cursor).rowcount = PropertyMock(side_effect=[*rowcounts, 0])
 
     # do not use real PostgreSQL instance
-    with patch("psycopg2.connect"):
-        PostgresCache._cleanup(mock_cursor, capacity)
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig(max_entries=1000, eviction_batch_size=250))
+        mock_connect.return_value.commit.reset_mock()
 
-    # Verify the query execution
-    mock_cursor.execute.assert_called_once_with(PostgresCache.QUERY_CACHE_SIZE)
+        assert cache.evict() == sum(rowcounts)
+
+    assert mock_cursor.execute.call_args_list == [
+        call(PostgresCache.EVICTION_LOCK_STATEMENT),
+        call(PostgresCache.QUERY_CACHE_SIZE_ESTIMATE),
+        *(
+            call(PostgresCache.DELETE_CONVERSATION_HISTORY_STATEMENT, (limit,))
+            for limit in expected_limits
+        ),
+        call(PostgresCache.DELETE_UNUSED_ATTACHMENTS_STATEMENT, (250,)),
+    ]
+    # deletions and the eviction lock end with one transaction
+    mock_connect.return_value.commit.assert_called_once_with()
 
 
-def test_cleanup_method_when_clean_performed():
-    """Test the static method that cleans up PG cache."""
+def test_evict_failure_releases_lock():
+    """Test that eviction lock is released by rollback when eviction fails."""
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.return_value = (200,)
-    capacity = 100
+    mock_cursor.fetchone.return_value = (True,)
 
     # do not use real PostgreSQL instance
-    with patch("psycopg2.connect"):
-        PostgresCache._cleanup(mock_cursor, capacity)
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig())
+        mock_connect.return_value.commit.reset_mock()
+        mock_connect.return_value.rollback.reset_mock()
+        mock_cursor.execute.side_effect = [None, psycopg2.DatabaseError("error")]
 
-    # Verify the query execution
-    calls = [
-        call(
-            PostgresCache.QUERY_CACHE_SIZE,
-        ),
-        call(
-            PostgresCache.DELETE_CONVERSATION_HISTORY_STATEMENT + " 100)",
-        ),
+        with pytest.raises(psycopg2.DatabaseError):
+            cache.evict()
+
+    mock_connect.return_value.commit.assert_not_called()
+    mock_connect.return_value.rollback.assert_called_once_with()
+
+
+def test_evict_unused_attachments():
+    """Test that unused attachments are deleted in batches during eviction."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.side_effect = [(True,), (0,)]
+    type(mock_cursor).rowcount = PropertyMock(side_effect=[250, 250, 10])
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig(max_entries=1000, eviction_batch_size=250))
+
+        # attachments are not counted as evicted conversations
+        assert cache.evict() == 0
+
+    assert mock_cursor.execute.call_args_list == [
+        call(PostgresCache.EVICTION_LOCK_STATEMENT),
+        call(PostgresCache.QUERY_CACHE_SIZE_ESTIMATE),
+        *[call(PostgresCache.DELETE_UNUSED_ATTACHMENTS_STATEMENT, (250,))] * 3,
     ]
-    mock_cursor.execute.assert_has_calls(calls, any_order=False)
+
+
+def test_evict_expired():
+    """Test that conversations exceeding their TTL are deleted before eviction."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.side_effect = [(True,), (0,)]
+    # two batches of idle conversations, one of old ones, no attachments
+    type(mock_cursor).rowcount = PropertyMock(side_effect=[250, 20, 5, 0])
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(
+            PostgresConfig(eviction_batch_size=250), idle_ttl=3600, absolute_ttl=86400
+        )
+        idle = REGISTRY.get_sample_value(
+            "ols_conversation_cache_evictions_total",
+            {"backend": "postgres", "reason": "idle"},
+        )
+
+        assert cache.evict() == 275
+
+    assert mock_cursor.execute.call_args_list == [
+        call(PostgresCache.EVICTION_LOCK_STATEMENT),
+        call(PostgresCache.DELETE_IDLE_CONVERSATIONS_STATEMENT, (3600, 250)),
+        call(PostgresCache.DELETE_IDLE_CONVERSATIONS_STATEMENT, (3600, 250)),
+        call(PostgresCache.DELETE_OLD_CONVERSATIONS_STATEMENT, (86400, 250)),
+        call(PostgresCache.QUERY_CACHE_SIZE_ESTIMATE),
+        call(PostgresCache.DELETE_UNUSED_ATTACHMENTS_STATEMENT, (250,)),
+    ]
+    assert (
+        REGISTRY.get_sample_value(
+            "ols_conversation_cache_evictions_total",
+            {"backend": "postgres", "reason": "idle"},
+        )
+        == (idle or 0) + 270
+    )
+
+
+def test_evict_by_another_instance():
+    """Test that conversations are not evicted when another instance does it."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (False,)
+
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.return_value.cursor.return_value.__enter__.return_value = (
+            mock_cursor
+        )
+        cache = PostgresCache(PostgresConfig())
+
+        assert cache.evict() == 0
+
+    mock_cursor.execute.assert_called_once_with(PostgresCache.EVICTION_LOCK_STATEMENT)
+
+
+def test_eviction_requested_after_inserts():
+    """Test that eviction is requested after configured number of conversations."""
+    # do not use real PostgreSQL instance
+    with patch("psycopg2.connect"):
+        cache = PostgresCache(PostgresConfig(eviction_inserts=3))
+
+    with patch.object(cache, "_eviction_requested") as eviction_requested:
+        for _ in range(2):
+            cache._conversation_created()
+        eviction_requested.set.assert_not_called()
+
+        cache._conversation_created()
+        eviction_requested.set.assert_called_once_with()
+
+        # counting starts again
+        cache._conversation_created()
+        eviction_requested.set.assert_called_once_with()
 
 
 def test_ready():
     """Test the Cache.ready operation."""
     # do not use real PostgreSQL instance
-    with patch("psycopg2.connect"):
+    with patch("psycopg2.connect") as mock_connect:
         # initialize Postgres cache
         config = PostgresConfig()
         cache = PostgresCache(config)
+        connection = mock_connect.return_value
 
-        # mock the connection state 0 - open
-        cache.connection.closed = 0
         # patch the poll function to return POLL_OK
-        cache.connection.poll = MagicMock(return_value=psycopg2.extensions.POLL_OK)
+        connection.poll = MagicMock(return_value=psycopg2.extensions.POLL_OK)
         # cache is ready
         assert cache.ready()
 
-        # mock the connection state 1 - closed
-        cache.connection.closed = 1
-        # cache is not ready
+        # patch the poll function to raise InterfaceError - connection closed
+        connection.poll = MagicMock(
+            side_effect=psycopg2.InterfaceError("connection already closed")
+        )
+        # cache is not ready and broken connection is not returned to the pool
         assert not cache.ready()
+        connection.close.assert_called_once_with()
+        assert cache.pool.size == 0
 
-        # mock the connection state 0 - open
-        cache.connection.closed = 0
         # patch the poll function to raise OperationalError
-        cache.connection.poll = MagicMock(
+        connection.poll = MagicMock(
             side_effect=psycopg2.OperationalError("Connection closed")
         )
         # cache is not ready
         assert not cache.ready()
+
+        # cache without pool is not ready
+        cache.pool = None
+        assert not cache.ready()
@@ -0,0 +1,186 @@
+"""Unit tests for SQLiteCache class."""
+
+# pylint: disable=W0621
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ols.app.models.config import SQLiteCacheConfig
+from ols.app.models.models import Attachment, CacheEntry
+from ols.src.cache.cache_error import CacheError
+from ols.src.cache.sqlite_cache import SQLiteCache
+from ols.utils import suid
+
+user_id = suid.get_suid()
+conversation_id = suid.get_suid()
+cache_entry_1 = CacheEntry(
+    query=HumanMessage("用户消息"), response=AIMessage("人工智能信息")
+)
+cache_entry_2 = CacheEntry(
+    query=HumanMessage("user message"),
+    response=AIMessage("ai message"),
+    attachments=[
+        Attachment(
+            attachment_type="log", content_type="text/plain", content="error: oops"
+        )
+    ],
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """SQLite cache stored in temporary directory."""
+    return SQLiteCache(SQLiteCacheConfig(path=str(tmp_path / "cache.db")))
+
+
+def test_insert_and_get(cache):
+    """Test that appended turns are read in order."""
+    assert cache.get(user_id, conversation_id) == []
+
+    cache.insert_or_append(user_id, conversation_id, cache_entry_1, "topic")
+    cache.insert_or_append(user_id, conversation_id, cache_entry_2)
+
+    assert cache.get(user_id, conversation_id) == [cache_entry_1, cache_entry_2]
+    assert cache.get(user_id, conversation_id, limit=1) == [cache_entry_2]
+    assert cache.get(user_id, conversation_id, limit=0) == []
+
+
+def test_conversations_persist(tmp_path):
+    """Test that conversations are read by a new instance of the cache."""
+    config = SQLiteCacheConfig(path=str(tmp_path / "cache.db"))
+    SQLiteCache(config).insert_or_append(
+        user_id, conversation_id, cache_entry_1, "topic"
+    )
+
+    cache = SQLiteCache(config)
+
+    assert cache.get(user_id, conversation_id) == [cache_entry_1]
+    assert cache.list(user_id) == [
+        {"conversation_id": conversation_id, "topic_summary": "topic"}
+    ]
+
+
+def test_list(cache):
+    """Test that conversations are listed from the most recently updated."""
+    conversation_ids = [suid.get_suid() for _ in range(3)]
+    for i, conv_id in enumerate(conversation_ids):
+        cache.insert_or_append(user_id, conv_id, cache_entry_1, f"topic {i}")
+    cache.insert_or_append(user_id, conversation_ids[0], cache_entry_2, "ignored")
+
+    assert cache.list(user_id) == [
+        {"conversation_id": conversation_ids[0], "topic_summary": "topic 0"},
+        {"conversation_id": conversation_ids[2], "topic_summary": "topic 2"},
+        {"conversation_id": conversation_ids[1], "topic_summary": "topic 1"},
+    ]
+    assert cache.list(suid.get_suid()) == []
+
+
+def test_delete(cache):
+    """Test that deleted conversation is not found."""
+    cache.insert_or_append(user_id, conversation_id, cache_entry_1)
+
+    assert cache.delete(user_id, conversation_id)
+    assert not cache.delete(user_id, conversation_id)
+    assert cache.get(user_id, conversation_id) == []
+    assert cache.list(user_id) == []
+
+    # turns of the deleted conversation are deleted too
+    cache.insert_or_append(user_id, conversation_id, cache_entry_2)
+    assert cache.get(user_id, conversation_id) == [cache_entry_2]
+
+
+def test_capacity(tmp_path):
+    """Test that the least recently updated conversations are evicted."""
+    cache = SQLiteCache(SQLiteCacheConfig(path=str(tmp_path / "db"), max_entries=2))
+    conversation_ids = [suid.get_suid() for _ in range(3)]
+    with patch("ols.src.cache.sqlite_cache.time.time") as mock_time:
+        for i, conv_id in enumerate(conversation_ids):
+            mock_time.return_value = 1000.0 + i
+            cache.insert_or_append(user_id, conv_id, cache_entry_1)
+        # the first conversation is updated last
+        mock_time.return_value = 1010.0
+        cache.insert_or_append(user_id, conversation_ids[0], cache_entry_2)
+        mock_time.return_value = 1020.0
+        cache.insert_or_append(user_id, suid.get_suid(), cache_entry_1)
+
+    listed = [conv["conversation_id"] for conv in cache.list(user_id)]
+    assert len(listed) == 2
+    assert conversation_ids[0] in listed
+    assert cache.get(user_id, conversation_ids[1]) == []
+
+
+def test_expire(tmp_path):
+    """Test that conversations expire after their idle or absolute TTL."""
+    cache = SQLiteCache(
+        SQLiteCacheConfig(path=str(tmp_path / "db")), idle_ttl=100, absolute_ttl=1000
+    )
+    conversation_ids = [suid.get_suid() for _ in range(2)]
+    with patch("ols.src.cache.sqlite_cache.time.time") as mock_time:
+        for i, conv_id in enumerate(conversation_ids):
+            mock_time.return_value = 1000.0 + i * 10
+            cache.insert_or_append(user_id, conv_id, cache_entry_1)
+        # the first conversation is kept active
+        mock_time.return_value = 1900.0
+        cache.insert_or_append(user_id, conversation_ids[0], cache_entry_2)
+
+    assert cache.expire(now=1100.0) == 0
+    assert cache.expire(now=1115.0) == 1
+    assert cache.expire(now=2000.0) == 0
+    assert cache.expire(now=2001.0) == 1
+    assert cache.list(user_id) == []
+
+
+def test_concurrent_access(cache):
+    """Test that threads with their own connections see each other's writes."""
+    conversation_ids = [suid.get_suid() for _ in range(8)]
+    errors = []
+
+    def worker(conv_id):
+        try:
+            for _ in range(20):
+                cache.insert_or_append(user_id, conv_id, cache_entry_1)
+                cache.get(user_id, conv_id)
+        except Exception as e:  # pylint: disable=W0718
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(c,)) for c in conversation_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    for conv_id in conversation_ids:
+        assert len(cache.get(user_id, conv_id)) == 20
+
+
+def test_ready(cache):
+    """Test that the cache is ready when the database can be read."""
+    assert cache.ready()
+
+
+def test_database_error(cache):
+    """Test that database errors are reported as cache errors."""
+    cache._connection().execute("DROP TABLE conversation_turns")
+
+    with pytest.raises(CacheError, match="no such table"):
+        cache.get(user_id, conversation_id)
+    with pytest.raises(CacheError, match="no such table"):
+        cache.insert_or_append(user_id, conversation_id, cache_entry_1)
+    # failed transaction was rolled back
+    assert not cache._connection().in_transaction
+
+
+def test_improper_conversation_id(cache):
+    """Test that conversation ID is checked."""
+    with pytest.raises(ValueError, match="Invalid conversation ID"):
+        cache.get(user_id, "invalid-id")
+
+
+def test_wal_mode(cache):
+    """Test that the database is used in WAL mode."""
+    (mode,) = cache._connection().execute("PRAGMA journal_mode").fetchone()
+    assert mode == "wal"
@@ -0,0 +1,171 @@
+"""Unit tests for TieredCache class."""
+
+# pylint: disable=W0621
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from prometheus_client import REGISTRY
+
+from ols.app.models.models import CacheEntry
+from ols.src.cache.postgres_cache import PostgresCache
+from ols.src.cache.tiered_cache import TieredCache
+from ols.utils import suid
+
+user_id = suid.get_suid()
+conversation_id = suid.get_suid()
+updated_at = datetime(2025, 1, 1, 12, 0, 0)
+cache_entry_1 = CacheEntry(
+    query=HumanMessage("user message1"), response=AIMessage("ai message1")
+)
+cache_entry_2 = CacheEntry(
+    query=HumanMessage("user message2"), response=AIMessage("ai message2")
+)
+
+
+@pytest.fixture
+def remote():
+    """Mock of Postgres cache."""
+    return MagicMock(spec=PostgresCache)
+
+
+@pytest.fixture
+def cache(remote):
+    """Tiered cache in front of mocked Postgres cache."""
+    return TieredCache(remote, 2)
+
+
+def lookups(tier, result):
+    """Get number of lookups in given tier with given result."""
+    return (
+        REGISTRY.get_sample_value(
+            "ols_conversation_cache_lookups_total", {"tier": tier, "result": result}
+        )
+        or 0.0
+    )
+
+
+def test_written_conversation_is_read_locally(cache, remote):
+    """Test that history written by this instance is not read from Postgres."""
+    remote.append.side_effect = [(1, updated_at), (2, updated_at)]
+    cache.insert_or_append(user_id, conversation_id, cache_entry_1, "topic")
+    cache.insert_or_append(user_id, conversation_id, cache_entry_2)
+    remote.append.assert_called_with(user_id, conversation_id, cache_entry_2, "")
+
+    remote.version.return_value = (2, updated_at)
+    local_hits = lookups("local", "hit")
+
+    assert cache.get(user_id, conversation_id) == [cache_entry_1, cache_entry_2]
+    assert cache.get(user_id, conversation_id, limit=1) == [cache_entry_2]
+    remote.get.assert_not_called()
+    assert lookups("local", "hit") == local_hits + 2
+
+
+def test_changed_conversation_is_reloaded(cache, remote):
+    """Test that history changed by another instance is read from Postgres."""
+    remote.append.return_value = (1, updated_at)
+    cache.insert_or_append(user_id, conversation_id, cache_entry_1)
+
+    # another instance appended a turn
+    remote.version.return_value = (2, updated_at)
+    remote.get.return_value = [cache_entry_1, cache_entry_2]
+    remote_hits = lookups("remote", "hit")
+
+    assert cache.get(user_id, conversation_id) == [cache_entry_1, cache_entry_2]
+    assert cache.get(user_id, conversation_id) == [cache_entry_1, cache_entry_2]
+    remote.get.assert_called_once_with(user_id, conversation_id, True, limit=None)
+    assert lookups("remote", "hit") == remote_hits + 1
+
+
+def test_concurrent_append_invalidates_local_copy(cache, remote):
+    """Test that local copy is dropped when the version skipped a turn."""
+    remote.append.side_effect = [(1, updated_at), (3, updated_at)]
+    cache.insert_or_append(user_id, conversation_id, cache_entry_1)
+    cache.insert_or_append(user_id, conversation_id, cache_entry_2)
+
+    remote.version.return_value = (3, updated_at)
+    remote.get.return_value = [cache_entry_1, cache_entry_1, cache_entry_2]
+    assert len(cache.get(user_id, conversation_id)) == 3
+    remote.get.assert_called_once()
+
+
+def test_limited_history_is_read_partially(cache, remote):
+    """Test that history read with a limit serves only requests it contains."""
+    remote.version.return_value = (3, updated_at)
+    remote.get.return_value = [cache_entry_2]
+
+    assert cache.get(user_id, conversation_id, limit=1) == [cache_entry_2]
+    remote.get.assert_called_once_with(user_id, conversation_id, True, limit=1)
+
+    # the most recent turn is kept locally
+    assert cache.get(user_id, conversation_id, limit=1) == [cache_entry_2]
+    remote.get.assert_called_once()
+
+    # more turns than kept locally are read from Postgres
+    remote.get.return_value = [cache_entry_1, cache_entry_1, cache_entry_2]
+    assert cache.get(user_id, conversation_id) == [
+        cache_entry_1,
+        cache_entry_1,
+        cache_entry_2,
+    ]
+    remote.get.assert_called_with(user_id, conversation_id, True, limit=None)
+
+    # complete history serves any limit
+    assert cache.get(user_id, conversation_id, limit=2) == [
+        cache_entry_1,
+        cache_entry_2,
+    ]
+    assert remote.get.call_count == 2
+
+
+def test_missing_conversation(cache, remote):
+    """Test that conversation deleted or evicted in Postgres is not found."""
+    remote.append.return_value = (1, updated_at)
+    cache.insert_or_append(user_id, conversation_id, cache_entry_1)
+    remote.version.return_value = None
+
+    assert cache.get(user_id, conversation_id) is None
+    remote.get.assert_not_called()
+
+
+def test_local_cache_is_bounded(cache, remote):
+    """Test that the least recently used conversation is evicted locally."""
+    conversation_ids = [suid.get_suid() for _ in range(3)]
+    remote.append.return_value = (1, updated_at)
+    for conv_id in conversation_ids:
+        cache.insert_or_append(user_id, conv_id, cache_entry_1)
+
+    remote.version.return_value = (1, updated_at)
+    remote.get.return_value = [cache_entry_1]
+    cache.get(user_id, conversation_ids[2])
+    cache.get(user_id, conversation_ids[1])
+    remote.get.assert_not_called()
+    cache.get(user_id, conversation_ids[0])
+    remote.get.assert_called_once_with(user_id, conversation_ids[0], True, limit=None)
+
+
+def test_delete_list_and_ready(cache, remote):
+    """Test that other operations are delegated to Postgres."""
+    remote.append.return_value = (1, updated_at)
+    cache.insert_or_append(user_id, conversation_id, cache_entry_1)
+    remote.delete.return_value = True
+    remote.list.return_value = []
+    remote.ready.return_value = True
+
+    assert cache.delete(user_id, conversation_id)
+    assert cache.list(user_id) == []
+    assert cache.ready()
+    remote.delete.assert_called_once_with(user_id, conversation_id, False)
+
+    # deleted conversation is not served locally, even when created again
+    remote.version.return_value = (1, updated_at)
+    remote.get.return_value = [cache_entry_2]
+    assert cache.get(user_id, conversation_id) == [cache_entry_2]
+
+
+def test_improper_conversation_id(cache):
+    """Test that conversation ID is checked."""
+    with pytest.raises(ValueError, match="Invalid conversation ID"):
+        cache.get(user_id, "invalid-id")
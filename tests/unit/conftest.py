@@ -3,9 +3,17 @@
 import pytest
 
 from ols import config
+from ols.utils import postgres_pool
 
 
 @pytest.fixture(scope="function", autouse=True)
 def ensure_empty_config_for_each_unit_test_by_default():
     """Set up fixture for all unit tests."""
     config.reload_empty()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def close_postgres_pools():
+    """Do not share pooled (mocked) Postgres connections between tests."""
+    yield
+    postgres_pool.close_pools()
@@ -0,0 +1 @@
+"""Test cases for customization modules."""
@@ -0,0 +1,182 @@
+"""Unit tests for the cross-encoder reranker."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ols import config
+
+# needs to be setup there before is_user_authorized is imported
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.metrics import reranker_fallbacks_total  # noqa:E402
+from ols.app.models.config import ReferenceContent  # noqa:E402
+from ols.customize.ols import reranker  # noqa:E402
+from tests.mock_classes.mock_retrieved_node import MockRetrievedNode  # noqa:E402
+
+
+def make_node(text, score):
+    """Construct retrieved node with given text and score."""
+    return MockRetrievedNode({"text": text, "score": score, "metadata": {}})
+
+
+def fake_score(model_path, query, texts):
+    """Score texts by number of query words they contain."""
+    return [float(sum(word in text for word in query.split())) for text in texts]
+
+
+def wait_for_reranker():
+    """Wait until jobs submitted to the reranker worker are finished."""
+    reranker._executor.submit(lambda: None).result()
+
+
+@pytest.fixture
+def _reranker_config(tmpdir):
+    """Configure reranker with loaded model."""
+    config.ols_config.reference_content = ReferenceContent(
+        {"reranker": {"model_path": str(tmpdir), "top_n": 2}}
+    )
+    with patch.dict(reranker._models, {str(tmpdir): object()}):
+        yield
+        wait_for_reranker()
+    config.ols_config.reference_content = None
+
+
+def test_rerank_not_configured():
+    """Test that nodes are not modified when reranker is not configured."""
+    config.ols_config.reference_content = None
+    nodes = [make_node("a", 0.5), make_node("b", 0.1)]
+    assert reranker.rerank(nodes, "query") == nodes
+
+
+@pytest.mark.usefixtures("_reranker_config")
+def test_rerank():
+    """Test that nodes are reordered by cross-encoder scores."""
+    nodes = [
+        make_node("pods", 0.9),
+        make_node("pods and routes", 0.8),
+        make_node("routes", 0.7),
+        make_node("routes and nodes", 0.2),
+    ]
+    with patch("ols.customize.ols.reranker._score", new=fake_score):
+        reranked = reranker.rerank(nodes, "routes nodes")
+
+    # node under similarity cutoff is not considered
+    assert [node.get_text() for node in reranked] == ["pods and routes", "routes"]
+
+
+@pytest.mark.usefixtures("_reranker_config")
+def test_rerank_latency_budget_exceeded():
+    """Test that original order is used when reranking is too slow."""
+    config.ols_config.reference_content.reranker.latency_budget_ms = 10
+
+    def slow_score(model_path, query, texts):
+        time.sleep(0.1)
+        return fake_score(model_path, query, texts)
+
+    nodes = [make_node("pods", 0.9), make_node("routes", 0.8), make_node("x", 0.7)]
+    fallbacks = reranker_fallbacks_total.labels("timeout")._value.get()
+    with patch("ols.customize.ols.reranker._score", new=slow_score):
+        reranked = reranker.rerank(nodes, "routes")
+
+    assert reranked == nodes[:2]
+    assert reranker_fallbacks_total.labels("timeout")._value.get() == fallbacks + 1
+
+
+@pytest.mark.usefixtures("_reranker_config")
+def test_rerank_model_error():
+    """Test that original order is used when the model fails."""
+    nodes = [make_node("pods", 0.9), make_node("routes", 0.8)]
+    with patch(
+        "ols.customize.ols.reranker._get_model", side_effect=OSError("no model")
+    ):
+        assert reranker.rerank(nodes, "routes") == nodes
+
+
+@pytest.mark.usefixtures("_reranker_config")
+def test_rerank_waits_for_worker():
+    """Test that requests wait for a running job within their latency budget."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocked_score(model_path, query, texts):
+        started.set()
+        release.wait(5)
+        return fake_score(model_path, query, texts)
+
+    config.ols_config.reference_content.reranker.latency_budget_ms = 5000
+    nodes = [make_node("pods", 0.9), make_node("routes", 0.8), make_node("x", 0.7)]
+    with patch("ols.customize.ols.reranker._score", new=blocked_score):
+        first = threading.Thread(target=reranker.rerank, args=(nodes, "routes"))
+        first.start()
+        assert started.wait(5)
+        threading.Timer(0.1, release.set).start()
+
+        # the next request is scored once the first one is done
+        assert reranker.rerank(nodes, "routes")[0].get_text() == "routes"
+        first.join()
+
+
+@pytest.mark.usefixtures("_reranker_config")
+def test_rerank_expired_request_not_scored():
+    """Test that request which timed out in the queue is not scored later."""
+    started = threading.Event()
+    release = threading.Event()
+    scored = []
+
+    def blocked_score(model_path, query, texts):
+        scored.append(query)
+        started.set()
+        release.wait(5)
+        return fake_score(model_path, query, texts)
+
+    config.ols_config.reference_content.reranker.latency_budget_ms = 50
+    nodes = [make_node("pods", 0.9), make_node("routes", 0.8), make_node("x", 0.7)]
+    fallbacks = reranker_fallbacks_total.labels("timeout")._value.get()
+    with patch("ols.customize.ols.reranker._score", new=blocked_score):
+        first = threading.Thread(target=reranker.rerank, args=(nodes, "first"))
+        first.start()
+        assert started.wait(5)
+        # waits for the first request being scored, then times out
+        assert reranker.rerank(nodes, "second") == nodes[:2]
+        first.join()
+        release.set()
+        wait_for_reranker()
+
+    assert scored == ["first"]
+    assert reranker_fallbacks_total.labels("timeout")._value.get() == fallbacks + 2
+
+
+def test_rerank_model_not_loaded(tmpdir):
+    """Test that requests don't wait for the model load."""
+    config.ols_config.reference_content = ReferenceContent(
+        {"reranker": {"model_path": str(tmpdir), "top_n": 2}}
+    )
+    loaded = threading.Event()
+
+    def load_model(model_path):
+        loaded.wait(5)
+        reranker._models[model_path] = object()
+
+    nodes = [make_node("pods", 0.9), make_node("routes", 0.8), make_node("x", 0.7)]
+    fallbacks = reranker_fallbacks_total.labels("not_loaded")._value.get()
+    try:
+        with (
+            patch.dict(reranker._models, clear=True),
+            patch("ols.customize.ols.reranker._load_model", new=load_model),
+            patch("ols.customize.ols.reranker._score", new=fake_score),
+        ):
+            reranker.load_model()
+            assert reranker.rerank(nodes, "routes") == nodes[:2]
+            assert (
+                reranker_fallbacks_total.labels("not_loaded")._value.get()
+                == fallbacks + 1
+            )
+
+            loaded.set()
+            wait_for_reranker()
+            assert reranker.rerank(nodes, "routes")[0].get_text() == "routes"
+    finally:
+        config.ols_config.reference_content = None
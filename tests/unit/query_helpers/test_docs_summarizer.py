@@ -1,7 +1,7 @@
 """Unit tests for DocsSummarizer class."""
 
 import logging
-from unittest.mock import ANY, call, patch
+from unittest.mock import ANY, Mock, call, patch
 
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage
@@ -12,11 +12,12 @@ from ols import config
 config.ols_config.authentication_config.module = "k8s"
 
 
-from ols.app.models.config import LoggingConfig  # noqa:E402
+from ols.app.models.config import LoggingConfig, RetrievalDepthConfig  # noqa:E402
 from ols.src.query_helpers.docs_summarizer import (  # noqa:E402
     DocsSummarizer,
     QueryHelper,
 )
+from ols.src.rag_index.retrieval_depth import ChunkTokensEstimate  # noqa:E402
 from ols.utils import suid  # noqa:E402
 from ols.utils.logging_configurator import configure_logging  # noqa:E402
 from tests import constants  # noqa:E402
@@ -25,6 +26,7 @@ from tests.mock_classes.mock_langchain_interface import (  # noqa:E402
 )
 from tests.mock_classes.mock_llama_index import MockLlamaIndex  # noqa:E402
 from tests.mock_classes.mock_llm_loader import mock_llm_loader  # noqa:E402
+from tests.mock_classes.mock_retrieved_node import MockRetrievedNode  # noqa:E402
 
 conversation_id = suid.get_suid()
 
@@ -133,6 +135,37 @@ def test_summarize_truncation():
         assert summary.history_truncated
 
 
+def test_summarize_loads_older_history():
+    """Test that older turns are loaded while the whole history tail fits."""
+    summarizer = DocsSummarizer(llm_loader=mock_llm_loader(None))
+    turn = [HumanMessage("What is Kubernetes?"), AIMessage("Container platform.")]
+    # conversation of 5 turns, tail of 2 turns was retrieved
+    history = turn * 2
+    requested = []
+
+    def history_loader(turns):
+        requested.append(turns)
+        return turn * min(turns, 5)
+
+    summary = summarizer.create_response("question", None, history, history_loader)
+
+    # tail was doubled until the whole conversation was loaded
+    assert requested == [4, 8]
+    assert not summary.history_truncated
+
+
+def test_summarize_does_not_load_truncated_history():
+    """Test that older turns are not loaded when the tail exceeds budget."""
+    summarizer = DocsSummarizer(llm_loader=mock_llm_loader(None))
+    history = [HumanMessage("What is Kubernetes?")] * 10000
+    history_loader = Mock()
+
+    summary = summarizer.create_response("question", None, history, history_loader)
+
+    assert summary.history_truncated
+    history_loader.assert_not_called()
+
+
 def test_prepare_prompt_context():
     """Basic test for DocsSummarizer to check re-structuring of context for the 'temp' prompt."""
     with patch("ols.utils.token_handler.RAG_SIMILARITY_CUTOFF", 0.4):
@@ -191,6 +224,51 @@ def test_summarize_reranker(caplog):
         assert "reranker.rerank() is called with 1 result(s)." in caplog.text
 
 
+class MockDeepIndex:
+    """Mocked index with many relevant chunks, records retrieval depths."""
+
+    def __init__(self):
+        """Initialize the index."""
+        self.top_ks = []
+
+    def as_retriever(self, similarity_top_k):
+        """Return retriever of given depth."""
+        self.top_ks.append(similarity_top_k)
+        return self
+
+    def retrieve(self, query):
+        """Return chunks of the last requested depth."""
+        return [
+            MockRetrievedNode(
+                {
+                    "text": f"chunk {i} " + "word " * 10,
+                    "score": 0.9,
+                    "metadata": {"docs_url": f"https://docs/{i}", "title": str(i)},
+                }
+            )
+            for i in range(self.top_ks[-1])
+        ]
+
+
+def test_summarize_retrieval_depth():
+    """Test that number of retrieved chunks is driven by token budget."""
+    config.ols_config.reference_content.retrieval_depth = RetrievalDepthConfig(
+        min_top_k=2, max_top_k=8
+    )
+    summarizer = DocsSummarizer(llm_loader=mock_llm_loader(None))
+    rag_index = MockDeepIndex()
+
+    estimate = ChunkTokensEstimate(initial=100)
+    with patch("ols.src.query_helpers.docs_summarizer.chunk_tokens_estimate", estimate):
+        summary = summarizer.create_response("question", rag_index)
+
+    # chunks are smaller than estimated, so more of them are retrieved
+    # until the upper bound is reached; the estimate is corrected
+    assert rag_index.top_ks == [4, 7, 8]
+    assert len(summary.rag_chunks) == 8
+    assert estimate.get() < 100
+
+
 @pytest.mark.asyncio
 async def test_response_generator():
     """Test response generator method."""
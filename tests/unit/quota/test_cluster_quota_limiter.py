@@ -56,7 +56,7 @@ def test_init_quota():
             q = ClusterQuotaLimiter(config, quota_limit)
 
             # init quota for given cluster
-            q._init_quota()
+            q._init_quota(mock_connect.return_value)
 
     # new record should be inserted into storage
     mock_cursor.execute.assert_called_once_with(
@@ -90,8 +90,6 @@ def test_available_quota_with_data():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given cluster should be read from storage
         call(ClusterQuotaLimiter.SELECT_QUOTA, ("", subject)),
     ]
@@ -169,7 +167,7 @@ def test_available_quota_on_disconnected_db():
             q = ClusterQuotaLimiter(config, quota_limit)
 
             # simulate DB disconnection
-            q.connection = None
+            q.pool = None
             assert not q.connected()
 
             # try to retrieve available quota for given cluster
@@ -213,8 +211,6 @@ def test_revoke_quota():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given cluster should be written into the storage
         call(
             ClusterQuotaLimiter.SET_AVAILABLE_QUOTA,
@@ -251,7 +247,7 @@ def test_revoke_quota_on_disconnected_db():
             q = ClusterQuotaLimiter(config, quota_limit)
 
             # simulate DB disconnection
-            q.connection = None
+            q.pool = None
             assert not q.connected()
 
             # try to revoke quota
@@ -295,8 +291,6 @@ def test_consume_tokens_not_enough():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given user should be updated in storage
         call(
             ClusterQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -340,8 +334,6 @@ def test_consume_input_tokens_enough_tokens():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given user should be updated in storage
         call(
             ClusterQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -385,8 +377,6 @@ def test_consume_output_tokens_enough_tokens():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given user should be updated in storage
         call(
             ClusterQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -432,8 +422,6 @@ def test_consume_input_and_output_tokens_enough_tokens():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given user should be updated in storage
         call(
             ClusterQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -475,8 +463,6 @@ def test_consume_tokens_on_no_record():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given user should be updated in storage
         call(
             ClusterQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -516,7 +502,7 @@ def test_consume_tokens_on_disconnected_db():
             q = ClusterQuotaLimiter(config, quota_limit)
 
             # simulate DB disconnection
-            q.connection = None
+            q.pool = None
             assert not q.connected()
 
             # try to consume tokens
@@ -559,8 +545,6 @@ def test_increase_quota():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given cluster should be written into the storage
         call(
             ClusterQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -597,7 +581,7 @@ def test_increase_quota_on_disconnected_db():
             q = ClusterQuotaLimiter(config, quota_limit)
 
             # simulate DB disconnection
-            q.connection = None
+            q.pool = None
             assert not q.connected()
 
             # try to increase quota
@@ -57,7 +57,7 @@ def test_init_quota():
             q = UserQuotaLimiter(config, quota_limit)
 
             # init quota for given user
-            q._init_quota(user_id)
+            q._init_quota(mock_connect.return_value, user_id)
 
     # new record should be inserted into storage
     mock_cursor.execute.assert_called_once_with(
@@ -92,8 +92,6 @@ def test_available_quota_with_data():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given user should be read from storage
         call(
             UserQuotaLimiter.SELECT_QUOTA,
@@ -177,7 +175,7 @@ def test_available_quota_on_disconnected_db():
             q = UserQuotaLimiter(config, quota_limit)
 
             # simulate DB disconnection
-            q.connection = None
+            q.pool = None
             assert not q.connected()
 
             # try to retrieve available quota for given user
@@ -222,8 +220,6 @@ def test_revoke_quota():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given user should be written into the storage
         call(
             UserQuotaLimiter.SET_AVAILABLE_QUOTA,
@@ -261,7 +257,7 @@ def test_revoke_quota_on_disconnected_db():
             q = UserQuotaLimiter(config, quota_limit)
 
             # simulate DB disconnection
-            q.connection = None
+            q.pool = None
             assert not q.connected()
 
             # try to revoke quota
@@ -306,8 +302,6 @@ def test_consume_tokens_not_enough():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         call(
             # quota for given user should be read from storage
             UserQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -352,8 +346,6 @@ def test_consume_input_tokens_enough_tokens():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         call(
             # quota for given user should be read from storage
             UserQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -398,8 +390,6 @@ def test_consume_output_tokens_enough_tokens():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         call(
             # quota for given user should be read from storage
             UserQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -446,8 +436,6 @@ def test_consume_input_and_output_tokens_enough_tokens():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         call(
             UserQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
             (-to_be_consumed, timestamp, user_id, subject),
@@ -489,8 +477,6 @@ def test_consume_tokens_on_no_record():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         call(
             # quota for given user should be read from storage
             UserQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -531,7 +517,7 @@ def test_consume_tokens_on_disconnected_db():
             q = UserQuotaLimiter(config, quota_limit)
 
             # simulate DB disconnection
-            q.connection = None
+            q.pool = None
             assert not q.connected()
 
             # try to consume tokens
@@ -575,8 +561,6 @@ def test_increase_quota():
 
     # expected calls to storage
     calls = [
-        # check if storage connection is alive
-        call("SELECT 1"),
         # quota for given user should be written into the storage
         call(
             UserQuotaLimiter.UPDATE_AVAILABLE_QUOTA,
@@ -614,7 +598,7 @@ def test_increase_quota_on_disconnected_db():
             q = UserQuotaLimiter(config, quota_limit)
 
             # simulate DB disconnection
-            q.connection = None
+            q.pool = None
             assert not q.connected()
 
             # try to increase quota
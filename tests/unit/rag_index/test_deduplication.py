@@ -0,0 +1,86 @@
+"""Unit tests for the deduplication module."""
+
+from ols.app.models.config import DeduplicationConfig
+from ols.src.rag_index.deduplication import (
+    deduplicate,
+    diversify,
+    jaccard_similarity,
+    maximal_marginal_relevance,
+    shingles,
+)
+from tests.mock_classes.mock_retrieved_node import MockRetrievedNode
+
+INSTALL_4_15 = (
+    "To install the cluster, run the openshift-install create cluster command "
+    "and wait until the installation of OpenShift Container Platform 4.15 completes."
+)
+INSTALL_4_16 = INSTALL_4_15.replace("4.15", "4.16")
+ROUTES = "Routes expose services outside of the cluster by a host name."
+ROUTES_TLS = "Secured routes expose services outside of the cluster by TLS."
+
+
+def make_node(text, score):
+    """Construct retrieved node with given text and score."""
+    return MockRetrievedNode({"text": text, "score": score, "metadata": {}})
+
+
+def texts(nodes):
+    """Get texts of nodes."""
+    return [node.get_text() for node in nodes]
+
+
+def test_shingles_similarity():
+    """Test similarity of texts by their shingles."""
+    assert jaccard_similarity(shingles(ROUTES), shingles(ROUTES.upper())) == 1.0
+    assert jaccard_similarity(shingles(INSTALL_4_15), shingles(INSTALL_4_16)) > 0.8
+    assert jaccard_similarity(shingles(INSTALL_4_15), shingles(ROUTES)) == 0.0
+    # text shorter than shingle
+    assert jaccard_similarity(shingles("oc get"), shingles("oc get")) == 1.0
+    assert jaccard_similarity(shingles(""), shingles(ROUTES)) < 1.0
+
+
+def test_deduplicate():
+    """Test that near-duplicates of better ranked nodes are dropped."""
+    nodes = [
+        make_node(INSTALL_4_16, 0.9),
+        make_node(ROUTES, 0.8),
+        make_node(INSTALL_4_15, 0.7),
+        make_node(ROUTES_TLS, 0.6),
+    ]
+
+    assert texts(deduplicate(nodes, 0.8)) == [INSTALL_4_16, ROUTES, ROUTES_TLS]
+    assert texts(deduplicate(nodes, 0.99)) == texts(nodes)
+
+
+def test_maximal_marginal_relevance():
+    """Test that redundant nodes are moved behind the diverse ones."""
+    nodes = [
+        make_node(INSTALL_4_16, 0.9),
+        make_node(INSTALL_4_15, 0.85),
+        make_node(ROUTES, 0.7),
+    ]
+
+    assert texts(maximal_marginal_relevance(nodes, 0.5)) == [
+        INSTALL_4_16,
+        ROUTES,
+        INSTALL_4_15,
+    ]
+    # just the relevance counts
+    assert texts(maximal_marginal_relevance(nodes, 1.0)) == texts(nodes)
+
+
+def test_diversify():
+    """Test post-retrieval stage according to configuration."""
+    nodes = [
+        make_node(INSTALL_4_16, 0.9),
+        make_node(INSTALL_4_15, 0.85),
+        make_node(ROUTES, 0.7),
+        make_node(ROUTES_TLS, 0.1),
+    ]
+
+    assert diversify(nodes, None) == nodes
+    # nodes under cutoff are dropped too
+    assert texts(diversify(nodes, DeduplicationConfig())) == [INSTALL_4_16, ROUTES]
+    assert texts(
+        diversify(nodes, DeduplicationConfig(similarity_threshold=1.0, mmr=True))
+    ) == [INSTALL_4_16, ROUTES, INSTALL_4_15]
@@ -0,0 +1,84 @@
+"""Unit tests for the FAISS index helpers."""
+
+import faiss
+import numpy as np
+import pytest
+
+from ols.app.models.config import FaissConfig
+from ols.constants import FaissIndexType
+from ols.src.rag_index.faiss_index import (
+    build_index,
+    convert_index,
+    get_index_type,
+    set_search_parameters,
+)
+
+
+@pytest.fixture
+def vectors():
+    """Random normalized vectors."""
+    rng = np.random.default_rng(42)
+    vectors = rng.standard_normal((2000, 16)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def test_get_index_type(vectors):
+    """Test detection of FAISS index type."""
+    for index_type in FaissIndexType:
+        index = build_index(vectors, index_type, faiss.METRIC_INNER_PRODUCT)
+        assert get_index_type(index) == index_type
+
+    # wrapped index
+    index = faiss.IndexIDMap(faiss.IndexHNSWFlat(16, 8))
+    assert get_index_type(index) == FaissIndexType.HNSW
+
+    # unsupported index type
+    assert get_index_type(faiss.IndexLSH(16, 8)) is None
+
+
+def test_set_search_parameters(vectors):
+    """Test setting of search parameters."""
+    faiss_config = FaissConfig(nprobe=7, ef_search=99)
+
+    index = build_index(vectors, FaissIndexType.IVF, faiss.METRIC_INNER_PRODUCT)
+    set_search_parameters(index, faiss_config)
+    assert faiss.extract_index_ivf(index).nprobe == 7
+
+    index = build_index(vectors, FaissIndexType.HNSW, faiss.METRIC_INNER_PRODUCT)
+    set_search_parameters(index, faiss_config)
+    assert faiss.downcast_index(index).hnsw.efSearch == 99
+
+    # nothing to set for flat index
+    index = build_index(vectors, FaissIndexType.FLAT, faiss.METRIC_INNER_PRODUCT)
+    set_search_parameters(index, faiss_config)
+
+
+def test_set_search_parameters_type_mismatch(vectors, caplog):
+    """Test that configured and persisted index type mismatch is reported."""
+    index = build_index(vectors, FaissIndexType.FLAT, faiss.METRIC_INNER_PRODUCT)
+    set_search_parameters(index, FaissConfig(index_type="hnsw"))
+    assert "configured as hnsw, but the persisted index is flat" in caplog.text
+
+
+@pytest.mark.parametrize("index_type", [FaissIndexType.IVF, FaissIndexType.HNSW])
+def test_convert_index(vectors, index_type):
+    """Test that converted index returns the same vectors (IDs)."""
+    flat_index = build_index(vectors, FaissIndexType.FLAT, faiss.METRIC_INNER_PRODUCT)
+
+    index = convert_index(flat_index, index_type)
+    set_search_parameters(index, FaissConfig(nprobe=64, ef_search=128))
+
+    assert index.ntotal == flat_index.ntotal
+    assert index.metric_type == faiss.METRIC_INNER_PRODUCT
+    queries = vectors[:50]
+    _, expected = flat_index.search(queries, 5)
+    _, found = index.search(queries, 5)
+    recall = np.mean([len(set(e) & set(f)) / 5 for e, f in zip(expected, found)])
+    assert recall > 0.9
+
+
+def test_build_index_unknown_type(vectors):
+    """Test building index of unsupported type."""
+    with pytest.raises(ValueError, match="Unsupported"):
+        build_index(vectors, "lsh", faiss.METRIC_L2)
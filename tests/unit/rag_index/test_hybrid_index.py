@@ -0,0 +1,215 @@
+"""Unit tests for the lexical (BM25) and hybrid index modules."""
+
+import os
+
+import pytest
+from llama_index.core.schema import NodeWithScore, TextNode
+from llama_index.core.storage.docstore import SimpleDocumentStore
+
+from ols.app.models.config import ReferenceContentIndex
+from ols.constants import RAG_SIMILARITY_CUTOFF
+from ols.src.rag_index.bm25_index import BM25Index, docstore_fingerprint, tokenize
+from ols.src.rag_index.hybrid_index import HybridIndex, reciprocal_rank_fusion
+from ols.src.rag_index.index_loader import IndexLoader
+
+DOCUMENTS = {
+    "pods": "A pod in CrashLoopBackOff state is restarted repeatedly.",
+    "dry-run": "Use oc apply --dry-run=client to validate the manifest.",
+    "routes": "Routes expose services outside of the OpenShift cluster.",
+    "nodes": "Nodes run pods; a node can be cordoned before maintenance.",
+}
+
+
+@pytest.fixture
+def docstore():
+    """Docstore with testing documents."""
+    docstore = SimpleDocumentStore()
+    docstore.add_documents(
+        [TextNode(id_=node_id, text=text) for node_id, text in DOCUMENTS.items()]
+    )
+    return docstore
+
+
+def make_node(node_id, score):
+    """Construct retrieved node with given ID and score."""
+    return NodeWithScore(node=TextNode(id_=node_id, text=node_id), score=score)
+
+
+class FakeVectorIndex:
+    """Vector index returning predefined nodes."""
+
+    def __init__(self, docstore, nodes):
+        """Store docstore and nodes to be retrieved."""
+        self.docstore = docstore
+        self.nodes = nodes
+
+    def as_retriever(self, similarity_top_k):
+        """Return retriever, which is the index itself in this case."""
+        return self
+
+    def retrieve(self, query):
+        """Return predefined nodes."""
+        return list(self.nodes)
+
+
+def test_tokenize():
+    """Test that identifiers are kept together with their parts."""
+    assert tokenize("Run `oc apply --dry-run`, see OCP-4.15") == [
+        "run",
+        "oc",
+        "apply",
+        "dry-run",
+        "dry",
+        "run",
+        "see",
+        "ocp-4.15",
+        "ocp",
+        "4",
+        "15",
+    ]
+
+
+def test_bm25_index_retrieve(docstore):
+    """Test retrieving documents by exact identifiers."""
+    index = BM25Index.from_docstore(docstore)
+
+    results = index.retrieve("pod in CrashLoopBackOff", 2)
+    assert results[0][0] == "pods"
+
+    results = index.retrieve("what does --dry-run do", 5)
+    assert results[0][0] == "dry-run"
+
+    assert index.retrieve("unknown words only", 5) == []
+
+
+def test_bm25_index_retrieve_relevant_only(docstore):
+    """Test that documents sharing few query terms are not retrieved."""
+    index = BM25Index.from_docstore(docstore)
+
+    # documents sharing stopwords only
+    assert index.retrieve("what is in the state of the art", 5) == []
+    # one common word of an unrelated query
+    assert index.retrieve("how to run a marathon in under three hours", 5) == []
+    # rare identifier is enough in a short query
+    results = index.retrieve("why is my pod in CrashLoopBackOff", 5)
+    assert [node_id for node_id, _ in results] == ["pods"]
+
+
+def test_bm25_index_top_k(docstore):
+    """Test that number of retrieved documents is limited."""
+    index = BM25Index.from_docstore(docstore)
+    assert len(index.retrieve("pod node", 5)) == 2
+    assert len(index.retrieve("pod node", 1)) == 1
+
+
+def test_bm25_index_persist(docstore, tmpdir):
+    """Test that persisted index returns the same results."""
+    index = BM25Index.from_docstore(docstore)
+    assert not BM25Index.exists(tmpdir)
+
+    index.persist(tmpdir)
+
+    assert BM25Index.exists(tmpdir)
+    loaded = BM25Index.from_persist_dir(tmpdir)
+    assert loaded.retrieve("cordoned node", 3) == index.retrieve("cordoned node", 3)
+
+
+def test_bm25_index_persist_fingerprint(docstore, tmpdir):
+    """Test that fingerprint of the docstore is persisted with the index."""
+    BM25Index.from_docstore(docstore, "fingerprint").persist(tmpdir)
+    assert BM25Index.from_persist_dir(tmpdir).fingerprint == "fingerprint"
+
+
+def test_docstore_fingerprint(docstore, tmpdir):
+    """Test that rewritten docstore gets another fingerprint."""
+    docstore.persist(os.path.join(tmpdir, "docstore.json"))
+    fingerprint = docstore_fingerprint(tmpdir, "product")
+    assert fingerprint == docstore_fingerprint(tmpdir, "product")
+    assert fingerprint != docstore_fingerprint(tmpdir, "other")
+
+    docstore.add_documents([TextNode(id_="new", text="new document")])
+    docstore.persist(os.path.join(tmpdir, "docstore.json"))
+
+    assert fingerprint != docstore_fingerprint(tmpdir, "product")
+
+
+def test_lexical_index_rebuilt_for_new_docstore(docstore, tmpdir):
+    """Test that lexical index built from another docstore is not used."""
+    docstore.persist(os.path.join(tmpdir, "docstore.json"))
+    # index persisted by a build of another vector index
+    BM25Index.from_texts([("stale", "CrashLoopBackOff")], "stale").persist(tmpdir)
+    index_config = ReferenceContentIndex(
+        {"product_docs_index_path": str(tmpdir), "product_docs_index_id": "product"}
+    )
+    loader = IndexLoader.__new__(IndexLoader)
+
+    hybrid_index = loader._add_lexical_index(
+        FakeVectorIndex(docstore, []), index_config
+    )
+
+    assert hybrid_index.retrieve("CrashLoopBackOff", 1)[0].node_id == "pods"
+    persisted = BM25Index.from_persist_dir(tmpdir)
+    assert persisted.fingerprint == docstore_fingerprint(str(tmpdir), "product")
+    assert persisted.retrieve("CrashLoopBackOff", 1)[0][0] == "pods"
+
+
+def test_reciprocal_rank_fusion():
+    """Test fusion of vector and lexical search results."""
+    vector_nodes = [make_node("a", 0.8), make_node("b", 0.6), make_node("c", 0.1)]
+    lexical_nodes = [make_node("b", 12.0), make_node("d", 7.0), make_node("c", 3.0)]
+
+    fused = reciprocal_rank_fusion(vector_nodes, lexical_nodes, 3)
+
+    # node found by both searches is the best one, irrelevant node is dropped
+    assert [node.node_id for node in fused] == ["b", "a", "d"]
+    # scores are mapped to similarity range, above the cutoff
+    assert fused[0].score == pytest.approx(0.8)
+    assert fused[1].score < fused[0].score
+    assert RAG_SIMILARITY_CUTOFF <= fused[2].score < fused[1].score
+
+
+def test_reciprocal_rank_fusion_lexical_only():
+    """Test that nodes found by lexical search only are not dropped."""
+    vector_nodes = [make_node("a", 0.2), make_node("b", 0.1)]
+    lexical_nodes = [make_node("c", 12.0), make_node("d", 7.0)]
+
+    fused = reciprocal_rank_fusion(vector_nodes, lexical_nodes, 3)
+
+    assert [node.node_id for node in fused] == ["c", "d"]
+    assert all(node.score >= RAG_SIMILARITY_CUTOFF for node in fused)
+
+
+def test_reciprocal_rank_fusion_no_lexical_results():
+    """Test that vector search results are used when lexical search is empty."""
+    vector_nodes = [make_node("a", 0.8), make_node("b", 0.6)]
+    assert reciprocal_rank_fusion(vector_nodes, [], 1) == vector_nodes[:1]
+
+
+def test_hybrid_index_retrieve(docstore):
+    """Test retrieving nodes from hybrid index."""
+    vector_index = FakeVectorIndex(
+        docstore, [make_node("routes", 0.7), make_node("nodes", 0.5)]
+    )
+    hybrid_index = HybridIndex(vector_index, BM25Index.from_docstore(docstore))
+
+    nodes = hybrid_index.as_retriever(similarity_top_k=3).retrieve(
+        "CrashLoopBackOff pods"
+    )
+
+    node_ids = [node.node_id for node in nodes]
+    # node found by lexical search only is fetched from docstore
+    assert "pods" in node_ids
+    assert nodes[node_ids.index("pods")].get_text() == DOCUMENTS["pods"]
+    assert len(nodes) == 3
+
+
+def test_hybrid_index_retrieve_keyword_query(docstore):
+    """Test that nodes matched by lexical search only are retrieved."""
+    # vector search finds nothing relevant for an error code
+    vector_index = FakeVectorIndex(docstore, [make_node("routes", 0.1)])
+    hybrid_index = HybridIndex(vector_index, BM25Index.from_docstore(docstore))
+
+    nodes = hybrid_index.as_retriever(similarity_top_k=3).retrieve("CrashLoopBackOff")
+
+    assert [node.node_id for node in nodes] == ["pods"]
+    assert nodes[0].score >= RAG_SIMILARITY_CUTOFF
@@ -0,0 +1,135 @@
+"""Unit tests for the index builder module."""
+
+import json
+import os
+from functools import partial
+
+import pytest
+from llama_index.core import StorageContext, load_index_from_storage
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.vector_stores.faiss import FaissVectorStore
+
+from ols.constants import (
+    BM25_INDEX_FILENAME,
+    INDEX_BUILD_MANIFEST_FILENAME,
+    TOKEN_COUNTS_METADATA_KEY,
+    FaissIndexType,
+)
+from ols.src.rag_index.index_builder import IndexBuilder
+
+DOCS = {
+    "pods.md": "# Pods\n\nA pod in CrashLoopBackOff state is restarted repeatedly.",
+    "networking/routes.md": "# Routes\n\nRoutes expose services outside the cluster.",
+    "nodes.adoc": "= Nodes\n\nNodes run pods; a node can be cordoned.",
+    "image.png": "not a documentation file",
+}
+
+
+@pytest.fixture
+def docs_dir(tmpdir):
+    """Directory with documentation files."""
+    for name, content in DOCS.items():
+        path = tmpdir.join("docs", name)
+        path.write_text(content, encoding="utf-8", ensure=True)
+    return str(tmpdir.join("docs"))
+
+
+def make_builder(**kwargs):
+    """Construct index builder using mock embedding model."""
+    return IndexBuilder(
+        partial(MockEmbedding, embed_dim=8),
+        "mock",
+        docs_url_base="https://docs.example.com/",
+        **kwargs,
+    )
+
+
+def load_index(persist_dir):
+    """Load built index the same way as `IndexLoader` does."""
+    storage_context = StorageContext.from_defaults(
+        vector_store=FaissVectorStore.from_persist_dir(persist_dir),
+        persist_dir=persist_dir,
+    )
+    return load_index_from_storage(
+        storage_context, index_id="ocp", embed_model=MockEmbedding(embed_dim=8)
+    )
+
+
+@pytest.mark.parametrize("index_type", [FaissIndexType.FLAT, FaissIndexType.HNSW])
+def test_build(docs_dir, tmpdir, index_type):
+    """Test that built index can be loaded and queried."""
+    output_dir = str(tmpdir.join("index"))
+
+    stats = make_builder(index_type=index_type).build(docs_dir, output_dir, "ocp")
+
+    assert stats.files == 3
+    assert stats.changed_files == 3
+    assert stats.chunks == stats.embedded_chunks == 3
+
+    nodes = load_index(output_dir).as_retriever(similarity_top_k=3).retrieve("pod")
+    metadata = {node.metadata["title"]: node.metadata for node in nodes}
+    assert metadata.keys() == {"Pods", "Routes", "Nodes"}
+    assert (
+        metadata["Routes"]["docs_url"]
+        == "https://docs.example.com/networking/routes.md"
+    )
+    assert TOKEN_COUNTS_METADATA_KEY in metadata["Pods"]
+    # URL and token counts are not embedded
+    assert "docs.example.com" not in nodes[0].node.get_content("embed")
+
+
+def test_build_incremental(docs_dir, tmpdir):
+    """Test that just the changed files are embedded on rebuild."""
+    output_dir = str(tmpdir.join("index"))
+    make_builder().build(docs_dir, output_dir, "ocp")
+    # derived index is stale after rebuild
+    tmpdir.join("index", BM25_INDEX_FILENAME).write("{}")
+
+    stats = make_builder().build(docs_dir, output_dir, "ocp")
+    assert stats.changed_files == 0
+    assert stats.embedded_chunks == 0
+    assert not os.path.exists(os.path.join(output_dir, BM25_INDEX_FILENAME))
+
+    # one file is changed, one removed, one added
+    tmpdir.join("docs", "pods.md").write("# Pods\n\nPods are scheduled to nodes.")
+    tmpdir.join("docs", "nodes.adoc").remove()
+    tmpdir.join("docs", "builds.md").write("# Builds\n\nBuilds create images.")
+    stats = make_builder().build(docs_dir, output_dir, "ocp")
+    assert stats.files == 3
+    assert stats.changed_files == 2
+    assert stats.embedded_chunks == 2
+
+    nodes = load_index(output_dir).as_retriever(similarity_top_k=5).retrieve("pod")
+    assert sorted(node.metadata["title"] for node in nodes) == [
+        "Builds",
+        "Pods",
+        "Routes",
+    ]
+    with open(
+        os.path.join(output_dir, INDEX_BUILD_MANIFEST_FILENAME), encoding="utf-8"
+    ) as fin:
+        assert json.load(fin)["files"].keys() == {
+            "builds.md",
+            "networking/routes.md",
+            "pods.md",
+        }
+
+    # all chunks are embedded when build settings change
+    stats = make_builder(chunk_size=200).build(docs_dir, output_dir, "ocp")
+    assert stats.embedded_chunks == 3
+
+
+def test_build_in_worker_processes(docs_dir, tmpdir):
+    """Test that chunks can be embedded by pool of processes."""
+    output_dir = str(tmpdir.join("index"))
+
+    stats = make_builder(workers=2, batch_size=1).build(docs_dir, output_dir, "ocp")
+
+    assert stats.embedded_chunks == 3
+    assert len(load_index(output_dir).as_retriever().retrieve("pod")) == 2
+
+
+def test_build_no_docs(tmpdir):
+    """Test that index is not built without documentation files."""
+    with pytest.raises(ValueError, match="No documentation files"):
+        make_builder().build(str(tmpdir), str(tmpdir.join("index")), "ocp")
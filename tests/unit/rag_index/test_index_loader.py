@@ -4,11 +4,22 @@ import os
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 from ols import config
-from ols.app.models.config import PostgresConfig, ReferenceContent
-from ols.constants import VectorStoreType
-from ols.src.rag_index.index_loader import IndexLoader
-from tests.mock_classes.mock_llama_index import MockLlamaIndex
+
+# needs to be setup there before metrics are imported
+config.ols_config.authentication_config.module = "k8s"
+
+from ols.app.metrics import index_load_duration_seconds  # noqa:E402
+from ols.app.models.config import PostgresConfig, ReferenceContent  # noqa:E402
+from ols.constants import VectorStoreType  # noqa:E402
+from ols.src.rag_index.index_loader import (  # noqa:E402
+    IndexLoader,
+    get_index_load_durations,
+    timed_phase,
+)
+from tests.mock_classes.mock_llama_index import MockLlamaIndex  # noqa:E402
 
 
 def test_index_loader_empty_config(caplog):
@@ -84,6 +95,32 @@ def test_index_loader_from_faiss():
 
         assert isinstance(index, MockLlamaIndex)
 
+    # all load phases are timed
+    durations = get_index_load_durations()
+    assert {"total", "embedding_model"} <= durations.keys()
+    assert durations["indexes"]["./some_id"].keys() == {
+        "vector_store",
+        "docstore",
+        "index",
+    }
+
+
+def test_timed_phase():
+    """Test that durations of load phases are stored."""
+    with timed_phase("foo"), timed_phase("bar", "ocp"):
+        pass
+
+    durations = get_index_load_durations()
+    assert durations["foo"] >= durations["indexes"]["ocp"]["bar"] >= 0
+
+    assert index_load_duration_seconds.labels(
+        phase="bar", index="ocp"
+    )._value.get() == pytest.approx(durations["indexes"]["ocp"]["bar"], abs=0.001)
+
+    # copy is returned
+    durations["foo"] = -1
+    assert get_index_load_durations()["foo"] >= 0
+
 
 def test_index_loader_from_postgres():
     """Test index loader when 'postgres' is selected for the vector store type."""
@@ -94,17 +131,22 @@ def test_index_loader_from_postgres():
 
     with (
         patch("llama_index.core.StorageContext.from_defaults"),
+        patch("llama_index.vector_stores.postgres.PGVectorStore") as pg_vector_store,
         patch(
-            "llama_index.vector_stores.postgres.PGVectorStore.from_params"
-        ) as from_params,
+            "ols.src.rag_index.index_loader.create_engines",
+            return_value=(None, None),
+        ),
+        patch("ols.src.rag_index.index_loader.ensure_ann_index") as ensure_ann_index,
         patch(
             "llama_index.core.VectorStoreIndex.from_vector_store", new=MockLlamaIndex
         ),
         patch.dict(os.environ, {"TRANSFORMERS_CACHE": "", "TRANSFORMERS_OFFLINE": ""}),
     ):
-        from_params.return_value = None
+        pg_vector_store.return_value = None
 
         index_loader_obj = IndexLoader(config.ols_config.reference_content)
         index = index_loader_obj.vector_index
 
         assert isinstance(index, MockLlamaIndex)
+        ensure_ann_index.assert_called_once()
+        assert ensure_ann_index.call_args.args[1] == "data_some_id"
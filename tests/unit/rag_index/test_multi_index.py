@@ -0,0 +1,222 @@
+"""Unit tests for the multi index and index router modules."""
+
+import pytest
+
+from ols.app.models.config import ReferenceContentIndex
+from ols.constants import IndexRoutingMethod
+from ols.src.rag_index.index_router import IndexRouter
+from ols.src.rag_index.multi_index import MultiIndex, merge_retrieved_nodes
+from tests.mock_classes.mock_retrieved_node import MockRetrievedNode
+
+
+def make_node(text, score):
+    """Construct retrieved node with given text and score."""
+    return MockRetrievedNode({"text": text, "score": score, "metadata": {}})
+
+
+def make_index_config(name, keywords=None, description=None):
+    """Construct configuration of one index."""
+    return ReferenceContentIndex(
+        {
+            "name": name,
+            "product_docs_index_id": name,
+            "keywords": keywords or [],
+            "description": description,
+        }
+    )
+
+
+class FakeIndex:
+    """Index returning predefined nodes."""
+
+    def __init__(self, nodes):
+        """Store nodes to be retrieved."""
+        self.nodes = nodes
+        self.queries = []
+
+    def as_retriever(self, similarity_top_k):
+        """Return retriever, which is the index itself in this case."""
+        self.similarity_top_k = similarity_top_k
+        return self
+
+    def retrieve(self, query):
+        """Return copy of predefined nodes."""
+        self.queries.append(query)
+        return [make_node(node.get_text(), node.score) for node in self.nodes]
+
+
+class FakeEmbedModel:
+    """Embedding model producing one-hot vectors for known words."""
+
+    WORDS = ("openshift", "ansible", "rhel")
+
+    def _embed(self, text):
+        return [1.0 if word in text.lower() else 0.0 for word in self.WORDS]
+
+    def get_query_embedding(self, query):
+        """Embed the query."""
+        return self._embed(query)
+
+    def get_text_embedding_batch(self, texts):
+        """Embed all texts."""
+        return [self._embed(text) for text in texts]
+
+
+def test_merge_retrieved_nodes_single_index():
+    """Test that nodes from one index are not modified."""
+    nodes = [make_node("a", 0.9), make_node("b", 0.2), make_node("c", 0.1)]
+    merged = merge_retrieved_nodes([nodes], 2)
+    assert [node.get_text() for node in merged] == ["a", "b"]
+    assert [node.score for node in merged] == [0.9, 0.2]
+
+
+def test_merge_retrieved_nodes_keeps_scores():
+    """Test that nodes from multiple indexes are merged by their scores."""
+    first = [make_node("a1", 0.8), make_node("a2", 0.4)]
+    second = [make_node("b1", 0.5), make_node("b2", 0.45), make_node("b3", 0.1)]
+
+    merged = merge_retrieved_nodes([first, second], 10)
+
+    # node under similarity cutoff is dropped
+    assert [node.get_text() for node in merged] == ["a1", "b1", "b2", "a2"]
+    assert [node.score for node in merged] == [0.8, 0.5, 0.45, 0.4]
+
+
+def test_merge_retrieved_nodes_weak_index_not_promoted():
+    """Test that the best node of a weakly matching index keeps its score."""
+    relevant = [make_node("a1", 0.9), make_node("a2", 0.85)]
+    weak = [make_node("b1", 0.35)]
+
+    merged = merge_retrieved_nodes([relevant, weak], 10)
+
+    assert [node.get_text() for node in merged] == ["a1", "a2", "b1"]
+    assert merged[2].score == 0.35
+
+
+def test_merge_retrieved_nodes_top_k():
+    """Test that number of merged nodes is limited."""
+    first = [make_node("a1", 0.8), make_node("a2", 0.7)]
+    second = [make_node("b1", 0.9), make_node("b2", 0.6)]
+    assert len(merge_retrieved_nodes([first, second], 3)) == 3
+
+
+def test_merge_retrieved_nodes_nothing_relevant():
+    """Test merging nodes when all nodes are under similarity cutoff."""
+    first = [make_node("a1", 0.1)]
+    second = [make_node("b1", 0.2)]
+    assert merge_retrieved_nodes([first, second], 3) == []
+
+
+def test_router_all():
+    """Test that all indexes are selected by default."""
+    router = IndexRouter(
+        IndexRoutingMethod.ALL, [make_index_config("a"), make_index_config("b")]
+    )
+    assert router.route("anything") == (["a", "b"], None)
+
+
+def test_router_keywords():
+    """Test routing by keywords."""
+    router = IndexRouter(
+        IndexRoutingMethod.KEYWORD,
+        [
+            make_index_config("ocp", keywords=["OpenShift", "oc "]),
+            make_index_config("aap", keywords=["ansible"]),
+            make_index_config("generic"),
+        ],
+    )
+    assert router.route("How to install OpenShift?")[0] == ["ocp", "generic"]
+    assert router.route("ansible playbook")[0] == ["aap", "generic"]
+    assert router.route("what is a pod")[0] == ["generic"]
+
+
+def test_router_keywords_no_match():
+    """Test that all indexes are selected when no keyword matches."""
+    router = IndexRouter(
+        IndexRoutingMethod.KEYWORD,
+        [
+            make_index_config("ocp", keywords=["openshift"]),
+            make_index_config("aap", keywords=["ansible"]),
+        ],
+    )
+    assert router.route("what is a pod")[0] == ["ocp", "aap"]
+
+
+def test_router_embedding():
+    """Test routing by similarity of query and index description."""
+    router = IndexRouter(
+        IndexRoutingMethod.EMBEDDING,
+        [
+            make_index_config("ocp", description="OpenShift documentation"),
+            make_index_config("aap", description="Ansible documentation"),
+        ],
+        FakeEmbedModel(),
+    )
+    selected, embedding = router.route("install openshift")
+    assert selected == ["ocp"]
+    assert embedding == [1.0, 0.0, 0.0]
+
+    # no similar description, the most similar index is selected
+    selected, _ = router.route("rhel ansible")
+    assert selected == ["aap"]
+
+
+def test_router_embedding_without_description():
+    """Test that index without description is always selected."""
+    router = IndexRouter(
+        IndexRoutingMethod.EMBEDDING,
+        [
+            make_index_config("ocp", description="OpenShift documentation"),
+            make_index_config("generic"),
+        ],
+        FakeEmbedModel(),
+    )
+    assert router.route("ansible")[0] == ["generic"]
+
+
+def test_multi_index_retrieve():
+    """Test retrieving nodes from multiple indexes."""
+    first = FakeIndex([make_node("a1", 0.8)])
+    second = FakeIndex([make_node("b1", 0.6), make_node("b2", 0.5)])
+    multi_index = MultiIndex({"first": first, "second": second})
+
+    retriever = multi_index.as_retriever(similarity_top_k=2)
+    nodes = retriever.retrieve("question")
+
+    assert [node.get_text() for node in nodes] == ["a1", "b1"]
+    assert first.similarity_top_k == 2
+    assert second.queries == ["question"]
+
+
+def test_multi_index_routing():
+    """Test that only routed indexes are queried."""
+    first = FakeIndex([make_node("a1", 0.8)])
+    second = FakeIndex([make_node("b1", 0.6)])
+    router = IndexRouter(
+        IndexRoutingMethod.KEYWORD,
+        [
+            make_index_config("first", keywords=["openshift"]),
+            make_index_config("second", keywords=["ansible"]),
+        ],
+    )
+    multi_index = MultiIndex({"first": first, "second": second}, router)
+
+    nodes = multi_index.as_retriever(similarity_top_k=5).retrieve("ansible")
+
+    assert [node.get_text() for node in nodes] == ["b1"]
+    assert first.queries == []
+
+
+def test_multi_index_select():
+    """Test selecting subset of indexes."""
+    first = FakeIndex([make_node("a1", 0.8)])
+    second = FakeIndex([make_node("b1", 0.6)])
+    multi_index = MultiIndex({"first": first, "second": second})
+
+    selected = multi_index.select(["second"])
+    assert selected.names == ["second"]
+    nodes = selected.as_retriever(similarity_top_k=5).retrieve("question")
+    assert [node.get_text() for node in nodes] == ["b1"]
+
+    with pytest.raises(ValueError, match="Unknown index"):
+        multi_index.select(["third"])
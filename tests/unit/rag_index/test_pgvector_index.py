@@ -0,0 +1,112 @@
+"""Unit tests for the pgvector index helpers."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from ols.app.models.config import PGVectorConfig, PostgresConfig
+from ols.constants import PGVectorIndexType
+from ols.src.rag_index.pgvector_index import (
+    create_engines,
+    ensure_ann_index,
+    find_ann_index,
+    get_table_name,
+)
+
+HNSW_INDEX = (
+    "data_ocp_embedding_idx",
+    "CREATE INDEX data_ocp_embedding_idx ON public.data_ocp "
+    "USING hnsw (embedding vector_cosine_ops) WITH (m='16', ef_construction='64')",
+)
+IVFFLAT_INDEX = (
+    "data_ocp_embedding_idx",
+    "CREATE INDEX data_ocp_embedding_idx ON public.data_ocp "
+    "USING ivfflat (embedding vector_cosine_ops) WITH (lists='100')",
+)
+PKEY_INDEX = (
+    "data_ocp_pkey",
+    "CREATE UNIQUE INDEX data_ocp_pkey ON public.data_ocp USING btree (id)",
+)
+
+
+def mock_engine(indexes):
+    """Mock SQLAlchemy engine with table having given indexes."""
+    engine = MagicMock()
+    connection = (
+        engine.connect.return_value.execution_options.return_value.__enter__.return_value
+    )
+    connection.execute.return_value.fetchall.return_value = indexes
+    return engine, connection
+
+
+def test_get_table_name():
+    """Test name of table used by pgvector store."""
+    assert get_table_name("OCP-product-docs-4_15") == "data_ocp_product_docs_4_15"
+
+
+def test_create_engines():
+    """Test that engines use connection pool and search settings."""
+    postgres_config = PostgresConfig(host="db.example.com")
+    pgvector_config = PGVectorConfig(pool_size=3, max_overflow=2, ef_search=100)
+
+    engine, async_engine = create_engines(postgres_config, pgvector_config)
+
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 2
+    assert async_engine.pool.size() == 3
+    assert engine.url.host == "db.example.com"
+    assert engine.url.drivername == "postgresql+psycopg2"
+    assert async_engine.url.drivername == "postgresql+asyncpg"
+
+
+@pytest.mark.parametrize(
+    "indexes, expected",
+    [
+        ([], None),
+        ([PKEY_INDEX], None),
+        ([PKEY_INDEX, HNSW_INDEX], PGVectorIndexType.HNSW),
+        ([IVFFLAT_INDEX], PGVectorIndexType.IVFFLAT),
+    ],
+)
+def test_find_ann_index(indexes, expected):
+    """Test detection of ANN index on embedding column."""
+    _, connection = mock_engine(indexes)
+    assert find_ann_index(connection, "data_ocp") == expected
+
+
+def test_ensure_ann_index_existing_index():
+    """Test that no index is created when there is one already."""
+    engine, connection = mock_engine([IVFFLAT_INDEX])
+
+    assert ensure_ann_index(engine, "data_ocp", PGVectorConfig()) == "ivfflat"
+    assert connection.execute.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "index_type, parameters",
+    [
+        ("hnsw", "WITH (m = 8, ef_construction = 64)"),
+        ("ivfflat", "WITH (lists = 100)"),
+    ],
+)
+def test_ensure_ann_index_creates_index(index_type, parameters):
+    """Test that missing index is created."""
+    engine, connection = mock_engine([PKEY_INDEX])
+    pgvector_config = PGVectorConfig(index_type=index_type, hnsw_m=8)
+
+    assert ensure_ann_index(engine, "data_ocp", pgvector_config) == index_type
+
+    statement = str(connection.execute.call_args.args[0])
+    assert statement.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS")
+    assert f"USING {index_type} (embedding vector_cosine_ops)" in statement
+    assert statement.endswith(parameters)
+
+
+def test_ensure_ann_index_creation_disabled():
+    """Test that index is not created when it is disabled by configuration."""
+    engine, connection = mock_engine([])
+
+    pgvector_config = PGVectorConfig(create_index=False)
+
+    assert ensure_ann_index(engine, "data_ocp", pgvector_config) is None
+    assert connection.execute.call_count == 1
@@ -0,0 +1,138 @@
+"""Unit tests for the remote index (retrieval sidecar client) module."""
+
+import os
+import stat
+import threading
+
+import pytest
+
+from ols.app.models.config import RetrievalSidecarConfig
+from ols.runners.retrieval_sidecar import RetrievalServer, make_socket_directory
+from ols.src.rag_index.multi_index import MultiIndex
+from ols.src.rag_index.remote_index import (
+    OP_RETRIEVE,
+    RemoteIndex,
+    RemoteNode,
+    RetrievalProtocolError,
+    decode_nodes,
+    decode_request,
+    encode_error,
+    encode_nodes,
+    encode_request,
+)
+
+
+class FakeIndex:
+    """Index returning one node per query, mentioning its name."""
+
+    def __init__(self, name):
+        """Initialize the index."""
+        self.name = name
+
+    def as_retriever(self, similarity_top_k):
+        """Return retriever of the index."""
+        self.similarity_top_k = similarity_top_k
+        return self
+
+    def retrieve(self, query):
+        """Return node for given query."""
+        if query == "fail":
+            raise RuntimeError("index failure")
+        return [
+            RemoteNode(
+                f"{self.name}-1",
+                f"{self.name}: {query}",
+                0.8,
+                {"docs_url": f"https://{self.name}", "title": "Ünïcode"},
+            )
+        ]
+
+
+@pytest.fixture
+def sidecar(tmpdir):
+    """Sidecar serving two indexes on a Unix socket."""
+    socket_path = str(tmpdir.join("retrieval.sock"))
+    index = MultiIndex({"ocp": FakeIndex("ocp"), "acm": FakeIndex("acm")})
+    server = RetrievalServer(socket_path, index)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield RetrievalSidecarConfig(socket_path=socket_path, timeout=5)
+    server.shutdown()
+    server.server_close()
+
+
+def test_request_encoding():
+    """Test that request is decoded as it was encoded."""
+    payload = encode_request(OP_RETRIEVE, "what is a pod?", 7, ["ocp", "acm"])
+
+    assert decode_request(payload) == (OP_RETRIEVE, "what is a pod?", 7, ["ocp", "acm"])
+    with pytest.raises(RetrievalProtocolError, match="Truncated"):
+        decode_request(payload[:-1])
+
+
+def test_nodes_encoding():
+    """Test that nodes are decoded as they were encoded."""
+    node = RemoteNode("id", "text", 0.5, {"title": "Pods", "token_counts": {"gpt": 2}})
+
+    decoded = decode_nodes(encode_nodes([node]))
+
+    assert len(decoded) == 1
+    assert decoded[0].node_id == "id"
+    assert decoded[0].get_text() == "text"
+    assert decoded[0].get_score() == 0.5
+    assert decoded[0].metadata == node.metadata
+    with pytest.raises(RetrievalProtocolError, match="index failure"):
+        decode_nodes(encode_error("index failure"))
+
+
+def test_remote_index(sidecar):
+    """Test retrieval from indexes served by the sidecar."""
+    remote_index = RemoteIndex(sidecar, ["ocp", "acm"])
+    assert remote_index.is_ready()
+
+    nodes = remote_index.as_retriever(similarity_top_k=3).retrieve("pods")
+    assert sorted(node.get_text() for node in nodes) == ["acm: pods", "ocp: pods"]
+    assert nodes[0].metadata["title"] == "Ünïcode"
+
+    nodes = remote_index.select(["acm"]).as_retriever(similarity_top_k=3).retrieve("x")
+    assert [node.node_id for node in nodes] == ["acm-1"]
+
+    with pytest.raises(ValueError, match="Unknown index"):
+        remote_index.select(["rhel"])
+    with pytest.raises(RetrievalProtocolError, match="index failure"):
+        remote_index.as_retriever(similarity_top_k=3).retrieve("fail")
+
+
+def test_remote_index_not_ready(tmpdir):
+    """Test that index is not ready until the sidecar listens."""
+    sidecar_config = RetrievalSidecarConfig(socket_path=str(tmpdir.join("no.sock")))
+
+    remote_index = RemoteIndex(sidecar_config, ["ocp"])
+
+    assert not remote_index.is_ready()
+    with pytest.raises(OSError):
+        remote_index.as_retriever(similarity_top_k=3).retrieve("pods")
+
+
+def test_retrieval_server_socket_private(tmpdir):
+    """Test that stale socket is replaced by socket of the service user only."""
+    socket_path = str(tmpdir.join("retrieval.sock"))
+    with open(socket_path, "w", encoding="utf-8"):
+        pass
+
+    server = RetrievalServer(socket_path, None)
+    try:
+        mode = os.stat(socket_path).st_mode
+        assert stat.S_ISSOCK(mode)
+        assert mode & 0o077 == 0
+    finally:
+        server.server_close()
+
+
+def test_make_socket_directory(tmpdir):
+    """Test that socket directory is accessible by the service user only."""
+    socket_path = str(tmpdir.join("sidecar", "retrieval.sock"))
+
+    make_socket_directory(socket_path)
+
+    assert stat.S_IMODE(os.stat(tmpdir.join("sidecar")).st_mode) == 0o700
@@ -0,0 +1,70 @@
+"""Unit tests for the retrieval depth module."""
+
+import pytest
+
+from ols.app.models.config import RetrievalDepthConfig
+from ols.src.rag_index.retrieval_depth import (
+    ChunkTokensEstimate,
+    get_next_top_k,
+    get_top_k,
+)
+from tests.mock_classes.mock_retrieved_node import MockRetrievedNode
+
+
+def make_nodes(scores):
+    """Construct retrieved nodes with given scores."""
+    return [
+        MockRetrievedNode({"text": "text", "score": score, "metadata": {}})
+        for score in scores
+    ]
+
+
+def test_chunk_tokens_estimate():
+    """Test that estimate follows the observed chunks."""
+    estimate = ChunkTokensEstimate(initial=400, smoothing=0.5)
+    assert estimate.get() == 400
+
+    estimate.update(600, 3)
+    assert estimate.get() == 300
+    # no chunk used, nothing to learn from
+    estimate.update(0, 0)
+    assert estimate.get() == 300
+
+
+@pytest.mark.parametrize(
+    ("available_tokens", "expected"),
+    [(100, 2), (1000, 3), (2100, 6), (100000, 10)],
+)
+def test_get_top_k(available_tokens, expected):
+    """Test that number of chunks is sized from the budget within bounds."""
+    retrieval_depth_config = RetrievalDepthConfig(min_top_k=2, max_top_k=10)
+    estimate = ChunkTokensEstimate(initial=400)
+
+    assert get_top_k(retrieval_depth_config, available_tokens, estimate) == expected
+
+
+def test_get_next_top_k():
+    """Test when more chunks are retrieved."""
+    retrieval_depth_config = RetrievalDepthConfig(min_top_k=2, max_top_k=10)
+    estimate = ChunkTokensEstimate(initial=400)
+    nodes = make_nodes([0.9, 0.8, 0.7])
+
+    # budget left for two more chunks
+    assert get_next_top_k(retrieval_depth_config, 3, nodes, 800, estimate) == 5
+    # upper bound is not exceeded
+    assert get_next_top_k(retrieval_depth_config, 3, nodes, 8000, estimate) == 10
+    # budget is filled
+    assert get_next_top_k(retrieval_depth_config, 3, nodes, 100, estimate) is None
+    # upper bound reached
+    assert get_next_top_k(retrieval_depth_config, 10, nodes, 800, estimate) is None
+    # index has no more chunks
+    assert get_next_top_k(retrieval_depth_config, 4, nodes, 800, estimate) is None
+    # the next chunks would be under the similarity cutoff
+    nodes = make_nodes([0.9, 0.8, 0.1])
+    assert get_next_top_k(retrieval_depth_config, 3, nodes, 800, estimate) is None
+
+
+def test_retrieval_depth_config():
+    """Test validation of retrieval depth bounds."""
+    with pytest.raises(ValueError, match="min_top_k"):
+        RetrievalDepthConfig(min_top_k=5, max_top_k=2)
@@ -0,0 +1,139 @@
+"""Unit tests for the SQLite docstore module."""
+
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from llama_index.core.schema import TextNode
+from llama_index.core.storage.docstore import SimpleDocumentStore
+
+from ols.constants import SQLITE_DOCSTORE_FILENAME
+from ols.src.rag_index.sqlite_docstore import (
+    SQLiteKVStore,
+    convert_docstore,
+    exists,
+    load_docstore,
+)
+
+NODES = {
+    "pods": "A pod in CrashLoopBackOff state is restarted repeatedly.",
+    "routes": "Routes expose services outside of the OpenShift cluster.",
+    "nodes": "Nodes run pods; a node can be cordoned before maintenance.",
+}
+
+
+@pytest.fixture
+def persist_dir(tmpdir):
+    """Directory with persisted JSON docstore."""
+    docstore = SimpleDocumentStore()
+    docstore.add_documents(
+        [
+            TextNode(id_=node_id, text=text, metadata={"title": node_id})
+            for node_id, text in NODES.items()
+        ]
+    )
+    docstore.persist(os.path.join(tmpdir, "docstore.json"))
+    return str(tmpdir)
+
+
+def test_load_docstore(persist_dir):
+    """Test that nodes are read from SQLite docstore converted from JSON."""
+    assert not exists(persist_dir)
+
+    docstore = load_docstore(persist_dir)
+
+    assert exists(persist_dir)
+    node = docstore.get_node("routes")
+    assert node.text == NODES["routes"]
+    assert node.metadata == {"title": "routes"}
+    assert [node.node_id for node in docstore.get_nodes(["pods", "nodes"])] == [
+        "pods",
+        "nodes",
+    ]
+    assert docstore.get_node("unknown", raise_error=False) is None
+    assert docstore.docs.keys() == NODES.keys()
+
+
+def test_load_docstore_converted_once(persist_dir):
+    """Test that existing SQLite docstore is used."""
+    load_docstore(persist_dir)
+
+    with patch("ols.src.rag_index.sqlite_docstore.convert_docstore") as convert:
+        docstore = load_docstore(persist_dir)
+        convert.assert_not_called()
+    assert docstore.get_node("pods").text == NODES["pods"]
+
+
+def test_load_docstore_converted_again(persist_dir):
+    """Test that SQLite docstore is converted again from rebuilt JSON docstore."""
+    load_docstore(persist_dir)
+
+    docstore = SimpleDocumentStore()
+    docstore.add_documents([TextNode(id_="new", text="new document")])
+    docstore.persist(os.path.join(persist_dir, "docstore.json"))
+    assert not exists(persist_dir)
+
+    docstore = load_docstore(persist_dir)
+    assert exists(persist_dir)
+    assert docstore.docs.keys() == {"new"}
+
+
+def test_exists_without_json_docstore(persist_dir):
+    """Test that SQLite docstore is used when JSON docstore is not shipped."""
+    convert_docstore(persist_dir)
+    os.remove(os.path.join(persist_dir, "docstore.json"))
+    assert exists(persist_dir)
+
+
+def test_exists_database_without_source(persist_dir):
+    """Test that database written without source signature is outdated."""
+    convert_docstore(persist_dir)
+    connection = sqlite3.connect(os.path.join(persist_dir, SQLITE_DOCSTORE_FILENAME))
+    with connection:
+        connection.execute("DROP TABLE source")
+    connection.close()
+    assert not exists(persist_dir)
+
+
+def test_convert_docstore_failure(persist_dir):
+    """Test that partially written database is removed."""
+    with (
+        patch("ols.src.rag_index.sqlite_docstore.json.dumps", side_effect=TypeError),
+        pytest.raises(TypeError),
+    ):
+        convert_docstore(persist_dir)
+
+    assert os.listdir(persist_dir) == ["docstore.json"]
+
+
+def test_kvstore_cache(persist_dir):
+    """Test that recently read values are cached."""
+    convert_docstore(persist_dir)
+    kvstore = SQLiteKVStore(os.path.join(persist_dir, SQLITE_DOCSTORE_FILENAME), 2)
+
+    first = kvstore.get("pods", "docstore/data")
+    kvstore.get("routes", "docstore/data")
+    assert len(kvstore._cache) == 2
+
+    # cached values are not shared by callers
+    first["__data__"]["text"] = "changed"
+    assert kvstore.get("pods", "docstore/data")["__data__"]["text"] == NODES["pods"]
+
+    # the least recently read value is evicted
+    kvstore.get("nodes", "docstore/data")
+    assert list(kvstore._cache) == [
+        ("docstore/data", "pods"),
+        ("docstore/data", "nodes"),
+    ]
+
+
+def test_kvstore_is_read_only(persist_dir):
+    """Test that values can not be stored into SQLite docstore."""
+    convert_docstore(persist_dir)
+    kvstore = SQLiteKVStore(os.path.join(persist_dir, SQLITE_DOCSTORE_FILENAME))
+
+    with pytest.raises(NotImplementedError):
+        kvstore.put("pods", {})
+    with pytest.raises(NotImplementedError):
+        kvstore.delete("pods")
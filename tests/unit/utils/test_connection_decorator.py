@@ -1,8 +1,12 @@
 """Unit tests for the connection decorator."""
 
+from unittest.mock import call, patch
+
+import psycopg2
 import pytest
 
-from ols.utils.connection_decorator import connection
+from ols.utils.connection_decorator import UnconfirmedWriteError, connection
+from ols.utils.postgres_pool import PoolTimeoutError
 
 
 class Connectable:
@@ -51,3 +55,129 @@ def test_connection_decorator_on_connection_exception():
     with pytest.raises(Exception, match="foo error!"):
         # this method should autoconnect
         c.foo()
+
+
+class FlakyConnectable(Connectable):
+    """Connectable whose action fails on connection errors."""
+
+    def __init__(self, errors, connect_errors=()):
+        """Initialize class with errors raised by subsequent calls."""
+        super().__init__(raise_exception_from_foo=False)
+        self._connected = True
+        self.errors = list(errors)
+        self.connect_errors = list(connect_errors)
+        self.calls = 0
+        self.connects = 0
+
+    def connect(self) -> None:
+        """Connect, failing while there are connect errors left."""
+        self.connects += 1
+        if self.connect_errors:
+            raise self.connect_errors.pop(0)
+        super().connect()
+
+    @connection
+    def foo(self) -> None:
+        """Perform action, failing while there are errors left."""
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+def test_connection_decorator_does_not_probe_connection():
+    """Test that method is executed without reconnecting when it succeeds."""
+    c = FlakyConnectable([])
+
+    c.foo()
+
+    assert c.calls == 1
+    assert c.connects == 0
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        psycopg2.OperationalError("server closed the connection"),
+        psycopg2.InterfaceError("connection already closed"),
+    ],
+)
+def test_connection_decorator_retries_once(error):
+    """Test that method is retried once after reconnect on connection error."""
+    c = FlakyConnectable([error])
+
+    c.foo()
+
+    assert c.calls == 2
+    assert c.connects == 1
+
+    # the second failure is not retried again
+    c = FlakyConnectable([error, error])
+    with pytest.raises(type(error)):
+        c.foo()
+    assert c.calls == 2
+
+
+def test_connection_decorator_retries_wrapped_error():
+    """Test that connection error wrapped by another exception is retried."""
+    try:
+        raise psycopg2.OperationalError("server closed the connection")
+    except psycopg2.OperationalError as e:
+        wrapped = RuntimeError("cache error")
+        wrapped.__cause__ = e
+    c = FlakyConnectable([wrapped])
+
+    c.foo()
+
+    assert c.calls == 2
+
+
+def test_connection_decorator_does_not_retry_other_errors():
+    """Test that errors not caused by connection are not retried."""
+    c = FlakyConnectable([psycopg2.DatabaseError("constraint violated")])
+
+    with pytest.raises(psycopg2.DatabaseError):
+        c.foo()
+
+    assert c.calls == 1
+    assert c.connects == 0
+
+
+def test_connection_decorator_does_not_retry_unconfirmed_write():
+    """Test that write which might be done already is not retried."""
+    try:
+        raise psycopg2.OperationalError("server closed the connection")
+    except psycopg2.OperationalError as e:
+        unconfirmed = UnconfirmedWriteError("write failed")
+        unconfirmed.__cause__ = e
+    c = FlakyConnectable([unconfirmed])
+
+    with pytest.raises(UnconfirmedWriteError):
+        c.foo()
+
+    assert c.calls == 1
+
+
+def test_connection_decorator_does_not_retry_pool_timeout():
+    """Test that saturated pool is not handled as lost connection."""
+    c = FlakyConnectable([PoolTimeoutError("no connection became free")])
+
+    with pytest.raises(PoolTimeoutError):
+        c.foo()
+
+    assert c.calls == 1
+    assert c.connects == 0
+
+
+def test_reconnect_backoff():
+    """Test that reconnection is attempted with bounded exponential backoff."""
+    error = psycopg2.OperationalError("connection refused")
+    with patch("ols.utils.connection_decorator.time.sleep") as mock_sleep:
+        c = FlakyConnectable([error], connect_errors=[error, error])
+        c.foo()
+        assert c.connects == 3
+        assert mock_sleep.call_args_list == [call(0.1), call(0.2)]
+
+        c = FlakyConnectable([error], connect_errors=[error, error, error])
+        with pytest.raises(psycopg2.OperationalError, match="connection refused"):
+            c.foo()
+        assert c.calls == 1
@@ -0,0 +1,154 @@
+"""Unit tests for the Postgres connection pool."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+from prometheus_client import REGISTRY
+
+from ols.app.models.config import PostgresConfig, PostgresPoolConfig
+from ols.utils.postgres_pool import PoolTimeoutError, PostgresPool, get_pool
+
+
+def new_connection(**kwargs):
+    """Construct mock of idle connection."""
+    conn = MagicMock()
+    conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def mock_connect():
+    """Mock of psycopg2.connect returning new connection each call."""
+    with patch("psycopg2.connect") as mock_connect:
+        mock_connect.side_effect = new_connection
+        yield mock_connect
+
+
+def make_pool(**pool_config):
+    """Construct pool with given settings."""
+    return PostgresPool(PostgresConfig(pool=PostgresPoolConfig(**pool_config)))
+
+
+def test_get_pool_is_shared(mock_connect):
+    """Test that components with the same connection parameters share pool."""
+    pool = get_pool(PostgresConfig())
+
+    assert get_pool(PostgresConfig()) is pool
+    assert get_pool(PostgresConfig(dbname="quota")) is not pool
+
+
+def test_connections_are_reused(mock_connect):
+    """Test that returned connection is borrowed again."""
+    pool = make_pool(min_size=2, max_size=3)
+    assert mock_connect.call_count == 2
+    assert pool.size == 2
+
+    conn = pool.getconn()
+    assert conn.autocommit is True
+    assert pool.in_use == 1
+    pool.putconn(conn)
+
+    assert pool.getconn() is conn
+    assert mock_connect.call_count == 2
+
+
+def test_pool_is_bounded(mock_connect):
+    """Test that borrowing waits for a free connection up to the timeout."""
+    pool = make_pool(min_size=0, max_size=1)
+    pool._timeout = 0.05
+    conn = pool.getconn()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+    assert REGISTRY.get_sample_value(
+        "ols_postgres_pool_timeouts_total", {"pool": pool.name}
+    )
+    assert (
+        REGISTRY.get_sample_value("ols_postgres_pool_saturation", {"pool": pool.name})
+        == 1.0
+    )
+
+    # connection returned by another thread is handed over to the waiter
+    pool._timeout = 5
+    threading.Timer(0.05, pool.putconn, args=(conn,)).start()
+    assert pool.getconn() is conn
+
+
+def test_expired_connection_is_replaced(mock_connect):
+    """Test that connection is closed after its maximal lifetime."""
+    pool = make_pool(min_size=1, max_lifetime=60)
+    idle = pool._idle[0][0]
+    now = time.monotonic()
+
+    with patch("ols.utils.postgres_pool.time.monotonic", return_value=now + 61):
+        conn = pool.getconn()
+    # idle connection expired, so a new one is opened instead
+    idle.close.assert_called_once_with()
+    assert conn is not idle
+    assert mock_connect.call_count == 2
+
+    with patch("ols.utils.postgres_pool.time.monotonic", return_value=now + 200):
+        pool.putconn(conn)
+    conn.close.assert_called_once_with()
+    assert pool.size == 0
+
+
+def test_connection_context_manager(mock_connect):
+    """Test that broken connections are closed, others are rolled back."""
+    pool = make_pool(min_size=1)
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    with pytest.raises(psycopg2.DatabaseError), pool.connection() as borrowed:
+        assert borrowed is conn
+        conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_INERROR
+        raise psycopg2.DatabaseError("constraint violated")
+    conn.rollback.assert_called_once_with()
+    conn.close.assert_not_called()
+    assert pool.size == 1
+
+    with pytest.raises(psycopg2.OperationalError), pool.connection():
+        raise psycopg2.OperationalError("server closed the connection")
+    conn.close.assert_called_once_with()
+    assert pool.size == 0
+    assert pool.in_use == 0
+
+
+def test_connection_failure_closes_idle_connections(mock_connect):
+    """Test that idle connections are closed once any connection fails."""
+    pool = make_pool(min_size=2)
+    idle = [entry[0] for entry in pool._idle]
+
+    with pytest.raises(psycopg2.OperationalError), pool.connection():
+        raise psycopg2.OperationalError("terminating connection")
+
+    for conn in idle:
+        conn.close.assert_called_once_with()
+    assert pool.size == 0
+
+
+def test_keepalive_checks_idle_connections(mock_connect):
+    """Test that keep-alive closes broken idle connections."""
+    pool = make_pool(min_size=3, keepalive_interval=30)
+    alive, broken, recent = (entry[0] for entry in pool._idle)
+    broken.cursor.return_value.__enter__.return_value.execute.side_effect = (
+        psycopg2.OperationalError("server closed the connection")
+    )
+    pool._idle[2] = (recent, pool._idle[2][1], time.monotonic() + 60)
+
+    with patch(
+        "ols.utils.postgres_pool.time.monotonic", return_value=time.monotonic() + 31
+    ):
+        pool.check_idle()
+
+    alive.cursor.return_value.__enter__.return_value.execute.assert_called_once_with(
+        "SELECT 1"
+    )
+    broken.close.assert_called_once_with()
+    # recently used connection is not checked
+    recent.cursor.assert_not_called()
+    assert [entry[0] for entry in pool._idle] == [alive, recent]
+    pool.close()
@@ -6,7 +6,7 @@ from unittest import TestCase, mock
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage
 
-from ols.constants import TOKEN_BUFFER_WEIGHT, ModelFamily
+from ols.constants import TOKEN_BUFFER_WEIGHT, TOKEN_COUNTS_METADATA_KEY, ModelFamily
 from ols.src.prompts.prompt_generator import restructure_history
 from ols.utils.token_handler import PromptTooLongError, TokenHandler
 from tests.mock_classes.mock_retrieved_node import MockRetrievedNode
@@ -178,6 +178,73 @@ class TestTokenHandler(TestCase):
         assert len(rag_chunks) == 1
         assert available_tokens == 1
 
+    def test_count_rag_context_tokens(self):
+        """Test token counts of RAG context precomputed for each model family."""
+        token_counts = self._token_handler_obj.count_rag_context_tokens("a text")
+
+        assert token_counts["encoding"] == "cl100k_base"
+        assert token_counts["text_length"] == 6
+        # model specific tags are counted too
+        assert token_counts[ModelFamily.GPT] == 5
+        assert token_counts[ModelFamily.GRANITE] > token_counts[ModelFamily.GPT]
+
+    @mock.patch("ols.utils.token_handler.TOKEN_BUFFER_WEIGHT", 1.05)
+    @mock.patch("ols.utils.token_handler.MINIMUM_CONTEXT_TOKEN_LIMIT", 1)
+    @mock.patch("ols.utils.token_handler.RAG_SIMILARITY_CUTOFF", 0.4)
+    def test_token_handler_precomputed_token_counts(self):
+        """Test that text is not tokenized when token count is precomputed."""
+        for node in self._mock_retrieved_obj:
+            node.metadata[TOKEN_COUNTS_METADATA_KEY] = (
+                self._token_handler_obj.count_rag_context_tokens(node.get_text())
+            )
+        retrieved_nodes = self._mock_retrieved_obj[:3]
+
+        with mock.patch.object(
+            self._token_handler_obj,
+            "text_to_tokens",
+            wraps=self._token_handler_obj.text_to_tokens,
+        ) as text_to_tokens:
+            rag_chunks, available_tokens = self._token_handler_obj.truncate_rag_context(
+                retrieved_nodes, ModelFamily.GPT
+            )
+            text_to_tokens.assert_not_called()
+
+            # the same result as with counting tokens on the fly
+            assert len(rag_chunks) == 3
+            assert (
+                rag_chunks[0].text
+                == "\nDocument:\n" + self._mock_retrieved_obj[0].get_text() + "\n"
+            )
+            assert available_tokens == 473
+
+            # text is tokenized when it needs to be truncated
+            rag_chunks, available_tokens = self._token_handler_obj.truncate_rag_context(
+                retrieved_nodes, ModelFamily.GPT, 13
+            )
+            text_to_tokens.assert_called_once()
+            assert (
+                rag_chunks[1].text
+                == "\nDocument:\n" + self._mock_retrieved_obj[1].get_text()[:1] + "\n"
+            )
+            assert available_tokens == 0
+
+    @mock.patch("ols.utils.token_handler.TOKEN_BUFFER_WEIGHT", 1.05)
+    @mock.patch("ols.utils.token_handler.MINIMUM_CONTEXT_TOKEN_LIMIT", 1)
+    @mock.patch("ols.utils.token_handler.RAG_SIMILARITY_CUTOFF", 0.4)
+    def test_token_handler_stale_token_counts(self):
+        """Test that token counts not matching node text are ignored."""
+        node = self._mock_retrieved_obj[0]
+        node.metadata[TOKEN_COUNTS_METADATA_KEY] = (
+            self._token_handler_obj.count_rag_context_tokens("other text")
+        )
+
+        rag_chunks, available_tokens = self._token_handler_obj.truncate_rag_context(
+            [node], ModelFamily.GPT
+        )
+
+        assert len(rag_chunks) == 1
+        assert available_tokens == 491
+
     def test_token_handler_empty(self):
         """Test token handler when node is empty."""
         rag_chunks, available_tokens = self._token_handler_obj.truncate_rag_context(